@@ -1,47 +1,80 @@
 """
 resolve_mcp — MCP server for DaVinci Resolve scripting API.
 215+ tools covering the full Resolve API (v20.3) plus AI-enhanced editing tools.
+
+Which tool groups register depends on the tool profile (see ``profiles.py``).
 """
 
 from .config import mcp  # noqa: F401 — re-export for entry points
+from .profiles import PROFILES, active_profile, wants
 
 
-def main():
+def main(argv=None):
     """Entry point for `resolve-mcp` console script."""
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(prog="resolve-mcp", description="MCP server for DaVinci Resolve.")
+    parser.add_argument(
+        "--profile",
+        default=active_profile(),
+        help=f"tool profile, or several joined with commas: {', '.join(PROFILES)} (default: full, or RESOLVE_PROFILE)",
+    )
+    args = parser.parse_args(argv)
+    if args.profile != active_profile():
+        # Tools registered when the package was imported.
+        parser.error(f"--profile {args.profile} given after tools loaded with profile {active_profile()}")
+    # Build the tool manifest now rather than on the client's first tools/list.
+    asyncio.run(mcp.list_tools())
     mcp.run()
 
 
-# --- Resolve scripting API tools ---
+# --- Every profile: project, timelines, clips, markers, media pool ---
 from . import project_tools       # noqa: F401  — project/DB management (10 tools)
 from . import media_pool_tools    # noqa: F401  — media pool operations (11 tools)
 from . import timeline_mgmt_tools # noqa: F401  — timeline management (15 tools)
 from . import edit_tools          # noqa: F401  — timeline item editing (12 tools)
 from . import marker_tools        # noqa: F401  — markers & playhead (9 tools)
-from . import render_tools        # noqa: F401  — render/deliver pipeline (14 tools)
-from . import color_tools         # noqa: F401  — color grading (12 tools)
 from . import media_storage_tools # noqa: F401  — media storage browsing (3 tools)
-from . import fairlight_tools     # noqa: F401  — Fairlight audio tools (4 tools)
-
-# --- Extended Resolve API coverage ---
-from . import project_mgr_tools   # noqa: F401  — archive/delete/DB switching (10 tools)
-from . import media_pool_extras   # noqa: F401  — timeline-from-clips, import folder (10 tools)
-from . import clip_metadata_tools # noqa: F401  — clip markers/flags/proxy/transcription (18 tools)
-from . import timeline_insert_tools  # noqa: F401  — generators/titles/scene detect (13 tools)
-from . import item_marker_tools   # noqa: F401  — timeline item markers & flags (11 tools)
-from . import item_version_tools  # noqa: F401  — clip versions/color groups (11 tools)
-from . import fusion_tools        # noqa: F401  — Fusion comp management (8 tools)
-from . import gallery_tools       # noqa: F401  — gallery albums & stills (7 tools)
-from . import node_tools          # noqa: F401  — node graph (5 tools)
-from . import layout_preset_tools # noqa: F401  — layouts/burn-in/render presets (22 tools)
-from . import dolby_stereo_tools  # noqa: F401  — Dolby Vision & 3D stereo (4 tools)
-from . import folder_tools        # noqa: F401  — bin transcription/export/IDs (4 tools)
+from . import resolve_info_tools  # noqa: F401  — project summary, bin listing, item inspector (3 tools)
+from . import batch_tools         # noqa: F401  — run many tool calls in one request (1 tool)
+
+# --- Edit page ---
+if wants("edit", "color", "deliver"):
+    from . import timeline_insert_tools  # noqa: F401  — generators/titles/scene detect (13 tools)
+if wants("edit", "deliver"):
+    from . import media_pool_extras   # noqa: F401  — timeline-from-clips, import folder (10 tools)
+if wants("edit", "fairlight"):
+    from . import clip_metadata_tools # noqa: F401  — clip markers/flags/proxy/transcription (18 tools)
+    from . import item_marker_tools   # noqa: F401  — timeline item markers & flags (11 tools)
+    from . import fairlight_tools     # noqa: F401  — Fairlight audio tools (4 tools)
+if wants("edit"):
+    from . import fusion_tools        # noqa: F401  — Fusion comp management (8 tools)
+
+# --- Color page ---
+if wants("color"):
+    from . import color_tools         # noqa: F401  — color grading (12 tools)
+    from . import node_tools          # noqa: F401  — node graph (5 tools)
+    from . import item_version_tools  # noqa: F401  — clip versions/color groups (11 tools)
+    from . import gallery_tools       # noqa: F401  — gallery albums & stills (7 tools)
+    from . import dolby_stereo_tools  # noqa: F401  — Dolby Vision & 3D stereo (4 tools)
+
+# --- Deliver page & project housekeeping ---
+if wants("deliver", "fairlight"):
+    from . import render_tools        # noqa: F401  — render/deliver pipeline (14 tools)
+if wants("deliver"):
+    from . import project_mgr_tools   # noqa: F401  — archive/delete/DB switching (10 tools)
+    from . import layout_preset_tools # noqa: F401  — layouts/burn-in/render presets (22 tools)
+    from . import folder_tools        # noqa: F401  — bin transcription/export/IDs (4 tools)
 
 # --- Photo tools (Resolve 21+) ---
-from . import photo_tools           # noqa: F401  — Photo page navigation & album import (4 tools)
-from . import photo_raw_tools       # noqa: F401  — Clip properties, metadata, flags (8 tools)
+if wants("photo"):
+    from . import photo_tools         # noqa: F401  — Photo page navigation & album import (4 tools)
+    from . import photo_raw_tools     # noqa: F401  — Clip properties, metadata, flags (8 tools)
 
 # --- AI bridge tools (require GEMINI_API_KEY) ---
-from . import resolve_tools       # noqa: F401  — AI-driven Resolve tools (9 tools)
+if wants("ai"):
+    from . import resolve_tools       # noqa: F401  — AI-driven Resolve tools (9 tools)
 
 # --- MCP Resources ---
 from . import resources           # noqa: F401  — resolve://project, timelines, bins, etc.
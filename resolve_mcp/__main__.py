@@ -1,5 +1,5 @@
 """Entry point: python -m resolve_mcp"""
 
-from . import mcp
+from . import main
 
-mcp.run()
+main()
@@ -9,6 +9,8 @@ Essential for debugging multi-track audio sync and channel routing issues.
 import json
 
 from .config import mcp
+from .item_cache import item_cache
+from .media_index import find_clip
 from .resolve import _boilerplate
 
 
@@ -22,7 +24,7 @@ def resolve_get_audio_mapping(clip_name: str) -> str:
     offsets), and track mapping (channel assignments, types, mute states).
     """
     _, _, mp = _boilerplate()
-    clip = _find_clip(mp.GetRootFolder(), clip_name)
+    clip = find_clip(mp, clip_name)
     if not clip:
         return f"Clip '{clip_name}' not found in media pool."
 
@@ -38,12 +40,14 @@ def resolve_get_audio_mapping(clip_name: str) -> str:
 
 
 @mcp.tool
-def resolve_get_source_audio_mapping(track_type: str, track_index: int, item_index: int) -> str:
+def resolve_get_source_audio_mapping(track_type: str, track_index: int, item_index: int,
+                                     item_id: str = "") -> str:
     """Get the source audio channel mapping for a timeline item.
 
     *track_type*: 'video' or 'audio'.
     *track_index*: 1-based track number.
     *item_index*: 1-based clip position on the track.
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
 
     Returns how the source clip's audio channels are mapped in the timeline.
     """
@@ -52,10 +56,10 @@ def resolve_get_source_audio_mapping(track_type: str, track_index: int, item_ind
     if not tl:
         return "No active timeline."
 
-    items = tl.GetItemListInTrack(track_type, int(track_index)) or []
-    if item_index < 1 or item_index > len(items):
-        return f"Item {item_index} out of range (1-{len(items)})."
-    item = items[item_index - 1]
+    try:
+        item = item_cache.get(tl, track_type, track_index, item_index, item_id)
+    except ValueError as e:
+        return str(e)
 
     mapping_str = item.GetSourceAudioChannelMapping()
     if not mapping_str:
@@ -98,14 +102,3 @@ def _format_mapping(clip_name, mapping):
 
     return "\n".join(lines)
 
-
-def _find_clip(folder, name):
-    """Recursively search for a clip by name."""
-    for clip in folder.GetClipList() or []:
-        if clip.GetName() == name:
-            return clip
-    for sub in folder.GetSubFolderList() or []:
-        found = _find_clip(sub, name)
-        if found:
-            return found
-    return None
@@ -0,0 +1,111 @@
+"""
+Batch execution tool.
+
+``resolve_batch`` runs an ordered list of tool invocations in one MCP round
+trip.  Each step goes through the registered tool (same argument validation
+as a direct call), while the Resolve connection is held open for the whole
+run so steps share one health check, and the media pool / timeline item
+caches stay warm between steps.  Steps are recorded in ``resolve://metrics``
+under their own tool names.
+"""
+
+import json
+import time
+
+import anyio
+
+from .config import mcp
+from .connection import connection
+from .errors import is_failure
+from .metrics import metrics, result_text
+
+
+def _clip_text(text: str, limit: int) -> str:
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return text[: limit - 1] + "…"
+
+
+@mcp.tool
+async def resolve_batch(steps_json: str, stop_on_error: bool = True, max_result_chars: int = 200) -> str:
+    """Run many tool calls in one request.
+
+    *steps_json*: JSON array of ``{"tool": "<tool name>", "args": {...}}``
+    objects, executed in order.
+    *stop_on_error*: stop at the first failing step (default) or keep going.
+    *max_result_chars*: truncate each step's result text (0 = no limit).
+
+    A step fails if the tool raises or its result reports a failure
+    ("Error: ...", "Failed ...", "... not found", "... out of range",
+    "No active timeline", ...; see ``errors.is_failure``).  Returns JSON:
+    ``{"ran", "ok", "failed", "stopped_at", "elapsed_ms", "steps": [...]}``
+    where each step is ``{"i", "tool", "ok", "ms", "result"}``.
+
+    Example::
+
+        [{"tool": "resolve_set_item_properties",
+          "args": {"track_type": "video", "track_index": 1, "item_index": 3,
+                   "properties_json": "{\\"ZoomX\\": 1.2}"}},
+         {"tool": "resolve_add_marker_at", "args": {"frame": 120, "color": "Red"}}]
+    """
+    try:
+        steps = json.loads(steps_json)
+    except json.JSONDecodeError as exc:
+        return f"Invalid JSON: {exc}"
+    if not isinstance(steps, list):
+        return "steps_json must be a JSON array of {tool, args} objects."
+
+    results: list[dict] = []
+    stopped_at = None
+    t_batch = time.perf_counter()
+
+    # The health check may wait on the dispatcher; keep it off the event loop.
+    await anyio.to_thread.run_sync(connection.get)
+    with connection.hold(validate=False):
+        for i, step in enumerate(steps):
+            if not isinstance(step, dict):
+                step = {}
+            name = step.get("tool", "")
+            args = step.get("args") or {}
+            t0 = time.perf_counter()
+            ok = False
+            if not name or not isinstance(args, dict):
+                text = "Step must be an object with 'tool' and optional 'args' object."
+            elif name == "resolve_batch":
+                text = "resolve_batch cannot be nested."
+            else:
+                tool = await mcp.get_tool(name)
+                if tool is None:
+                    text = f"Unknown tool '{name}'."
+                else:
+                    try:
+                        with metrics.invocation(name) as inv:
+                            text = result_text(await tool.run(args))
+                            ok = not is_failure(text)
+                            inv.bytes_out, inv.error = len(text.encode("utf-8")), not ok
+                    except Exception as exc:
+                        text = f"Error: {exc}"
+            results.append(
+                {
+                    "i": i,
+                    "tool": name,
+                    "ok": ok,
+                    "ms": round((time.perf_counter() - t0) * 1000.0, 1),
+                    "result": _clip_text(text, max_result_chars),
+                }
+            )
+            if not ok and stop_on_error:
+                stopped_at = i
+                break
+
+    n_ok = sum(1 for r in results if r["ok"])
+    return json.dumps(
+        {
+            "ran": len(results),
+            "ok": n_ok,
+            "failed": len(results) - n_ok,
+            "stopped_at": stopped_at,
+            "elapsed_ms": round((time.perf_counter() - t_batch) * 1000.0, 1),
+            "steps": results,
+        }
+    )
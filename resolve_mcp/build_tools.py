@@ -3,11 +3,11 @@ Build timeline MCP tools: build_timeline and build_status.
 """
 
 import json
-import threading
 from pathlib import Path
 from typing import Optional
 
 from .config import log, mcp
+from .dispatcher import start_background
 from .media import load_sidecars
 from .build_worker import (
     _build_worker, _active_build_workers,
@@ -54,13 +54,7 @@ def build_timeline(folder_path: str, instruction: str) -> str:
         except (json.JSONDecodeError, OSError):
             cached_plan = None
 
-    thread = threading.Thread(
-        target=_build_worker,
-        args=(root, sidecars, instruction),
-        kwargs={"cached_plan": cached_plan},
-        daemon=True,
-    )
-    thread.start()
+    thread = start_background(_build_worker, root, sidecars, instruction, cached_plan=cached_plan)
     _active_build_workers[key] = thread
 
     if cached_plan:
@@ -7,8 +7,6 @@ import threading
 from pathlib import Path
 from typing import Optional
 
-from google.genai import types
-
 from .config import MODEL, client, log
 from .retry import retry_gemini
 from .prompts import EDIT_PROMPT_TEMPLATE, MUSIC_BRIEF_ADDENDUM
@@ -43,6 +41,8 @@ def _build_worker(root: Path, sidecars: list[dict], instruction: str,
         if cached_plan:
             edit_plan = cached_plan
         else:
+            from google.genai import types
+
             _write_build_progress(root, {
                 "status": "uploading",
                 "detail": f"Uploading {len(sidecars)} media file(s) to Gemini…",
@@ -1,16 +1,18 @@
 """Clip editing tools: set properties, enable/disable, color, delete, link, compound, stabilize, speed ramp."""
 
+import fnmatch
 import json
 
 from .config import mcp
 from .resolve import _boilerplate
 from .clip_query_tools import _get_item
+from .item_cache import item_cache
 from .resolve_transforms import _apply_speed_ramp
 
 
 @mcp.tool
 def resolve_set_item_properties(
-    track_type: str, track_index: int, item_index: int, properties_json: str
+    track_type: str, track_index: int, item_index: int, properties_json: str, item_id: str = ""
 ) -> str:
     """Set properties on a timeline item.
 
@@ -18,10 +20,11 @@ def resolve_set_item_properties(
     Supported: Pan, Tilt, ZoomX, ZoomY, RotationAngle, AnchorPointX, AnchorPointY,
     Pitch, Yaw, FlipX, FlipY, CropLeft/Right/Top/Bottom, CropSoftness,
     CompositeMode, Opacity, RetimeProcess, MotionEstimation, Scaling, ResizeFilter.
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
     _, project, _ = _boilerplate()
     try:
-        _, item = _get_item(project, track_type, track_index, item_index)
+        _, item = _get_item(project, track_type, track_index, item_index, item_id)
     except ValueError as e:
         return str(e)
     try:
@@ -35,14 +38,119 @@ def resolve_set_item_properties(
     return "Property updates:\n" + "\n".join(results)
 
 
+def _parse_track_range(spec: str, track_count: int) -> list[int]:
+    """Parse '' (all), '2', '1-3' or '1,3,5' into 1-based track numbers."""
+    if not spec.strip():
+        return list(range(1, track_count + 1))
+    tracks: set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = (int(x) for x in part.split("-", 1))
+            tracks.update(range(lo, hi + 1))
+        elif part:
+            tracks.add(int(part))
+    return sorted(t for t in tracks if 1 <= t <= track_count)
+
+
+def _source_name(item) -> str:
+    pool_item = item.GetMediaPoolItem()
+    return (pool_item.GetName() if pool_item else None) or item.GetName() or ""
+
+
+@mcp.tool
+def resolve_set_item_properties_bulk(
+    properties_json: str,
+    track_type: str = "video",
+    track_range: str = "",
+    frame_start: int = -1,
+    frame_end: int = -1,
+    clip_color: str = "",
+    name_pattern: str = "",
+    enabled_state: str = "any",
+    dry_run: bool = False,
+) -> str:
+    """Set the same properties on every timeline item matching a selector.
+
+    *properties_json*: JSON object of property names and values, as for
+    resolve_set_item_properties (e.g. '{"ZoomX": 1.1, "ZoomY": 1.1}').
+    *track_type*: 'video', 'audio', or 'subtitle'.
+    *track_range*: tracks to scan — '' for all, '2', '1-3' or '1,3'.
+    *frame_start*/*frame_end*: only items overlapping this record-frame range
+    (-1 = unbounded).
+    *clip_color*: only items with this clip color tag.
+    *name_pattern*: case-insensitive glob on the source clip name (e.g. 'A001*').
+    *enabled_state*: 'any', 'enabled' or 'disabled'.
+    *dry_run*: report matches without changing anything.
+
+    Returns the match count and per-property success/failure counts.
+    """
+    _, project, _ = _boilerplate()
+    tl = project.GetCurrentTimeline()
+    if not tl:
+        return "No active timeline."
+    try:
+        props = json.loads(properties_json)
+    except json.JSONDecodeError as exc:
+        return f"Invalid JSON: {exc}"
+    if not isinstance(props, dict) or not props:
+        return "properties_json must be a non-empty JSON object."
+    state = enabled_state.lower()
+    if state not in ("any", "enabled", "disabled"):
+        return f"Invalid enabled_state '{enabled_state}'. Use 'any', 'enabled' or 'disabled'."
+    try:
+        tracks = _parse_track_range(track_range, tl.GetTrackCount(track_type.lower()) or 0)
+    except ValueError:
+        return f"Invalid track_range '{track_range}'."
+    if not tracks:
+        return f"No {track_type} tracks match '{track_range}'."
+
+    pattern = name_pattern.lower()
+    scanned = 0
+    matched = []
+    for track_index in tracks:
+        for item in item_cache.items(tl, track_type, track_index):
+            scanned += 1
+            # Cheapest checks first; each filter costs one API call per item.
+            if frame_start >= 0 and item.GetEnd() <= frame_start:
+                continue
+            if frame_end >= 0 and item.GetStart() >= frame_end:
+                continue
+            if clip_color and (item.GetClipColor() or "").lower() != clip_color.lower():
+                continue
+            if state != "any" and bool(item.GetClipEnabled()) != (state == "enabled"):
+                continue
+            if pattern and not fnmatch.fnmatch(_source_name(item).lower(), pattern):
+                continue
+            matched.append(item)
+
+    where = f"{track_type} track(s) {', '.join(str(t) for t in tracks)}"
+    if not matched:
+        return f"No items matched on {where} ({scanned} scanned)."
+    if dry_run:
+        return f"Dry run: {len(matched)} of {scanned} item(s) on {where} would be updated."
+
+    counts = {k: [0, 0] for k in props}
+    for item in matched:
+        for k, v in props.items():
+            counts[k][0 if item.SetProperty(k, v) else 1] += 1
+
+    lines = [f"Updated {len(matched)} of {scanned} item(s) on {where}:"]
+    lines += [f"  {k}={props[k]}: {ok} OK, {bad} FAILED" for k, (ok, bad) in counts.items()]
+    return "\n".join(lines)
+
+
 @mcp.tool
 def resolve_set_clip_enabled(
-    track_type: str, track_index: int, item_index: int, enabled: bool = True
+    track_type: str, track_index: int, item_index: int, enabled: bool = True, item_id: str = ""
 ) -> str:
-    """Enable or disable a clip on the timeline."""
+    """Enable or disable a clip on the timeline.
+
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
+    """
     _, project, _ = _boilerplate()
     try:
-        _, item = _get_item(project, track_type, track_index, item_index)
+        _, item = _get_item(project, track_type, track_index, item_index, item_id)
     except ValueError as e:
         return str(e)
     state = "enabled" if enabled else "disabled"
@@ -55,16 +163,18 @@ def resolve_set_clip_enabled(
 
 @mcp.tool
 def resolve_set_clip_color_on_timeline(
-    track_type: str, track_index: int, item_index: int, color: str
+    track_type: str, track_index: int, item_index: int, color: str, item_id: str = ""
 ) -> str:
     """Set the color tag of a clip on the timeline.
 
     Valid colors: Orange, Apricot, Yellow, Lime, Olive, Green, Teal, Navy,
     Blue, Purple, Violet, Pink, Tan, Beige, Brown, Chocolate.
+
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
     _, project, _ = _boilerplate()
     try:
-        _, item = _get_item(project, track_type, track_index, item_index)
+        _, item = _get_item(project, track_type, track_index, item_index, item_id)
     except ValueError as e:
         return str(e)
     return (
@@ -87,7 +197,7 @@ def resolve_delete_clips_from_timeline(
     tl = project.GetCurrentTimeline()
     if not tl:
         return "No active timeline."
-    items = tl.GetItemListInTrack(track_type.lower(), int(track_index))
+    items = item_cache.items(tl, track_type, track_index)
     if not items:
         return f"No items on {track_type} track {track_index}."
     indices = [int(x.strip()) for x in item_indices.split(",") if x.strip()]
@@ -96,6 +206,7 @@ def resolve_delete_clips_from_timeline(
     if not to_delete:
         return f"No valid items to delete. Bad indices: {', '.join(bad_idx)}"
     result = tl.DeleteClips(to_delete, ripple)
+    item_cache.bump()
     msg = f"Deleted {len(to_delete)} clip(s) from {track_type} track {track_index}."
     if ripple:
         msg += " (with ripple)"
@@ -116,7 +227,7 @@ def resolve_link_clips(
     tl = project.GetCurrentTimeline()
     if not tl:
         return "No active timeline."
-    items = tl.GetItemListInTrack(track_type.lower(), int(track_index))
+    items = item_cache.items(tl, track_type, track_index)
     if not items:
         return f"No items on {track_type} track {track_index}."
     indices = [int(x.strip()) for x in item_indices.split(",") if x.strip()]
@@ -143,16 +254,18 @@ def resolve_create_compound_clip(
     tl = project.GetCurrentTimeline()
     if not tl:
         return "No active timeline."
-    items = tl.GetItemListInTrack(track_type.lower(), int(track_index))
+    items = item_cache.items(tl, track_type, track_index)
     if not items:
         return f"No items on {track_type} track {track_index}."
     indices = [int(x.strip()) for x in item_indices.split(",") if x.strip()]
     selected = [items[i - 1] for i in indices if 1 <= i <= len(items)]
     if not selected:
         return "No valid items selected."
+    result = tl.CreateCompoundClip(selected, {"name": name})
+    item_cache.bump()
     return (
         f"Created compound clip '{name}' from {len(selected)} items."
-        if tl.CreateCompoundClip(selected, {"name": name})
+        if result
         else "Failed to create compound clip."
     )
 
@@ -163,6 +276,7 @@ def resolve_stabilize_clip(
     track_index: int,
     item_index: int,
     mode: str = "",
+    item_id: str = "",
 ) -> str:
     """Apply stabilization to a clip on the timeline. Requires Resolve Studio.
 
@@ -171,10 +285,11 @@ def resolve_stabilize_clip(
     so the Inspector's current mode is used regardless. When a future Resolve
     build exposes the property we try SetProperty here as well so the tool
     upgrades automatically.
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
     _, project, _ = _boilerplate()
     try:
-        _, item = _get_item(project, track_type, track_index, item_index)
+        _, item = _get_item(project, track_type, track_index, item_index, item_id)
     except ValueError as e:
         return str(e)
     mode_note = ""
@@ -198,11 +313,14 @@ def resolve_stabilize_clip(
 
 
 @mcp.tool
-def resolve_smart_reframe(track_type: str, track_index: int, item_index: int) -> str:
-    """Apply Smart Reframe to a clip (auto-crops for different aspect ratios). Requires Resolve Studio."""
+def resolve_smart_reframe(track_type: str, track_index: int, item_index: int, item_id: str = "") -> str:
+    """Apply Smart Reframe to a clip (auto-crops for different aspect ratios). Requires Resolve Studio.
+
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
+    """
     _, project, _ = _boilerplate()
     try:
-        _, item = _get_item(project, track_type, track_index, item_index)
+        _, item = _get_item(project, track_type, track_index, item_index, item_id)
     except ValueError as e:
         return str(e)
     return f"Smart Reframe applied to clip {item_index}." if item.SmartReframe() else "Smart Reframe failed. Requires Resolve Studio."
@@ -210,7 +328,7 @@ def resolve_smart_reframe(track_type: str, track_index: int, item_index: int) ->
 
 @mcp.tool
 def resolve_speed_ramp(track_type: str, track_index: int, item_index: int,
-                       speed_points_json: str) -> str:
+                       speed_points_json: str, item_id: str = "") -> str:
     """Apply a speed ramp to a timeline clip via a Fusion TimeStretcher.
 
     Creates a Fusion composition on the clip with a TimeStretcher node
@@ -219,6 +337,7 @@ def resolve_speed_ramp(track_type: str, track_index: int, item_index: int,
     *speed_points_json*: JSON array of control points, each with:
       - ``t_sec`` (float): time in seconds from clip start
       - ``speed`` (float): playback speed at this point (1.0 = normal, 2.0 = 2× fast, 0.5 = half speed)
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
 
     Speed is linearly interpolated between control points. The last
     control point's ``t_sec`` should match the clip duration.
@@ -239,7 +358,7 @@ def resolve_speed_ramp(track_type: str, track_index: int, item_index: int,
     """
     _, project, _ = _boilerplate()
     try:
-        tl, item = _get_item(project, track_type, track_index, item_index)
+        tl, item = _get_item(project, track_type, track_index, item_index, item_id)
     except ValueError as e:
         return str(e)
 
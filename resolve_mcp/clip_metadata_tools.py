@@ -4,16 +4,15 @@ transcription, replace, and unique IDs.
 """
 
 import json
-from pathlib import Path
 
 from .config import mcp
 from .errors import safe_resolve_call
-from .resolve import _boilerplate, _collect_clips_recursive
+from .media_index import find_clip, media_index
+from .resolve import _boilerplate
 
 
 def _clip(media_pool, name: str):
-    pool = _collect_clips_recursive(media_pool.GetRootFolder())
-    return pool.get(name) or pool.get(Path(name).stem)
+    return find_clip(media_pool, name)
 
 
 # ---------------------------------------------------------------------------
@@ -285,6 +284,7 @@ def resolve_clip_replace(clip_name: str, new_file_path: str) -> str:
     if not c:
         return f"Clip '{clip_name}' not found."
     r = c.ReplaceClip(new_file_path)
+    media_index.reset()  # file path changed; name and counts did not
     return f"Replaced with {new_file_path}" if r else "Replace failed."
 
 
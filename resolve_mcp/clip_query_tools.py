@@ -3,21 +3,16 @@
 import json
 
 from .config import mcp
+from .item_cache import item_cache, timeline_item
 from .resolve import _boilerplate
 
 
-def _get_item(project, track_type: str, track_index: int, item_index: int):
-    """Return (timeline, item) or raise ValueError."""
-    tl = project.GetCurrentTimeline()
-    if not tl:
-        raise ValueError("No active timeline.")
-    items = tl.GetItemListInTrack(track_type.lower(), int(track_index))
-    if not items:
-        raise ValueError(f"No items on {track_type} track {track_index}.")
-    idx = int(item_index) - 1
-    if idx < 0 or idx >= len(items):
-        raise ValueError(f"Item index {item_index} out of range (1–{len(items)}).")
-    return tl, items[idx]
+def _get_item(project, track_type: str, track_index: int, item_index: int, item_id: str = ""):
+    """Return (timeline, item) or raise ValueError.
+
+    *item_id* (a ``GetUniqueId()`` value) takes precedence over track/index.
+    """
+    return timeline_item(project, track_type, track_index, item_index, item_id)
 
 
 @mcp.tool
@@ -26,12 +21,15 @@ def resolve_list_clips_on_track(track_type: str, track_index: int) -> str:
 
     *track_type*: 'video', 'audio', or 'subtitle'.
     *track_index*: 1-based track number.
+
+    Each line ends with the item's unique ID, which item tools accept as
+    *item_id* to skip the positional lookup.
     """
     _, project, _ = _boilerplate()
     tl = project.GetCurrentTimeline()
     if not tl:
         return "No active timeline."
-    items = tl.GetItemListInTrack(track_type.lower(), int(track_index))
+    items = item_cache.items(tl, track_type, track_index)
     if not items:
         return f"No items on {track_type} track {track_index}."
 
@@ -41,20 +39,21 @@ def resolve_list_clips_on_track(track_type: str, track_index: int) -> str:
         src_name = pool_item.GetName() if pool_item else "—"
         lines.append(
             f"  {i}. [{item.GetStart()}→{item.GetEnd()}] dur={item.GetDuration()} "
-            f"name='{item.GetName() or '?'}' src='{src_name}'"
+            f"name='{item.GetName() or '?'}' src='{src_name}' id={item.GetUniqueId()}"
         )
     return "\n".join(lines)
 
 
 @mcp.tool
-def resolve_get_item_properties(track_type: str, track_index: int, item_index: int) -> str:
+def resolve_get_item_properties(track_type: str, track_index: int, item_index: int, item_id: str = "") -> str:
     """Get all properties of a timeline item (transform, composite, crop, etc.).
 
     *item_index*: 1-based position within the track.
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
     _, project, _ = _boilerplate()
     try:
-        _, item = _get_item(project, track_type, track_index, item_index)
+        _, item = _get_item(project, track_type, track_index, item_index, item_id)
     except ValueError as e:
         return str(e)
 
@@ -86,14 +85,17 @@ def resolve_get_item_properties(track_type: str, track_index: int, item_index: i
 
 
 @mcp.tool
-def resolve_get_clip_source_info(track_type: str, track_index: int, item_index: int) -> str:
+def resolve_get_clip_source_info(track_type: str, track_index: int, item_index: int,
+                                 item_id: str = "") -> str:
     """Get source file info for a clip on the timeline.
 
     Returns media pool item name, file path, in/out points, and offsets.
+
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
     _, project, _ = _boilerplate()
     try:
-        _, item = _get_item(project, track_type, track_index, item_index)
+        _, item = _get_item(project, track_type, track_index, item_index, item_id)
     except ValueError as e:
         return str(e)
 
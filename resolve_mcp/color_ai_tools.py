@@ -12,11 +12,12 @@ import contextlib
 import json
 import shutil
 import tempfile
-import threading
 from pathlib import Path
 
 from .build_worker import _active_build_workers
 from .config import MODEL, client, log, mcp
+from .dispatcher import start_background
+from .execution import report_progress
 from .media import load_sidecars
 from .prompts_color import AUTO_BROLL_PROMPT, GRADE_CONSISTENCY_PROMPT
 from .resolve import _boilerplate
@@ -63,6 +64,7 @@ def _export_timeline_frames(project, timeline, tmpdir: str) -> list[dict]:
     frames: list[dict] = []
 
     for idx, item in enumerate(items, start=1):
+        report_progress(idx - 1, len(items), "Exporting stills")
         start = item.GetStart()
         end = item.GetEnd()
         mid = (start + end) // 2
@@ -99,6 +101,7 @@ def _export_timeline_frames(project, timeline, tmpdir: str) -> list[dict]:
             }
         )
 
+    report_progress(len(items), len(items), "Exporting stills")
     return frames
 
 
@@ -437,22 +440,18 @@ def resolve_auto_broll(instruction: str, footage_folder: str = "", target_track:
     if key in _active_build_workers and _active_build_workers[key].is_alive():
         return "B-roll insertion already running for this timeline."
 
-    t = threading.Thread(
-        target=_broll_worker,
-        args=(
-            resolve,
-            project,
-            media_pool,
-            timeline,
-            sidecars,
-            aroll_manifest,
-            instruction,
-            target_track,
-            progress_root,
-        ),
-        daemon=True,
+    t = start_background(
+        _broll_worker,
+        resolve,
+        project,
+        media_pool,
+        timeline,
+        sidecars,
+        aroll_manifest,
+        instruction,
+        target_track,
+        progress_root,
     )
-    t.start()
     _active_build_workers[key] = t
 
     return (
@@ -634,9 +633,7 @@ def resolve_check_grade_consistency(apply_fixes: str = "false") -> str:
         except Exception as exc:
             entry["error"] = str(exc)
 
-    t = threading.Thread(target=_bg, daemon=True)
-    entry["thread"] = t
-    t.start()
+    entry["thread"] = start_background(_bg)
     return (
         f"Consistency check running in background for '{tl_name}' ({len(items)} clips). "
         "Re-call resolve_check_grade_consistency() to retrieve the result."
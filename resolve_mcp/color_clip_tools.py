@@ -1,6 +1,7 @@
 """Color clip tools: grade copy, gallery stills, frame export, color groups."""
 
 from .config import mcp
+from .item_cache import item_cache
 from .resolve import _boilerplate
 from .color_grade_tools import _current_item
 
@@ -18,7 +19,7 @@ def resolve_copy_grade(source_clip_index: int, target_clip_indices: str,
     if not tl:
         return "No active timeline."
 
-    items = tl.GetItemListInTrack(track_type.lower(), int(track_index))
+    items = item_cache.items(tl, track_type, track_index)
     if not items:
         return f"No items on {track_type} track {track_index}."
 
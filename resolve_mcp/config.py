@@ -4,10 +4,15 @@ Global configuration, constants, and shared singletons (Gemini client, MCP serve
 
 import logging
 import os
+import threading
 
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 
+from .execution import ToolExecutionMiddleware
+from .metrics import METRICS_ENABLED, ToolMetricsMiddleware
+from .profiles import manifest_cache
+
 load_dotenv()
 
 log = logging.getLogger("resolve-mcp")
@@ -19,11 +24,32 @@ log = logging.getLogger("resolve-mcp")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 MODEL = "gemini-3-flash-preview"  # free preview pricing
-client = None
 
-if GEMINI_API_KEY:
-    from google import genai
-    client = genai.Client(api_key=GEMINI_API_KEY)
+
+class _LazyGeminiClient:
+    """Stands in for ``genai.Client`` until first use.
+
+    Importing ``google.genai`` takes about half a second, which every server
+    start paid even if no AI tool was ever called.  The real client is built
+    on the first attribute access (``client.models``, ``client.files``).
+    """
+
+    def __init__(self, api_key: str):
+        self._api_key = api_key
+        self._client = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from google import genai
+                    self._client = genai.Client(api_key=self._api_key)
+        return getattr(self._client, name)
+
+
+# None when no key is set, so ``if client is None`` checks keep working.
+client = _LazyGeminiClient(GEMINI_API_KEY) if GEMINI_API_KEY else None
 
 # ---------------------------------------------------------------------------
 # MCP server instance — tools register via @mcp.tool in other modules
@@ -49,6 +75,11 @@ mcp = FastMCP(
     ),
 )
 
+if METRICS_ENABLED:
+    mcp.add_middleware(ToolMetricsMiddleware())
+mcp.add_middleware(ToolExecutionMiddleware())
+mcp.add_middleware(manifest_cache)
+
 # ---------------------------------------------------------------------------
 # Media constants
 # ---------------------------------------------------------------------------
@@ -62,4 +93,6 @@ IMAGE_EXTS = {
 }
 GEMINI_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB Files API ceiling
 SAFE_CODECS = {"h264", "avc", "avc1", "hevc", "h265", "hev1"}
+# Containers the Gemini Files API accepts for video; others are remuxed to MP4.
+GEMINI_CONTAINERS = {".mp4", ".m4v", ".mov", ".avi", ".webm", ".mpg", ".mpeg", ".wmv", ".flv", ".3gp"}
 GEMINI_MAX_LONG_EDGE = 1280
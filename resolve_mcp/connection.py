@@ -0,0 +1,254 @@
+"""
+Persistent DaVinci Resolve scripting connection.
+
+``get_resolve()`` used to re-import ``DaVinciResolveScript`` and call
+``scriptapp("Resolve")`` on every tool invocation.  ``ResolveConnection``
+keeps one live handle, validates it with a cheap ``GetVersionString()`` ping
+(rate-limited and bounded by a short timeout), and reconnects only when the
+ping fails.  Counters are exposed via ``connection.stats()``.  The handle is
+wrapped by ``metrics.counted`` so scripting calls are attributed to tools and
+run on the Resolve dispatcher thread.
+"""
+
+import contextlib
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+
+from .dispatcher import URGENT, dispatcher
+from .metrics import counted
+
+log = logging.getLogger(__name__)
+
+# Seconds a successful ping stays valid before the next call re-pings.
+PING_INTERVAL = float(os.getenv("RESOLVE_PING_INTERVAL", "1.0"))
+# Seconds to wait for a ping reply before declaring the handle stale.
+PING_TIMEOUT = float(os.getenv("RESOLVE_PING_TIMEOUT", "2.0"))
+# Seconds a ping may wait in all, including behind a scripting call still running.
+PING_LIMIT = float(os.getenv("RESOLVE_PING_LIMIT", "30.0"))
+
+
+def _resolve_module_path() -> str | None:
+    """Return the Resolve scripting modules directory for the current platform."""
+    override = os.getenv("RESOLVE_SCRIPT_API")
+    if override and os.path.isdir(override):
+        return override
+
+    platform_paths = {
+        "darwin": "/Library/Application Support/Blackmagic Design/DaVinci Resolve/Developer/Scripting/Modules/",
+        "win32": os.path.expandvars(
+            r"%PROGRAMDATA%\Blackmagic Design\DaVinci Resolve"
+            r"\Support\Developer\Scripting\Modules\\"
+        ),
+        "linux": "/opt/resolve/Developer/Scripting/Modules/",
+    }
+    path = platform_paths.get(sys.platform, platform_paths["linux"])
+    return path if os.path.isdir(path) else None
+
+
+class ResolveConnection:
+    """One cached Resolve handle, health-checked and reconnected on demand."""
+
+    def __init__(
+        self, ping_interval: float = PING_INTERVAL, ping_timeout: float = PING_TIMEOUT, ping_limit: float = PING_LIMIT
+    ):
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.ping_limit = max(ping_limit, ping_timeout)
+        self._lock = threading.RLock()
+        self._module = None
+        self._handle = None
+        self._project_manager = None
+        self._validated_at = 0.0
+        # True inside ``hold()``; a context variable, so only the holder's own
+        # calls (and the worker threads they start) skip the ping.
+        self._held = contextvars.ContextVar(f"resolve_connection_held_{id(self)}", default=False)
+        # Set while a ping is in flight; other callers wait on it instead of pinging.
+        self._pinging: threading.Event | None = None
+        self._counters = {
+            "connects": 0,
+            "reconnects": 0,
+            "connect_failures": 0,
+            "pings": 0,
+            "ping_failures": 0,
+            "cache_hits": 0,
+        }
+        self._ping_ms_total = 0.0
+        self._ping_ms_last = 0.0
+        self._ping_ms_max = 0.0
+
+    # -- module / handle ------------------------------------------------------
+
+    def _import_module(self):
+        """Import ``DaVinciResolveScript`` once; returns None if unavailable."""
+        if self._module is not None:
+            return self._module
+        mod_path = _resolve_module_path()
+        if mod_path is None:
+            return None
+        if mod_path not in sys.path:
+            sys.path.insert(0, mod_path)
+        try:
+            import DaVinciResolveScript as dvr_script  # type: ignore
+        except ImportError:
+            return None
+        self._module = dvr_script
+        return dvr_script
+
+    def _connect(self):
+        """Open a fresh handle.  Returns it, or None on failure."""
+        module = self._import_module()
+        if module is None:
+            self._counters["connect_failures"] += 1
+            return None
+        try:
+            handle = counted(module.scriptapp("Resolve"))
+        except (AttributeError, TypeError):
+            handle = None
+        if not handle:
+            self._counters["connect_failures"] += 1
+            return None
+        if self._counters["connects"]:
+            self._counters["reconnects"] += 1
+            log.info("Reconnected to DaVinci Resolve.")
+        self._counters["connects"] += 1
+        self._handle = handle
+        self._project_manager = None
+        self._validated_at = time.monotonic()
+        return handle
+
+    def _ping(self, handle) -> bool:
+        """Return True if *handle* answers ``GetVersionString`` within the timeout.
+
+        The ping jumps the dispatcher queue; the timeout starts once it runs.
+        A ping that cannot start within ``ping_limit`` (the executor is stuck
+        in a call that never returns) fails as well.
+        """
+
+        def _call():
+            try:
+                return handle.GetVersionString()
+            except Exception:
+                return None
+
+        t0 = time.perf_counter()
+        # Submitted from an empty context so the ping belongs to no tool call:
+        # cancelling the tool that triggered it must not fail the health check.
+        job = contextvars.Context().run(dispatcher.submit, _call, priority=URGENT)
+        answered = job.wait(self.ping_timeout, limit=self.ping_limit)
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+
+        ok = answered and bool(job.result)
+        with self._lock:
+            self._counters["pings"] += 1
+            self._ping_ms_last = elapsed_ms
+            self._ping_ms_total += elapsed_ms
+            self._ping_ms_max = max(self._ping_ms_max, elapsed_ms)
+            if not ok:
+                self._counters["ping_failures"] += 1
+        if not ok:
+            log.warning("Resolve ping failed after %.1f ms — handle marked stale.", elapsed_ms)
+        return ok
+
+    # -- public API -----------------------------------------------------------
+
+    def get(self):
+        """Return a live Resolve handle, reconnecting if the cached one is stale.
+
+        The lock is not held while a ping waits: one caller pings, callers
+        arriving meanwhile wait for its verdict, and the handle is re-checked
+        afterwards in case another thread reconnected or invalidated it.
+        """
+        while True:
+            with self._lock:
+                handle = self._handle
+                if handle is None:
+                    return self._connect()
+                if self._held.get() or time.monotonic() - self._validated_at < self.ping_interval:
+                    self._counters["cache_hits"] += 1
+                    return handle
+                validated_at, pinging = self._validated_at, self._pinging
+                owner = pinging is None
+                if pinging is None:
+                    pinging = self._pinging = threading.Event()
+            if not owner:
+                pinging.wait()
+                with self._lock:
+                    if self._handle is handle and self._validated_at > validated_at:
+                        self._counters["cache_hits"] += 1
+                        return handle
+                continue
+            ok = False
+            try:
+                ok = self._ping(handle)
+            finally:
+                with self._lock:
+                    self._pinging = None
+                    if self._handle is handle:
+                        if ok:
+                            self._validated_at = time.monotonic()
+                        else:
+                            self._handle = None
+                            self._project_manager = None
+                pinging.set()
+            if ok and self._handle is handle:
+                return handle
+
+    def project_manager(self, handle=None):
+        """Return the cached ProjectManager for the live handle, or None.
+
+        Pass the *handle* just returned by ``get()`` to skip a second check.
+        """
+        if handle is None or handle is not self._handle:
+            handle = self.get()
+        if handle is None:
+            return None
+        with self._lock:
+            if handle is not self._handle:
+                return handle.GetProjectManager()
+            if self._project_manager is None:
+                self._project_manager = handle.GetProjectManager()
+            return self._project_manager
+
+    @contextlib.contextmanager
+    def hold(self, validate: bool = True):
+        """Validate once, then skip pings in this context until the block exits.
+
+        Used by ``resolve_batch`` so a run of hundreds of steps pays for one
+        health check instead of one per ping interval.  Other callers keep
+        pinging as usual.  Yields the handle (None if Resolve is unreachable).
+        Pass ``validate=False`` when the caller has just called ``get()``
+        itself, e.g. from a worker thread to keep the ping off an event loop.
+        """
+        handle = self.get() if validate else self._handle
+        token = self._held.set(True)
+        try:
+            yield handle
+        finally:
+            self._held.reset(token)
+
+    def invalidate(self) -> None:
+        """Drop the cached handle so the next ``get()`` reconnects."""
+        with self._lock:
+            self._handle = None
+            self._project_manager = None
+            self._validated_at = 0.0
+
+    def stats(self) -> dict:
+        """Return connection counters and ping latency (milliseconds)."""
+        with self._lock:
+            pings = self._counters["pings"]
+            return {
+                **self._counters,
+                "connected": self._handle is not None,
+                "ping_ms_last": round(self._ping_ms_last, 3),
+                "ping_ms_avg": round(self._ping_ms_total / pings, 3) if pings else 0.0,
+                "ping_ms_max": round(self._ping_ms_max, 3),
+            }
+
+
+# Process-wide connection shared by every tool module.
+connection = ResolveConnection()
@@ -0,0 +1,340 @@
+"""
+Single-threaded executor for Resolve scripting calls.
+
+The scripting bridge is not safe to drive from several threads at once, yet
+background workers (ingest, timeline builds, the Gemini agent, B-roll and
+grade checks) run alongside foreground MCP tools.  Every scripting method
+call made through the proxied Resolve handle (see ``metrics.counted``) is
+handed to one ``resolve-dispatch`` thread and executed there, in priority
+order:
+
+  URGENT       connection health pings
+  INTERACTIVE  MCP tool calls (the default)
+  BACKGROUND   threads started with ``start_background``
+
+Interactive calls always jump queued background calls, and background work
+is held back for ``RESOLVE_DISPATCH_GRACE_MS`` after each interactive call so
+a tool's next scripting call wins the executor as well.  Calls made on the
+executor thread itself run inline, so ``dispatcher.call(closure)`` runs a
+whole burst of scripting calls as one job.  A long job (a full media pool
+walk) calls ``run_urgent()`` between steps so a health ping queued behind it
+still answers in time.
+
+Jobs carry the MCP tool call they were made for: once the client cancels
+it, the dispatcher raises ``ToolCancelled`` instead of running its calls.
+
+``dispatcher.stats()`` reports queue depth, wait and run times per priority
+and is included in ``resolve://metrics``.  ``RESOLVE_DISPATCH=0`` runs calls
+on the calling thread as before.
+"""
+
+import contextlib
+import contextvars
+import functools
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+from .errors import ToolCancelled
+from .execution import current_call
+
+DISPATCH_ENABLED = os.getenv("RESOLVE_DISPATCH", "1").lower() not in ("0", "false", "no", "off")
+# Milliseconds background calls wait after an interactive call finishes.
+DISPATCH_GRACE = float(os.getenv("RESOLVE_DISPATCH_GRACE_MS", "5")) / 1000.0
+# Wait-time samples kept per priority for percentile estimates.
+DISPATCH_WINDOW = int(os.getenv("RESOLVE_DISPATCH_WINDOW", "2048"))
+
+URGENT, INTERACTIVE, BACKGROUND = 0, 1, 2
+PRIORITY_NAMES = {URGENT: "urgent", INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("resolve_mcp_priority", default=INTERACTIVE)
+
+
+class Job:
+    """One queued call.  ``wait()`` blocks until it has run."""
+
+    __slots__ = (
+        "fn",
+        "args",
+        "kwargs",
+        "priority",
+        "context",
+        "owner",
+        "queued_at",
+        "started_at",
+        "done",
+        "result",
+        "error",
+    )
+
+    def __init__(self, fn, args, kwargs, priority: int):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        # Run in the caller's context so tool attribution follows the call.
+        self.context = contextvars.copy_context()
+        self.owner = current_call()
+        self.queued_at = time.perf_counter()
+        self.started_at = 0.0
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+    def run(self) -> None:
+        self.started_at = time.perf_counter()
+        if self.owner is not None and self.owner.cancelled.is_set():
+            self.error = ToolCancelled(self.owner.name)
+            self.done.set()
+            return
+        try:
+            self.result = self.context.run(self.fn, *self.args, **self.kwargs)
+        except BaseException as exc:
+            self.error = exc
+        self.done.set()
+
+    def wait(self, timeout: float | None = None, limit: float | None = None) -> bool:
+        """Wait for the job to finish.
+
+        *timeout* counts from when the job starts running, not from when it
+        was queued: time spent behind other calls shows Resolve is answering.
+        *limit* bounds the whole wait, queueing included, so a job stuck
+        behind a call that never returns still gives up.  Returns False if
+        the job ran longer than *timeout* or was not done within *limit*.
+        """
+        if timeout is None and limit is None:
+            self.done.wait()
+            return True
+        give_up = time.perf_counter() + limit if limit is not None else float("inf")
+        while True:
+            ends = give_up
+            if timeout is not None and self.started_at:
+                ends = min(ends, self.started_at + timeout)
+            remaining = ends - time.perf_counter()
+            if remaining <= 0:
+                return self.done.is_set()
+            if timeout is not None and not self.started_at:
+                remaining = min(remaining, timeout)  # re-check whether it has started
+            if self.done.wait(remaining):
+                return True
+
+    def outcome(self):
+        """Return the result, re-raising any exception the call raised."""
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class _PriorityStats:
+    __slots__ = ("calls", "errors", "cancelled", "queued", "max_queued", "run_ms_total", "run_ms_max", "waits")
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.run_ms_total = 0.0
+        self.run_ms_max = 0.0
+        self.waits: deque = deque(maxlen=window)
+
+
+class ResolveDispatcher:
+    """Priority queue in front of one thread that owns all scripting calls."""
+
+    def __init__(self, grace: float = DISPATCH_GRACE, window: int = DISPATCH_WINDOW, enabled: bool = DISPATCH_ENABLED):
+        self.grace = grace
+        self.enabled = enabled
+        self._cond = threading.Condition()
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._ident: int | None = None
+        self._running: Job | None = None
+        self._interactive_at = 0.0
+        self._stats = {p: _PriorityStats(window) for p in PRIORITY_NAMES}
+        self._preemptions = 0
+        self._inline = 0
+
+    # -- submitting -----------------------------------------------------------
+
+    def on_executor(self) -> bool:
+        """True when called from the dispatcher thread."""
+        return threading.get_ident() == self._ident
+
+    @contextlib.contextmanager
+    def priority(self, level: int):
+        """Run the block's scripting calls at *level* (e.g. ``BACKGROUND``)."""
+        token = _priority.set(level)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def submit(self, fn, *args, priority: int | None = None, **kwargs) -> Job:
+        """Queue ``fn(*args, **kwargs)`` and return its ``Job`` without waiting.
+
+        From the executor thread the job runs immediately.  With dispatch
+        disabled it runs on a short-lived thread of its own.
+        """
+        job = Job(fn, args, kwargs, _priority.get() if priority is None else priority)
+        if self.on_executor():
+            self._inline += 1
+            job.run()
+            return job
+        if not self.enabled:
+            threading.Thread(target=job.run, name="resolve-call", daemon=True).start()
+            return job
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="resolve-dispatch", daemon=True)
+                self._thread.start()
+            heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+            stats = self._stats[job.priority]
+            stats.queued += 1
+            stats.max_queued = max(stats.max_queued, stats.queued)
+            self._cond.notify()
+        return job
+
+    def call(self, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` on the executor at the context's priority."""
+        owner = current_call()
+        if owner is not None and owner.cancelled.is_set():
+            raise ToolCancelled(owner.name)
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        if self.on_executor():
+            self._inline += 1
+            return fn(*args, **kwargs)
+        job = self.submit(fn, *args, **kwargs)
+        job.done.wait()
+        return job.outcome()
+
+    def run_urgent(self) -> int:
+        """From a long job on the executor: run any queued ``URGENT`` jobs now.
+
+        Only urgent jobs (health pings) are run, since they touch no cache a
+        half-finished job may hold.  Returns how many ran.
+        """
+        if not self.on_executor():
+            return 0
+        ran = 0
+        while True:
+            with self._cond:
+                if not self._heap or self._heap[0][0] != URGENT:
+                    return ran
+                job = heapq.heappop(self._heap)[2]
+                self._stats[URGENT].queued -= 1
+            job.run()
+            finished = time.perf_counter()
+            with self._cond:
+                self._record_locked(job, finished)
+            ran += 1
+
+    # -- executor -------------------------------------------------------------
+
+    def _next(self) -> Job:
+        with self._cond:
+            while True:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                level = self._heap[0][0]
+                if level >= BACKGROUND:
+                    hold = self._interactive_at + self.grace - time.perf_counter()
+                    if hold > 0:
+                        self._cond.wait(hold)
+                        continue
+                job = heapq.heappop(self._heap)[2]
+                self._stats[level].queued -= 1
+                if level < BACKGROUND and self._stats[BACKGROUND].queued:
+                    self._preemptions += 1
+                self._running = job
+                return job
+
+    def _loop(self) -> None:
+        self._ident = threading.get_ident()
+        while True:
+            job = self._next()
+            job.run()
+            finished = time.perf_counter()
+            with self._cond:
+                self._running = None
+                self._record_locked(job, finished)
+
+    def _record_locked(self, job: Job, finished: float) -> None:
+        if job.priority < BACKGROUND:
+            self._interactive_at = finished
+        stats = self._stats[job.priority]
+        stats.calls += 1
+        stats.errors += job.error is not None
+        stats.cancelled += isinstance(job.error, ToolCancelled)
+        run_ms = (finished - job.started_at) * 1000.0
+        stats.run_ms_total += run_ms
+        stats.run_ms_max = max(stats.run_ms_max, run_ms)
+        stats.waits.append((job.started_at - job.queued_at) * 1000.0)
+
+    # -- reporting ------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Return queue depth, preemptions and wait/run times (ms) per priority."""
+        with self._cond:
+            running = self._running if self._running and self._running.started_at else None
+            priorities = {}
+            for level, s in self._stats.items():
+                waits = sorted(s.waits)
+                priorities[PRIORITY_NAMES[level]] = {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "cancelled": s.cancelled,
+                    "queued": s.queued,
+                    "max_queued": s.max_queued,
+                    "wait_p50_ms": round(waits[len(waits) // 2], 3) if waits else 0.0,
+                    "wait_p95_ms": round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else 0.0,
+                    "wait_max_ms": round(waits[-1], 3) if waits else 0.0,
+                    "run_avg_ms": round(s.run_ms_total / s.calls, 3) if s.calls else 0.0,
+                    "run_max_ms": round(s.run_ms_max, 3),
+                }
+            return {
+                "enabled": self.enabled,
+                "queue_depth": len(self._heap),
+                "running": getattr(running.fn, "__name__", repr(running.fn)) if running else None,
+                "running_ms": round((time.perf_counter() - running.started_at) * 1000.0, 3) if running else 0.0,
+                "preemptions": self._preemptions,
+                "inline_calls": self._inline,
+                "priorities": priorities,
+            }
+
+
+# Process-wide dispatcher shared by every tool module.
+dispatcher = ResolveDispatcher()
+
+
+def runs_on_executor(method):
+    """Decorator: run *method* as one dispatcher job.
+
+    For caches that hold a lock around scripting calls: the lock is then
+    only taken on the executor thread.  A caller holding it while waiting
+    for the executor would deadlock against a queued job that needs it.
+    """
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        return dispatcher.call(method, *args, **kwargs)
+
+    return wrapper
+
+
+def start_background(target, *args, name: str | None = None, **kwargs) -> threading.Thread:
+    """Start a daemon thread whose Resolve calls run at ``BACKGROUND`` priority."""
+
+    def run():
+        with dispatcher.priority(BACKGROUND):
+            target(*args, **kwargs)
+
+    thread = threading.Thread(target=run, name=name or f"resolve-bg-{target.__name__}", daemon=True)
+    thread.start()
+    return thread
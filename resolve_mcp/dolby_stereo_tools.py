@@ -10,6 +10,7 @@ Stereo tools handle 3D convergence and floating windows.
 import json
 
 from .config import mcp
+from .item_cache import item_cache
 from .errors import safe_resolve_call
 from .resolve import _boilerplate
 
@@ -77,6 +78,7 @@ def resolve_convert_timeline_to_stereo() -> str:
     if not tl:
         return "No active timeline."
     r = tl.ConvertTimelineToStereo()
+    item_cache.bump()
     return "Timeline converted to stereo." if r else "Failed."
 
 
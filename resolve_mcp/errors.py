@@ -7,9 +7,20 @@ instead of bare "Failed." strings.
 
 import functools
 import logging
+import re
 
 log = logging.getLogger(__name__)
 
+# How tools report failure without raising: the "Error: ..." strings from
+# ``safe_resolve_call`` and ``_boilerplate``, plus the phrasings the tool
+# modules use for missing objects, bad arguments and rejected API calls.
+_FAILURE_START = re.compile(
+    r"(?:Error\b|Failed\b|Invalid\b|Cannot\b|Could not\b|Unknown\b"
+    r"|DaVinci Resolve is not running"
+    r"|No (?:active timeline|project|current|matching|valid|items|clip selected|node graph|frames))"
+)
+_FAILURE_PHRASE = re.compile(r"\b(?:not found|out of range|failed|returned failure|must be)\b")
+
 
 class ResolveError(Exception):
     """Base error for Resolve API failures."""
@@ -31,6 +42,10 @@ class BinNotFound(ResolveError):
     """The requested media pool bin does not exist."""
 
 
+class BinAmbiguous(ResolveError):
+    """A bare bin name matches more than one media pool bin."""
+
+
 class ClipNotFound(ResolveError):
     """The requested clip does not exist in the media pool."""
 
@@ -43,6 +58,28 @@ class StudioRequired(ResolveError):
     """The feature requires DaVinci Resolve Studio."""
 
 
+class ToolCancelled(BaseException):
+    """The MCP client cancelled the tool call.
+
+    Derives from BaseException, like ``asyncio.CancelledError``, so the
+    ``except Exception`` blocks in tools and ``safe_resolve_call`` let it
+    through instead of turning it into an error string.
+    """
+
+
+def is_failure(text: str) -> bool:
+    """True if a tool's result text reports a failure.
+
+    Only the first line is checked, so a partial success such as
+    "Relinked 3 clip(s). Not found: A001." still counts as success.  JSON
+    results fail only as an ``{"error": ...}`` object.
+    """
+    first = text.lstrip().split("\n", 1)[0]
+    if first.startswith(("{", "[")):
+        return first.replace(" ", "").startswith('{"error"')
+    return bool(_FAILURE_START.match(first) or _FAILURE_PHRASE.search(first))
+
+
 def safe_resolve_call(func):
     """Decorator: catch exceptions from Resolve API and return error strings.
 
@@ -0,0 +1,188 @@
+"""
+Off-loop tool execution: work pool, progress notifications and cancellation.
+
+FastMCP runs every synchronous tool in a worker thread, so the event loop
+keeps serving other requests while a tool runs.  Resolve scripting calls from
+that thread are handed to the Resolve-affine executor in ``dispatcher.py``;
+this module supplies the rest:
+
+* ``work_pool`` — a thread pool for ffprobe, ffmpeg, Gemini uploads and other
+  CPU/IO work, kept apart from the Resolve executor so a slow upload never
+  holds up scripting calls.  ``submit_work``/``map_work`` run jobs in the
+  caller's context, so cancellation and metrics attribution follow them.
+* ``report_progress(done, total, message)`` — sends an MCP progress
+  notification for the running tool call when the client asked for progress
+  (at most every ``RESOLVE_PROGRESS_INTERVAL`` seconds, plus the final one).
+* Cancellation — ``ToolExecutionMiddleware`` flags the call's ``ToolCall``
+  when the client aborts.  ``check_cancelled()`` then raises
+  ``ToolCancelled``, and the dispatcher refuses further scripting calls from
+  the cancelled tool, including ones already queued.
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import logging
+import os
+import threading
+import time
+
+import anyio
+import anyio.lowlevel
+import mcp.types as mt
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.base import ToolResult
+
+from .errors import ToolCancelled
+
+log = logging.getLogger(__name__)
+
+WORK_POOL_SIZE = int(os.getenv("RESOLVE_WORK_POOL_SIZE", str(min(8, (os.cpu_count() or 2) + 2))))
+# Minimum seconds between progress notifications for one tool call.
+PROGRESS_INTERVAL = float(os.getenv("RESOLVE_PROGRESS_INTERVAL", "0.25"))
+
+
+class ToolCall:
+    """State shared between one MCP tool call and every thread working for it."""
+
+    __slots__ = ("name", "cancelled", "finished", "_ctx", "_loop", "_sent_at", "_last")
+
+    def __init__(self, name: str, ctx=None, loop=None):
+        self.name = name
+        self.cancelled = threading.Event()
+        self.finished = False
+        self._ctx = ctx
+        self._loop = loop
+        self._sent_at = 0.0
+        self._last = -1.0
+
+    def progress(self, done: float, total: float | None = None, message: str | None = None) -> None:
+        # MCP requires progress to increase from one notification to the next.
+        if self._ctx is None or self._loop is None or done <= self._last:
+            return
+        now = time.monotonic()
+        final = total is not None and done >= total
+        if not final and now - self._sent_at < PROGRESS_INTERVAL:
+            return
+        self._sent_at = now
+        self._last = done
+        with contextlib.suppress(RuntimeError):  # loop already closed
+            asyncio.run_coroutine_threadsafe(self._ctx.report_progress(done, total, message), self._loop)
+
+
+_call: contextvars.ContextVar = contextvars.ContextVar("resolve_mcp_tool_call", default=None)
+
+
+def current_call() -> ToolCall | None:
+    """The MCP tool call the current thread is working for, if any."""
+    return _call.get()
+
+
+def is_cancelled() -> bool:
+    call = _call.get()
+    return call is not None and call.cancelled.is_set()
+
+
+def check_cancelled() -> None:
+    """Raise ``ToolCancelled`` if the client aborted the current tool call."""
+    call = _call.get()
+    if call is not None and call.cancelled.is_set():
+        raise ToolCancelled(call.name)
+
+
+def report_progress(done: float, total: float | None = None, message: str | None = None) -> None:
+    """Report progress of the current tool call; a no-op outside one."""
+    call = _call.get()
+    if call is not None:
+        call.progress(done, total, message)
+
+
+# ---------------------------------------------------------------------------
+# CPU / IO work pool
+# ---------------------------------------------------------------------------
+
+work_pool = concurrent.futures.ThreadPoolExecutor(max_workers=WORK_POOL_SIZE, thread_name_prefix="resolve-work")
+
+
+def submit_work(fn, *args, **kwargs) -> concurrent.futures.Future:
+    """Run ``fn(*args, **kwargs)`` on the work pool in the caller's context."""
+    ctx = contextvars.copy_context()
+    return work_pool.submit(ctx.run, fn, *args, **kwargs)
+
+
+def map_work(fn, items, message: str = "") -> list:
+    """Apply *fn* to every item on the work pool; results in input order.
+
+    Reports progress as items finish.  If the tool call is cancelled, jobs
+    not yet started are dropped and ``ToolCancelled`` is raised.
+    """
+    items = list(items)
+    futures = [submit_work(fn, item) for item in items]
+    try:
+        for done, _ in enumerate(concurrent.futures.as_completed(futures), start=1):
+            check_cancelled()
+            report_progress(done, len(futures), message or None)
+        return [f.result() for f in futures]
+    except BaseException:
+        for f in futures:
+            f.cancel()
+        raise
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+
+async def _watch(call: ToolCall) -> None:
+    try:
+        await anyio.sleep_forever()
+    except anyio.get_cancelled_exc_class():
+        if not call.finished:
+            call.cancelled.set()
+            log.info("Tool call %s cancelled by the client.", call.name)
+        raise
+
+
+class ToolExecutionMiddleware(Middleware):
+    """Gives each tool call a ``ToolCall`` for progress and cancellation.
+
+    The tool body runs in a worker thread that anyio shields from
+    cancellation; a watcher task in the same cancel scope sees the client's
+    abort immediately and flags the call, so the thread stops at its next
+    scripting call or ``check_cancelled()``.
+    """
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        call = ToolCall(context.message.name, context.fastmcp_context, asyncio.get_running_loop())
+        token = _call.set(call)
+        result: ToolResult | None = None
+        error: BaseException | None = None
+        try:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(_watch, call)
+                try:
+                    result = await call_next(context)
+                except (Exception, ToolCancelled) as exc:
+                    # Re-raised below so the task group doesn't wrap it in an ExceptionGroup.
+                    error = exc
+                finally:
+                    call.finished = True
+                    tg.cancel_scope.cancel()
+        finally:
+            _call.reset(token)
+        if isinstance(error, ToolCancelled):
+            # Deliver the pending cancellation of this request; ToolCancelled
+            # itself must never reach the server's task groups.
+            await anyio.lowlevel.checkpoint()
+            raise ToolError(f"Tool call {call.name} was cancelled.")
+        if error is not None:
+            raise error
+        assert result is not None  # call_next either returned or raised
+        return result
@@ -1,103 +1,317 @@
 """
 ffprobe wrappers for extracting codec, duration, fps, timecode, resolution,
 and audio info from media files.
+
+``probe(path)`` runs ffprobe once per file (``-show_streams -show_format``)
+and caches the parsed ``ProbeResult`` by path, size and modification time,
+in memory and in the persistent ``probe_cache`` database.  MP4/MOV files are
+read directly from their boxes (``bmff.py``) with no subprocess; ffprobe
+handles everything that parser declines.  The ``ffprobe_*`` helpers read
+single fields from the result, so asking for a file's codec, resolution and
+duration costs at most one process instead of three, and none at all once
+the file has been probed by an earlier run.
+
+``probe_many(paths)`` probes a folder's worth of files concurrently, after
+answering every cached file with one database query per 500 paths.  On
+network storage each ffprobe mostly waits on reads, so the default worker
+count (``RESOLVE_PROBE_WORKERS``, 16) does not follow the CPU count.  Each run
+is limited to ``RESOLVE_PROBE_TIMEOUT`` seconds and the whole batch to
+``RESOLVE_PROBE_DEADLINE``.
 """
 
+import concurrent.futures
+import json
+import logging
+import os
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
 from pathlib import Path
-from typing import Optional
 
+from .bmff import read_bmff
+from .execution import check_cancelled, report_progress
+from .probe_cache import probe_cache
 
-def ffprobe_codec(video_path: Path) -> Optional[str]:
-    """Return the lowercase video codec name via ffprobe, or None on failure."""
+log = logging.getLogger(__name__)
+
+# Parsed results kept in memory (least recently used dropped first).
+PROBE_CACHE_SIZE = 4096
+# Read by the built-in MP4/MOV parser first; everything else goes to ffprobe.
+BMFF_EXTS = frozenset({".mov", ".mp4", ".m4v", ".m4a", ".3gp"})
+# Concurrent ffprobe runs in probe_many().  Each run is mostly waiting on
+# storage round trips, so this is sized for latency, not for the CPU count.
+PROBE_WORKERS = int(os.getenv("RESOLVE_PROBE_WORKERS", "16"))
+# Seconds a single ffprobe run may take.
+PROBE_TIMEOUT = float(os.getenv("RESOLVE_PROBE_TIMEOUT", "30"))
+# Seconds a whole probe_many() batch may take.
+PROBE_DEADLINE = float(os.getenv("RESOLVE_PROBE_DEADLINE", "300"))
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Everything the server reads from one ffprobe run.
+
+    Fields are None when the file has no such stream or ffprobe failed.
+    """
+
+    codec: str | None = None
+    duration: float | None = None
+    fps: float | None = None
+    start_tc: str | None = None
+    width: int | None = None
+    height: int | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    fourcc: str | None = None
+    audio_codec: str | None = None
+    audio_bitrate: int | None = None  # bits per second
+
+    @property
+    def ok(self) -> bool:
+        """True if ffprobe read the file (a duration or any stream was found)."""
+        return self != _EMPTY
+
+
+_EMPTY = ProbeResult()
+
+
+def _int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _rate(value) -> float | None:
+    """Parse a rational like '30000/1001' (29.97) or a plain number."""
+    try:
+        if isinstance(value, str) and "/" in value:
+            num, den = value.split("/")
+            return float(num) / float(den)
+        return float(value)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+
+
+def _fourcc(tag) -> str | None:
+    # ffprobe prints untagged streams (MXF, raw) as e.g. '[0][0][0][0]'.
+    return tag if isinstance(tag, str) and len(tag) == 4 and tag.isprintable() else None
+
+
+def parse_probe(data: dict) -> ProbeResult:
+    """Build a ``ProbeResult`` from ffprobe's JSON output."""
+    streams = data.get("streams") or []
+    fmt = data.get("format") or {}
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+
+    # Stream-level timecode is the most reliable for camera footage.
+    start_tc = None
+    for tags in (video.get("tags") or {}, fmt.get("tags") or {}):
+        tc = str(tags.get("timecode", "")).strip()
+        if tc and ":" in tc:
+            start_tc = tc
+            break
+
+    try:
+        duration = float(fmt["duration"])
+    except (KeyError, TypeError, ValueError):
+        duration = None
+
+    return ProbeResult(
+        codec=(video.get("codec_name") or "").lower() or None,
+        duration=duration,
+        fps=_rate(video.get("r_frame_rate")) if video else None,
+        start_tc=start_tc,
+        width=_int(video.get("width")),
+        height=_int(video.get("height")),
+        sample_rate=_int(audio.get("sample_rate")),
+        channels=_int(audio.get("channels")),
+        fourcc=_fourcc(video.get("codec_tag_string")),
+        audio_codec=(audio.get("codec_name") or "").lower() or None,
+        audio_bitrate=_int(audio.get("bit_rate")),
+    )
+
+
+_FIELDS = frozenset(f.name for f in fields(ProbeResult))
+
+
+def _run_ffprobe(path: Path, timeout: float = PROBE_TIMEOUT) -> ProbeResult | None:
+    """Run ffprobe on *path*; None if it could not run, timed out or failed on the file."""
     try:
         result = subprocess.run(
             [
                 "ffprobe", "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=codec_name",
-                "-of", "csv=p=0",
-                str(video_path),
+                "-show_streams", "-show_format",
+                "-of", "json",
+                str(path),
             ],
-            capture_output=True, text=True, timeout=30,
+            capture_output=True, text=True, timeout=timeout,
         )
-        codec = result.stdout.strip().lower()
-        return codec if codec else None
     except (FileNotFoundError, subprocess.TimeoutExpired):
         return None
+    if result.returncode != 0:
+        # A read error or a half-copied file: report nothing rather than cache a blank.
+        log.debug("ffprobe failed on %s: %s", path, (result.stderr or "").strip()[:200])
+        return None
+    try:
+        return parse_probe(json.loads(result.stdout or "{}"))
+    except ValueError:
+        return None
 
 
-def ffprobe_duration(video_path: Path) -> Optional[float]:
-    """Return duration in seconds via ffprobe, or None."""
+_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def file_key(path: Path) -> tuple | None:
+    """Cache key for *path*: (resolved path, size, mtime_ns), or None if it can't be read."""
+    path = Path(path)
     try:
-        result = subprocess.run(
-            [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "csv=p=0",
-                str(video_path),
-            ],
-            capture_output=True, text=True, timeout=30,
-        )
-        return float(result.stdout.strip())
-    except (FileNotFoundError, subprocess.TimeoutExpired, ValueError):
+        st = path.stat()
+    except OSError:
         return None
+    return str(path.resolve()), st.st_size, st.st_mtime_ns
 
 
-def ffprobe_fps(video_path: Path) -> Optional[float]:
+def _remember(key: tuple, result: ProbeResult) -> None:
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > PROBE_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _from_fields(data: dict) -> ProbeResult:
+    return ProbeResult(**{k: v for k, v in data.items() if k in _FIELDS})
+
+
+def _lookup(keys) -> dict:
+    """Cached results for *keys*: memory first, then one database query."""
+    found = {}
+    with _cache_lock:
+        for key in keys:
+            if key in _cache:
+                _cache.move_to_end(key)
+                found[key] = _cache[key]
+    missing = [k for k in keys if k not in found]
+    for key, data in probe_cache.get_many(missing).items():
+        found[key] = _from_fields(data)
+        _remember(key, found[key])
+    return found
+
+
+def _probe_key(path: Path, key: tuple, timeout: float) -> ProbeResult | None:
+    fast = read_bmff(path) if path.suffix.lower() in BMFF_EXTS else None
+    result = ProbeResult(**fast) if fast is not None else _run_ffprobe(path, timeout)
+    if result is not None and result.ok:
+        probe_cache.put(key, asdict(result))
+        _remember(key, result)
+    return result
+
+
+def probe(path: Path, timeout: float = PROBE_TIMEOUT) -> ProbeResult:
+    """Probe *path* with a single ffprobe run; cached until the file changes."""
+    key = file_key(path)
+    if key is None:
+        return _EMPTY
+    cached = _lookup([key])
+    if key in cached:
+        return cached[key]
+    return _probe_key(Path(path), key, timeout) or _EMPTY
+
+
+def probe_many(
+    paths,
+    max_workers: int = PROBE_WORKERS,
+    timeout: float = PROBE_TIMEOUT,
+    deadline: float = PROBE_DEADLINE,
+    message: str = "Probing media",
+) -> dict[Path, ProbeResult]:
+    """Probe many files concurrently; returns ``{path: ProbeResult}`` in input order.
+
+    Cached files are answered first; the rest run ffprobe on up to
+    *max_workers* threads, each limited to *timeout* seconds.  Files not
+    probed within *deadline* seconds of the call come back as an empty
+    ``ProbeResult`` (``.ok`` is False).  Queued probes are cancelled, but one
+    already running is not waited for: it finishes within *timeout*, and a
+    good result is still written to the cache for the next call.  Inside a
+    tool call this reports progress and stops early if the client cancels.
+    """
+    paths = list(dict.fromkeys(Path(p) for p in paths))
+    results = dict.fromkeys(paths, _EMPTY)
+    if not paths:
+        return results
+    started = time.monotonic()
+    workers = max(1, min(max_workers, len(paths)))
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resolve-probe")
+    try:
+        # Even a stat is a network round trip on a NAS.
+        keys = dict(zip(paths, pool.map(file_key, paths), strict=True))
+        cached = _lookup([k for k in keys.values() if k is not None])
+        pending = {}
+        for path, key in keys.items():
+            if key in cached:
+                results[path] = cached[key]
+            elif key is not None:
+                pending[pool.submit(_probe_key, path, key, timeout)] = path
+        done_count = len(paths) - len(pending)
+        while pending:
+            check_cancelled()
+            remaining = started + deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = concurrent.futures.wait(
+                pending, timeout=min(remaining, 0.5), return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                results[pending.pop(future)] = future.result() or _EMPTY
+            done_count += len(done)
+            report_progress(done_count, len(paths), message)
+        if pending:
+            log.warning("probe_many: %d of %d file(s) not probed within %.1f s",
+                        len(pending), len(paths), deadline)
+    finally:
+        # Running probes are bounded by *timeout*; don't hold the caller for them.
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def clear_probe_cache() -> None:
+    """Forget in-memory probe results (the database is left alone)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def ffprobe_codec(video_path: Path) -> str | None:
+    """Return the lowercase video codec name via ffprobe, or None on failure."""
+    return probe(video_path).codec
+
+
+def ffprobe_duration(video_path: Path) -> float | None:
+    """Return duration in seconds via ffprobe, or None."""
+    return probe(video_path).duration
+
+
+def ffprobe_fps(video_path: Path) -> float | None:
     """Return average frame rate via ffprobe, or None.
 
     Parses r_frame_rate (rational like '30000/1001' for 29.97) and
     returns the float value.  This is authoritative — never trust
     Gemini's fps guess over ffprobe.
     """
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe", "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=r_frame_rate",
-                "-of", "csv=p=0",
-                str(video_path),
-            ],
-            capture_output=True, text=True, timeout=30,
-        )
-        raw = result.stdout.strip()
-        if "/" in raw:
-            num, den = raw.split("/")
-            return float(num) / float(den)
-        return float(raw)
-    except (FileNotFoundError, subprocess.TimeoutExpired, ValueError, ZeroDivisionError):
-        return None
+    return probe(video_path).fps
 
 
-def ffprobe_start_tc(video_path: Path) -> Optional[str]:
+def ffprobe_start_tc(video_path: Path) -> str | None:
     """Return the embedded start timecode string (e.g. '14:40:52:00') via ffprobe.
 
     Tries stream-level timecode first (most reliable for camera footage),
     then falls back to format-level.  Returns None if no TC found.
     """
-    for show_entries in [
-        "stream_tags=timecode",
-        "format_tags=timecode",
-    ]:
-        try:
-            result = subprocess.run(
-                [
-                    "ffprobe", "-v", "error",
-                    "-select_streams", "v:0",
-                    "-show_entries", show_entries,
-                    "-of", "csv=p=0",
-                    str(video_path),
-                ],
-                capture_output=True, text=True, timeout=30,
-            )
-            tc = result.stdout.strip().strip(",")
-            if tc and ":" in tc:
-                return tc
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
-    return None
+    return probe(video_path).start_tc
 
 
 def tc_to_frames(tc_str: str, fps: float) -> int:
@@ -118,39 +332,17 @@ def tc_to_frames(tc_str: str, fps: float) -> int:
     return h * 3600 * fps_int + m * 60 * fps_int + s * fps_int + f
 
 
-def ffprobe_resolution(video_path: Path) -> tuple[Optional[int], Optional[int]]:
+def ffprobe_resolution(video_path: Path) -> tuple[int | None, int | None]:
     """Return (width, height) via ffprobe, or (None, None)."""
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe", "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=width,height",
-                "-of", "csv=p=0",
-                str(video_path),
-            ],
-            capture_output=True, text=True, timeout=30,
-        )
-        parts = result.stdout.strip().split(",")
-        return int(parts[0]), int(parts[1])
-    except (FileNotFoundError, subprocess.TimeoutExpired, ValueError, IndexError):
+    result = probe(video_path)
+    if result.width is None or result.height is None:
         return None, None
+    return result.width, result.height
 
 
 def ffprobe_audio_info(audio_path: Path) -> tuple[int, int]:
     """Return (sample_rate, channels) via ffprobe.  Defaults to (48000, 2)."""
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe", "-v", "error",
-                "-select_streams", "a:0",
-                "-show_entries", "stream=sample_rate,channels",
-                "-of", "csv=p=0",
-                str(audio_path),
-            ],
-            capture_output=True, text=True, timeout=30,
-        )
-        parts = result.stdout.strip().split(",")
-        return int(parts[0]), int(parts[1])
-    except (FileNotFoundError, subprocess.TimeoutExpired, ValueError, IndexError):
+    result = probe(audio_path)
+    if result.sample_rate is None or result.channels is None:
         return 48000, 2
+    return result.sample_rate, result.channels
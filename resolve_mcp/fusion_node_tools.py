@@ -20,27 +20,22 @@ import logging
 
 from .config import mcp
 from .errors import safe_resolve_call
+from .item_cache import timeline_item
 from .resolve import _boilerplate
 
 log = logging.getLogger(__name__)
 
 
-def _get_comp(project, track_type=None, track_index=None, item_index=None, comp_name=None):
+def _get_comp(project, track_type=None, track_index=None, item_index=None, comp_name=None, item_id=None):
     """Get a Fusion composition.
 
-    If track/item args are provided, gets the comp from that timeline item.
-    Otherwise tries to get the current comp from the active Fusion page.
+    If an item ID or track/item args are provided, gets the comp from that
+    timeline item.  Otherwise tries to get the current comp from the active
+    Fusion page.
     """
     # Route 1: specific timeline item
-    if track_type and track_index and item_index:
-        tl = project.GetCurrentTimeline()
-        if not tl:
-            raise ValueError("No active timeline.")
-        items = tl.GetItemListInTrack(track_type.lower(), int(track_index)) or []
-        idx = int(item_index) - 1
-        if idx < 0 or idx >= len(items):
-            raise ValueError(f"Item index {item_index} out of range (1–{len(items)}).")
-        item = items[idx]
+    if item_id or (track_type and track_index and item_index):
+        _, item = timeline_item(project, track_type or "video", track_index or 1, item_index or 1, item_id or "")
         if comp_name:
             comp = item.GetFusionCompByName(comp_name)
         else:
@@ -78,7 +73,7 @@ def _get_comp(project, track_type=None, track_index=None, item_index=None, comp_
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_list_tools(comp_name: str = "") -> str:
+def resolve_fusion_list_tools(comp_name: str = "", item_id: str = "") -> str:
     """List all tools in the current Fusion composition.
 
     Returns each tool's name and type ID (e.g. 'Background1: Background',
@@ -86,9 +81,10 @@ def resolve_fusion_list_tools(comp_name: str = "") -> str:
 
     Args:
         comp_name (str): Optional comp name. If empty, uses the active/last comp.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     tool_list = comp.GetToolList(False)
     if not tool_list:
         return "Comp is empty (no tools)."
@@ -102,7 +98,7 @@ def resolve_fusion_list_tools(comp_name: str = "") -> str:
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_get_tool_inputs(tool_name: str, comp_name: str = "") -> str:
+def resolve_fusion_get_tool_inputs(tool_name: str, comp_name: str = "", item_id: str = "") -> str:
     """List all available inputs on a Fusion tool.
 
     Shows input names, types, and current values — essential for knowing
@@ -111,9 +107,10 @@ def resolve_fusion_get_tool_inputs(tool_name: str, comp_name: str = "") -> str:
     Args:
         tool_name (str): Name of the tool (e.g. 'Background1', 'Merge1', 'Text1').
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     tool = comp.FindTool(tool_name)
     if not tool:
         return f"Tool '{tool_name}' not found."
@@ -136,7 +133,8 @@ def resolve_fusion_get_tool_inputs(tool_name: str, comp_name: str = "") -> str:
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_add_tool(tool_id: str, name: str = "", x: int = 0, y: int = 0, comp_name: str = "") -> str:
+def resolve_fusion_add_tool(tool_id: str, name: str = "", x: int = 0, y: int = 0, comp_name: str = "",
+                            item_id: str = "") -> str:
     """Add a tool to the Fusion composition.
 
     Common tool IDs:
@@ -162,9 +160,10 @@ def resolve_fusion_add_tool(tool_id: str, name: str = "", x: int = 0, y: int = 0
         x (int): X position in the flow view. 0 = auto-place.
         y (int): Y position in the flow view. 0 = auto-place.
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
 
     if x != 0 or y != 0:
         tool = comp.AddTool(tool_id, x, y)
@@ -186,15 +185,16 @@ def resolve_fusion_add_tool(tool_id: str, name: str = "", x: int = 0, y: int = 0
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_remove_tool(tool_name: str, comp_name: str = "") -> str:
+def resolve_fusion_remove_tool(tool_name: str, comp_name: str = "", item_id: str = "") -> str:
     """Remove a tool from the Fusion composition.
 
     Args:
         tool_name (str): Name of the tool to remove (e.g. 'Background1').
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     tool = comp.FindTool(tool_name)
     if not tool:
         return f"Tool '{tool_name}' not found."
@@ -210,7 +210,8 @@ def resolve_fusion_remove_tool(tool_name: str, comp_name: str = "") -> str:
 @mcp.tool
 @safe_resolve_call
 def resolve_fusion_connect(
-    from_tool: str, to_tool: str, from_output: str = "Output", to_input: str = "Background", comp_name: str = ""
+    from_tool: str, to_tool: str, from_output: str = "Output", to_input: str = "Background", comp_name: str = "",
+    item_id: str = "",
 ) -> str:
     """Connect the output of one tool to the input of another.
 
@@ -227,9 +228,10 @@ def resolve_fusion_connect(
         from_output (str): Output name on source tool. Defaults to 'Output'.
         to_input (str): Input name on destination tool. Defaults to 'Background'.
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     src = comp.FindTool(from_tool)
     dst = comp.FindTool(to_tool)
     if not src:
@@ -256,16 +258,17 @@ def resolve_fusion_connect(
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_disconnect(tool_name: str, input_name: str, comp_name: str = "") -> str:
+def resolve_fusion_disconnect(tool_name: str, input_name: str, comp_name: str = "", item_id: str = "") -> str:
     """Disconnect an input on a Fusion tool.
 
     Args:
         tool_name (str): Tool name (e.g. 'Merge1').
         input_name (str): Input to disconnect (e.g. 'Foreground').
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     tool = comp.FindTool(tool_name)
     if not tool:
         return f"Tool '{tool_name}' not found."
@@ -283,7 +286,8 @@ def resolve_fusion_disconnect(tool_name: str, input_name: str, comp_name: str =
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_set_input(tool_name: str, input_name: str, value: str, comp_name: str = "") -> str:
+def resolve_fusion_set_input(tool_name: str, input_name: str, value: str, comp_name: str = "",
+                             item_id: str = "") -> str:
     """Set a parameter value on a Fusion tool.
 
     Values are auto-converted: numbers become float, 'true'/'false' become
@@ -302,9 +306,10 @@ def resolve_fusion_set_input(tool_name: str, input_name: str, value: str, comp_n
         input_name (str): Input parameter name (e.g. 'TopLeftRed', 'StyledText', 'Size').
         value (str): Value to set. Numbers, booleans, and JSON arrays are auto-converted.
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     tool = comp.FindTool(tool_name)
     if not tool:
         return f"Tool '{tool_name}' not found."
@@ -321,16 +326,17 @@ def resolve_fusion_set_input(tool_name: str, input_name: str, value: str, comp_n
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_get_input(tool_name: str, input_name: str, comp_name: str = "") -> str:
+def resolve_fusion_get_input(tool_name: str, input_name: str, comp_name: str = "", item_id: str = "") -> str:
     """Read the current value of a parameter on a Fusion tool.
 
     Args:
         tool_name (str): Tool name (e.g. 'Background1').
         input_name (str): Input parameter name (e.g. 'TopLeftRed', 'Size').
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     tool = comp.FindTool(tool_name)
     if not tool:
         return f"Tool '{tool_name}' not found."
@@ -345,7 +351,8 @@ def resolve_fusion_get_input(tool_name: str, input_name: str, comp_name: str = "
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_set_keyframe(tool_name: str, input_name: str, frame: int, value: str, comp_name: str = "") -> str:
+def resolve_fusion_set_keyframe(tool_name: str, input_name: str, frame: int, value: str, comp_name: str = "",
+                                item_id: str = "") -> str:
     """Set a keyframe on a tool input at a specific frame.
 
     This enables animation — set different values at different frames and
@@ -357,9 +364,10 @@ def resolve_fusion_set_keyframe(tool_name: str, input_name: str, frame: int, val
         frame (int): Frame number to place the keyframe at.
         value (str): Value at this keyframe. Auto-converted like set_input.
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     tool = comp.FindTool(tool_name)
     if not tool:
         return f"Tool '{tool_name}' not found."
@@ -374,7 +382,8 @@ def resolve_fusion_set_keyframe(tool_name: str, input_name: str, frame: int, val
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_get_keyframes(tool_name: str, input_name: str, comp_name: str = "") -> str:
+def resolve_fusion_get_keyframes(tool_name: str, input_name: str, comp_name: str = "",
+                                 item_id: str = "") -> str:
     """Get all keyframes on a tool input.
 
     Returns frame→value pairs for animated parameters.
@@ -383,9 +392,10 @@ def resolve_fusion_get_keyframes(tool_name: str, input_name: str, comp_name: str
         tool_name (str): Tool name.
         input_name (str): Input parameter name.
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     tool = comp.FindTool(tool_name)
     if not tool:
         return f"Tool '{tool_name}' not found."
@@ -405,29 +415,31 @@ def resolve_fusion_get_keyframes(tool_name: str, input_name: str, comp_name: str
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_set_comp_time(frame: int, comp_name: str = "") -> str:
+def resolve_fusion_set_comp_time(frame: int, comp_name: str = "", item_id: str = "") -> str:
     """Set the current time position in the Fusion comp.
 
     Args:
         frame (int): Frame number to jump to.
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     comp.SetCurrentTime(frame)
     return f"Comp time set to frame {frame}."
 
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_get_comp_time(comp_name: str = "") -> str:
+def resolve_fusion_get_comp_time(comp_name: str = "", item_id: str = "") -> str:
     """Get the current time position and render range of the Fusion comp.
 
     Args:
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     current = comp.GetCurrentTime()
     attrs = comp.GetAttrs() or {}
     start = attrs.get("COMPN_RenderStart", "?")
@@ -437,7 +449,8 @@ def resolve_fusion_get_comp_time(comp_name: str = "") -> str:
 
 @mcp.tool
 @safe_resolve_call
-def resolve_fusion_render_comp(start_frame: int = -1, end_frame: int = -1, comp_name: str = "") -> str:
+def resolve_fusion_render_comp(start_frame: int = -1, end_frame: int = -1, comp_name: str = "",
+                               item_id: str = "") -> str:
     """Render the current Fusion composition.
 
     If start/end are -1, renders the full comp range.
@@ -446,9 +459,10 @@ def resolve_fusion_render_comp(start_frame: int = -1, end_frame: int = -1, comp_
         start_frame (int): Start frame. -1 = use comp default.
         end_frame (int): End frame. -1 = use comp default.
         comp_name (str): Optional comp name.
+        item_id (str): Optional timeline item unique ID. If set, uses that item's comp instead of the active one.
     """
     _, project, _ = _boilerplate()
-    comp = _get_comp(project, comp_name=comp_name or None)
+    comp = _get_comp(project, comp_name=comp_name or None, item_id=item_id or None)
     if start_frame >= 0 and end_frame >= 0:
         r = comp.Render({"Start": start_frame, "End": end_frame})
     else:
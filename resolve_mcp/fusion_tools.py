@@ -7,18 +7,12 @@ attached to clips on the timeline.
 
 from .config import mcp
 from .errors import safe_resolve_call
+from .item_cache import timeline_item
 from .resolve import _boilerplate
 
 
-def _item(project, track_type, track_index, item_index):
-    tl = project.GetCurrentTimeline()
-    if not tl:
-        raise ValueError("No active timeline.")
-    items = tl.GetItemListInTrack(track_type.lower(), int(track_index)) or []
-    idx = int(item_index) - 1
-    if idx < 0 or idx >= len(items):
-        raise ValueError(f"Item index {item_index} out of range (1–{len(items)}).")
-    return items[idx]
+def _item(project, track_type, track_index, item_index, item_id=""):
+    return timeline_item(project, track_type, track_index, item_index, item_id)[1]
 
 
 # ---------------------------------------------------------------------------
@@ -26,18 +20,19 @@ def _item(project, track_type, track_index, item_index):
 @mcp.tool
 @safe_resolve_call
 def resolve_item_list_fusion_comps(track_type: str, track_index: int,
-                                    item_index: int) -> str:
+                                    item_index: int, item_id: str = "") -> str:
     """List all Fusion compositions on a timeline item.
 
     Args:
         track_type: Track type — 'video', 'audio', or 'subtitle'.
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_add_fusion_comp, resolve_item_delete_fusion_comp
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     names = it.GetFusionCompNameList() or []
     count = it.GetFusionCompCount()
     if not names:
@@ -48,18 +43,19 @@ def resolve_item_list_fusion_comps(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_add_fusion_comp(track_type: str, track_index: int,
-                                  item_index: int) -> str:
+                                  item_index: int, item_id: str = "") -> str:
     """Create a new Fusion composition on a timeline item.
 
     Args:
         track_type: Track type — 'video', 'audio', or 'subtitle'.
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_list_fusion_comps, resolve_item_delete_fusion_comp
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     comp = it.AddFusionComp()
     return "Fusion comp added." if comp else "Failed."
 
@@ -68,7 +64,7 @@ def resolve_item_add_fusion_comp(track_type: str, track_index: int,
 @safe_resolve_call
 def resolve_item_import_fusion_comp(track_type: str, track_index: int,
                                      item_index: int,
-                                     file_path: str) -> str:
+                                     file_path: str, item_id: str = "") -> str:
     """Import a Fusion composition from a .comp file.
 
     Args:
@@ -76,11 +72,12 @@ def resolve_item_import_fusion_comp(track_type: str, track_index: int,
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
         file_path: Path to the .comp file to import.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_export_fusion_comp, resolve_item_list_fusion_comps
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.ImportFusionComp(file_path)
     return f"Imported Fusion comp from {file_path}" if r else "Import failed."
 
@@ -89,7 +86,7 @@ def resolve_item_import_fusion_comp(track_type: str, track_index: int,
 @safe_resolve_call
 def resolve_item_export_fusion_comp(track_type: str, track_index: int,
                                      item_index: int, comp_name: str,
-                                     file_path: str) -> str:
+                                     file_path: str, item_id: str = "") -> str:
     """Export a Fusion composition to a .comp file.
 
     Args:
@@ -98,11 +95,12 @@ def resolve_item_export_fusion_comp(track_type: str, track_index: int,
         item_index: 1-based item position on the track.
         comp_name: Name of the composition to export.
         file_path: Destination path for the .comp file.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_import_fusion_comp, resolve_item_list_fusion_comps
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.ExportFusionComp(comp_name, file_path)
     return f"Exported '{comp_name}' → {file_path}" if r else "Export failed."
 
@@ -111,7 +109,7 @@ def resolve_item_export_fusion_comp(track_type: str, track_index: int,
 @safe_resolve_call
 def resolve_item_delete_fusion_comp(track_type: str, track_index: int,
                                      item_index: int,
-                                     comp_name: str) -> str:
+                                     comp_name: str, item_id: str = "") -> str:
     """Delete a Fusion composition by name.
 
     Args:
@@ -119,11 +117,12 @@ def resolve_item_delete_fusion_comp(track_type: str, track_index: int,
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
         comp_name: Name of the composition to delete.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_list_fusion_comps, resolve_item_add_fusion_comp
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.DeleteFusionCompByName(comp_name)
     return f"Deleted Fusion comp '{comp_name}'." if r else "Failed."
 
@@ -132,7 +131,7 @@ def resolve_item_delete_fusion_comp(track_type: str, track_index: int,
 @safe_resolve_call
 def resolve_item_load_fusion_comp(track_type: str, track_index: int,
                                    item_index: int,
-                                   comp_name: str) -> str:
+                                   comp_name: str, item_id: str = "") -> str:
     """Load/select a Fusion composition by name.
 
     Args:
@@ -140,11 +139,12 @@ def resolve_item_load_fusion_comp(track_type: str, track_index: int,
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
         comp_name: Name of the composition to load.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_list_fusion_comps, resolve_item_rename_fusion_comp
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.LoadFusionCompByName(comp_name)
     return f"Loaded '{comp_name}'." if r else "Failed."
 
@@ -153,7 +153,7 @@ def resolve_item_load_fusion_comp(track_type: str, track_index: int,
 @safe_resolve_call
 def resolve_item_rename_fusion_comp(track_type: str, track_index: int,
                                      item_index: int, old_name: str,
-                                     new_name: str) -> str:
+                                     new_name: str, item_id: str = "") -> str:
     """Rename a Fusion composition.
 
     Args:
@@ -162,10 +162,11 @@ def resolve_item_rename_fusion_comp(track_type: str, track_index: int,
         item_index: 1-based item position on the track.
         old_name: Current composition name.
         new_name: New composition name.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_list_fusion_comps, resolve_item_load_fusion_comp
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.RenameFusionCompByName(old_name, new_name)
     return f"Renamed '{old_name}' → '{new_name}'." if r else "Failed."
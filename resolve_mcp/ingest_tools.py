@@ -3,12 +3,12 @@ Ingest MCP tools: ingest_footage and ingest_status.
 """
 
 import shutil
-import threading
 from pathlib import Path
 from typing import Optional
 
 from .config import mcp
-from .transcode import get_hw_encoder
+from .dispatcher import start_background
+from .transcode import get_hw_encoder, transcode_scheduler
 from .media import list_all_videos, list_all_audio, list_pending_videos, list_pending_audio
 from .ingest_worker import _ingest_worker, _active_workers, _write_progress, _read_progress
 
@@ -68,8 +68,7 @@ def ingest_footage(folder_path: str, instruction: Optional[str] = None) -> str:
         "total": total, "errors": [],
     })
 
-    thread = threading.Thread(target=_ingest_worker, args=(root, instruction), daemon=True)
-    thread.start()
+    thread = start_background(_ingest_worker, root, instruction)
     _active_workers[key] = thread
 
     hw = get_hw_encoder() or "libx265"
@@ -118,6 +117,12 @@ def ingest_status(folder_path: str) -> str:
 
     if status == "running":
         msg = f"Ingestion running: {completed}/{total} done. Now {step} {current}."
+        stages = progress.get("stages")
+        if stages:
+            msg += "\nIn flight: " + ", ".join(f"{n} {name}" for name, n in stages.items() if n)
+        running = [t for t in transcode_scheduler.stats()["active"] if t.get("state") == "running"]
+        if running:
+            msg += "\nTranscoding: " + ", ".join(f"{t['file']} {t['percent']}%" for t in running)
         if errors:
             msg += f"\n{len(errors)} error(s) so far."
         return msg
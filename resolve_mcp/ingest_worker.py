@@ -1,20 +1,20 @@
 """
-Ingest background worker: Gemini upload + analysis loop, progress tracking.
+Ingest background worker: transcode → upload → analysis pipeline, progress tracking.
 """
 
 import json
+import os
+import queue
 import threading
 import time
 from pathlib import Path
 from typing import Optional
 
-from google.genai import types
-
 from .config import MODEL, AUDIO_EXTS, client, log
 from .retry import retry_gemini
 from .schemas import VideoSidecar, AudioSidecar
-from .ffprobe import ffprobe_fps, ffprobe_duration
-from .transcode import prepare_for_gemini
+from .ffprobe import ProbeResult, probe, probe_many
+from .transcode import transcode_scheduler
 from .media import (
     list_all_videos, list_all_audio,
     list_pending_videos, list_pending_audio,
@@ -23,6 +23,16 @@ from .prompts import ANALYSIS_PROMPT, AUDIO_ANALYSIS_PROMPT
 
 _PROGRESS_FILENAME = ".ingest_progress.json"
 
+# Concurrent Gemini uploads (each also polls until the file is ACTIVE).
+INGEST_UPLOADS = int(os.getenv("RESOLVE_INGEST_UPLOADS", "4"))
+# Concurrent Gemini analysis requests.
+INGEST_ANALYZERS = int(os.getenv("RESOLVE_INGEST_ANALYZERS", "4"))
+# Videos that may be transcoding or waiting to upload at once.
+INGEST_MAX_PROXIES = int(os.getenv("RESOLVE_INGEST_MAX_PROXIES", "8"))
+
+# Pipeline stages, as counted under "stages" in the progress file.
+STAGES = ("queued", "transcoding", "uploading", "analyzing")
+
 # Active worker threads keyed by resolved folder path.
 _active_workers: dict[str, threading.Thread] = {}
 
@@ -41,98 +51,200 @@ def _read_progress(root: Path) -> Optional[dict]:
         return None
 
 
+class _Progress:
+    """Thread-safe ``.ingest_progress.json`` writer shared by the pipeline stages."""
+
+    def __init__(self, root: Path, total: int, already_done: int, errors: list[str]):
+        self.root = root
+        self.total = total
+        self.already_done = already_done
+        self.errors = errors
+        self.stages: dict[str, int] = dict.fromkeys(STAGES, 0)
+        self.finished = 0
+        self._lock = threading.Lock()
+
+    def error(self, media_path: Path, message: str) -> None:
+        with self._lock:
+            self.errors.append(f"{media_path.name}: {message}")
+
+    def move(self, media_path: Path, old: str, new: str | None) -> None:
+        """Move one file from stage *old* to *new* (None: finished, done or failed)."""
+        with self._lock:
+            self.stages[old] -= 1
+            if new:
+                self.stages[new] += 1
+            else:
+                self.finished += 1
+            _write_progress(self.root, {
+                "status": "running", "current_file": media_path.name,
+                "current_step": new or old, "completed": self.already_done + self.finished,
+                "total": self.total, "errors": self.errors, "stages": dict(self.stages),
+            })
+
+
+def _split_note(parts: int) -> str:
+    """Prompt preamble for a source uploaded as several consecutive files."""
+    if parts < 2:
+        return ""
+    return (
+        f"The video above was uploaded in {parts} consecutive parts, in order. Treat them as one "
+        "continuous clip: timestamps count from the start of the first part.\n\n"
+    )
+
+
+def _analyze(types, media_path: Path, file_refs: list) -> None:
+    """Run the Gemini analysis for one uploaded file (or its split parts) and write its sidecar."""
+    is_audio = media_path.suffix.lower() in AUDIO_EXTS
+    if is_audio:
+        response = retry_gemini(
+            client.models.generate_content, model=MODEL,
+            contents=[*file_refs, AUDIO_ANALYSIS_PROMPT],
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=AudioSidecar,
+            ),
+        )
+    else:
+        response = retry_gemini(
+            client.models.generate_content, model=MODEL,
+            contents=[*file_refs, _split_note(len(file_refs)) + ANALYSIS_PROMPT],
+            config=types.GenerateContentConfig(
+                media_resolution=types.MediaResolution.MEDIA_RESOLUTION_HIGH,
+                response_mime_type="application/json",
+                response_schema=VideoSidecar,
+            ),
+        )
+
+    sidecar_data = json.loads(response.text)
+    sidecar_data["file_path"] = str(media_path)
+    sidecar_data["filename"] = media_path.name
+    sidecar_data["analysis_model"] = MODEL
+
+    if not is_audio:
+        info = probe(media_path)
+        if info.fps:
+            sidecar_data["fps"] = round(info.fps, 3)
+        if info.duration:
+            sidecar_data["duration"] = round(info.duration, 3)
+
+    sidecar_path = media_path.with_suffix(media_path.suffix + ".json")
+    sidecar_path.write_text(json.dumps(sidecar_data, indent=2), encoding="utf-8")
+
+
 def _ingest_worker(root: Path, build_instruction: Optional[str] = None) -> None:
-    """Background thread: process all pending media files sequentially.
+    """Background thread: process all pending media files.
+
+    Files move through three stages that overlap: transcode (on
+    ``transcode_scheduler``), upload (``INGEST_UPLOADS`` threads, each also
+    waiting out Gemini's PROCESSING state) and analysis (``INGEST_ANALYZERS``
+    threads).  At most ``INGEST_MAX_PROXIES`` videos are queued for
+    transcoding or waiting to upload at once, so a large card never fills
+    the disk with proxies ahead of the network; those proxies are pinned in
+    ``proxy_cache`` until uploaded, so its size cap never evicts them.
 
     If *build_instruction* is provided, a timeline build is automatically
     started once all sidecars are written.
     """
+    from google.genai import types
+
     pending_videos = list_pending_videos(root)
     pending_audio = list_pending_audio(root)
-    pending = pending_videos + pending_audio
     total = len(list_all_videos(root)) + len(list_all_audio(root))
-    already_done = total - len(pending)
+    already_done = total - len(pending_videos) - len(pending_audio)
     errors: list[str] = []
 
-    for i, media_path in enumerate(pending):
-        sidecar_path = media_path.with_suffix(media_path.suffix + ".json")
-        is_audio = media_path.suffix.lower() in AUDIO_EXTS
-
-        step = "uploading" if is_audio else "transcoding"
+    # Probe all pending videos up front, in parallel; the transcode check and
+    # sidecar fps/duration below then read the cached results.
+    probes: dict[Path, ProbeResult] = {}
+    if pending_videos:
         _write_progress(root, {
-            "status": "running", "current_file": media_path.name,
-            "current_step": step, "completed": already_done + i,
-            "total": total, "errors": errors,
+            "status": "running", "current_file": "", "current_step": "probing",
+            "completed": already_done, "total": total, "errors": errors,
         })
-
-        try:
-            if is_audio:
-                upload_path = media_path
-            else:
-                upload_path = prepare_for_gemini(media_path)
-                _write_progress(root, {
-                    "status": "running", "current_file": media_path.name,
-                    "current_step": "uploading", "completed": already_done + i,
-                    "total": total, "errors": errors,
-                })
-
-            file_ref = retry_gemini(client.files.upload, file=str(upload_path))
-            while file_ref.state.name == "PROCESSING":
-                time.sleep(2)
-                file_ref = client.files.get(name=file_ref.name)
-
-            if file_ref.state.name != "ACTIVE":
-                errors.append(f"{media_path.name}: upload state={file_ref.state.name}")
+        probes = probe_many(pending_videos)
+        # Shortest first, so the first sidecars appear early.
+        pending_videos.sort(key=lambda p: probes[p].duration or float("inf"))
+
+    progress = _Progress(root, total, already_done, errors)
+    progress.stages["queued"] = len(pending_videos) + len(pending_audio)
+    proxy_slots = threading.Semaphore(INGEST_MAX_PROXIES)
+    uploads: queue.Queue = queue.Queue()
+    analyses: queue.Queue = queue.Queue(maxsize=INGEST_ANALYZERS * 2)
+
+    def upload_stage():
+        while (item := uploads.get()) is not None:
+            media_path, job = item
+            stage = "transcoding" if job else "queued"
+            try:
+                upload_paths = job.result_parts() if job else [media_path]
+                progress.move(media_path, stage, "uploading")
+                stage = "uploading"
+                file_refs = []
+                for upload_path in upload_paths:
+                    file_ref = retry_gemini(client.files.upload, file=str(upload_path))
+                    while file_ref.state.name == "PROCESSING":
+                        time.sleep(2)
+                        file_ref = client.files.get(name=file_ref.name)
+                    if file_ref.state.name != "ACTIVE":
+                        raise RuntimeError(f"upload state={file_ref.state.name}")
+                    file_refs.append(file_ref)
+            except Exception as exc:
+                progress.error(media_path, str(exc))
+                progress.move(media_path, stage, None)
                 continue
-
-            _write_progress(root, {
-                "status": "running", "current_file": media_path.name,
-                "current_step": "analyzing", "completed": already_done + i,
-                "total": total, "errors": errors,
-            })
-
-            if is_audio:
-                response = retry_gemini(
-                    client.models.generate_content, model=MODEL,
-                    contents=[file_ref, AUDIO_ANALYSIS_PROMPT],
-                    config=types.GenerateContentConfig(
-                        response_mime_type="application/json",
-                        response_schema=AudioSidecar,
-                    ),
-                )
-            else:
-                response = retry_gemini(
-                    client.models.generate_content, model=MODEL,
-                    contents=[file_ref, ANALYSIS_PROMPT],
-                    config=types.GenerateContentConfig(
-                        media_resolution=types.MediaResolution.MEDIA_RESOLUTION_HIGH,
-                        response_mime_type="application/json",
-                        response_schema=VideoSidecar,
-                    ),
-                )
-
-            sidecar_data = json.loads(response.text)
-            sidecar_data["file_path"] = str(media_path)
-            sidecar_data["filename"] = media_path.name
-            sidecar_data["analysis_model"] = MODEL
-
-            if not is_audio:
-                probe_fps = ffprobe_fps(media_path)
-                if probe_fps:
-                    sidecar_data["fps"] = round(probe_fps, 3)
-                probe_dur = ffprobe_duration(media_path)
-                if probe_dur:
-                    sidecar_data["duration"] = round(probe_dur, 3)
-
-            sidecar_path.write_text(json.dumps(sidecar_data, indent=2), encoding="utf-8")
-
-        except Exception as exc:
-            errors.append(f"{media_path.name}: {exc}")
+            finally:
+                if job:
+                    job.release()
+                    proxy_slots.release()
+            progress.move(media_path, "uploading", "analyzing")
+            analyses.put((media_path, file_refs))
+
+    def analysis_stage():
+        while (item := analyses.get()) is not None:
+            media_path, file_refs = item
+            try:
+                _analyze(types, media_path, file_refs)
+            except Exception as exc:
+                progress.error(media_path, str(exc))
+            progress.move(media_path, "analyzing", None)
+
+    uploaders = [
+        threading.Thread(target=upload_stage, name=f"resolve-ingest-upload-{n}", daemon=True)
+        for n in range(INGEST_UPLOADS)
+    ]
+    analyzers = [
+        threading.Thread(target=analysis_stage, name=f"resolve-ingest-analyze-{n}", daemon=True)
+        for n in range(INGEST_ANALYZERS)
+    ]
+    for thread in uploaders + analyzers:
+        thread.start()
+
+    # Audio needs no transcode, so it goes straight to the uploaders while
+    # the first videos encode.
+    for media_path in pending_audio:
+        uploads.put((media_path, None))
+    for media_path in pending_videos:
+        proxy_slots.acquire()  # backpressure: wait for an upload to free a slot
+        progress.move(media_path, "queued", "transcoding")
+        job = transcode_scheduler.submit(
+            media_path, priority=probes[media_path].duration, allow_split=True, pin=True,
+        )
+        uploads.put((media_path, job))
+
+    for _ in uploaders:
+        uploads.put(None)
+    for thread in uploaders:
+        thread.join()
+    for _ in analyzers:
+        analyses.put(None)
+    for thread in analyzers:
+        thread.join()
 
     done_count = total - len(list_pending_videos(root)) - len(list_pending_audio(root))
     _write_progress(root, {
         "status": "complete", "current_file": None, "current_step": None,
         "completed": done_count, "total": total, "errors": errors,
+        "stages": dict.fromkeys(STAGES, 0),
     })
 
     if build_instruction:
@@ -0,0 +1,153 @@
+"""
+Timeline item cache.
+
+Item tools address clips as ``(track_type, track_index, item_index)`` and
+used to call ``GetItemListInTrack`` for every lookup — on a 3,000-item track
+that re-materialises the whole list over IPC each time.  ``TimelineItemCache``
+keeps per-track item lists and a ``GetUniqueId`` → item map, both tagged with
+a generation number.  Tools that add, remove or reorder items (delete, append,
+insert, ripple, compound/Fusion clips, track add/delete) call ``bump()``,
+which drops everything cached under the old generation.
+
+Track lists are also re-fetched once older than ``RESOLVE_ITEM_CACHE_TTL``
+seconds so edits made in the Resolve UI are picked up.  Items resolved by ID
+are verified with a single ``GetUniqueId()`` call instead of a list fetch.
+Lookups run as one dispatcher job each, so the cache lock is only taken on
+the Resolve executor thread.
+"""
+
+import os
+import threading
+import time
+
+from .dispatcher import runs_on_executor
+
+# Seconds a cached track list is trusted before it is fetched again.
+ITEM_CACHE_TTL = float(os.getenv("RESOLVE_ITEM_CACHE_TTL", "2.0"))
+
+_TRACK_TYPES = ("video", "audio", "subtitle")
+
+
+def _uid(obj) -> str:
+    try:
+        return obj.GetUniqueId() or ""
+    except Exception:
+        return ""
+
+
+class TimelineItemCache:
+    """Per-track item lists and unique-ID map, invalidated by generation."""
+
+    def __init__(self, ttl: float = ITEM_CACHE_TTL):
+        self.ttl = ttl
+        self.generation = 0
+        self._lock = threading.RLock()
+        # (timeline id, track type, track index) -> (generation, fetched_at, items)
+        self._tracks: dict[tuple, tuple] = {}
+        # (timeline id, item id) -> (generation, item)
+        self._by_id: dict[tuple, tuple] = {}
+        self._counters = {
+            "list_hits": 0,
+            "list_fetches": 0,
+            "id_hits": 0,
+            "id_scans": 0,
+            "bumps": 0,
+        }
+
+    def _remember(self, tl_id: str, item) -> None:
+        item_id = _uid(item)
+        if item_id:
+            self._by_id[(tl_id, item_id)] = (self.generation, item)
+
+    def _track(self, tl, tl_id: str, track_type: str, track_index: int) -> list:
+        key = (tl_id, track_type, track_index)
+        entry = self._tracks.get(key)
+        now = time.monotonic()
+        if entry and entry[0] == self.generation and now - entry[1] <= self.ttl:
+            self._counters["list_hits"] += 1
+            return entry[2]
+        items = tl.GetItemListInTrack(track_type, track_index) or []
+        self._tracks[key] = (self.generation, now, items)
+        self._counters["list_fetches"] += 1
+        return items
+
+    # -- public API -----------------------------------------------------------
+
+    @runs_on_executor
+    def items(self, tl, track_type: str, track_index: int) -> list:
+        """Return the (cached) item list for one track."""
+        with self._lock:
+            return self._track(tl, _uid(tl), track_type.lower(), int(track_index))
+
+    @runs_on_executor
+    def get(self, tl, track_type: str, track_index: int, item_index: int, item_id: str = ""):
+        """Return one item by unique ID (if given) or by 1-based track position.
+
+        Raises ``ValueError`` with a user-facing message when not found.
+        """
+        if item_id:
+            return self.by_id(tl, item_id)
+        with self._lock:
+            tl_id = _uid(tl)
+            items = self._track(tl, tl_id, track_type.lower(), int(track_index))
+            if not items:
+                raise ValueError(f"No items on {track_type} track {track_index}.")
+            idx = int(item_index) - 1
+            if idx < 0 or idx >= len(items):
+                raise ValueError(f"Item index {item_index} out of range (1–{len(items)}).")
+            item = items[idx]
+            self._remember(tl_id, item)
+            return item
+
+    @runs_on_executor
+    def by_id(self, tl, item_id: str):
+        """Return the item whose ``GetUniqueId()`` is *item_id*.
+
+        Raises ``ValueError`` if no track of *tl* holds it.
+        """
+        with self._lock:
+            tl_id = _uid(tl)
+            entry = self._by_id.get((tl_id, item_id))
+            if entry and entry[0] == self.generation and _uid(entry[1]) == item_id:
+                self._counters["id_hits"] += 1
+                return entry[1]
+            self._counters["id_scans"] += 1
+            for track_type in _TRACK_TYPES:
+                for track_index in range(1, (tl.GetTrackCount(track_type) or 0) + 1):
+                    for item in self._track(tl, tl_id, track_type, track_index):
+                        uid = _uid(item)
+                        if uid:
+                            self._by_id[(tl_id, uid)] = (self.generation, item)
+                        if uid == item_id:
+                            return item
+            raise ValueError(f"No timeline item with ID '{item_id}'.")
+
+    def bump(self) -> None:
+        """Invalidate every cached list and ID after a structural edit."""
+        with self._lock:
+            self.generation += 1
+            self._tracks.clear()
+            self._by_id.clear()
+            self._counters["bumps"] += 1
+
+    def stats(self) -> dict:
+        """Return cache size and hit/fetch counters."""
+        with self._lock:
+            return {
+                **self._counters,
+                "generation": self.generation,
+                "tracks": len(self._tracks),
+                "ids": len(self._by_id),
+            }
+
+
+# Process-wide cache shared by every tool module.
+item_cache = TimelineItemCache()
+
+
+def timeline_item(project, track_type: str, track_index: int, item_index: int, item_id: str = ""):
+    """Return ``(timeline, item)`` for the current timeline or raise ValueError."""
+    tl = project.GetCurrentTimeline()
+    if not tl:
+        raise ValueError("No active timeline.")
+    return tl, item_cache.get(tl, track_type, track_index, item_index, item_id)
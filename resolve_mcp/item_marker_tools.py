@@ -9,18 +9,12 @@ import json
 
 from .config import mcp
 from .errors import safe_resolve_call
+from .item_cache import timeline_item
 from .resolve import _boilerplate
 
 
-def _item(project, track_type, track_index, item_index):
-    tl = project.GetCurrentTimeline()
-    if not tl:
-        raise ValueError("No active timeline.")
-    items = tl.GetItemListInTrack(track_type.lower(), int(track_index)) or []
-    idx = int(item_index) - 1
-    if idx < 0 or idx >= len(items):
-        raise ValueError(f"Item index {item_index} out of range (1–{len(items)}).")
-    return items[idx]
+def _item(project, track_type, track_index, item_index, item_id=""):
+    return timeline_item(project, track_type, track_index, item_index, item_id)[1]
 
 
 # ---------------------------------------------------------------------------
@@ -33,7 +27,7 @@ def resolve_item_add_marker(track_type: str, track_index: int,
                              item_index: int, frame: int,
                              color: str = "Blue", name: str = "",
                              note: str = "", duration: int = 1,
-                             custom_data: str = "") -> str:
+                             custom_data: str = "", item_id: str = "") -> str:
     """Add a marker to a timeline item at a frame offset within the clip.
 
     Args:
@@ -47,11 +41,12 @@ def resolve_item_add_marker(track_type: str, track_index: int,
         note: Longer marker description.
         duration: Marker duration in frames (default 1).
         custom_data: Arbitrary string stored with the marker.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_get_markers, resolve_item_delete_markers
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.AddMarker(frame, color, name, note, duration, custom_data)
     return f"Marker added at frame {frame}." if r else "Failed."
 
@@ -59,18 +54,19 @@ def resolve_item_add_marker(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_get_markers(track_type: str, track_index: int,
-                              item_index: int) -> str:
+                              item_index: int, item_id: str = "") -> str:
     """List all markers on a timeline item.
 
     Args:
         track_type: Track type — 'video', 'audio', or 'subtitle'.
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_add_marker, resolve_item_delete_markers
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     markers = it.GetMarkers() or {}
     if not markers:
         return "No markers on this item."
@@ -84,7 +80,7 @@ def resolve_item_get_markers(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_delete_markers(track_type: str, track_index: int,
-                                 item_index: int, color: str = "All") -> str:
+                                 item_index: int, color: str = "All", item_id: str = "") -> str:
     """Delete markers on a timeline item by color.
 
     Args:
@@ -92,11 +88,12 @@ def resolve_item_delete_markers(track_type: str, track_index: int,
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
         color: Marker color to delete, or 'All' to delete all markers.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_add_marker, resolve_item_get_markers
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.DeleteMarkersByColor(color)
     return f"Deleted '{color}' markers." if r else "Failed."
 
@@ -104,7 +101,7 @@ def resolve_item_delete_markers(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_delete_marker_at(track_type: str, track_index: int,
-                                   item_index: int, frame: int) -> str:
+                                   item_index: int, frame: int, item_id: str = "") -> str:
     """Delete a specific marker on a timeline item.
 
     Args:
@@ -112,11 +109,12 @@ def resolve_item_delete_marker_at(track_type: str, track_index: int,
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
         frame: Frame offset of the marker to delete.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_delete_markers, resolve_item_get_markers
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.DeleteMarkerAtFrame(frame)
     return f"Marker deleted at frame {frame}." if r else "No marker at that frame."
 
@@ -124,7 +122,7 @@ def resolve_item_delete_marker_at(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_find_marker(track_type: str, track_index: int,
-                              item_index: int, custom_data: str) -> str:
+                              item_index: int, custom_data: str, item_id: str = "") -> str:
     """Find a marker on a timeline item by custom data.
 
     Args:
@@ -132,11 +130,12 @@ def resolve_item_find_marker(track_type: str, track_index: int,
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
         custom_data: Custom data string to search for.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_get_markers, resolve_item_add_marker
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.GetMarkerByCustomData(custom_data)
     return json.dumps(r, indent=2, default=str) if r else "No match."
 
@@ -148,7 +147,7 @@ def resolve_item_find_marker(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_add_flag(track_type: str, track_index: int,
-                           item_index: int, color: str) -> str:
+                           item_index: int, color: str, item_id: str = "") -> str:
     """Add a flag to a timeline item.
 
     Args:
@@ -157,11 +156,12 @@ def resolve_item_add_flag(track_type: str, track_index: int,
         item_index: 1-based item position on the track.
         color: Flag color. Valid: Orange, Apricot, Yellow, Lime, Olive, Green,
             Teal, Navy, Blue, Purple, Violet, Pink, Tan, Beige, Brown, Chocolate.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_get_flags, resolve_item_clear_flags
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.AddFlag(color)
     return f"Flag '{color}' added." if r else "Failed."
 
@@ -169,18 +169,19 @@ def resolve_item_add_flag(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_get_flags(track_type: str, track_index: int,
-                            item_index: int) -> str:
+                            item_index: int, item_id: str = "") -> str:
     """List all flags on a timeline item.
 
     Args:
         track_type: Track type — 'video', 'audio', or 'subtitle'.
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_add_flag, resolve_item_clear_flags
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     flags = it.GetFlagList() or []
     return ", ".join(flags) if flags else "No flags."
 
@@ -188,18 +189,19 @@ def resolve_item_get_flags(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_clear_flags(track_type: str, track_index: int,
-                              item_index: int) -> str:
+                              item_index: int, item_id: str = "") -> str:
     """Clear all flags from a timeline item.
 
     Args:
         track_type: Track type — 'video', 'audio', or 'subtitle'.
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_add_flag, resolve_item_get_flags
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.ClearFlags()
     return "Flags cleared." if r else "Failed."
 
@@ -211,18 +213,19 @@ def resolve_item_clear_flags(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_get_source_timecodes(track_type: str, track_index: int,
-                                       item_index: int) -> str:
+                                       item_index: int, item_id: str = "") -> str:
     """Get source start/end timecodes and frames for a timeline item.
 
     Args:
         track_type: Track type — 'video', 'audio', or 'subtitle'.
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_get_id
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     return (f"Source start: {it.GetSourceStartTimecode()} (frame {it.GetSourceStartFrame()})\n"
             f"Source end:   {it.GetSourceEndTimecode()} (frame {it.GetSourceEndFrame()})")
 
@@ -230,17 +233,18 @@ def resolve_item_get_source_timecodes(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_get_id(track_type: str, track_index: int,
-                         item_index: int) -> str:
+                         item_index: int, item_id: str = "") -> str:
     """Get the unique ID of a timeline item.
 
     Args:
         track_type: Track type — 'video', 'audio', or 'subtitle'.
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_clip_get_id, resolve_item_get_source_timecodes
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     uid = it.GetUniqueId()
     return f"Item unique ID: {uid}" if uid else "Could not retrieve."
@@ -7,18 +7,12 @@ import json
 
 from .config import mcp
 from .errors import safe_resolve_call
+from .item_cache import timeline_item
 from .resolve import _boilerplate
 
 
-def _item(project, track_type, track_index, item_index):
-    tl = project.GetCurrentTimeline()
-    if not tl:
-        raise ValueError("No active timeline.")
-    items = tl.GetItemListInTrack(track_type.lower(), int(track_index)) or []
-    idx = int(item_index) - 1
-    if idx < 0 or idx >= len(items):
-        raise ValueError(f"Item index {item_index} out of range (1–{len(items)}).")
-    return items[idx]
+def _item(project, track_type, track_index, item_index, item_id=""):
+    return timeline_item(project, track_type, track_index, item_index, item_id)[1]
 
 
 # ---------------------------------------------------------------------------
@@ -28,18 +22,19 @@ def _item(project, track_type, track_index, item_index):
 @mcp.tool
 @safe_resolve_call
 def resolve_item_list_versions(track_type: str, track_index: int,
-                                item_index: int) -> str:
+                                item_index: int, item_id: str = "") -> str:
     """List all clip versions on a timeline item.
 
     Args:
         track_type: Track type — 'video', 'audio', or 'subtitle'.
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_add_version, resolve_item_load_version
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     names = it.GetVersionNameList() or []
     current = it.GetCurrentVersion()
     if not names:
@@ -55,7 +50,7 @@ def resolve_item_list_versions(track_type: str, track_index: int,
 @safe_resolve_call
 def resolve_item_add_version(track_type: str, track_index: int,
                               item_index: int, version_name: str,
-                              version_type: int = 0) -> str:
+                              version_type: int = 0, item_id: str = "") -> str:
     """Create a new clip version.
 
     Args:
@@ -64,11 +59,12 @@ def resolve_item_add_version(track_type: str, track_index: int,
         item_index: 1-based item position on the track.
         version_name: Name for the new version.
         version_type: 0 = local, 1 = remote (default 0).
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_load_version, resolve_item_delete_version
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.AddVersion(version_name, version_type)
     return f"Version '{version_name}' created." if r else "Failed."
 
@@ -77,7 +73,7 @@ def resolve_item_add_version(track_type: str, track_index: int,
 @safe_resolve_call
 def resolve_item_load_version(track_type: str, track_index: int,
                                item_index: int, version_name: str,
-                               version_type: int = 0) -> str:
+                               version_type: int = 0, item_id: str = "") -> str:
     """Switch to a specific clip version.
 
     Args:
@@ -86,11 +82,12 @@ def resolve_item_load_version(track_type: str, track_index: int,
         item_index: 1-based item position on the track.
         version_name: Name of the version to load.
         version_type: 0 = local, 1 = remote (default 0).
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_list_versions, resolve_item_add_version
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.LoadVersionByName(version_name, version_type)
     return f"Loaded version '{version_name}'." if r else "Failed."
 
@@ -99,7 +96,7 @@ def resolve_item_load_version(track_type: str, track_index: int,
 @safe_resolve_call
 def resolve_item_delete_version(track_type: str, track_index: int,
                                  item_index: int, version_name: str,
-                                 version_type: int = 0) -> str:
+                                 version_type: int = 0, item_id: str = "") -> str:
     """Delete a clip version.
 
     Args:
@@ -108,11 +105,12 @@ def resolve_item_delete_version(track_type: str, track_index: int,
         item_index: 1-based item position on the track.
         version_name: Name of the version to delete.
         version_type: 0 = local, 1 = remote (default 0).
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_list_versions, resolve_item_load_version
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.DeleteVersionByName(version_name, version_type)
     return f"Deleted version '{version_name}'." if r else "Failed."
 
@@ -122,7 +120,7 @@ def resolve_item_delete_version(track_type: str, track_index: int,
 def resolve_item_rename_version(track_type: str, track_index: int,
                                  item_index: int, old_name: str,
                                  new_name: str,
-                                 version_type: int = 0) -> str:
+                                 version_type: int = 0, item_id: str = "") -> str:
     """Rename a clip version.
 
     Args:
@@ -132,11 +130,12 @@ def resolve_item_rename_version(track_type: str, track_index: int,
         old_name: Current version name.
         new_name: New version name.
         version_type: 0 = local, 1 = remote (default 0).
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_list_versions, resolve_item_load_version
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     r = it.RenameVersionByName(old_name, new_name, version_type)
     return f"Renamed '{old_name}' → '{new_name}'." if r else "Failed."
 
@@ -148,18 +147,19 @@ def resolve_item_rename_version(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_get_color_group(track_type: str, track_index: int,
-                                  item_index: int) -> str:
+                                  item_index: int, item_id: str = "") -> str:
     """Get the color group assigned to a timeline item.
 
     Args:
         track_type: Track type — 'video', 'audio', or 'subtitle'.
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_set_color_group
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     cg = it.GetColorGroup()
     if cg:
         name = cg.GetName() if hasattr(cg, "GetName") else str(cg)
@@ -171,7 +171,7 @@ def resolve_item_get_color_group(track_type: str, track_index: int,
 @safe_resolve_call
 def resolve_item_set_color_group(track_type: str, track_index: int,
                                   item_index: int,
-                                  group_name: str) -> str:
+                                  group_name: str, item_id: str = "") -> str:
     """Assign a color group to a timeline item.
 
     Args:
@@ -179,11 +179,12 @@ def resolve_item_set_color_group(track_type: str, track_index: int,
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
         group_name: Name of the color group to assign.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     See also: resolve_item_get_color_group, resolve_list_color_groups
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
 
     groups = project.GetColorGroupsList() or []
     target = None
@@ -206,7 +207,7 @@ def resolve_item_set_color_group(track_type: str, track_index: int,
 @safe_resolve_call
 def resolve_item_assign_grade_from_album(track_type: str, track_index: int,
                                           item_index: int,
-                                          still_index: int = 0) -> str:
+                                          still_index: int = 0, item_id: str = "") -> str:
     """Apply grade from a gallery still to a timeline item.
 
     Args:
@@ -214,12 +215,13 @@ def resolve_item_assign_grade_from_album(track_type: str, track_index: int,
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
         still_index: 0-based index into the current still album (default 0).
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     Note:
         Uses the current still album from the project gallery.
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     gallery = project.GetGallery()
     if not gallery:
         return "Cannot access gallery."
@@ -240,20 +242,21 @@ def resolve_item_assign_grade_from_album(track_type: str, track_index: int,
 @mcp.tool
 @safe_resolve_call
 def resolve_item_get_stereo_convergence(track_type: str, track_index: int,
-                                         item_index: int) -> str:
+                                         item_index: int, item_id: str = "") -> str:
     """Get stereo convergence values for a 3D timeline item.
 
     Args:
         track_type: Track type — 'video', 'audio', or 'subtitle'.
         track_index: 1-based track number.
         item_index: 1-based item position on the track.
+        item_id: Optional item unique ID (see resolve_list_clips_on_track); overrides track/index.
 
     Note:
         Returns stereo convergence data for 3D workflows. Only populated for
         items in stereo timelines.
     """
     _, project, _ = _boilerplate()
-    it = _item(project, track_type, track_index, item_index)
+    it = _item(project, track_type, track_index, item_index, item_id)
     vals = it.GetStereoConvergenceValues()
     if vals:
         return json.dumps(vals, indent=2, default=str)
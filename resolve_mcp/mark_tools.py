@@ -7,6 +7,7 @@ rendering, playback, and editing operations.
 """
 
 from .config import mcp
+from .media_index import find_clip
 from .resolve import _boilerplate
 
 # ---------------------------------------------------------------------------
@@ -90,7 +91,7 @@ def resolve_get_clip_mark_in_out(clip_name: str) -> str:
     *clip_name*: name of the clip in the media pool.
     """
     _, _, mp = _boilerplate()
-    clip = _find_clip(mp.GetRootFolder(), clip_name)
+    clip = find_clip(mp, clip_name)
     if not clip:
         return f"Clip '{clip_name}' not found."
 
@@ -117,7 +118,7 @@ def resolve_set_clip_mark_in_out(clip_name: str, mark_in: int, mark_out: int, ma
     *mark_type*: 'video', 'audio', or 'all' (default).
     """
     _, _, mp = _boilerplate()
-    clip = _find_clip(mp.GetRootFolder(), clip_name)
+    clip = find_clip(mp, clip_name)
     if not clip:
         return f"Clip '{clip_name}' not found."
 
@@ -135,7 +136,7 @@ def resolve_clear_clip_mark_in_out(clip_name: str, mark_type: str = "all") -> st
     *mark_type*: 'video', 'audio', or 'all' (default).
     """
     _, _, mp = _boilerplate()
-    clip = _find_clip(mp.GetRootFolder(), clip_name)
+    clip = find_clip(mp, clip_name)
     if not clip:
         return f"Clip '{clip_name}' not found."
 
@@ -144,14 +145,3 @@ def resolve_clear_clip_mark_in_out(clip_name: str, mark_type: str = "all") -> st
         return f"Marks cleared on '{clip_name}' ({mark_type})."
     return f"Failed to clear marks on '{clip_name}'."
 
-
-def _find_clip(folder, name):
-    """Recursively search for a clip by name."""
-    for clip in folder.GetClipList() or []:
-        if clip.GetName() == name:
-            return clip
-    for sub in folder.GetSubFolderList() or []:
-        found = _find_clip(sub, name)
-        if found:
-            return found
-    return None
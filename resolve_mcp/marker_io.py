@@ -0,0 +1,251 @@
+"""
+Marker list parsing and serialisation for the bulk marker tools.
+
+Parses JSON, CSV, Resolve marker EDLs and plain timecoded note lines into
+``{frame, color, name, note, duration, custom_data}`` dicts.  Timecode and
+seconds → frame conversion uses one frame rate / start offset computed by the
+caller, so thousands of entries cost no extra Resolve API calls.
+"""
+
+import csv
+import io
+import json
+import re
+
+MARKER_COLORS = (
+    "Blue",
+    "Cyan",
+    "Green",
+    "Yellow",
+    "Red",
+    "Pink",
+    "Purple",
+    "Fuchsia",
+    "Rose",
+    "Lavender",
+    "Sky",
+    "Mint",
+    "Lemon",
+    "Sand",
+    "Cocoa",
+    "Cream",
+)
+_COLOR_LOOKUP = {c.lower(): c for c in MARKER_COLORS}
+
+_TC_RE = re.compile(r"^(\d{1,2}):(\d{2}):(\d{2})[:;.](\d{2,3})$")
+_HMS_RE = re.compile(r"^(?:(\d{1,2}):)?(\d{1,2}):(\d{2})(?:\.\d+)?$")
+_SECONDS_RE = re.compile(r"^(\d+(?:\.\d+)?)s$")
+# Resolve marker EDL event: "001  001  V  C  01:00:05:00 01:00:05:01 01:00:05:00 01:00:05:01"
+_EDL_EVENT_RE = re.compile(r"^\d+\s+\S+\s+\S+\s+\S+\s+(\S+)\s+(\S+)\s+(\S+)\s+(\S+)\s*$")
+_EDL_FIELD_RE = re.compile(r"\|([CMD]):([^|]*)")
+# Note line: optional list number, optional [brackets], timecode, separator, text.
+_NOTE_RE = re.compile(r"^\s*(?:\d+[.)]\s+)?\[?([\d:;.]+s?)\]?\s*(?:[-–—:|]\s*)?(.*)$")
+
+
+def frames_to_tc(frame: int, fps: float) -> str:
+    """Convert a frame count to ``HH:MM:SS:FF`` at the integer timebase."""
+    fps_int = round(fps) or 24
+    total_secs, f = divmod(int(frame), fps_int)
+    total_mins, s = divmod(total_secs, 60)
+    h, m = divmod(total_mins, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}:{f:02d}"
+
+
+def _normalise_color(value, default: str) -> str:
+    if not value:
+        return default
+    text = str(value).strip()
+    if text.lower().startswith("resolvecolor"):
+        text = text[len("resolvecolor") :]
+    return _COLOR_LOOKUP.get(text.lower(), default)
+
+
+class FrameConverter:
+    """Turns frames, seconds or timecodes into frame offsets from *start_frame*.
+
+    Timecodes at or after *start_frame* are treated as absolute record
+    timecodes; earlier ones (e.g. ``00:30`` on a 01:00:00:00 timeline) are
+    treated as offsets from the start.
+    """
+
+    def __init__(self, fps: float, start_frame: int = 0):
+        self.fps = fps or 24.0
+        self.fps_int = round(self.fps) or 24
+        self.start_frame = start_frame
+
+    def _absolute(self, frames: int) -> int:
+        return frames - self.start_frame if frames >= self.start_frame else frames
+
+    def timecode(self, text: str) -> int | None:
+        text = text.strip()
+        m = _TC_RE.match(text)
+        if m:
+            h, mi, s, f = (int(g) for g in m.groups())
+            return self._absolute(((h * 60 + mi) * 60 + s) * self.fps_int + f)
+        m = _SECONDS_RE.match(text)
+        if m:
+            return round(float(m.group(1)) * self.fps)
+        m = _HMS_RE.match(text)
+        if m:
+            h, mi, s = int(m.group(1) or 0), int(m.group(2)), int(m.group(3))
+            return self._absolute(((h * 60 + mi) * 60 + s) * self.fps_int)
+        return None
+
+    def entry_frame(self, entry: dict) -> int | None:
+        """Frame for an entry with a ``frame``, ``seconds`` or ``timecode`` field."""
+        if entry.get("frame") not in (None, ""):
+            return int(float(entry["frame"]))
+        if entry.get("seconds") not in (None, ""):
+            return round(float(entry["seconds"]) * self.fps)
+        if entry.get("timecode"):
+            return self.timecode(str(entry["timecode"]))
+        return None
+
+
+def _from_records(records, conv: FrameConverter, default_color: str) -> tuple[list, list]:
+    markers, errors = [], []
+    for i, rec in enumerate(records, 1):
+        if not isinstance(rec, dict):
+            errors.append(f"entry {i}: not an object")
+            continue
+        try:
+            frame = conv.entry_frame(rec)
+        except (TypeError, ValueError):
+            frame = None
+        if frame is None or frame < 0:
+            errors.append(f"entry {i}: no usable frame/seconds/timecode")
+            continue
+        try:
+            duration = max(1, int(float(rec.get("duration") or 1)))
+        except (TypeError, ValueError):
+            errors.append(f"entry {i}: bad duration {rec.get('duration')!r}")
+            continue
+        # CSV headers arrive lowercased, so accept ``customdata`` as well.
+        custom_data = rec.get("custom_data") or rec.get("customData") or rec.get("customdata")
+        markers.append(
+            {
+                "frame": frame,
+                "color": _normalise_color(rec.get("color"), default_color),
+                "name": str(rec.get("name") or ""),
+                "note": str(rec.get("note") or ""),
+                "duration": duration,
+                "custom_data": str(custom_data or ""),
+            }
+        )
+    return markers, errors
+
+
+def _parse_edl(lines: list, conv: FrameConverter, default_color: str) -> tuple[list, list]:
+    markers, errors = [], []
+    current = None
+    for line in lines:
+        m = _EDL_EVENT_RE.match(line.strip())
+        if m:
+            if current:
+                markers.append(current)
+            frame = conv.timecode(m.group(3))
+            out = conv.timecode(m.group(4))
+            if frame is None:
+                errors.append(f"bad event timecode: {line.strip()}")
+                current = None
+                continue
+            current = {
+                "frame": frame,
+                "color": default_color,
+                "name": "",
+                "note": "",
+                "duration": max(1, (out or frame + 1) - frame),
+                "custom_data": "",
+            }
+        elif current and "|" in line:
+            for key, val in _EDL_FIELD_RE.findall(line):
+                val = val.strip()
+                if key == "C":
+                    current["color"] = _normalise_color(val, default_color)
+                elif key == "M":
+                    current["name"] = val
+                elif key == "D":
+                    current["duration"] = max(1, int(val or 1))
+        elif current and line.strip() and not line.startswith(("TITLE", "FCM")):
+            current["note"] = (current["note"] + " " + line.strip()).strip()
+    if current:
+        markers.append(current)
+    return markers, errors
+
+
+def _parse_notes(lines: list, conv: FrameConverter, default_color: str) -> tuple[list, list]:
+    markers, errors = [], []
+    for line in lines:
+        if not line.strip():
+            continue
+        m = _NOTE_RE.match(line)
+        frame = conv.timecode(m.group(1)) if m else None
+        if m is None or frame is None or frame < 0:
+            errors.append(f"no timecode: {line.strip()[:60]}")
+            continue
+        text = m.group(2).strip()
+        markers.append(
+            {
+                "frame": frame,
+                "color": default_color,
+                "name": text[:40],
+                "note": text,
+                "duration": 1,
+                "custom_data": "",
+            }
+        )
+    return markers, errors
+
+
+def detect_format(text: str, hint: str = "") -> str:
+    """Guess ``json``, ``csv``, ``edl`` or ``notes`` from a file suffix or the content."""
+    hint = hint.lower().lstrip(".")
+    if hint in ("json", "csv", "edl", "notes"):
+        return hint
+    if hint == "txt":
+        return "notes"
+    stripped = text.lstrip()
+    if stripped.startswith(("[{", "{", "[\n", "[ ")) or stripped == "[]":
+        return "json"
+    lines = [ln for ln in text.splitlines() if ln.strip()]
+    if any(_EDL_EVENT_RE.match(ln.strip()) for ln in lines[:20]):
+        return "edl"
+    first = lines[0].lower() if lines else ""
+    if "," in first and any(k in first for k in ("frame", "seconds", "timecode")):
+        return "csv"
+    return "notes"
+
+
+def parse_markers(text: str, fmt: str, conv: FrameConverter, default_color: str = "Blue") -> tuple[list, list]:
+    """Parse *text* in *fmt* into marker dicts.  Returns ``(markers, errors)``."""
+    if fmt == "json":
+        data = json.loads(text)
+        if isinstance(data, dict):
+            data = data.get("markers", [data])
+        return _from_records(data, conv, default_color)
+    if fmt == "csv":
+        rows = csv.DictReader(io.StringIO(text))
+        return _from_records(({(k or "").strip().lower(): v for k, v in r.items()} for r in rows), conv, default_color)
+    if fmt == "edl":
+        return _parse_edl(text.splitlines(), conv, default_color)
+    return _parse_notes(text.splitlines(), conv, default_color)
+
+
+def marker_records(raw: dict, fps: float, start_frame: int = 0) -> list[dict]:
+    """Convert a ``GetMarkers()`` dict into records sorted by frame."""
+    records = []
+    for key, info in sorted(raw.items(), key=lambda kv: int(float(kv[0]))):
+        frame = int(float(key))
+        records.append(
+            {
+                "frame": frame,
+                "sec": frame / fps if fps else 0.0,
+                "timecode": frames_to_tc(start_frame + frame, fps),
+                "color": info.get("color", "Blue"),
+                "name": info.get("name", ""),
+                "note": info.get("note", ""),
+                "duration": info.get("duration", 1),
+                "custom_data": info.get("customData", ""),
+            }
+        )
+    return records
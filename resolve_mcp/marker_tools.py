@@ -2,13 +2,18 @@
 Marker and playhead MCP tools.
 
 Covers: Timeline markers (add, delete, list, update custom data),
-playhead position (get/set timecode), and marker-based queries.
+bulk marker import/export, playhead position (get/set timecode),
+and marker-based queries.
 """
 
 import json
+from pathlib import Path
 from typing import Optional
 
 from .config import mcp
+from .ffprobe import tc_to_frames
+from .marker_io import FrameConverter, detect_format, marker_records, parse_markers
+from .media_index import find_clip, media_index
 from .resolve import _boilerplate
 
 
@@ -177,6 +182,149 @@ def resolve_get_marker_data(seconds: float) -> str:
     return f"No custom data on marker at frame {frame}."
 
 
+def _timeline_fps(tl) -> float:
+    try:
+        return float(tl.GetSetting("timelineFrameRate") or 24)
+    except (ValueError, TypeError):
+        return 24.0
+
+
+def _clip_fps_and_start(clip) -> tuple[float, int]:
+    try:
+        fps = float(clip.GetClipProperty("FPS") or 24)
+    except (ValueError, TypeError):
+        fps = 24.0
+    start_tc = clip.GetClipProperty("Start TC") or ""
+    return fps, tc_to_frames(start_tc, fps) if start_tc else 0
+
+
+@mcp.tool
+def resolve_import_markers(data: str = "", file_path: str = "", fmt: str = "auto",
+                           clip_name: str = "", default_color: str = "Blue",
+                           on_conflict: str = "skip") -> str:
+    """Add many markers in one call from a JSON, CSV, EDL or notes list.
+
+    *data*: inline marker list (or use *file_path*).
+    *file_path*: path to a .json, .csv, .edl or .txt marker file.
+    *fmt*: 'auto' (from suffix/content), 'json', 'csv', 'edl' or 'notes'.
+    *clip_name*: add to this media pool clip instead of the current timeline.
+    *default_color*: color for entries that do not specify one.
+    *on_conflict*: 'skip' existing markers at the same frame, or 'replace' them.
+
+    JSON/CSV entries take one of ``frame`` (offset from start), ``seconds``
+    or ``timecode`` plus optional ``color``, ``name``, ``note``, ``duration``
+    and ``custom_data``.  EDL input is Resolve's marker EDL export
+    (``|C:ResolveColorRed |M:name |D:1``).  Notes are lines such as
+    ``01:02:15:03 — fix this`` or ``[02:15] cut is abrupt``.  Timecodes
+    before the timeline/clip start are read as offsets from the start.
+    """
+    if on_conflict not in ("skip", "replace"):
+        return f"Invalid on_conflict '{on_conflict}'. Use 'skip' or 'replace'."
+    if file_path:
+        path = Path(file_path).expanduser()
+        if not path.is_file():
+            return f"File not found: {file_path}"
+        text = path.read_text(encoding="utf-8-sig")
+        hint = path.suffix if fmt == "auto" else fmt
+    elif data.strip():
+        text, hint = data, ("" if fmt == "auto" else fmt)
+    else:
+        return "Provide marker data inline or via file_path."
+
+    _, project, mp = _boilerplate()
+    if clip_name:
+        target = find_clip(mp, clip_name)
+        if not target:
+            return f"Clip '{clip_name}' not found in media pool."
+        fps, start = _clip_fps_and_start(target)
+        label = f"clip '{clip_name}'"
+    else:
+        target = project.GetCurrentTimeline()
+        if not target:
+            return "No active timeline."
+        fps, start = _timeline_fps(target), int(target.GetStartFrame() or 0)
+        label = f"timeline '{target.GetName()}'"
+
+    parsed_fmt = detect_format(text, hint)
+    try:
+        markers, errors = parse_markers(text, parsed_fmt, FrameConverter(fps, start), default_color)
+    except (json.JSONDecodeError, ValueError) as exc:
+        return f"Could not parse {parsed_fmt} marker list: {exc}"
+    if not markers:
+        return f"No markers found in {parsed_fmt} input." + (f" First error: {errors[0]}" if errors else "")
+
+    existing = {int(float(f)) for f in (target.GetMarkers() or {})}
+    added = skipped = replaced = failed = 0
+    for m in markers:
+        frame = m["frame"]
+        if frame in existing:
+            if on_conflict == "skip":
+                skipped += 1
+                continue
+            target.DeleteMarkerAtFrame(frame)
+            replaced += 1
+        if target.AddMarker(frame, m["color"], m["name"], m["note"], m["duration"], m["custom_data"]):
+            added += 1
+            existing.add(frame)
+        else:
+            failed += 1
+
+    msg = f"Imported {added} of {len(markers)} {parsed_fmt} marker(s) to {label}"
+    extras = [f"{n} {what}" for n, what in ((replaced, "replaced"), (skipped, "skipped (existing)"),
+                                           (failed, "rejected"), (len(errors), "unparsed")) if n]
+    if extras:
+        msg += " — " + ", ".join(extras)
+    msg += "."
+    if errors:
+        msg += "\nUnparsed: " + "; ".join(errors[:5]) + (" …" if len(errors) > 5 else "")
+    return msg
+
+
+@mcp.tool
+def resolve_export_markers(output_path: str, include_clips: bool = True) -> str:
+    """Export timeline and clip markers to an NDJSON file (one marker per line).
+
+    *output_path*: destination .ndjson file.
+    *include_clips*: also export markers on every media pool clip.
+
+    Each line: ``{"scope": "timeline"|"clip", "timeline"|"clip", "clip_id"?,
+    "frame", "sec", "timecode", "color", "name", "note", "duration",
+    "custom_data"}``.  Lines are written as they are read, so large marker
+    sets never build up in memory.
+    """
+    _, project, mp = _boilerplate()
+    tl = project.GetCurrentTimeline()
+    if not tl and not include_clips:
+        return "No active timeline."
+
+    out = Path(output_path).expanduser()
+    out.parent.mkdir(parents=True, exist_ok=True)
+    n_timeline = n_clip = n_clips_with = 0
+    with open(out, "w", encoding="utf-8") as fh:
+        if tl:
+            tl_name = tl.GetName()
+            fps, start = _timeline_fps(tl), int(tl.GetStartFrame() or 0)
+            for rec in marker_records(tl.GetMarkers() or {}, fps, start):
+                fh.write(json.dumps({"scope": "timeline", "timeline": tl_name, **rec}) + "\n")
+                n_timeline += 1
+        if include_clips:
+            for name, clip in media_index.clips_in(mp):
+                raw = clip.GetMarkers() or {}
+                if not raw:
+                    continue
+                fps, start = _clip_fps_and_start(clip)
+                uid = clip.GetUniqueId()
+                for rec in marker_records(raw, fps, start):
+                    fh.write(json.dumps({"scope": "clip", "clip": name, "clip_id": uid, **rec}) + "\n")
+                    n_clip += 1
+                n_clips_with += 1
+
+    summary = f"Exported {n_timeline} timeline marker(s)"
+    if include_clips:
+        summary += f" and {n_clip} clip marker(s) from {n_clips_with} clip(s)"
+    return summary + f" → {out}"
+
+
 @mcp.tool
 def resolve_get_playhead() -> str:
     """Get the current playhead position as timecode and seconds."""
@@ -6,7 +6,8 @@ Mattes are external alpha channel files used for compositing and grading isolati
 """
 
 from .config import mcp
-from .resolve import _boilerplate
+from .media_index import find_clip
+from .resolve import _boilerplate, _find_bin_or_error
 
 
 @mcp.tool
@@ -17,8 +18,7 @@ def resolve_get_clip_mattes(clip_name: str) -> str:
     Returns file paths to the matte files.
     """
     _, _, mp = _boilerplate()
-    root = mp.GetRootFolder()
-    clip = _find_clip(root, clip_name)
+    clip = find_clip(mp, clip_name)
     if not clip:
         return f"Clip '{clip_name}' not found in media pool."
 
@@ -42,8 +42,7 @@ def resolve_add_clip_mattes(clip_name: str, matte_paths: str, stereo_eye: str =
     """
     resolve, _, mp = _boilerplate()
     ms = resolve.GetMediaStorage()
-    root = mp.GetRootFolder()
-    clip = _find_clip(root, clip_name)
+    clip = find_clip(mp, clip_name)
     if not clip:
         return f"Clip '{clip_name}' not found in media pool."
 
@@ -67,8 +66,7 @@ def resolve_delete_clip_mattes(clip_name: str, matte_paths: str) -> str:
     *matte_paths*: comma-separated paths of mattes to remove.
     """
     _, _, mp = _boilerplate()
-    root = mp.GetRootFolder()
-    clip = _find_clip(root, clip_name)
+    clip = find_clip(mp, clip_name)
     if not clip:
         return f"Clip '{clip_name}' not found in media pool."
 
@@ -105,7 +103,9 @@ def resolve_get_timeline_mattes(bin_name: str = "") -> str:
     _, _, mp = _boilerplate()
 
     if bin_name:
-        folder = _find_folder(mp.GetRootFolder(), bin_name)
+        folder, error = _find_bin_or_error(mp.GetRootFolder(), bin_name)
+        if error:
+            return error
         if not folder:
             return f"Bin '{bin_name}' not found."
     else:
@@ -120,26 +120,3 @@ def resolve_get_timeline_mattes(bin_name: str = "") -> str:
         name = m.GetName() if hasattr(m, "GetName") else str(m)
         lines.append(f"  • {name}")
     return "\n".join(lines)
-
-
-def _find_clip(folder, name):
-    """Recursively search for a clip by name."""
-    for clip in folder.GetClipList() or []:
-        if clip.GetName() == name:
-            return clip
-    for sub in folder.GetSubFolderList() or []:
-        found = _find_clip(sub, name)
-        if found:
-            return found
-    return None
-
-
-def _find_folder(folder, name):
-    """Recursively find a folder by name."""
-    if folder.GetName() == name:
-        return folder
-    for sub in folder.GetSubFolderList() or []:
-        found = _find_folder(sub, name)
-        if found:
-            return found
-    return None
@@ -6,6 +6,7 @@ import json
 from pathlib import Path
 
 from .config import VIDEO_EXTS, AUDIO_EXTS, log
+from .proxy_cache import proxy_cache
 
 
 def is_junk(p: Path) -> bool:
@@ -14,7 +15,7 @@ def is_junk(p: Path) -> bool:
 
 
 def list_all_videos(root: Path) -> list[Path]:
-    """Return all source video files in *root* (excludes .gemini.mp4 caches)."""
+    """Return all source video files in *root* (excludes .gemini.mp4 proxies left by older versions)."""
     return sorted(
         p for p in root.iterdir()
         if p.suffix.lower() in VIDEO_EXTS
@@ -50,12 +51,16 @@ def list_pending_audio(root: Path) -> list[Path]:
     ]
 
 
-def find_proxy(media_path: Path) -> Path:
-    """Return the .gemini.mp4 proxy if it exists, otherwise the original file."""
-    proxy = media_path.with_suffix(".gemini.mp4")
-    if proxy.exists():
-        return proxy
-    return media_path
+def find_proxy_parts(media_path: Path) -> list[Path]:
+    """Return the files to upload for *media_path*: its cached Gemini proxy
+    (every part, if it was split), otherwise the original file."""
+    parts = proxy_cache.find_parts(media_path)
+    if parts:
+        return parts
+    legacy = media_path.with_suffix(".gemini.mp4")  # written beside the source by older versions
+    if legacy.exists():
+        return [legacy]
+    return [media_path]
 
 
 def load_sidecars(folder: Path) -> list[dict]:
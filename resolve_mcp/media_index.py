@@ -0,0 +1,578 @@
+"""
+Incremental media pool index.
+
+``_collect_clips_recursive`` walks the whole media pool (one ``GetName`` round
+trip per clip) on every lookup.  ``MediaPoolIndex`` walks it once and maps clip
+name, stem, file path and unique ID to the ``MediaPoolItem``.  Every bin
+remembers the clip/subfolder counts seen at its last walk and carries its own
+generation number; a refresh re-reads clips only in bins whose counts changed.
+
+Lookups are dictionary hits once warm.  The index re-checks bin counts when
+it is older than ``RESOLVE_INDEX_TTL`` seconds.  After ``invalidate()``
+(called by tools that move, rename or delete clips) it also re-reads every
+clip name, so a clip renamed in place is re-filed.  A lookup that misses
+re-reads every clip in full before giving up, which catches relinked clips
+too, but only once until the next ``invalidate()``: later misses re-check
+bin counts only.
+Clips returned by ``ImportMedia`` are filed with ``register()`` rather than
+invalidating, so importing new sources one by one never re-walks the pool.
+
+``BinTree`` does the same for folders: a trie of bins keyed by name segment,
+so ``/``-separated paths resolve in O(depth), plus a name → bins multimap so a
+bare name that matches several bins is reported instead of silently taking the
+first depth-first hit.  Bin create/move/delete tools patch the trie in place.
+
+Each lookup runs as one dispatcher job (``runs_on_executor``), so a refresh
+costs one queue round trip and the index locks are only taken on the Resolve
+executor thread.  Walks let queued health pings run between bins
+(``dispatcher.run_urgent``), so a walk of a large pool is not mistaken for a
+hung Resolve.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from .dispatcher import dispatcher, runs_on_executor
+from .errors import BinAmbiguous
+
+log = logging.getLogger(__name__)
+
+# Seconds a checked index is trusted before bin counts are re-verified.
+INDEX_TTL = float(os.getenv("RESOLVE_INDEX_TTL", "5.0"))
+
+
+class _ClipRecord:
+    """One indexed clip and the keys it was filed under."""
+
+    __slots__ = ("clip", "name", "stem", "path", "uid")
+
+    def __init__(self, clip, name: str, path: str, uid: str):
+        self.clip = clip
+        self.name = name
+        self.stem = Path(name).stem
+        self.path = path
+        self.uid = uid
+
+
+class _BinState:
+    """Per-bin snapshot: counts at last walk, child bins, and indexed clips."""
+
+    __slots__ = ("folder", "clip_count", "sub_count", "sub_ids", "records", "generation")
+
+    def __init__(self, folder, clip_count: int, sub_count: int, records: list, generation: int):
+        self.folder = folder
+        self.clip_count = clip_count
+        self.sub_count = sub_count
+        self.sub_ids: list[str] = []
+        self.records = records
+        self.generation = generation
+
+
+class MediaPoolIndex:
+    """Name/stem/path/unique-ID → MediaPoolItem map with lazy per-bin refresh."""
+
+    def __init__(self, ttl: float = INDEX_TTL):
+        self.ttl = ttl
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._root_id = None
+        self._bins: dict[str, _BinState] = {}
+        self._by_name: dict[str, list[_ClipRecord]] = {}
+        self._by_stem: dict[str, list[_ClipRecord]] = {}
+        self._by_path: dict[str, list[_ClipRecord]] = {}
+        self._by_uid: dict[str, _ClipRecord] = {}
+        self._checked_at = 0.0
+        self._dirty = True
+        # Every clip read in full since the last invalidate(): a miss is real.
+        self._complete = False
+        self._counters = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "full_walks": 0,
+            "refreshes": 0,
+            "bins_rewalked": 0,
+        }
+
+    # -- map maintenance ------------------------------------------------------
+
+    def _clear(self) -> None:
+        self._bins.clear()
+        self._by_name.clear()
+        self._by_stem.clear()
+        self._by_path.clear()
+        self._by_uid.clear()
+
+    def _add(self, rec: _ClipRecord) -> None:
+        self._by_name.setdefault(rec.name, []).append(rec)
+        self._by_stem.setdefault(rec.stem, []).append(rec)
+        if rec.path:
+            self._by_path.setdefault(rec.path, []).append(rec)
+        if rec.uid:
+            self._by_uid[rec.uid] = rec
+
+    def _remove(self, rec: _ClipRecord) -> None:
+        for table, key in ((self._by_name, rec.name), (self._by_stem, rec.stem), (self._by_path, rec.path)):
+            bucket = table.get(key)
+            if not bucket:
+                continue
+            bucket[:] = [r for r in bucket if r is not rec]
+            if not bucket:
+                del table[key]
+        if rec.uid and self._by_uid.get(rec.uid) is rec:
+            del self._by_uid[rec.uid]
+
+    def _drop_bin(self, bin_id: str) -> None:
+        state = self._bins.pop(bin_id, None)
+        if state is None:
+            return
+        for rec in state.records:
+            self._remove(rec)
+
+    @staticmethod
+    def _record(clip):
+        try:
+            name = clip.GetName()
+        except Exception:
+            return None
+        if not name:
+            return None
+        try:
+            uid = clip.GetUniqueId() or ""
+        except Exception:
+            uid = ""
+        try:
+            path = clip.GetClipProperty("File Path") or ""
+        except Exception:
+            path = ""
+        return _ClipRecord(clip, name, path, uid)
+
+    def _records(self, clips: list) -> list:
+        return [r for r in (self._record(c) for c in clips) if r is not None]
+
+    def _reread(self, old: list, clips: list) -> list:
+        """Re-read clip names; keep the record of any clip whose name is unchanged."""
+        out = []
+        for i, clip in enumerate(clips):
+            prev = old[i] if i < len(old) else None
+            try:
+                name = clip.GetName()
+            except Exception:
+                name = None
+            if prev is not None and name and name == prev.name:
+                prev.clip = clip
+                out.append(prev)
+            elif (rec := self._record(clip)) is not None:
+                out.append(rec)
+        return out
+
+    # -- walking --------------------------------------------------------------
+
+    def _walk(self, folder, seen: set, depth: int = 0) -> str:
+        """Refresh *folder* and its subtree; return the folder's unique ID.
+
+        *depth* 0 compares clip counts only, 1 also re-reads clip names and
+        2 re-reads every clip in full.
+        """
+        dispatcher.run_urgent()
+        bin_id = folder.GetUniqueId() or f"anon:{id(folder)}"
+        seen.add(bin_id)
+        clips = folder.GetClipList() or []
+        subs = folder.GetSubFolderList() or []
+
+        state = self._bins.get(bin_id)
+        if state is not None and depth == 1 and state.clip_count == len(clips):
+            records = self._reread(state.records, clips)
+            before, after = {id(r) for r in state.records}, {id(r) for r in records}
+            if before != after:
+                for rec in state.records:
+                    if id(rec) not in after:
+                        self._remove(rec)
+                for rec in records:
+                    if id(rec) not in before:
+                        self._add(rec)
+                self.generation += 1
+                state.generation = self.generation
+                state.records = records
+                self._counters["bins_rewalked"] += 1
+        if state is None or state.clip_count != len(clips) or depth == 2:
+            if state is not None:
+                for rec in state.records:
+                    self._remove(rec)
+            records = self._records(clips)
+            for rec in records:
+                self._add(rec)
+            self.generation += 1
+            old_subs = state.sub_ids if state else []
+            state = _BinState(folder, len(clips), len(subs), records, self.generation)
+            state.sub_ids = old_subs
+            self._bins[bin_id] = state
+            self._counters["bins_rewalked"] += 1
+        else:
+            state.folder = folder
+            if state.sub_count != len(subs):
+                self.generation += 1
+                state.generation = self.generation
+                state.sub_count = len(subs)
+
+        state.sub_ids = [self._walk(sub, seen, depth) for sub in subs]
+        return bin_id
+
+    def _sync(self, media_pool, force: bool = False) -> bool:
+        """Bring the index up to date if stale.
+
+        *force* re-reads every clip, unless that was already done since the
+        last ``invalidate()``; then it only re-reads bins whose clip count
+        changed.  Returns True if the pool was just checked and every clip
+        has been read in full, i.e. a miss now is a real miss.
+        """
+        root = media_pool.GetRootFolder()
+        if root is None:
+            self._clear()
+            return True
+        root_id = root.GetUniqueId()
+        if root_id != self._root_id:
+            self._clear()
+            self._root_id = root_id
+            depth = 2
+        elif force and not self._complete:
+            depth = 2
+        elif self._dirty:
+            depth = 1
+        elif force or time.monotonic() - self._checked_at > self.ttl:
+            depth = 0
+        else:
+            return False
+        self._counters["full_walks" if depth == 2 and not self._bins else "refreshes"] += 1
+
+        seen: set[str] = set()
+        self._walk(root, seen, depth)
+        for stale in [b for b in self._bins if b not in seen]:
+            self._drop_bin(stale)
+        self._checked_at = time.monotonic()
+        self._dirty = False
+        self._complete = self._complete or depth == 2
+        return self._complete
+
+    def _lookup(self, key: str):
+        probes = ((self._by_name, key), (self._by_stem, key), (self._by_path, key), (self._by_stem, Path(key).stem))
+        for table, k in probes:
+            bucket = table.get(k)
+            if bucket:
+                return bucket[0].clip
+        rec = self._by_uid.get(key)
+        return rec.clip if rec else None
+
+    # -- public API -----------------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Re-check bin counts and clip names on the next lookup."""
+        with self._lock:
+            self._dirty = True
+            self._complete = False
+
+    def reset(self) -> None:
+        """Discard everything; the next lookup does a full walk."""
+        with self._lock:
+            self._clear()
+            self._root_id = None
+            self._dirty = True
+            self._complete = False
+
+    @runs_on_executor
+    def register(self, media_pool, clips) -> None:
+        """File *clips* just returned by ``ImportMedia`` without re-walking the pool.
+
+        Imports land in the media pool's current folder.  If that bin is not
+        indexed yet, the next refresh finds the new clips by its clip count.
+        """
+        with self._lock:
+            folder = media_pool.GetCurrentFolder() if clips else None
+            state = self._bins.get(folder.GetUniqueId()) if folder is not None else None
+            if state is None:
+                return
+            records = [r for r in self._records(clips) if not (r.uid and r.uid in self._by_uid)]
+            for rec in records:
+                self._add(rec)
+            state.records = state.records + records
+            state.clip_count += len(records)
+            self.generation += 1
+            state.generation = self.generation
+
+    @runs_on_executor
+    def find(self, media_pool, key: str):
+        """Return the clip matching *key* (name, stem, file path or unique ID), or None."""
+        with self._lock:
+            refreshed = self._sync(media_pool)
+            self._counters["lookups"] += 1
+            clip = self._lookup(key)
+            if clip is None and not refreshed:
+                self._sync(media_pool, force=True)
+                clip = self._lookup(key)
+            self._counters["hits" if clip is not None else "misses"] += 1
+            return clip
+
+    @runs_on_executor
+    def find_many(self, media_pool, keys: list) -> tuple:
+        """Resolve *keys* to clips.  Returns ``(found, missing)`` in input order."""
+        with self._lock:
+            refreshed = self._sync(media_pool)
+            if not refreshed and any(self._lookup(k) is None for k in keys):
+                self._sync(media_pool, force=True)
+            found, missing = [], []
+            for key in keys:
+                clip = self._lookup(key)
+                self._counters["lookups"] += 1
+                self._counters["hits" if clip is not None else "misses"] += 1
+                (found if clip is not None else missing).append(clip if clip is not None else key)
+            return found, missing
+
+    @runs_on_executor
+    def clips_in(self, media_pool, folder=None) -> list:
+        """Return ``[(name, clip), ...]`` for every clip under *folder* (root if None)."""
+        with self._lock:
+            self._sync(media_pool)
+            if folder is None:
+                start = self._root_id
+            else:
+                start = folder.GetUniqueId()
+                if start not in self._bins:
+                    self._sync(media_pool, force=True)
+            out: list = []
+            stack = [start] if start in self._bins else []
+            while stack:
+                state = self._bins[stack.pop()]
+                out.extend((rec.name, rec.clip) for rec in state.records)
+                stack.extend(reversed([s for s in state.sub_ids if s in self._bins]))
+            return out
+
+    @runs_on_executor
+    def file_paths(self, media_pool) -> list[str]:
+        """Return the distinct source file paths of every indexed clip."""
+        with self._lock:
+            self._sync(media_pool)
+            return list(self._by_path)
+
+    @runs_on_executor
+    def bin_generation(self, media_pool, folder) -> int:
+        """Return the generation at which *folder* last changed (0 if unknown)."""
+        with self._lock:
+            self._sync(media_pool)
+            state = self._bins.get(folder.GetUniqueId())
+            return state.generation if state else 0
+
+    def stats(self) -> dict:
+        """Return index size, generation and hit/miss counters."""
+        with self._lock:
+            return {
+                **self._counters,
+                "bins": len(self._bins),
+                "clips": sum(len(b.records) for b in self._bins.values()),
+                "generation": self.generation,
+            }
+
+
+class _BinNode:
+    """One bin in the trie."""
+
+    __slots__ = ("folder", "name", "uid", "parent", "children")
+
+    def __init__(self, folder, name: str, uid: str, parent=None):
+        self.folder = folder
+        self.name = name
+        self.uid = uid
+        self.parent = parent
+        self.children: dict[str, _BinNode] = {}
+
+
+class BinTree:
+    """Path trie and name multimap over media pool bins."""
+
+    def __init__(self, ttl: float = INDEX_TTL):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._root: _BinNode | None = None
+        self._by_uid: dict[str, _BinNode] = {}
+        self._by_name: dict[str, list[_BinNode]] = {}
+        self._built_at = 0.0
+        self._dirty = True
+        self._counters = {"lookups": 0, "builds": 0, "patches": 0, "ambiguous": 0}
+
+    # -- trie maintenance -----------------------------------------------------
+
+    @staticmethod
+    def _uid(folder) -> str:
+        return folder.GetUniqueId() or f"anon:{id(folder)}"
+
+    def _attach(self, folder, parent) -> _BinNode:
+        dispatcher.run_urgent()
+        node = _BinNode(folder, folder.GetName(), self._uid(folder), parent)
+        if parent is not None:
+            # Resolve keeps sibling names unique; keep the first if it does not.
+            parent.children.setdefault(node.name, node)
+        self._by_uid[node.uid] = node
+        self._by_name.setdefault(node.name, []).append(node)
+        for sub in folder.GetSubFolderList() or []:
+            self._attach(sub, node)
+        return node
+
+    def _detach(self, node: _BinNode) -> None:
+        if node.parent is not None and node.parent.children.get(node.name) is node:
+            del node.parent.children[node.name]
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            self._by_uid.pop(n.uid, None)
+            bucket = self._by_name.get(n.name)
+            if bucket:
+                bucket[:] = [b for b in bucket if b is not n]
+                if not bucket:
+                    del self._by_name[n.name]
+            stack.extend(n.children.values())
+
+    def _build(self, root_folder) -> None:
+        self._by_uid.clear()
+        self._by_name.clear()
+        self._root = self._attach(root_folder, None)
+        self._built_at = time.monotonic()
+        self._dirty = False
+        self._counters["builds"] += 1
+
+    def _sync(self, root_folder, force: bool = False) -> bool:
+        """Rebuild if stale or the project changed.  Returns True if rebuilt."""
+        stale = (
+            force
+            or self._dirty
+            or self._root is None
+            or self._root.uid != self._uid(root_folder)
+            or time.monotonic() - self._built_at > self.ttl
+        )
+        if stale:
+            self._build(root_folder)
+        return stale
+
+    def _path(self, node: _BinNode) -> str:
+        parts = []
+        while node.parent is not None:
+            parts.append(node.name)
+            node = node.parent
+        return "/".join(reversed(parts)) or node.name
+
+    def _walk_path(self, segments: list):
+        node = self._root
+        if node is None:
+            return None
+        if segments and segments[0] not in node.children and segments[0] == node.name:
+            segments = segments[1:]  # tolerate the root name, as listed by resolve://bins
+        for seg in segments:
+            child = node.children.get(seg)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def _lookup(self, bin_path: str):
+        if "/" in bin_path:
+            node = self._walk_path([s for s in bin_path.split("/") if s])
+            return [node] if node is not None else []
+        return list(self._by_name.get(bin_path, ()))
+
+    # -- public API -----------------------------------------------------------
+
+    @runs_on_executor
+    def find(self, root_folder, bin_path: str):
+        """Return the folder for a bin name or ``/``-separated path, or None.
+
+        Raises ``BinAmbiguous`` when a bare name matches more than one bin.
+        """
+        with self._lock:
+            rebuilt = self._sync(root_folder)
+            self._counters["lookups"] += 1
+            nodes = self._lookup(bin_path)
+            if not nodes and not rebuilt:
+                self._sync(root_folder, force=True)
+                nodes = self._lookup(bin_path)
+            if len(nodes) > 1:
+                self._counters["ambiguous"] += 1
+                paths = ", ".join(sorted(self._path(n) for n in nodes))
+                raise BinAmbiguous(f"Bin name '{bin_path}' matches {len(nodes)} bins ({paths}). Use the full path.")
+            return nodes[0].folder if nodes else None
+
+    @runs_on_executor
+    def paths(self, root_folder, name: str) -> list[str]:
+        """Return the paths of every bin called *name*."""
+        with self._lock:
+            self._sync(root_folder)
+            return sorted(self._path(n) for n in self._by_name.get(name, ()))
+
+    @runs_on_executor
+    def added(self, parent_folder, folder) -> None:
+        """Record a bin just created under *parent_folder*."""
+        with self._lock:
+            parent = self._by_uid.get(self._uid(parent_folder)) if not self._dirty else None
+            if parent is None or folder is None:
+                self._dirty = True
+                return
+            self._attach(folder, parent)
+            self._counters["patches"] += 1
+
+    @runs_on_executor
+    def removed(self, folders: list) -> None:
+        """Drop deleted bins (and their subtrees)."""
+        with self._lock:
+            for folder in folders:
+                node = self._by_uid.get(self._uid(folder))
+                if node is not None:
+                    self._detach(node)
+            self._counters["patches"] += 1
+
+    @runs_on_executor
+    def moved(self, folders: list, target_folder) -> None:
+        """Re-parent bins moved under *target_folder*."""
+        with self._lock:
+            target = self._by_uid.get(self._uid(target_folder)) if not self._dirty else None
+            if target is None:
+                self._dirty = True
+                return
+            for folder in folders:
+                node = self._by_uid.get(self._uid(folder))
+                if node is None:
+                    self._dirty = True
+                    return
+                if node.parent is not None and node.parent.children.get(node.name) is node:
+                    del node.parent.children[node.name]
+                node.parent = target
+                target.children.setdefault(node.name, node)
+            self._counters["patches"] += 1
+
+    def invalidate(self) -> None:
+        """Rebuild the trie on the next lookup."""
+        with self._lock:
+            self._dirty = True
+
+    def stats(self) -> dict:
+        """Return trie size and counters."""
+        with self._lock:
+            return {
+                **self._counters,
+                "bins": len(self._by_uid),
+                "duplicate_names": sum(1 for b in self._by_name.values() if len(b) > 1),
+            }
+
+
+# Process-wide indexes shared by every tool module.
+media_index = MediaPoolIndex()
+bin_tree = BinTree()
+
+
+def find_clip(media_pool, clip_name: str):
+    """Find a clip in the media pool by name, stem, file path or unique ID."""
+    return media_index.find(media_pool, clip_name)
+
+
+def find_clips(media_pool, clip_names: list) -> tuple:
+    """Resolve multiple clip names to clip objects.  Returns ``(found, missing)``."""
+    return media_index.find_many(media_pool, clip_names)
@@ -3,9 +3,14 @@
 import json
 
 from .config import mcp
-from .resolve import _boilerplate, _find_bin
+from .execution import report_progress
+from .media_index import bin_tree, media_index
+from .resolve import _boilerplate, _find_bin_or_error
 from .media_pool_query_tools import _resolve_clip, _resolve_clips
 
+# Files per ImportMedia call in resolve_import_media.
+_IMPORT_CHUNK = 50
+
 
 @mcp.tool
 def resolve_create_bin(bin_name: str, parent_bin: str = "") -> str:
@@ -15,11 +20,17 @@ def resolve_create_bin(bin_name: str, parent_bin: str = "") -> str:
     """
     _, _, media_pool = _boilerplate()
     if parent_bin:
-        folder = _find_bin(media_pool.GetRootFolder(), parent_bin)
+        folder, error = _find_bin_or_error(media_pool.GetRootFolder(), parent_bin)
+        if error:
+            return error
         if not folder:
             return f"Parent bin '{parent_bin}' not found."
         media_pool.SetCurrentFolder(folder)
-    new_folder = media_pool.AddSubFolder(media_pool.GetCurrentFolder(), bin_name)
+    parent = media_pool.GetCurrentFolder()
+    new_folder = media_pool.AddSubFolder(parent, bin_name)
+    media_index.invalidate()
+    if new_folder:
+        bin_tree.added(parent, new_folder)
     return f"Created bin '{bin_name}'." if new_folder else f"Failed to create bin '{bin_name}'. It may already exist."
 
 
@@ -33,11 +44,21 @@ def resolve_import_media(file_paths: str, target_bin: str = "") -> str:
     _, _, media_pool = _boilerplate()
     paths = [p.strip() for p in file_paths.split(",") if p.strip()]
     if target_bin:
-        folder = _find_bin(media_pool.GetRootFolder(), target_bin)
+        folder, error = _find_bin_or_error(media_pool.GetRootFolder(), target_bin)
+        if error:
+            return error
         if not folder:
             return f"Target bin '{target_bin}' not found."
         media_pool.SetCurrentFolder(folder)
-    imported = media_pool.ImportMedia(paths)
+    imported = []
+    try:
+        # Import in chunks so long imports report progress and can be cancelled between chunks.
+        for i in range(0, len(paths), _IMPORT_CHUNK):
+            report_progress(i, len(paths), "Importing media")
+            imported += media_pool.ImportMedia(paths[i:i + _IMPORT_CHUNK]) or []
+    finally:
+        media_index.register(media_pool, imported)
+    report_progress(len(paths), len(paths), "Importing media")
     return f"Imported {len(imported)} file(s)." if imported else "Import failed. Check file paths and formats."
 
 
@@ -49,13 +70,16 @@ def resolve_move_clips(clip_names: str, target_bin: str) -> str:
     """
     _, _, media_pool = _boilerplate()
     names = [n.strip() for n in clip_names.split(",") if n.strip()]
-    target = _find_bin(media_pool.GetRootFolder(), target_bin)
+    target, error = _find_bin_or_error(media_pool.GetRootFolder(), target_bin)
+    if error:
+        return error
     if not target:
         return f"Target bin '{target_bin}' not found."
     found, missing = _resolve_clips(media_pool, names)
     if not found:
         return f"No matching clips found. Missing: {', '.join(missing)}"
     result = media_pool.MoveClips(found, target)
+    media_index.invalidate()
     msg = f"Moved {len(found)} clip(s) to '{target_bin}'."
     if missing:
         msg += f" Not found: {', '.join(missing)}."
@@ -109,6 +133,7 @@ def resolve_delete_clips(clip_names: str) -> str:
     if not found:
         return f"No matching clips found. Missing: {', '.join(missing)}"
     result = media_pool.DeleteClips(found)
+    media_index.invalidate()
     msg = f"Deleted {len(found)} clip(s)."
     if missing:
         msg += f" Not found: {', '.join(missing)}."
@@ -127,6 +152,7 @@ def resolve_relink_clips(clip_names: str, folder_path: str) -> str:
     if not found:
         return f"No matching clips found. Missing: {', '.join(missing)}"
     result = media_pool.RelinkClips(found, folder_path)
+    media_index.reset()  # file paths changed; clip counts did not
     msg = f"Relinked {len(found)} clip(s) to '{folder_path}'."
     if missing:
         msg += f" Not found: {', '.join(missing)}."
@@ -140,7 +166,9 @@ def resolve_auto_sync_audio(bin_name: str, mode: str = "timecode") -> str:
     *mode*: 'timecode' or 'waveform'.
     """
     _, _, media_pool = _boilerplate()
-    folder = _find_bin(media_pool.GetRootFolder(), bin_name)
+    folder, error = _find_bin_or_error(media_pool.GetRootFolder(), bin_name)
+    if error:
+        return error
     if not folder:
         return f"Bin '{bin_name}' not found."
     clips = folder.GetClipList() or []
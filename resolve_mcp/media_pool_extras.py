@@ -4,11 +4,22 @@ export metadata, unlink clips, delete folders, unique IDs.
 """
 
 import json
+from pathlib import Path
 from typing import Optional
 
 from .config import mcp
 from .errors import safe_resolve_call
-from .resolve import _boilerplate, _find_bin, _collect_clips_recursive
+from .media_index import bin_tree, media_index
+from .resolve import _boilerplate, _find_bin
+
+
+def _pool(mp, folder=None) -> dict:
+    """Clips under *folder* (root if None) keyed by both stem and full name."""
+    pool: dict[str, object] = {}
+    for name, clip in media_index.clips_in(mp, folder):
+        pool[Path(name).stem] = clip
+        pool[name] = clip
+    return pool
 
 
 # ---------------------------------------------------------------------------
@@ -43,7 +54,7 @@ def resolve_create_timeline_from_clips(timeline_name: str,
     _, _, mp = _boilerplate()
     root = mp.GetRootFolder()
     folder = _find_bin(root, bin_name) if bin_name else root
-    pool = _collect_clips_recursive(folder) if folder else {}
+    pool = _pool(mp, folder) if folder else {}
 
     names = [n.strip() for n in clip_names.split(",") if n.strip()]
     clips = [pool[n] for n in names if n in pool]
@@ -51,6 +62,7 @@ def resolve_create_timeline_from_clips(timeline_name: str,
         return "No matching clips found."
 
     tl = mp.CreateTimelineFromClips(timeline_name, clips)
+    media_index.invalidate()
     return f"Timeline '{timeline_name}' created with {len(clips)} clip(s)." if tl \
         else "Failed to create timeline from clips."
 
@@ -75,6 +87,7 @@ def resolve_import_timeline_from_file(file_path: str,
         opts = {}
     tl = mp.ImportTimelineFromFile(file_path, opts) if opts \
         else mp.ImportTimelineFromFile(file_path)
+    media_index.invalidate()
     return f"Timeline imported from {file_path}" if tl \
         else f"Import failed for {file_path}."
 
@@ -97,6 +110,8 @@ def resolve_import_folder_to_media_pool(folder_path: str,
         if f:
             mp.SetCurrentFolder(f)
     items = mp.ImportFolderToMediaPool(folder_path)
+    media_index.invalidate()
+    bin_tree.invalidate()
     if items:
         ct = len(items) if isinstance(items, list) else 1
         return f"Imported folder — {ct} item(s) added."
@@ -135,7 +150,7 @@ def resolve_unlink_clips(clip_names: str) -> str:
         clip_names (str): Comma-separated list of clip names to unlink.
     """
     _, _, mp = _boilerplate()
-    pool = _collect_clips_recursive(mp.GetRootFolder())
+    pool = _pool(mp)
     names = [n.strip() for n in clip_names.split(",") if n.strip()]
     clips = [pool[n] for n in names if n in pool]
     if not clips:
@@ -163,6 +178,9 @@ def resolve_delete_bins(bin_names: str) -> str:
     if not folders:
         return "No matching bins found."
     r = mp.DeleteFolders(folders)
+    media_index.invalidate()
+    if r:
+        bin_tree.removed(folders)
     return f"Deleted {len(folders)} bin(s)." if r else "Delete failed."
 
 
@@ -1,26 +1,20 @@
 """Media pool query tools: search clips, get clip info."""
 
 import json
-from pathlib import Path
 
 from .config import mcp
-from .resolve import _boilerplate, _find_bin, _collect_clips_recursive
+from .media_index import find_clip, find_clips, media_index
+from .resolve import _boilerplate, _find_bin_or_error
 
 
 def _resolve_clip(media_pool, clip_name: str):
     """Find a clip in the media pool by name (stem or full filename)."""
-    pool_clips = _collect_clips_recursive(media_pool.GetRootFolder())
-    return pool_clips.get(clip_name) or pool_clips.get(Path(clip_name).stem)
+    return find_clip(media_pool, clip_name)
 
 
 def _resolve_clips(media_pool, clip_names: list) -> tuple:
     """Resolve multiple clip names to clip objects. Returns (found, missing)."""
-    pool_clips = _collect_clips_recursive(media_pool.GetRootFolder())
-    found, missing = [], []
-    for name in clip_names:
-        clip = pool_clips.get(name) or pool_clips.get(Path(name).stem)
-        (found if clip else missing).append(clip or name)
-    return found, missing
+    return find_clips(media_pool, clip_names)
 
 
 @mcp.tool
@@ -31,7 +25,9 @@ def resolve_search_clips(query: str, search_in: str = "") -> str:
     """
     _, _, media_pool = _boilerplate()
     if search_in:
-        folder = _find_bin(media_pool.GetRootFolder(), search_in)
+        folder, error = _find_bin_or_error(media_pool.GetRootFolder(), search_in)
+        if error:
+            return error
         if not folder:
             return f"Bin '{search_in}' not found."
     else:
@@ -39,7 +35,7 @@ def resolve_search_clips(query: str, search_in: str = "") -> str:
 
     query_lower = query.lower()
     matches, seen = [], set()
-    for name in _collect_clips_recursive(folder):
+    for name, _clip in media_index.clips_in(media_pool, folder):
         if query_lower in name.lower() and name not in seen:
             seen.add(name)
             matches.append(name)
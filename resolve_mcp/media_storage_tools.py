@@ -9,6 +9,7 @@ import json
 from typing import Optional
 
 from .config import mcp
+from .media_index import media_index
 from .resolve import get_resolve, _boilerplate
 
 
@@ -95,12 +96,15 @@ def resolve_add_from_storage(file_paths: str, target_bin: str = "") -> str:
 
     if target_bin:
         _, _, media_pool = _boilerplate()
-        from .resolve import _find_bin
-        folder = _find_bin(media_pool.GetRootFolder(), target_bin)
+        from .resolve import _find_bin_or_error
+        folder, error = _find_bin_or_error(media_pool.GetRootFolder(), target_bin)
+        if error:
+            return error
         if folder:
             media_pool.SetCurrentFolder(folder)
 
     result = storage.AddItemListToMediaPool(paths)
+    media_index.invalidate()
     if result:
         count = len(result) if isinstance(result, list) else 1
         return f"Added {count} item(s) from storage to media pool."
@@ -0,0 +1,341 @@
+"""
+Per-tool latency, error and Resolve API call-count instrumentation.
+
+``ToolMetricsMiddleware`` wraps every MCP tool call in
+``metrics.invocation(name)``, which times the call and records whether it
+failed and how many bytes it returned.  The Resolve handle returned by
+``connection.get()`` is wrapped in ``counted()``: every object reached from
+it is a thin proxy that counts each scripting method call against the tool
+invocation running in the current context (threads started by the tool
+runner inherit it) and hands the call to the Resolve dispatcher thread.
+
+``metrics.snapshot()`` feeds the ``resolve://metrics`` resource.  Set
+``RESOLVE_METRICS_FILE`` to also dump the numbers every
+``RESOLVE_METRICS_DUMP_INTERVAL`` seconds and at exit (Prometheus text format
+for ``.prom``/``.txt`` files, JSON otherwise).  ``RESOLVE_METRICS=0``
+disables the middleware and call counting; the proxies stay in place while
+the dispatcher is enabled.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any
+
+from fastmcp.server.middleware import Middleware
+
+from .dispatcher import DISPATCH_ENABLED, PRIORITY_NAMES, dispatcher
+from .errors import is_failure
+from .probe_cache import probe_cache
+from .proxy_cache import proxy_cache
+
+log = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("RESOLVE_METRICS", "1").lower() not in ("0", "false", "no", "off")
+# Latency samples kept per tool for percentile estimates.
+METRICS_WINDOW = int(os.getenv("RESOLVE_METRICS_WINDOW", "2048"))
+METRICS_FILE = os.getenv("RESOLVE_METRICS_FILE", "")
+METRICS_DUMP_INTERVAL = float(os.getenv("RESOLVE_METRICS_DUMP_INTERVAL", "60"))
+
+_PRIMITIVES = (str, bytes, int, float, bool)
+
+
+def result_text(result) -> str:
+    """Flatten a ToolResult into its text content."""
+    parts = []
+    for block in getattr(result, "content", None) or []:
+        text = getattr(block, "text", None)
+        if text is not None:
+            parts.append(text)
+    return "\n".join(parts)
+
+
+class _Invocation:
+    __slots__ = ("name", "api_calls", "bytes_out", "error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.api_calls = 0
+        self.bytes_out = 0
+        self.error = False
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("resolve_mcp_invocation", default=None)
+
+
+class _ToolStats:
+    __slots__ = ("calls", "errors", "total_ms", "max_ms", "api_calls", "bytes_out", "samples")
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.api_calls = 0
+        self.bytes_out = 0
+        self.samples: deque = deque(maxlen=window)
+
+
+def _percentile(ordered: list, q: float) -> float:
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class ToolMetrics:
+    """Process-wide per-tool counters and latency windows."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._tools: dict[str, _ToolStats] = {}
+        self._api_methods: Counter = Counter()
+        self._api_unattributed = 0
+        self._started = time.time()
+        self._dumped_at = 0.0
+
+    # -- recording ------------------------------------------------------------
+
+    def count_api_call(self, method: str) -> None:
+        inv = _current.get()
+        if inv is not None:
+            inv.api_calls += 1
+        with self._lock:
+            self._api_methods[method] += 1
+            if inv is None:
+                self._api_unattributed += 1
+
+    def record(self, name: str, elapsed_ms: float, api_calls: int = 0, bytes_out: int = 0, error: bool = False) -> None:
+        with self._lock:
+            stats = self._tools.get(name)
+            if stats is None:
+                stats = self._tools[name] = _ToolStats(self.window)
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.api_calls += api_calls
+            stats.bytes_out += bytes_out
+            stats.samples.append(elapsed_ms)
+
+    @contextlib.contextmanager
+    def invocation(self, name: str):
+        """Time one tool call and attribute Resolve API calls made inside it.
+
+        Yields an object whose ``bytes_out`` and ``error`` the caller may set;
+        an exception escaping the block also counts as an error.
+        """
+        inv = _Invocation(name)
+        token = _current.set(inv)
+        t0 = time.perf_counter()
+        try:
+            yield inv
+        except BaseException:
+            inv.error = True
+            raise
+        finally:
+            _current.reset(token)
+            self.record(name, (time.perf_counter() - t0) * 1000.0, inv.api_calls, inv.bytes_out, inv.error)
+            self._maybe_dump()
+
+    # -- reporting ------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        """Return per-tool stats (latency in ms) and API method counts."""
+        with self._lock:
+            tools = {}
+            for name, s in sorted(self._tools.items()):
+                ordered = sorted(s.samples)
+                tools[name] = {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "error_rate": round(s.errors / s.calls, 4) if s.calls else 0.0,
+                    "p50_ms": round(_percentile(ordered, 0.50), 3),
+                    "p95_ms": round(_percentile(ordered, 0.95), 3),
+                    "p99_ms": round(_percentile(ordered, 0.99), 3),
+                    "max_ms": round(s.max_ms, 3),
+                    "avg_ms": round(s.total_ms / s.calls, 3) if s.calls else 0.0,
+                    "api_calls": s.api_calls,
+                    "api_calls_per_call": round(s.api_calls / s.calls, 2) if s.calls else 0.0,
+                    "bytes_out": s.bytes_out,
+                }
+            return {
+                "enabled": METRICS_ENABLED,
+                "uptime_s": round(time.time() - self._started, 1),
+                "tools": tools,
+                "api_methods": dict(self._api_methods.most_common()),
+                "api_calls_unattributed": self._api_unattributed,
+                "dispatcher": dispatcher.stats(),
+                "probe_cache": probe_cache.stats(),
+                "proxy_cache": proxy_cache.stats(),
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the snapshot in Prometheus text exposition format."""
+        snap = self.snapshot()
+        tools = snap["tools"]
+        lines = []
+        for family, kind, key in (
+            ("resolve_mcp_tool_calls_total", "counter", "calls"),
+            ("resolve_mcp_tool_errors_total", "counter", "errors"),
+            ("resolve_mcp_tool_api_calls_total", "counter", "api_calls"),
+            ("resolve_mcp_tool_bytes_out_total", "counter", "bytes_out"),
+        ):
+            lines.append(f"# TYPE {family} {kind}")
+            lines += [f'{family}{{tool="{name}"}} {s[key]}' for name, s in tools.items()]
+        lines.append("# TYPE resolve_mcp_tool_latency_ms summary")
+        for name, s in tools.items():
+            for q, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'resolve_mcp_tool_latency_ms{{tool="{name}",quantile="{q}"}} {s[key]}')
+            lines.append(f'resolve_mcp_tool_latency_ms_sum{{tool="{name}"}} {round(s["avg_ms"] * s["calls"], 3)}')
+            lines.append(f'resolve_mcp_tool_latency_ms_count{{tool="{name}"}} {s["calls"]}')
+        lines.append("# TYPE resolve_mcp_api_method_calls_total counter")
+        lines += [f'resolve_mcp_api_method_calls_total{{method="{m}"}} {n}' for m, n in snap["api_methods"].items()]
+        levels = snap["dispatcher"]["priorities"]
+        for family, kind, key in (
+            ("resolve_mcp_dispatch_calls_total", "counter", "calls"),
+            ("resolve_mcp_dispatch_queue_depth", "gauge", "queued"),
+            ("resolve_mcp_dispatch_wait_p95_ms", "gauge", "wait_p95_ms"),
+        ):
+            lines.append(f"# TYPE {family} {kind}")
+            lines += [f'{family}{{priority="{p}"}} {levels[p][key]}' for p in PRIORITY_NAMES.values()]
+        lines.append("# TYPE resolve_mcp_dispatch_preemptions_total counter")
+        lines.append(f"resolve_mcp_dispatch_preemptions_total {snap['dispatcher']['preemptions']}")
+        for result in ("hits", "misses"):
+            lines.append(f"# TYPE resolve_mcp_probe_cache_{result}_total counter")
+            lines.append(f"resolve_mcp_probe_cache_{result}_total {snap['probe_cache'][result]}")
+        for result in ("hits", "misses", "evicted"):
+            lines.append(f"# TYPE resolve_mcp_proxy_cache_{result}_total counter")
+            lines.append(f"resolve_mcp_proxy_cache_{result}_total {snap['proxy_cache'][result]}")
+        lines.append("# TYPE resolve_mcp_proxy_cache_bytes gauge")
+        lines.append(f"resolve_mcp_proxy_cache_bytes {snap['proxy_cache']['bytes']}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path) -> None:
+        """Write metrics to *path*: Prometheus text for .prom/.txt, else JSON."""
+        path = Path(path).expanduser()
+        body = self.to_prometheus() if path.suffix in (".prom", ".txt") else json.dumps(self.snapshot(), indent=2)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(body, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _maybe_dump(self) -> None:
+        if not METRICS_FILE:
+            return
+        now = time.monotonic()
+        if now - self._dumped_at < METRICS_DUMP_INTERVAL:
+            return
+        self._dumped_at = now
+        try:
+            self.dump(METRICS_FILE)
+        except OSError as exc:
+            log.warning("Could not write metrics to %s: %s", METRICS_FILE, exc)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self._api_methods.clear()
+            self._api_unattributed = 0
+            self._started = time.time()
+
+
+# Process-wide metrics registry.
+metrics = ToolMetrics()
+
+if METRICS_ENABLED and METRICS_FILE:
+    atexit.register(lambda: metrics.dump(METRICS_FILE))
+
+
+# ---------------------------------------------------------------------------
+# Resolve object proxies
+# ---------------------------------------------------------------------------
+
+
+def _unwrap(value):
+    if isinstance(value, _Counted):
+        return object.__getattribute__(value, "_obj")
+    if isinstance(value, list):
+        return [_unwrap(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    return value
+
+
+def _wrap(value) -> Any:
+    if value is None or isinstance(value, _PRIMITIVES):
+        return value
+    if isinstance(value, list):
+        return [_wrap(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_wrap(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _wrap(v) for k, v in value.items()}
+    return _Counted(value)
+
+
+class _Counted:
+    """Proxy that counts and dispatches scripting method calls and proxies returned objects."""
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj):
+        object.__setattr__(self, "_obj", obj)
+
+    def __getattr__(self, name) -> Any:
+        attr = getattr(object.__getattribute__(self, "_obj"), name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            if METRICS_ENABLED:
+                metrics.count_api_call(name)
+            args = tuple(_unwrap(a) for a in args)
+            kwargs = {k: _unwrap(v) for k, v in kwargs.items()}
+            return _wrap(dispatcher.call(attr, *args, **kwargs))
+
+        call.__name__ = name
+        return call
+
+    def __setattr__(self, name, value):
+        setattr(object.__getattribute__(self, "_obj"), name, _unwrap(value))
+
+    def __eq__(self, other):
+        return object.__getattribute__(self, "_obj") == _unwrap(other)
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self, "_obj"))
+
+    def __bool__(self):
+        return bool(object.__getattribute__(self, "_obj"))
+
+    def __repr__(self):
+        return repr(object.__getattribute__(self, "_obj"))
+
+
+def counted(handle) -> Any:
+    """Wrap a Resolve handle so calls on it (and objects it returns) are counted and dispatched."""
+    if not (METRICS_ENABLED or DISPATCH_ENABLED) or handle is None or isinstance(handle, _Counted):
+        return handle
+    return _Counted(handle)
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Records latency, errors, bytes and API calls for every MCP tool call."""
+
+    async def on_call_tool(self, context, call_next):
+        with metrics.invocation(context.message.name) as inv:
+            result = await call_next(context)
+            text = result_text(result)
+            inv.bytes_out = len(text.encode("utf-8"))
+            inv.error = is_failure(text)
+        return result
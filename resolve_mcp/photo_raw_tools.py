@@ -13,21 +13,13 @@ import os
 
 from .config import mcp, IMAGE_EXTS
 from .errors import safe_resolve_call
+from .media_index import find_clip
 from .resolve import _boilerplate
 
 
 def _find_clip(mp, clip_name: str):
-    """Walk all bins to find a clip by name."""
-    def _walk(folder):
-        for c in (folder.GetClipList() or []):
-            if c.GetName() == clip_name:
-                return c
-        for sub in (folder.GetSubFolderList() or []):
-            found = _walk(sub)
-            if found:
-                return found
-        return None
-    return _walk(mp.GetRootFolder())
+    """Find a clip by name via the shared media pool index."""
+    return find_clip(mp, clip_name)
 
 
 _RAW_SETTINGS_KEYS = [
@@ -0,0 +1,235 @@
+"""
+Persistent ffprobe cache: parsed probe results in a SQLite file.
+
+``ffprobe.probe()`` keeps results in memory for the life of the process;
+this cache keeps them across restarts, so rebuilding a timeline or
+re-ingesting a bin on network storage spawns no ffprobe for media that has
+not changed.  Each row is keyed by the resolved path and only served while
+the file's size and ``mtime_ns`` still match; a changed file is re-probed
+and its row replaced.
+
+  RESOLVE_PROBE_CACHE        database path (default
+                             ``~/.cache/resolve-mcp/probe.sqlite3``);
+                             ``0``/``off`` keeps probes in memory only
+  RESOLVE_PROBE_CACHE_DAYS   rows not used for this many days are pruned
+                             when the cache opens (default 90)
+
+Database errors never fail a probe: the cache logs a warning, disables
+itself and ffprobe runs as before.  ``stats()`` is included in
+``resolve://metrics``.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+_default_path = Path.home() / ".cache" / "resolve-mcp" / "probe.sqlite3"
+_setting = os.getenv("RESOLVE_PROBE_CACHE", str(_default_path))
+PROBE_CACHE_PATH = "" if _setting.lower() in ("", "0", "false", "no", "off") else _setting
+PROBE_CACHE_DAYS = float(os.getenv("RESOLVE_PROBE_CACHE_DAYS", "90"))
+
+# Bump when the stored JSON changes shape (3: ``fourcc``); older rows are
+# dropped on open.
+_SCHEMA_VERSION = 3
+# SQLite's default limit on bound parameters is 999.
+_BATCH = 500
+
+
+class ProbeCache:
+    """SQLite-backed map of (path, size, mtime_ns) -> probe fields.
+
+    Keys are ``(resolved path, size, mtime_ns)`` tuples as built by
+    ``ffprobe.file_key``; values are the ``ProbeResult`` fields as a dict.
+    The connection opens on first use and is shared across threads.
+    """
+
+    def __init__(self, path: str = PROBE_CACHE_PATH, max_age_days: float = PROBE_CACHE_DAYS):
+        self.path = path
+        self.max_age_days = max_age_days
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._disabled = not path
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.pruned = 0
+
+    # -- connection -----------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._db is not None or self._disabled:
+            return self._db
+        try:
+            Path(self.path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(Path(self.path).expanduser()), timeout=5.0, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS probes")
+                db.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS probes ("
+                " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+                " data TEXT NOT NULL, used_at REAL NOT NULL)"
+            )
+            db.commit()
+        except (sqlite3.Error, OSError) as exc:
+            self._fail(exc)
+            return None
+        self._db = db
+        if self.max_age_days > 0:
+            self._prune_locked(db, time.time() - self.max_age_days * 86400.0)
+        return self._db  # None if the prune failed and disabled the cache
+
+    def _fail(self, exc: Exception) -> None:
+        log.warning("Probe cache %s disabled: %s", self.path, exc)
+        self._disabled = True
+        if self._db is not None:
+            with contextlib.suppress(sqlite3.Error):
+                self._db.close()
+            self._db = None
+
+    # -- lookups --------------------------------------------------------------
+
+    def get(self, key: tuple) -> dict | None:
+        """Return the cached fields for *key*, or None if absent or stale."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys) -> dict:
+        """Look up many keys with one query per 500; returns ``{key: fields}`` for hits."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return found
+            wanted = {k[0]: k for k in keys}
+            paths = list(wanted)
+            try:
+                for i in range(0, len(paths), _BATCH):
+                    chunk = paths[i : i + _BATCH]
+                    rows = db.execute(
+                        f"SELECT path, size, mtime_ns, data FROM probes WHERE path IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    for path, size, mtime_ns, data in rows:
+                        key = wanted[path]
+                        if (size, mtime_ns) == key[1:]:
+                            found[key] = json.loads(data)
+                if found:
+                    now = time.time()
+                    db.executemany("UPDATE probes SET used_at=? WHERE path=?", [(now, k[0]) for k in found])
+                    db.commit()
+            except (sqlite3.Error, ValueError) as exc:
+                self._fail(exc)
+                return {}
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key: tuple, fields: dict) -> None:
+        self.put_many({key: fields})
+
+    def put_many(self, entries: dict) -> None:
+        """Store ``{key: fields}``, replacing any older row for the same path."""
+        if not entries:
+            return
+        now = time.time()
+        rows = [(k[0], k[1], k[2], json.dumps(v), now) for k, v in entries.items()]
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                db.executemany("INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?, ?)", rows)
+                db.commit()
+            except sqlite3.Error as exc:
+                self._fail(exc)
+                return
+            self.writes += len(rows)
+
+    # -- maintenance ----------------------------------------------------------
+
+    def prune(self, older_than_days: float | None = None, missing: bool = False) -> int:
+        """Drop rows unused for *older_than_days* and, with *missing*, rows whose file is gone or changed.
+
+        Checking *missing* stats every cached file, which is slow on network
+        storage, so it only runs when asked for.  Returns the rows removed.
+        """
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return 0
+            removed = 0
+            if older_than_days is not None:
+                removed += self._prune_locked(db, time.time() - older_than_days * 86400.0)
+            if missing and not self._disabled:
+                stale = []
+                try:
+                    for path, size, mtime_ns in db.execute("SELECT path, size, mtime_ns FROM probes"):
+                        try:
+                            st = os.stat(path)
+                        except OSError:
+                            stale.append((path,))
+                            continue
+                        if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+                            stale.append((path,))
+                    db.executemany("DELETE FROM probes WHERE path=?", stale)
+                    db.commit()
+                except sqlite3.Error as exc:
+                    self._fail(exc)
+                    return removed
+                removed += len(stale)
+                self.pruned += len(stale)
+            return removed
+
+    def _prune_locked(self, db: sqlite3.Connection, cutoff: float) -> int:
+        try:
+            removed = db.execute("DELETE FROM probes WHERE used_at < ?", (cutoff,)).rowcount
+            db.commit()
+        except sqlite3.Error as exc:
+            self._fail(exc)
+            return 0
+        self.pruned += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                db.execute("DELETE FROM probes")
+                db.commit()
+            except sqlite3.Error as exc:
+                self._fail(exc)
+
+    def stats(self) -> dict:
+        """Hit/miss/write counts, plus the row count once the database is open."""
+        with self._lock:
+            entries = None
+            if self._db is not None:
+                with contextlib.suppress(sqlite3.Error):
+                    entries = self._db.execute("SELECT COUNT(*) FROM probes").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "enabled": not self._disabled,
+                "path": self.path,
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "writes": self.writes,
+                "pruned": self.pruned,
+            }
+
+
+# Process-wide cache used by ffprobe.probe().
+probe_cache = ProbeCache()
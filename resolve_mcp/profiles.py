@@ -0,0 +1,100 @@
+"""
+Tool profiles: register only the tool groups a client needs.
+
+Every tool a server advertises is sent in ``tools/list`` and kept in the
+client's context, so a colorist session has no use for the 230-tool
+catalogue.  A profile names the groups ``__init__.py`` imports:
+
+  edit       timeline editing, inserts, clip metadata, Fusion titles
+  color      grading, nodes, versions, gallery, Dolby Vision
+  deliver    render queue/settings, presets, archives, conform helpers
+  fairlight  audio tools plus the render queue for stems
+  photo      Photo page (Resolve 21+)
+  ai         Gemini bridge tools
+  full       everything (the default)
+
+Project, timeline, clip, marker, media pool, batch tools and the
+``resolve://`` resources are loaded in every profile.  Profiles combine with
+commas (``edit,color``).  Choose one with ``RESOLVE_PROFILE`` or
+``resolve-mcp --profile``; modules outside the profile are never imported.
+
+``ToolManifestCache`` keeps the listed tools after the first ``tools/list``
+so later requests skip rebuilding the catalogue; ``main()`` fills it before
+the server starts.
+"""
+
+import argparse
+import functools
+import os
+import sys
+
+from fastmcp.server.middleware import Middleware
+
+GROUPS = ("edit", "color", "deliver", "fairlight", "photo", "ai")
+
+# Profile name -> tool groups.  Single-group profiles match the names above.
+PROFILES = {name: frozenset({name}) for name in GROUPS}
+PROFILES["full"] = frozenset(GROUPS)
+
+
+def parse_profile(value: str) -> frozenset:
+    """Return the groups for a profile spec such as ``"color"`` or ``"edit,color"``."""
+    groups = set()
+    for name in (part.strip().lower() for part in value.split(",")):
+        if not name:
+            continue
+        if name not in PROFILES:
+            raise ValueError(f"Unknown tool profile '{name}'. Choose from: {', '.join(PROFILES)}.")
+        groups |= PROFILES[name]
+    return frozenset(groups) if groups else PROFILES["full"]
+
+
+def _cli_profile(argv: list[str]) -> str | None:
+    """``--profile`` from the server's own command line, if present."""
+    # Tools register while the package imports, before main() runs, so the
+    # flag is read here.  Only the server entry points are considered; a test
+    # runner or host application importing the package keeps its own argv.
+    entry = os.path.basename(argv[0]) if argv else ""
+    if entry not in ("-m", "resolve-mcp", "resolve-mcp.exe", "__main__.py"):
+        return None
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile")
+    return parser.parse_known_args(argv[1:])[0].profile
+
+
+@functools.cache
+def active_profile() -> str:
+    """The profile this server runs with (read once, after ``.env`` is loaded)."""
+    return _cli_profile(sys.argv) or os.getenv("RESOLVE_PROFILE", "full")
+
+
+@functools.cache
+def _active_groups() -> frozenset:
+    return parse_profile(active_profile())
+
+
+def wants(*groups: str) -> bool:
+    """True if the active profile includes any of *groups*."""
+    return not _active_groups().isdisjoint(groups)
+
+
+class ToolManifestCache(Middleware):
+    """Serves ``tools/list`` from the tool list built on the first request.
+
+    Tools only register at import time, so the list never changes while the
+    server runs; ``invalidate()`` drops it if tools are added later.
+    """
+
+    def __init__(self):
+        self._tools: tuple | None = None
+
+    async def on_list_tools(self, context, call_next):
+        if self._tools is None:
+            self._tools = tuple(await call_next(context))
+        return list(self._tools)
+
+    def invalidate(self) -> None:
+        self._tools = None
+
+
+manifest_cache = ToolManifestCache()
@@ -0,0 +1,305 @@
+"""
+Content-addressed cache of Gemini upload proxies.
+
+Proxies used to be written next to their source as ``{name}.gemini.mp4``,
+which fails on read-only camera cards and leaves clutter on NAS shares.  They
+now live in one directory, named by a key derived from the source's content
+fingerprint (size, ``mtime_ns`` and a hash of its first and last MiB) and the
+encode settings, so a renamed or moved file still hits and a settings change
+re-encodes.
+
+  RESOLVE_PROXY_CACHE      cache directory (default
+                           ``~/.cache/resolve-mcp/proxies``)
+  RESOLVE_PROXY_CACHE_GB   total size cap; least recently used proxies are
+                           evicted past it (default 50)
+
+``index.json`` records each proxy's size, source and last use, so a lookup
+is a dict access plus one ``stat()`` instead of an ffprobe integrity check.
+Several server processes may share the directory: every write re-reads the
+index under a file lock and applies its change to that, so no process
+overwrites entries another one added.
+Proxies are written to a temp file and renamed in, so a crashed transcode
+never leaves a partial proxy behind a valid key.  A proxy still waiting to be
+uploaded is pinned (``pin()``/``unpin()``) and never evicted, however old.
+``stats()`` is included in ``resolve://metrics``.
+"""
+
+import contextlib
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: index updates are serialised per process only
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+PROXY_CACHE_DIR = os.getenv("RESOLVE_PROXY_CACHE", str(Path.home() / ".cache" / "resolve-mcp" / "proxies"))
+PROXY_CACHE_GB = float(os.getenv("RESOLVE_PROXY_CACHE_GB", "50"))
+
+# Bytes hashed from each end of the source for its fingerprint.
+_SAMPLE = 1024 * 1024
+_INDEX = "index.json"
+
+
+@functools.lru_cache(maxsize=4096)
+def _fingerprint(path: str, size: int, mtime_ns: int) -> str:
+    h = hashlib.blake2b(f"{size}:{mtime_ns}".encode(), digest_size=16)
+    with open(path, "rb") as fh:
+        h.update(fh.read(_SAMPLE))
+        if size > 2 * _SAMPLE:
+            fh.seek(-_SAMPLE, os.SEEK_END)
+            h.update(fh.read(_SAMPLE))
+    return h.hexdigest()
+
+
+def fingerprint(path: Path) -> str:
+    """Content fingerprint of *path*: size, mtime and a head/tail hash (memoized per size/mtime)."""
+    st = os.stat(path)
+    return _fingerprint(str(Path(path).resolve()), st.st_size, st.st_mtime_ns)
+
+
+class ProxyCache:
+    """Size-capped LRU directory of proxies keyed by source fingerprint + encode settings.
+
+    ``key()`` builds the key, ``get()`` returns a cached proxy,
+    ``partial_path()`` names the temp file to encode into and ``put()``
+    renames it into place and evicts down to the cap, skipping pinned keys.
+    """
+
+    def __init__(self, directory: str = PROXY_CACHE_DIR, max_gb: float = PROXY_CACHE_GB):
+        self.directory = Path(directory).expanduser()
+        self.max_bytes = int(max_gb * 1024**3)
+        self._lock = threading.Lock()
+        self._index: dict = {}
+        # st_mtime_ns of index.json when last read (None: no file yet, -1: never read).
+        self._index_mtime: int | None = -1
+        # key -> number of holders; pinned proxies are never evicted.
+        self._pins: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evicted = 0
+
+    # -- index ----------------------------------------------------------------
+
+    def _index_stamp(self) -> int | None:
+        try:
+            return (self.directory / _INDEX).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self, force: bool = False) -> dict:
+        """The index, re-read if another process has rewritten it since."""
+        stamp = self._index_stamp()
+        if force or stamp != self._index_mtime:
+            try:
+                index = json.loads((self.directory / _INDEX).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                index = {}
+            self._index = index if isinstance(index, dict) else {}
+            self._index_mtime = stamp
+        return self._index
+
+    def _save(self, index: dict) -> None:
+        tmp = self.directory / f".{_INDEX}.{os.getpid()}.tmp"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(index), encoding="utf-8")
+            os.replace(tmp, self.directory / _INDEX)
+            self._index_mtime = self._index_stamp()
+        except OSError as exc:
+            log.warning("Could not write proxy cache index %s: %s", self.directory, exc)
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / f".{_INDEX}.lock", "a") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            yield  # closing the file releases the lock
+
+    def _update(self, change) -> None:
+        """Apply *change* (a function of the index dict) to a fresh read of
+        ``index.json`` under the file lock, then write it back.  Call with
+        ``self._lock`` held."""
+        try:
+            with self._file_lock():
+                index = self._load(force=True)
+                change(index)
+                self._save(index)
+                return
+        except OSError as exc:
+            log.warning("Could not lock proxy cache index %s: %s", self.directory, exc)
+        change(self._load())
+
+    # -- lookups --------------------------------------------------------------
+
+    def key(self, source: Path, settings: str) -> str:
+        """Cache key for *source* encoded with *settings* (any string naming the encode)."""
+        return hashlib.blake2b(f"{fingerprint(source)}|{settings}".encode(), digest_size=20).hexdigest()
+
+    def path_for(self, key: str, part: int | None = None) -> Path:
+        return self.directory / (f"{key}.mp4" if part is None else f"{key}.{part:02d}.mp4")
+
+    def _paths(self, key: str, entry: dict) -> list[Path]:
+        parts = entry.get("parts", 1)
+        return [self.path_for(key)] if parts == 1 else [self.path_for(key, i) for i in range(parts)]
+
+    def partial_path(self, key: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / f".{key}.part.mp4"
+
+    def get(self, key: str) -> Path | None:
+        """Return the cached proxy for *key*, or None if absent or damaged."""
+        paths = self.get_parts(key)
+        return paths[0] if paths else None
+
+    def get_parts(self, key: str) -> list[Path] | None:
+        """Every file of the cached proxy for *key* (several for a split upload), or None."""
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is not None:
+                paths = self._paths(key, entry)
+                try:
+                    intact = sum(p.stat().st_size for p in paths) == entry["size"]
+                except OSError:
+                    intact = False
+                if intact:
+                    now = time.time()
+
+                    def touch(index):
+                        if key in index:
+                            index[key]["used_at"] = now
+
+                    self._update(touch)
+                    self.hits += 1
+                    return paths
+                for path in paths:
+                    path.unlink(missing_ok=True)
+                self._update(lambda index: index.pop(key, None))
+            self.misses += 1
+            return None
+
+    def find_parts(self, source: Path) -> list[Path] | None:
+        """Every file of the most recently used proxy of *source* under any encode settings.
+
+        A split proxy comes back as all of its parts, in order: its source is
+        too large to upload whole, so the caller must upload each part.
+        """
+        try:
+            fp = fingerprint(source)
+        except OSError:
+            return None
+        with self._lock:
+            matches = [(e["used_at"], k) for k, e in self._load().items() if e.get("fingerprint") == fp]
+        for _, key in sorted(matches, reverse=True):
+            if (paths := self.get_parts(key)) is not None:
+                return paths
+        return None
+
+    # -- pins -----------------------------------------------------------------
+
+    def pin(self, key: str) -> None:
+        """Keep the proxy for *key* (present or still to be written) from eviction.
+
+        Pins are counted: each ``pin()`` needs its own ``unpin()``.
+        """
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, key: str) -> None:
+        with self._lock:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+            else:
+                self._pins.pop(key, None)
+
+    # -- writes ---------------------------------------------------------------
+
+    def put(self, key: str, partial: Path, source: Path) -> Path:
+        """Rename the finished *partial* into the cache as *key* and evict past the size cap."""
+        return self.put_parts(key, [partial], source)[0]
+
+    def put_parts(self, key: str, partials: list[Path], source: Path) -> list[Path]:
+        """Like ``put()`` for a proxy split into several files, kept and evicted together."""
+        entry = {"parts": len(partials)} if len(partials) > 1 else {}
+        paths = self._paths(key, entry)
+        for partial, path in zip(partials, paths, strict=True):
+            os.replace(partial, path)
+        record = {
+            **entry,
+            "size": sum(p.stat().st_size for p in paths),
+            "source": str(source),
+            "fingerprint": fingerprint(source),
+            "used_at": time.time(),
+        }
+
+        def add(index):
+            index[key] = record
+            self._evict_locked(index, keep=key)
+
+        with self._lock:
+            self._update(add)
+            self.writes += 1
+        return paths
+
+    def _evict_locked(self, index: dict, keep: str | None = None) -> int:
+        total = sum(e["size"] for e in index.values())
+        removed = 0
+        for key, entry in sorted(index.items(), key=lambda kv: kv[1]["used_at"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep or key in self._pins:
+                continue
+            for path in self._paths(key, entry):
+                with contextlib.suppress(OSError):
+                    path.unlink(missing_ok=True)
+            total -= entry["size"]
+            del index[key]
+            removed += 1
+        if removed:
+            log.info("Evicted %d proxies from %s", removed, self.directory)
+        self.evicted += removed
+        return removed
+
+    def clear(self) -> None:
+        def drop_all(index):
+            for key, entry in index.items():
+                for path in self._paths(key, entry):
+                    with contextlib.suppress(OSError):
+                        path.unlink(missing_ok=True)
+            index.clear()
+
+        with self._lock:
+            self._update(drop_all)
+
+    def stats(self) -> dict:
+        """Hit/miss/write/eviction counts and current size against the cap."""
+        with self._lock:
+            index = self._load()
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.directory),
+                "entries": len(index),
+                "bytes": sum(e["size"] for e in index.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "writes": self.writes,
+                "evicted": self.evicted,
+                "pinned": len(self._pins),
+            }
+
+
+# Process-wide cache used by transcode.py and media.find_proxy_parts().
+proxy_cache = ProxyCache()
@@ -3,11 +3,12 @@ DaVinci Resolve scripting API connection and media pool helpers.
 """
 
 import logging
-import os
-import sys
 import time
 from pathlib import Path
-from typing import Optional
+
+from .connection import _resolve_module_path, connection  # noqa: F401 — _resolve_module_path re-exported
+from .errors import BinAmbiguous
+from .media_index import bin_tree
 
 log = logging.getLogger(__name__)
 
@@ -20,45 +21,22 @@ _FPS_MAP: dict[float, str] = {
 }
 
 
-def _resolve_module_path() -> Optional[str]:
-    """Return the Resolve scripting modules directory for the current platform."""
-    override = os.getenv("RESOLVE_SCRIPT_API")
-    if override and os.path.isdir(override):
-        return override
-
-    platform_paths = {
-        "darwin": "/Library/Application Support/Blackmagic Design/"
-                  "DaVinci Resolve/Developer/Scripting/Modules/",
-        "win32": os.path.expandvars(
-            r"%PROGRAMDATA%\Blackmagic Design\DaVinci Resolve"
-            r"\Support\Developer\Scripting\Modules\\"
-        ),
-        "linux": "/opt/resolve/Developer/Scripting/Modules/",
-    }
-    path = platform_paths.get(sys.platform, platform_paths["linux"])
-    return path if os.path.isdir(path) else None
-
-
 def get_resolve():
-    """Connect to the running DaVinci Resolve instance.  Returns None on failure."""
-    mod_path = _resolve_module_path()
-    if mod_path is None:
-        return None
-    if mod_path not in sys.path:
-        sys.path.insert(0, mod_path)
-    try:
-        import DaVinciResolveScript as dvr_script  # type: ignore
-        return dvr_script.scriptapp("Resolve")
-    except (ImportError, AttributeError):
-        return None
+    """Return the live DaVinci Resolve handle.  Returns None on failure.
+
+    The handle is cached by :data:`connection.connection` and only re-opened
+    when a periodic version ping shows it has gone stale.
+    """
+    return connection.get()
 
 
 def _boilerplate():
     """Return (resolve, project, media_pool) or raise ValueError with message."""
-    resolve = get_resolve()
+    resolve = connection.get()
     if not resolve:
         raise ValueError("Error: DaVinci Resolve is not running.")
-    project = resolve.GetProjectManager().GetCurrentProject()
+    pm = connection.project_manager(resolve)
+    project = pm.GetCurrentProject() if pm else None
     if not project:
         raise ValueError("Error: No project open in Resolve.")
     media_pool = project.GetMediaPool()
@@ -124,30 +102,23 @@ def _collect_clips_recursive(folder) -> dict:
 def _find_bin(root_folder, bin_path: str):
     """Locate a media pool folder by name or ``/``-separated path.
 
-    Returns the folder object or ``None`` if not found.
+    Returns the folder object or ``None`` if not found.  Raises
+    ``BinAmbiguous`` when a bare name matches more than one bin.
+    Served from the cached ``bin_tree`` (see ``media_index``).
+    """
+    return bin_tree.find(root_folder, bin_path)
+
+
+def _find_bin_or_error(root_folder, bin_path: str) -> tuple:
+    """``_find_bin`` for tools that report errors as text.
+
+    Returns ``(folder, None)`` (folder is None if not found), or
+    ``(None, "Error: ...")`` when a bare name matches more than one bin.
     """
-    if "/" in bin_path:
-        current = root_folder
-        for seg in (s for s in bin_path.split("/") if s):
-            found = next(
-                (sub for sub in (current.GetSubFolderList() or []) if sub.GetName() == seg),
-                None,
-            )
-            if found is None:
-                return None
-            current = found
-        return current
-
-    def _search(folder):
-        if folder.GetName() == bin_path:
-            return folder
-        for sub in (folder.GetSubFolderList() or []):
-            result = _search(sub)
-            if result is not None:
-                return result
-        return None
-
-    return _search(root_folder)
+    try:
+        return _find_bin(root_folder, bin_path), None
+    except BinAmbiguous as exc:
+        return None, f"Error: {exc}"
 
 
 def _enumerate_bins(folder, prefix: str = "") -> list:
@@ -10,11 +10,12 @@ can adapt.  Both paths coexist; use whichever fits the task.
 """
 
 import json
-import threading
 from pathlib import Path
 
 from .build_worker import _active_build_workers
 from .config import client, log, mcp
+from .dispatcher import start_background
+from .errors import BinAmbiguous
 from .gemini_agent import run_agent_loop
 from .media import load_sidecars
 from .resolve import _boilerplate
@@ -143,7 +144,10 @@ def _resolve_root(bin_name_or_folder: str) -> Path | None:
     except ValueError:
         return None
 
-    target, dirs = _dirs_from_bin(media_pool, bin_name_or_folder)
+    try:
+        target, dirs = _dirs_from_bin(media_pool, bin_name_or_folder)
+    except BinAmbiguous:
+        return None
     if not target or not dirs:
         return None
 
@@ -197,12 +201,7 @@ def resolve_agent_edit(bin_name_or_folder: str, instruction: str, num_edits: int
     if key in _active_build_workers and _active_build_workers[key].is_alive():
         return "Agent session already running for this target."
 
-    t = threading.Thread(
-        target=_agent_worker,
-        args=(root, sidecars, instruction, num_edits),
-        daemon=True,
-    )
-    t.start()
+    t = start_background(_agent_worker, root, sidecars, instruction, num_edits)
     _active_build_workers[key] = t
 
     return (
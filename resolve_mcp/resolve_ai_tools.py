@@ -4,12 +4,13 @@ Resolve AI tools: marker placement, timeline critique, video critique, and marke
 
 import json
 import time
-import threading
 from pathlib import Path
 
 from .config import MODEL, VIDEO_EXTS, client, log, mcp
+from .dispatcher import start_background
 from .retry import retry_gemini
-from .resolve import _boilerplate, _collect_clips_recursive
+from .media_index import media_index
+from .resolve import _boilerplate
 from .resolve_build import build_timeline_direct, read_timeline_markers, markers_to_slots
 from .media import load_sidecars
 from .prompts import TIMELINE_CRITIQUE_PROMPT_TEMPLATE, MARKER_EDIT_PROMPT_TEMPLATE
@@ -163,7 +164,7 @@ def resolve_analyze_timeline() -> str:
         except Exception as exc:
             result_holder["error"] = str(exc)
 
-    threading.Thread(target=_bg, daemon=True).start()
+    start_background(_bg)
     return (
         f"Critique running in background for '{tl_name}' ({len(clip_info)} clips). "
         "Re-call resolve_analyze_timeline() to retrieve the result."
@@ -206,30 +207,30 @@ def resolve_critique_video(video_path: str) -> str:
     if path.suffix.lower() not in VIDEO_EXTS:
         return f"Error: Not a video file: {path.suffix}"
 
-    # Prepare for Gemini (NVENC transcode if needed, otherwise pass through)
+    # Prepare for Gemini (NVENC transcode if needed, otherwise pass through).
+    # The proxy is pinned in the cache until the upload has finished.
     try:
-        upload_path = prepare_for_gemini(path)
+        with prepare_for_gemini(path) as upload_path:
+            log.info("Uploading %s (%.0f MB) to Gemini...", upload_path.name, upload_path.stat().st_size / 1e6)
+            try:
+                # Upload: no retries — large file uploads shouldn't retry with backoff
+                ref = client.files.upload(file=str(upload_path))
+                log.info("Upload complete, state=%s — waiting for processing...", ref.state.name)
+                polls = 0
+                while ref.state.name == "PROCESSING":
+                    time.sleep(2)
+                    ref = client.files.get(name=ref.name)
+                    polls += 1
+                    if polls > 60:  # 2 min max wait for processing
+                        return "Error: Gemini processing timed out after 2 minutes."
+                if ref.state.name != "ACTIVE":
+                    return f"Error: Upload ended in state {ref.state.name}"
+                log.info("File ACTIVE — requesting critique...")
+            except Exception as exc:
+                return f"Upload error: {exc}"
     except RuntimeError as exc:
         return f"Transcode error: {exc}"
 
-    log.info("Uploading %s (%.0f MB) to Gemini...", upload_path.name, upload_path.stat().st_size / 1e6)
-    try:
-        # Upload: no retries — large file uploads shouldn't retry with backoff
-        ref = client.files.upload(file=str(upload_path))
-        log.info("Upload complete, state=%s — waiting for processing...", ref.state.name)
-        polls = 0
-        while ref.state.name == "PROCESSING":
-            time.sleep(2)
-            ref = client.files.get(name=ref.name)
-            polls += 1
-            if polls > 60:  # 2 min max wait for processing
-                return "Error: Gemini processing timed out after 2 minutes."
-        if ref.state.name != "ACTIVE":
-            return f"Error: Upload ended in state {ref.state.name}"
-        log.info("File ACTIVE — requesting critique...")
-    except Exception as exc:
-        return f"Upload error: {exc}"
-
     prompt = VIDEO_CRITIQUE_PROMPT.format(video_name=path.name)
     try:
         # Critique: use retry (API calls are cheap to retry, unlike uploads)
@@ -292,15 +293,7 @@ def resolve_build_from_markers(instruction: str, footage_folder: str = "") -> st
             return f"Error: footage_folder '{footage_folder}' is not a valid directory."
         sidecars = load_sidecars(root)
     else:
-        pool_clips = _collect_clips_recursive(media_pool.GetRootFolder())
-        dirs: set[Path] = set()
-        for clip in pool_clips.values():
-            try:
-                fp = clip.GetClipProperty("File Path")
-                if fp:
-                    dirs.add(Path(fp).parent)
-            except Exception:
-                continue
+        dirs = {Path(fp).parent for fp in media_index.file_paths(media_pool)}
         sidecars = []
         for d in dirs:
             sidecars.extend(load_sidecars(d))
@@ -5,9 +5,10 @@ Timeline building: AppendToTimeline pipeline, marker utilities, XML import fallb
 import time
 from pathlib import Path
 
-from .resolve import (
-    get_resolve, _collect_clips_recursive, _unique_timeline_name, _FPS_MAP,
-)
+from .item_cache import item_cache
+from .marker_io import marker_records
+from .media_index import find_clip, media_index
+from .resolve import get_resolve, _unique_timeline_name, _FPS_MAP
 from .resolve_transforms import _apply_clip_transform, _apply_speed_ramp
 
 
@@ -27,7 +28,9 @@ def build_timeline_direct(edit_plan: dict, resolve_obj) -> tuple:
     if not cuts:
         return (False, "Edit plan has no cuts.")
 
-    pool_clips = _collect_clips_recursive(media_pool.GetRootFolder())
+    # Clips imported during this build, keyed like the index, so repeated
+    # sources skip the post-import refresh.
+    pool_clips: dict = {}
 
     timeline_fps: float = 59.94
     try:
@@ -55,10 +58,11 @@ def build_timeline_direct(edit_plan: dict, resolve_obj) -> tuple:
 
     for cut in cuts:
         src = Path(cut["source_file"])
-        clip = pool_clips.get(src.stem) or pool_clips.get(src.name)
+        clip = pool_clips.get(src.stem) or pool_clips.get(src.name) or find_clip(media_pool, str(src))
 
         if not clip:
             imported = media_pool.ImportMedia([str(src)])
+            media_index.register(media_pool, imported or [])
             if imported:
                 clip = imported[0]
                 pool_clips[src.stem] = clip
@@ -93,6 +97,7 @@ def build_timeline_direct(edit_plan: dict, resolve_obj) -> tuple:
         clip_items, clip_cuts = [p[0] for p in paired], [p[1] for p in paired]
 
     appended = media_pool.AppendToTimeline(clip_items) if clip_items else []
+    item_cache.bump()
 
     if appended:
         for i, item in enumerate(appended):
@@ -107,9 +112,10 @@ def build_timeline_direct(edit_plan: dict, resolve_obj) -> tuple:
     audio_info = edit_plan.get("audio_track")
     if audio_info and audio_info.get("source_file"):
         a_path = Path(audio_info["source_file"])
-        a_clip = pool_clips.get(a_path.stem) or pool_clips.get(a_path.name)
+        a_clip = pool_clips.get(a_path.stem) or pool_clips.get(a_path.name) or find_clip(media_pool, str(a_path))
         if not a_clip:
             imported = media_pool.ImportMedia([str(a_path)])
+            media_index.register(media_pool, imported or [])
             if imported:
                 a_clip = imported[0]
         if a_clip:
@@ -122,6 +128,7 @@ def build_timeline_direct(edit_plan: dict, resolve_obj) -> tuple:
                     "endFrame": round(a_end * timeline_fps),
                     "mediaType": 2,
                 }])
+                item_cache.bump()
 
     n_appended = len(appended) if appended else 0
     msg = f"Timeline '{name}' created with {n_appended}/{len(clip_items)} video clips."
@@ -140,17 +147,10 @@ def read_timeline_markers(timeline) -> list:
     except Exception:
         fps = 24.0
 
-    raw = timeline.GetMarkers() or {}
-    markers = []
-    for frame_id, info in sorted(raw.items(), key=lambda x: int(x[0])):
-        markers.append({
-            "frame": int(frame_id),
-            "sec": int(frame_id) / fps,
-            "color": info.get("color", "Blue"),
-            "name": info.get("name", ""),
-            "note": info.get("note", ""),
-        })
-    return markers
+    return [
+        {k: rec[k] for k in ("frame", "sec", "color", "name", "note")}
+        for rec in marker_records(timeline.GetMarkers() or {}, fps)
+    ]
 
 
 def markers_to_slots(markers: list) -> list:
@@ -223,6 +223,7 @@ def try_resolve_import(xml_path: Path, edit_plan: dict) -> str:
     media_msgs: list[str] = []
     if source_files:
         imported = media_pool.ImportMedia(sorted(source_files))
+        media_index.register(media_pool, imported or [])
         media_msgs.append(f"{len(imported)} media imported" if imported else "media import returned falsy")
 
     result = media_pool.ImportTimelineFromFile(str(xml_path))
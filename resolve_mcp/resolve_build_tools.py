@@ -3,12 +3,13 @@ Resolve build tools: Gemini edit → AppendToTimeline pipeline.
 """
 
 import json
-import threading
 from pathlib import Path
 
 from .config import MODEL, client, log, mcp
+from .dispatcher import start_background
+from .errors import BinAmbiguous
 from .retry import retry_gemini
-from .resolve import _boilerplate, _find_bin
+from .resolve import _boilerplate, _find_bin_or_error
 from .resolve_build import build_timeline_direct
 from .resolve_ingest_tools import _dirs_from_bin
 from .ingest import _ingest_worker, _active_workers
@@ -118,8 +119,7 @@ def resolve_build_timeline(bin_name_or_folder: str, instruction: str) -> str:
         if key in _active_workers and _active_workers[key].is_alive():
             prog = json.loads(progress_file.read_text()) if progress_file.exists() else {}
             return f"Build already running: {prog.get('status','?')} — {prog.get('detail','?')}"
-        t = threading.Thread(target=_resolve_build_worker, args=(root, sidecars, instruction), daemon=True)
-        t.start()
+        t = start_background(_resolve_build_worker, root, sidecars, instruction)
         _active_workers[key] = t
         return (
             f"Build started for folder '{root}' ({len(sidecars)} sidecars). "
@@ -131,7 +131,9 @@ def resolve_build_timeline(bin_name_or_folder: str, instruction: str) -> str:
     except ValueError as e:
         return str(e)
 
-    target = _find_bin(media_pool.GetRootFolder(), bin_name_or_folder)
+    target, error = _find_bin_or_error(media_pool.GetRootFolder(), bin_name_or_folder)
+    if error:
+        return error
     if target is None:
         return f"Error: bin '{bin_name_or_folder}' not found in media pool."
 
@@ -165,8 +167,7 @@ def resolve_build_timeline(bin_name_or_folder: str, instruction: str) -> str:
         prog = json.loads(progress_file.read_text()) if progress_file.exists() else {}
         return f"Build already running: {prog.get('status','?')} — {prog.get('detail','?')}"
 
-    t = threading.Thread(target=_resolve_build_worker, args=(root, sidecars, instruction), daemon=True)
-    t.start()
+    t = start_background(_resolve_build_worker, root, sidecars, instruction)
     _active_workers[key] = t
     return (
         f"Build started for bin '{bin_name_or_folder}' ({len(sidecars)} sidecars in '{root}'). "
@@ -186,7 +187,9 @@ def resolve_build_status(bin_name_or_folder: str) -> str:
     else:
         try:
             resolve, project, media_pool = _boilerplate()
-            target = _find_bin(media_pool.GetRootFolder(), bin_name_or_folder)
+            target, error = _find_bin_or_error(media_pool.GetRootFolder(), bin_name_or_folder)
+            if error:
+                return error
             if target:
                 for clip in (target.GetClipList() or []):
                     try:
@@ -237,7 +240,10 @@ def resolve_edit_bin(bin_name: str, instruction: str) -> str:
     except ValueError as e:
         return str(e)
 
-    target, dirs = _dirs_from_bin(media_pool, bin_name)
+    try:
+        target, dirs = _dirs_from_bin(media_pool, bin_name)
+    except BinAmbiguous as exc:
+        return f"Error: {exc}"
     if target is None:
         return f"Error: bin '{bin_name}' not found in the media pool."
     if not dirs:
@@ -288,8 +294,7 @@ def resolve_edit_bin(bin_name: str, instruction: str) -> str:
             return
         _resolve_build_worker(root, sidecars, instruction)
 
-    t = threading.Thread(target=_pipeline, daemon=True)
-    t.start()
+    t = start_background(_pipeline)
     _active_workers[key] = t
 
     return (
@@ -2,10 +2,11 @@
 Resolve ingest tools: scan bins for clip paths and launch ingest workers.
 """
 
-import threading
 from pathlib import Path
 
 from .config import mcp
+from .dispatcher import start_background
+from .errors import BinAmbiguous
 from .resolve import _boilerplate, _find_bin
 from .ingest import _ingest_worker, _active_workers
 
@@ -14,7 +15,8 @@ def _dirs_from_bin(media_pool, bin_name: str) -> tuple:
     """Return ``(bin_obj, {str_path: Path})`` for all clips in *bin_name*.
 
     Reads ``File Path`` properties directly from Resolve — no disk scanning.
-    Returns ``(None, {})`` if the bin isn't found or is empty.
+    Returns ``(None, {})`` if the bin isn't found or is empty.  Raises
+    ``BinAmbiguous`` when a bare name matches more than one bin.
     """
     target = _find_bin(media_pool.GetRootFolder(), bin_name)
     if target is None:
@@ -46,7 +48,10 @@ def resolve_ingest_bin(bin_name: str) -> str:
     except ValueError as e:
         return str(e)
 
-    target, dirs = _dirs_from_bin(media_pool, bin_name)
+    try:
+        target, dirs = _dirs_from_bin(media_pool, bin_name)
+    except BinAmbiguous as exc:
+        return f"Error: {exc}"
     if target is None:
         return f"Error: bin '{bin_name}' not found in the media pool."
     if not dirs:
@@ -61,8 +66,7 @@ def resolve_ingest_bin(bin_name: str) -> str:
         if key in _active_workers and _active_workers[key].is_alive():
             started.append(f"Already running: {dir_str}")
             continue
-        t = threading.Thread(target=_ingest_worker, args=(dir_path,), daemon=True)
-        t.start()
+        t = start_background(_ingest_worker, dir_path)
         _active_workers[key] = t
         started.append(dir_str)
 
@@ -10,12 +10,19 @@ Registered resources:
   resolve://bins        — full media pool bin tree with clip counts
   resolve://render-queue — render job list with statuses
   resolve://version     — Resolve version and edition (Free vs Studio)
+  resolve://connection  — scripting connection counters and ping latency
+  resolve://metrics     — per-tool latency percentiles, error rates, API calls, dispatcher queue
+  resolve://timeline/{name}/snapshot — full timeline snapshot (tracks, items, markers)
 """
 
 import json
 
 from .config import mcp
+from .connection import connection
+from .dispatcher import dispatcher
+from .metrics import metrics
 from .resolve import get_resolve, _boilerplate, _enumerate_bins, is_studio
+from .snapshot import snapshot_cache
 
 
 @mcp.resource("resolve://version")
@@ -36,6 +43,18 @@ def resource_version() -> str:
     }, indent=2)
 
 
+@mcp.resource("resolve://connection")
+def resource_connection() -> str:
+    """Scripting connection health: connects, reconnects, ping latency."""
+    return json.dumps(connection.stats(), indent=2)
+
+
+@mcp.resource("resolve://metrics")
+def resource_metrics() -> str:
+    """Per-tool call counts, p50/p95/p99 latency, error rate, bytes and Resolve API calls."""
+    return json.dumps(metrics.snapshot(), indent=2)
+
+
 @mcp.resource("resolve://project")
 def resource_project() -> str:
     """Current project name, key settings, and timeline count."""
@@ -94,6 +113,21 @@ def resource_timelines() -> str:
     return json.dumps(timelines, indent=2)
 
 
+@mcp.resource("resolve://timeline/{name}/snapshot")
+def resource_timeline_snapshot(name: str) -> str:
+    """Full snapshot of one timeline: tracks, items, properties, markers, content hash."""
+    try:
+        _, project, _ = _boilerplate()
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)})
+    for i in range(1, (project.GetTimelineCount() or 0) + 1):
+        tl = project.GetTimelineByIndex(i)
+        if tl and tl.GetName() == name:
+            snap = snapshot_cache.take(tl)
+            return json.dumps(snap.to_dict(), separators=(",", ":"), default=str)
+    return json.dumps({"error": f"Timeline '{name}' not found."})
+
+
 @mcp.resource("resolve://bins")
 def resource_bins() -> str:
     """Full media pool bin tree with clip counts per bin."""
@@ -102,7 +136,7 @@ def resource_bins() -> str:
     except ValueError as exc:
         return json.dumps({"error": str(exc)})
     root = mp.GetRootFolder()
-    bins = _enumerate_bins(root)
+    bins = dispatcher.call(_enumerate_bins, root)
     return json.dumps(bins, indent=2)
 
 
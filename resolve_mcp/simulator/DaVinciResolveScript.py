@@ -0,0 +1,12 @@
+"""
+Drop-in ``DaVinciResolveScript`` backed by the in-memory simulator.
+
+Loaded when ``RESOLVE_SCRIPT_API`` points at this directory.
+"""
+
+from resolve_mcp.simulator import instance
+
+
+def scriptapp(app: str):
+    """Return the simulated Resolve for ``"Resolve"``; None for anything else."""
+    return instance() if app == "Resolve" else None
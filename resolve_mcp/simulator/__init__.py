@@ -0,0 +1,74 @@
+"""
+In-memory DaVinci Resolve simulator.
+
+Point ``RESOLVE_SCRIPT_API`` at this directory (``SCRIPT_API_DIR``) and the
+server's ``import DaVinciResolveScript`` loads the shim next to this file,
+whose ``scriptapp("Resolve")`` returns a simulated Resolve.  The default
+instance is generated from ``RESOLVE_SIM_*`` environment variables (bins,
+clips, timelines, items, tracks, markers, seed); tests and benchmarks can
+install their own with ``install(generate_project(...))``.
+
+Per-call latency comes from ``RESOLVE_SIM_LATENCY_MS`` /
+``RESOLVE_SIM_JITTER_MS`` or ``sim.latency_ms``; ``sim.calls`` counts every
+scripting call by ``Class.Method``.
+"""
+
+from pathlib import Path
+
+from .generate import from_env, generate_project
+from .model import (
+    Folder,
+    Gallery,
+    GalleryStillAlbum,
+    Graph,
+    MediaPool,
+    MediaPoolItem,
+    MediaStorage,
+    Project,
+    ProjectManager,
+    Resolve,
+    Timeline,
+    TimelineItem,
+    sim,
+)
+
+SCRIPT_API_DIR = str(Path(__file__).parent)
+
+_instance: Resolve | None = None
+
+
+def install(resolve: Resolve | None) -> Resolve | None:
+    """Make *resolve* the instance returned by ``scriptapp("Resolve")``."""
+    global _instance
+    _instance = resolve
+    return resolve
+
+
+def instance() -> Resolve:
+    """Return the installed simulator, generating one from the environment if needed."""
+    global _instance
+    if _instance is None:
+        _instance = from_env()
+    return _instance
+
+
+__all__ = [
+    "SCRIPT_API_DIR",
+    "install",
+    "instance",
+    "generate_project",
+    "from_env",
+    "sim",
+    "Resolve",
+    "ProjectManager",
+    "Project",
+    "MediaPool",
+    "Folder",
+    "MediaPoolItem",
+    "Timeline",
+    "TimelineItem",
+    "Graph",
+    "Gallery",
+    "GalleryStillAlbum",
+    "MediaStorage",
+]
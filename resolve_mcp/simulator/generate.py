@@ -0,0 +1,107 @@
+"""Synthetic project generators for the Resolve simulator."""
+
+import os
+import random
+
+from .model import MediaPoolItem, Resolve
+
+_EXTS = (".mov", ".mp4", ".mxf", ".braw")
+
+
+def generate_project(
+    resolve: Resolve | None = None,
+    name: str = "Sim Project",
+    bins: int = 10,
+    clips: int = 100,
+    timelines: int = 1,
+    items: int = 50,
+    video_tracks: int = 1,
+    audio_tracks: int = 1,
+    markers: int = 0,
+    depth: int = 2,
+    seed: int = 0,
+) -> Resolve:
+    """Build (or add to) a simulated Resolve with one populated project.
+
+    *bins* folders are nested up to *depth* levels under the root, *clips*
+    media pool clips are spread across them round-robin, and each of the
+    *timelines* gets *items* clips split across *video_tracks* (mirrored onto
+    *audio_tracks*) plus *markers* timeline markers.  The same *seed* always
+    produces the same project.
+    """
+    rng = random.Random(seed)
+    resolve = resolve or Resolve()
+    pm = resolve.GetProjectManager()
+    project = pm.CreateProject(name) or pm.LoadProject(name)
+    assert project is not None
+    mp = project.GetMediaPool()
+    root = mp.GetRootFolder()
+
+    levels = [[root]]
+    folders = []
+    for n in range(1, bins + 1):
+        level = rng.randrange(1, depth + 1) if depth > 1 else 1
+        level = min(level, len(levels))
+        parent = rng.choice(levels[level - 1])
+        folder = mp.AddSubFolder(parent, f"Bin {n:03d}")
+        if len(levels) <= level:
+            levels.append([])
+        levels[level].append(folder)
+        folders.append(folder)
+    targets = folders or [root]
+
+    pool = []
+    for n in range(clips):
+        folder = targets[n % len(targets)]
+        path = f"/sim/media/{folder.GetName()}/A{n // 1000:03d}_C{n:05d}{_EXTS[n % len(_EXTS)]}"
+        clip = MediaPoolItem(path, frames=rng.randrange(240, 4800))
+        folder._clips.append(clip)
+        pool.append(clip)
+
+    for t in range(1, timelines + 1):
+        tl = mp.CreateEmptyTimeline(f"Timeline {t}")
+        for _ in range(1, video_tracks):
+            tl.AddTrack("video")
+        for _ in range(1, audio_tracks):
+            tl.AddTrack("audio")
+        if not pool:
+            continue
+        per_track = max(1, items // max(1, video_tracks))
+        for n in range(items):
+            clip = pool[(n * 7 + t) % len(pool)]
+            track = min(video_tracks, n // per_track + 1)
+            length = clip._frames()
+            src_in = rng.randrange(0, max(1, length // 2))
+            src_out = min(length, src_in + rng.randrange(24, 240))
+            tl._add_item("video", track, clip, src_in, src_out)
+            if track <= audio_tracks:
+                tl._add_item("audio", track, clip, src_in, src_out)
+        end = tl.GetEndFrame() - tl.GetStartFrame()
+        for m in range(markers):
+            tl.AddMarker(
+                rng.randrange(0, max(1, end)),
+                rng.choice(("Blue", "Red", "Green", "Yellow")),
+                f"Marker {m + 1}",
+                "",
+                1,
+                "",
+            )
+    if project.GetTimelineCount():
+        project.SetCurrentTimeline(project.GetTimelineByIndex(1))
+    return resolve
+
+
+def from_env() -> Resolve:
+    """Build the simulator instance described by ``RESOLVE_SIM_*`` variables."""
+    env = os.getenv
+    return generate_project(
+        name=env("RESOLVE_SIM_PROJECT", "Sim Project"),
+        bins=int(env("RESOLVE_SIM_BINS", "10")),
+        clips=int(env("RESOLVE_SIM_CLIPS", "100")),
+        timelines=int(env("RESOLVE_SIM_TIMELINES", "1")),
+        items=int(env("RESOLVE_SIM_ITEMS", "50")),
+        video_tracks=int(env("RESOLVE_SIM_VIDEO_TRACKS", "1")),
+        audio_tracks=int(env("RESOLVE_SIM_AUDIO_TRACKS", "1")),
+        markers=int(env("RESOLVE_SIM_MARKERS", "0")),
+        seed=int(env("RESOLVE_SIM_SEED", "0")),
+    )
@@ -0,0 +1,1128 @@
+"""
+In-memory stand-ins for the DaVinci Resolve scripting objects.
+
+The core objects — Resolve, ProjectManager, Project, MediaPool, Folder,
+MediaPoolItem, Timeline, TimelineItem, Graph, Gallery/GalleryStillAlbum and
+MediaStorage — keep real state, so imports, moves, appends, markers, flags,
+properties and settings round-trip the way the tools expect.
+
+Any other scripting method is answered by a permissive stub (``Get*`` →
+None, ``Is*`` → False, anything else → True) and recorded in
+``sim.unimplemented`` so coverage gaps stay visible.  Set ``sim.strict`` to
+raise ``AttributeError`` instead.
+
+Every scripting call sleeps ``sim.latency_ms`` (plus up to
+``sim.jitter_ms``) and is tallied in ``sim.calls``, so workloads can be
+profiled against a realistic IPC cost without Resolve running.
+"""
+
+import bisect
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+
+class _SimState:
+    """Global simulator knobs and counters."""
+
+    def __init__(self):
+        self.latency_ms = float(os.getenv("RESOLVE_SIM_LATENCY_MS", "0"))
+        self.jitter_ms = float(os.getenv("RESOLVE_SIM_JITTER_MS", "0"))
+        self.strict = os.getenv("RESOLVE_SIM_STRICT", "0") == "1"
+        self.calls: Counter = Counter()
+        self.unimplemented: Counter = Counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self, prefix: str) -> str:
+        with self._lock:
+            return f"{prefix}-{next(self._ids):08d}"
+
+    def tick(self, cls: str, name: str) -> None:
+        self.calls[f"{cls}.{name}"] += 1
+        delay = self.latency_ms
+        if self.jitter_ms:
+            delay += random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def reset_counters(self) -> None:
+        self.calls.clear()
+        self.unimplemented.clear()
+
+
+sim = _SimState()
+_MODULE_GLOBALS = globals()
+
+
+def _stub(cls: str, name: str):
+    sim.unimplemented[f"{cls}.{name}"] += 1
+    if name.startswith("Get"):
+        return lambda *a, **k: None
+    if name.startswith("Is"):
+        return lambda *a, **k: False
+    return lambda *a, **k: True
+
+
+class _Obj:
+    """Base for simulated API objects: latency, call counting, stub fallback.
+
+    Only calls from outside this module are ticked, so one simulated method
+    calling another does not double-charge latency.
+    """
+
+    def __getattribute__(self, name):
+        if name[:1].isupper() and sys._getframe(1).f_globals is not _MODULE_GLOBALS:
+            sim.tick(type(self).__name__, name)
+        return object.__getattribute__(self, name)
+
+    def __getattr__(self, name):
+        if not name[:1].isupper() or sim.strict:
+            raise AttributeError(f"{type(self).__name__!s} has no attribute {name!r}")
+        return _stub(type(self).__name__, name)
+
+
+# ---------------------------------------------------------------------------
+# Markers and flags (shared by MediaPoolItem, Timeline, TimelineItem)
+# ---------------------------------------------------------------------------
+
+
+class _MarkerMixin:
+    def _init_markers(self):
+        self._markers: dict = {}
+        self._flags: list = []
+        self._color = ""
+
+    def AddMarker(self, frame, color, name, note, duration, customData=""):
+        frame = int(frame)
+        if frame in self._markers:
+            return False
+        self._markers[frame] = {
+            "color": color,
+            "duration": int(duration),
+            "note": note,
+            "name": name,
+            "customData": customData,
+        }
+        return True
+
+    def GetMarkers(self):
+        return {f: dict(m) for f, m in self._markers.items()}
+
+    def GetMarkerByCustomData(self, custom):
+        for f, m in self._markers.items():
+            if m["customData"] == custom:
+                return {f: dict(m)}
+        return {}
+
+    def UpdateMarkerCustomData(self, frame, custom):
+        m = self._markers.get(int(frame))
+        if not m:
+            return False
+        m["customData"] = custom
+        return True
+
+    def GetMarkerCustomData(self, frame):
+        m = self._markers.get(int(frame))
+        return m["customData"] if m else ""
+
+    def DeleteMarkerAtFrame(self, frame):
+        return self._markers.pop(int(frame), None) is not None
+
+    def DeleteMarkersByColor(self, color):
+        doomed = [f for f, m in self._markers.items() if color == "All" or m["color"] == color]
+        for f in doomed:
+            del self._markers[f]
+        return bool(doomed)
+
+    def DeleteMarkerByCustomData(self, custom):
+        for f, m in list(self._markers.items()):
+            if m["customData"] == custom:
+                del self._markers[f]
+                return True
+        return False
+
+    def AddFlag(self, color):
+        if color not in self._flags:
+            self._flags.append(color)
+        return True
+
+    def GetFlagList(self):
+        return list(self._flags)
+
+    def ClearFlags(self, color="All"):
+        self._flags = [] if color == "All" else [c for c in self._flags if c != color]
+        return True
+
+    def GetClipColor(self):
+        return self._color
+
+    def SetClipColor(self, color):
+        self._color = color
+        return True
+
+    def ClearClipColor(self):
+        self._color = ""
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Media pool
+# ---------------------------------------------------------------------------
+
+
+class MediaPoolItem(_MarkerMixin, _Obj):
+    def __init__(
+        self,
+        path: str,
+        fps: float = 24.0,
+        frames: int = 2400,
+        start_tc: str = "01:00:00:00",
+        width: int = 1920,
+        height: int = 1080,
+        clip_type: str = "Video",
+    ):
+        self._id = sim.next_id("mpi")
+        self._init_markers()
+        p = Path(path)
+        self._metadata: dict = {}
+        self._third_party: dict = {}
+        self._mark: dict = {}
+        self._props = {
+            "Clip Name": p.name,
+            "File Name": p.name,
+            "File Path": str(path),
+            "Type": clip_type,
+            "FPS": fps,
+            "Frames": str(frames),
+            "Duration": _frames_to_tc(frames, fps),
+            "Start TC": start_tc,
+            "End TC": _frames_to_tc(_tc_to_frames(start_tc, fps) + frames, fps),
+            "Resolution": f"{width}x{height}",
+            "Video Codec": "H.264" if clip_type == "Video" else "",
+            "Audio Ch": "2",
+            "Format": p.suffix.lstrip(".").upper(),
+        }
+
+    def GetName(self):
+        return self._props["Clip Name"]
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetMediaId(self):
+        return self._id
+
+    def GetClipProperty(self, key=None):
+        if key is None:
+            return dict(self._props)
+        return self._props.get(key, "")
+
+    def SetClipProperty(self, key, value):
+        self._props[key] = value
+        return True
+
+    def GetMetadata(self, key=None):
+        return dict(self._metadata) if key is None else self._metadata.get(key, "")
+
+    def SetMetadata(self, key, value=None):
+        if isinstance(key, dict):
+            self._metadata.update(key)
+        else:
+            self._metadata[key] = value
+        return True
+
+    def GetThirdPartyMetadata(self, key=None):
+        return dict(self._third_party) if key is None else self._third_party.get(key, "")
+
+    def SetThirdPartyMetadata(self, key, value=None):
+        if isinstance(key, dict):
+            self._third_party.update(key)
+        else:
+            self._third_party[key] = value
+        return True
+
+    def GetMarkInOut(self):
+        return dict(self._mark)
+
+    def SetMarkInOut(self, mark_in, mark_out, type="all"):  # noqa: A002 — Resolve's parameter name
+        self._mark[type] = {"in": int(mark_in), "out": int(mark_out)}
+        return True
+
+    def ClearMarkInOut(self, type="all"):  # noqa: A002
+        self._mark.pop(type, None)
+        return True
+
+    def LinkProxyMedia(self, path):
+        self._props["Proxy Media Path"] = path
+        self._props["Proxy"] = "Yes"
+        return True
+
+    def UnlinkProxyMedia(self):
+        self._props.pop("Proxy Media Path", None)
+        self._props["Proxy"] = "None"
+        return True
+
+    def ReplaceClip(self, path):
+        self._props["File Path"] = path
+        return True
+
+    def GetAudioMapping(self):
+        return '{"embedded_audio_channels": 2, "track_mapping": {"1": {"type": "Stereo", "channel_idx": [1, 2]}}}'
+
+    def _frames(self) -> int:
+        return int(self._props.get("Frames") or 0)
+
+    def _fps(self) -> float:
+        return float(self._props.get("FPS") or 24)
+
+
+class Folder(_Obj):
+    def __init__(self, name: str, parent=None):
+        self._id = sim.next_id("bin")
+        self._name = name
+        self._parent = parent
+        self._clips: list = []
+        self._subs: list = []
+
+    def GetName(self):
+        return self._name
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetClipList(self):
+        return list(self._clips)
+
+    def GetSubFolderList(self):
+        return list(self._subs)
+
+    def GetIsFolderStale(self):
+        return False
+
+    def _walk(self):
+        yield self
+        for sub in self._subs:
+            yield from sub._walk()
+
+
+class MediaPool(_Obj):
+    def __init__(self, project):
+        self._id = sim.next_id("mp")
+        self._project = project
+        self._root = Folder("Master")
+        self._current = self._root
+        self._selected: list = []
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetRootFolder(self):
+        return self._root
+
+    def GetCurrentFolder(self):
+        return self._current
+
+    def SetCurrentFolder(self, folder):
+        self._current = folder
+        return True
+
+    def AddSubFolder(self, parent, name):
+        sub = Folder(name, parent)
+        parent._subs.append(sub)
+        return sub
+
+    def RefreshFolders(self):
+        return True
+
+    def ImportMedia(self, items, *args):
+        paths = [items] if isinstance(items, str) else list(items)
+        added = []
+        for entry in paths:
+            path = entry.get("FilePath", "") if isinstance(entry, dict) else entry
+            clip = MediaPoolItem(path)
+            self._current._clips.append(clip)
+            added.append(clip)
+        return added
+
+    def MoveClips(self, clips, target):
+        for clip in clips:
+            for folder in self._root._walk():
+                if clip in folder._clips:
+                    folder._clips.remove(clip)
+                    break
+            target._clips.append(clip)
+        return True
+
+    def MoveFolders(self, folders, target):
+        for folder in folders:
+            if folder._parent is not None:
+                folder._parent._subs.remove(folder)
+            folder._parent = target
+            target._subs.append(folder)
+        return True
+
+    def DeleteClips(self, clips):
+        doomed = set(map(id, clips))
+        for folder in self._root._walk():
+            folder._clips = [c for c in folder._clips if id(c) not in doomed]
+        return True
+
+    def DeleteFolders(self, folders):
+        for folder in folders:
+            if folder._parent is not None and folder in folder._parent._subs:
+                folder._parent._subs.remove(folder)
+        return True
+
+    def GetSelectedClips(self):
+        return list(self._selected)
+
+    def SetSelectedClip(self, clip):
+        self._selected = [clip]
+        return True
+
+    def RelinkClips(self, clips, folder_path):
+        for clip in clips:
+            clip._props["File Path"] = str(Path(folder_path) / clip._props["File Name"])
+        return True
+
+    def CreateEmptyTimeline(self, name):
+        if any(t.GetName() == name for t in self._project._timelines):
+            return None
+        tl = Timeline(name, self._project)
+        self._project._timelines.append(tl)
+        self._project._current_tl = tl
+        return tl
+
+    def CreateTimelineFromClips(self, name, clips):
+        tl = self.CreateEmptyTimeline(name)
+        if tl is not None:
+            self._append(tl, clips)
+        return tl
+
+    def AppendToTimeline(self, clips):
+        tl = self._project._current_tl
+        if tl is None:
+            return []
+        if not isinstance(clips, list | tuple):
+            clips = [clips]
+        return self._append(tl, clips)
+
+    def _append(self, tl, clips) -> list:
+        items = []
+        for entry in clips:
+            if isinstance(entry, dict):
+                clip = entry.get("mediaPoolItem")
+                start = int(entry.get("startFrame", 0))
+                end = int(entry.get("endFrame", clip._frames() - 1 if clip else 0))
+                track = int(entry.get("trackIndex", 1))
+                media_type = int(entry.get("mediaType", 1))
+                record = entry.get("recordFrame")
+            else:
+                clip, start, end, track, media_type, record = entry, 0, entry._frames() - 1, 1, 1, None
+            if clip is None:
+                continue
+            track_type = "audio" if media_type == 2 else "video"
+            item = tl._add_item(track_type, track, clip, start, end + 1, record)
+            items.append(item)
+        return items
+
+    def ImportTimelineFromFile(self, path, options=None):
+        tl = self.CreateEmptyTimeline(Path(path).stem)
+        return tl
+
+    def DeleteTimelines(self, timelines):
+        doomed = set(map(id, timelines))
+        project = self._project
+        project._timelines = [t for t in project._timelines if id(t) not in doomed]
+        if project._current_tl is not None and id(project._current_tl) in doomed:
+            project._current_tl = project._timelines[0] if project._timelines else None
+        return True
+
+    def GetClipMatteList(self, clip):
+        return []
+
+    def GetTimelineMatteList(self, folder):
+        return []
+
+
+# ---------------------------------------------------------------------------
+# Timeline
+# ---------------------------------------------------------------------------
+
+
+class TimelineItem(_MarkerMixin, _Obj):
+    def __init__(self, timeline, track_type: str, track: int, clip, src_start: int, src_end: int, start: int):
+        self._id = sim.next_id("ti")
+        self._init_markers()
+        self._timeline = timeline
+        self._track_type = track_type
+        self._track = track
+        self._clip = clip
+        self._src_start = src_start
+        self._src_end = src_end
+        self._start = start
+        self._enabled = True
+        self._props = {
+            "Pan": 0.0,
+            "Tilt": 0.0,
+            "ZoomX": 1.0,
+            "ZoomY": 1.0,
+            "ZoomGang": True,
+            "RotationAngle": 0.0,
+            "AnchorPointX": 0.0,
+            "AnchorPointY": 0.0,
+            "Pitch": 0.0,
+            "Yaw": 0.0,
+            "FlipX": False,
+            "FlipY": False,
+            "CropLeft": 0.0,
+            "CropRight": 0.0,
+            "CropTop": 0.0,
+            "CropBottom": 0.0,
+            "CropSoftness": 0.0,
+            "CropRetain": False,
+            "DynamicZoomEase": 0,
+            "CompositeMode": 0,
+            "Opacity": 100.0,
+            "Distortion": 0.0,
+            "RetimeProcess": 0,
+            "MotionEstimation": 0,
+            "Scaling": 0,
+            "ResizeFilter": 0,
+        }
+        self._graph = Graph()
+        self._versions = ["Version 1"]
+        self._fusion_comps: list = []
+
+    def GetName(self):
+        return self._clip.GetName() if self._clip else "Item"
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetStart(self, subframe=False):
+        return self._start
+
+    def GetEnd(self, subframe=False):
+        return self._start + self.GetDuration()
+
+    def GetDuration(self, subframe=False):
+        return self._src_end - self._src_start
+
+    def GetLeftOffset(self, subframe=False):
+        return self._src_start
+
+    def GetRightOffset(self, subframe=False):
+        total = self._clip._frames() if self._clip else self._src_end
+        return max(0, total - self._src_end)
+
+    def GetSourceStartFrame(self):
+        return self._src_start
+
+    def GetSourceEndFrame(self):
+        return self._src_end
+
+    def GetSourceStartTimecode(self):
+        fps = self._clip._fps() if self._clip else 24
+        return _frames_to_tc(self._src_start, fps)
+
+    def GetSourceEndTimecode(self):
+        fps = self._clip._fps() if self._clip else 24
+        return _frames_to_tc(self._src_end, fps)
+
+    def GetProperty(self, key=None):
+        return dict(self._props) if key is None else self._props.get(key)
+
+    def SetProperty(self, key, value):
+        if key not in self._props:
+            return False
+        self._props[key] = value
+        return True
+
+    def GetMediaPoolItem(self):
+        return self._clip
+
+    def GetClipEnabled(self):
+        return self._enabled
+
+    def SetClipEnabled(self, enabled):
+        self._enabled = bool(enabled)
+        return True
+
+    def GetTrackTypeAndIndex(self):
+        return [self._track_type, self._track]
+
+    def GetNodeGraph(self, layer=1):
+        return self._graph
+
+    def GetNumNodes(self):
+        return self._graph.GetNumNodes()
+
+    def GetLUT(self, node):
+        return self._graph.GetLUT(node)
+
+    def SetLUT(self, node, path):
+        return self._graph.SetLUT(node, path)
+
+    def GetCurrentVersion(self):
+        return {"versionName": self._versions[0], "versionType": 0}
+
+    def GetVersionNameList(self, version_type=0):
+        return list(self._versions)
+
+    def AddVersion(self, name, version_type=0):
+        self._versions.append(name)
+        return True
+
+    def GetFusionCompCount(self):
+        return len(self._fusion_comps)
+
+    def GetFusionCompNameList(self):
+        return list(self._fusion_comps)
+
+    def AddFusionComp(self):
+        self._fusion_comps.append(f"Composition {len(self._fusion_comps) + 1}")
+        return True
+
+    def GetTakesCount(self):
+        return 0
+
+
+class Timeline(_MarkerMixin, _Obj):
+    def __init__(self, name: str, project, fps: float = 24.0, start_frame: int = 86400):
+        self._id = sim.next_id("tl")
+        self._init_markers()
+        self._name = name
+        self._project = project
+        self._start_frame = start_frame
+        self._playhead = start_frame
+        self._settings = {
+            "timelineFrameRate": str(int(fps)) if float(fps).is_integer() else str(fps),
+            "timelineResolutionWidth": "1920",
+            "timelineResolutionHeight": "1080",
+            "timelinePlaybackFrameRate": str(int(fps)),
+            "videoBitDepth": "10",
+        }
+        self._tracks: dict = {"video": [[]], "audio": [[]], "subtitle": []}
+        self._track_meta: dict = {}
+
+    def _fps(self) -> float:
+        return float(self._settings["timelineFrameRate"])
+
+    def _add_item(self, track_type: str, track: int, clip, src_start: int, src_end: int, record=None):
+        tracks = self._tracks[track_type]
+        while len(tracks) < track:
+            tracks.append([])
+        lane = tracks[track - 1]
+        if record is None:
+            record = lane[-1].GetEnd() if lane else self._start_frame
+        item = TimelineItem(self, track_type, track, clip, src_start, src_end, int(record))
+        if not lane or item._start >= lane[-1]._start:
+            lane.append(item)
+        else:
+            bisect.insort(lane, item, key=lambda it: it._start)
+        return item
+
+    def GetName(self):
+        return self._name
+
+    def SetName(self, name):
+        self._name = name
+        return True
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetStartFrame(self):
+        return self._start_frame
+
+    def GetEndFrame(self):
+        ends = [lane[-1].GetEnd() for lanes in self._tracks.values() for lane in lanes if lane]
+        return max(ends, default=self._start_frame)
+
+    def GetStartTimecode(self):
+        return _frames_to_tc(self._start_frame, self._fps())
+
+    def SetStartTimecode(self, tc):
+        new_start = _tc_to_frames(tc, self._fps())
+        delta = new_start - self._start_frame
+        for lanes in self._tracks.values():
+            for lane in lanes:
+                for item in lane:
+                    item._start += delta
+        self._start_frame = new_start
+        return True
+
+    def GetEndTimecode(self):
+        return _frames_to_tc(self.GetEndFrame(), self._fps())
+
+    def GetSetting(self, key=None):
+        return dict(self._settings) if key is None else self._settings.get(key, "")
+
+    def SetSetting(self, key, value):
+        self._settings[key] = str(value)
+        return True
+
+    def GetTrackCount(self, track_type):
+        return len(self._tracks.get(track_type, []))
+
+    def GetItemListInTrack(self, track_type, index):
+        lanes = self._tracks.get(track_type, [])
+        if not 1 <= int(index) <= len(lanes):
+            return None
+        return list(lanes[int(index) - 1])
+
+    def AddTrack(self, track_type, sub_type=None):
+        self._tracks[track_type].append([])
+        return True
+
+    def DeleteTrack(self, track_type, index):
+        lanes = self._tracks.get(track_type, [])
+        if not 1 <= int(index) <= len(lanes):
+            return False
+        del lanes[int(index) - 1]
+        return True
+
+    def GetTrackName(self, track_type, index):
+        return self._track_meta.get((track_type, int(index), "name"), f"{track_type[0].upper()}{index}")
+
+    def SetTrackName(self, track_type, index, name):
+        self._track_meta[(track_type, int(index), "name")] = name
+        return True
+
+    def GetIsTrackEnabled(self, track_type, index):
+        return self._track_meta.get((track_type, int(index), "enabled"), True)
+
+    def SetTrackEnable(self, track_type, index, enabled):
+        self._track_meta[(track_type, int(index), "enabled")] = bool(enabled)
+        return True
+
+    def GetIsTrackLocked(self, track_type, index):
+        return self._track_meta.get((track_type, int(index), "locked"), False)
+
+    def SetTrackLock(self, track_type, index, locked):
+        self._track_meta[(track_type, int(index), "locked")] = bool(locked)
+        return True
+
+    def DeleteClips(self, items, ripple=False):
+        doomed = set(map(id, items))
+        for lanes in self._tracks.values():
+            for n, lane in enumerate(lanes):
+                lanes[n] = [it for it in lane if id(it) not in doomed]
+        return True
+
+    def GetCurrentTimecode(self):
+        return _frames_to_tc(self._playhead, self._fps())
+
+    def SetCurrentTimecode(self, tc):
+        self._playhead = _tc_to_frames(tc, self._fps())
+        return True
+
+    def GetCurrentVideoItem(self):
+        for lane in reversed(self._tracks["video"]):
+            for item in lane:
+                if item._start <= self._playhead < item.GetEnd():
+                    return item
+        return None
+
+    def DuplicateTimeline(self, name=None):
+        dup = Timeline(name or f"{self._name} copy", self._project, self._fps(), self._start_frame)
+        dup._settings = dict(self._settings)
+        for track_type, lanes in self._tracks.items():
+            dup._tracks[track_type] = [[] for _ in lanes]
+            for t, lane in enumerate(lanes, 1):
+                for item in lane:
+                    dup._add_item(track_type, t, item._clip, item._src_start, item._src_end, item._start)
+        self._project._timelines.append(dup)
+        return dup
+
+    def Export(self, path, export_type, export_subtype=None):
+        Path(path).write_text(f"TITLE: {self._name}\n", encoding="utf-8")
+        return True
+
+    def GetMediaPoolItem(self):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Color: node graph and gallery
+# ---------------------------------------------------------------------------
+
+
+class Graph(_Obj):
+    def __init__(self, nodes: int = 1):
+        self._nodes = [{"label": "", "enabled": True, "lut": "", "cache": 0} for _ in range(nodes)]
+
+    def _node(self, index):
+        index = int(index)
+        return self._nodes[index - 1] if 1 <= index <= len(self._nodes) else None
+
+    def GetNumNodes(self):
+        return len(self._nodes)
+
+    def GetNodeLabel(self, index):
+        node = self._node(index)
+        return node["label"] if node else ""
+
+    def SetNodeLabel(self, index, label):
+        node = self._node(index)
+        if node:
+            node["label"] = label
+        return bool(node)
+
+    def GetNodeEnabled(self, index):
+        node = self._node(index)
+        return node["enabled"] if node else False
+
+    def SetNodeEnabled(self, index, enabled):
+        node = self._node(index)
+        if node:
+            node["enabled"] = bool(enabled)
+        return bool(node)
+
+    def GetLUT(self, index):
+        node = self._node(index)
+        return node["lut"] if node else ""
+
+    def SetLUT(self, index, path):
+        node = self._node(index)
+        if node:
+            node["lut"] = path
+        return bool(node)
+
+    def GetNodeCacheMode(self, index):
+        node = self._node(index)
+        return node["cache"] if node else -1
+
+    def SetNodeCacheMode(self, index, mode):
+        node = self._node(index)
+        if node:
+            node["cache"] = mode
+        return bool(node)
+
+    def GetToolsInNode(self, index):
+        return []
+
+    def ApplyGradeFromDRX(self, path, mode=0):
+        return True
+
+    def ResetAllGrades(self):
+        for node in self._nodes:
+            node["lut"] = ""
+        return True
+
+
+class GalleryStillAlbum(_Obj):
+    def __init__(self, name: str):
+        self._name = name
+        self._stills: list = []
+
+    def GetStills(self):
+        return list(self._stills)
+
+    def GetLabel(self, still):
+        return getattr(still, "label", "")
+
+    def ImportStills(self, paths):
+        self._stills.extend(_Still(Path(p).stem) for p in paths)
+        return True
+
+    def ExportStills(self, stills, folder, prefix, fmt):
+        return True
+
+    def DeleteStills(self, stills):
+        doomed = set(map(id, stills))
+        self._stills = [s for s in self._stills if id(s) not in doomed]
+        return True
+
+
+class _Still:
+    def __init__(self, label: str):
+        self.label = label
+
+
+class Gallery(_Obj):
+    def __init__(self):
+        self._albums = [GalleryStillAlbum("Stills 1")]
+        self._power = [GalleryStillAlbum("PowerGrade 1")]
+        self._current = self._albums[0]
+
+    def GetAlbumName(self, album):
+        return album._name
+
+    def SetAlbumName(self, album, name):
+        album._name = name
+        return True
+
+    def GetCurrentStillAlbum(self):
+        return self._current
+
+    def SetCurrentStillAlbum(self, album):
+        self._current = album
+        return True
+
+    def GetGalleryStillAlbums(self):
+        return list(self._albums)
+
+    def GetGalleryPowerGradeAlbums(self):
+        return list(self._power)
+
+    def CreateGalleryStillAlbum(self):
+        album = GalleryStillAlbum(f"Stills {len(self._albums) + 1}")
+        self._albums.append(album)
+        return album
+
+    def CreateGalleryPowerGradeAlbum(self):
+        album = GalleryStillAlbum(f"PowerGrade {len(self._power) + 1}")
+        self._power.append(album)
+        return album
+
+
+# ---------------------------------------------------------------------------
+# Project, project manager, media storage, Resolve
+# ---------------------------------------------------------------------------
+
+
+class Project(_Obj):
+    def __init__(self, name: str):
+        self._id = sim.next_id("prj")
+        self._name = name
+        self._timelines: list = []
+        self._current_tl = None
+        self._media_pool = MediaPool(self)
+        self._gallery = Gallery()
+        self._render_jobs: list = []
+        self._settings = {
+            "timelineFrameRate": "24",
+            "timelineResolutionWidth": "1920",
+            "timelineResolutionHeight": "1080",
+            "timelinePlaybackFrameRate": "24",
+            "videoBitDepth": "10",
+            "videoMonitorFormat": "HD 1080p 24",
+        }
+
+    def GetName(self):
+        return self._name
+
+    def SetName(self, name):
+        self._name = name
+        return True
+
+    def GetUniqueId(self):
+        return self._id
+
+    def GetMediaPool(self):
+        return self._media_pool
+
+    def GetGallery(self):
+        return self._gallery
+
+    def GetTimelineCount(self):
+        return len(self._timelines)
+
+    def GetTimelineByIndex(self, index):
+        index = int(index)
+        return self._timelines[index - 1] if 1 <= index <= len(self._timelines) else None
+
+    def GetCurrentTimeline(self):
+        return self._current_tl
+
+    def SetCurrentTimeline(self, timeline):
+        self._current_tl = timeline
+        return True
+
+    def GetSetting(self, key=None):
+        return dict(self._settings) if key is None else self._settings.get(key, "")
+
+    def SetSetting(self, key, value):
+        self._settings[key] = str(value)
+        return True
+
+    def GetRenderJobList(self):
+        return [dict(job) for job in self._render_jobs]
+
+    def AddRenderJob(self):
+        job_id = sim.next_id("job")
+        tl = self._current_tl
+        self._render_jobs.append(
+            {
+                "JobId": job_id,
+                "TimelineName": tl.GetName() if tl else "",
+                "TargetDir": "",
+                "OutputFilename": "",
+                "RenderStatus": "Ready",
+                "CompletionPercentage": 0,
+            }
+        )
+        return job_id
+
+    def DeleteRenderJob(self, job_id):
+        before = len(self._render_jobs)
+        self._render_jobs = [j for j in self._render_jobs if j["JobId"] != job_id]
+        return len(self._render_jobs) < before
+
+    def DeleteAllRenderJobs(self):
+        self._render_jobs = []
+        return True
+
+    def GetRenderJobStatus(self, job_id):
+        for job in self._render_jobs:
+            if job["JobId"] == job_id:
+                return {"JobStatus": job["RenderStatus"], "CompletionPercentage": job["CompletionPercentage"]}
+        return {}
+
+    def StartRendering(self, *job_ids, **kwargs):
+        for job in self._render_jobs:
+            job["RenderStatus"], job["CompletionPercentage"] = "Complete", 100
+        return True
+
+    def IsRenderingInProgress(self):
+        return False
+
+    def GetRenderPresetList(self):
+        return ["H.264 Master", "YouTube - 1080p"]
+
+    def GetRenderFormats(self):
+        return {"QuickTime": "mov", "MP4": "mp4"}
+
+    def GetRenderCodecs(self, fmt):
+        return {"H.264": "H264", "H.265": "H265"}
+
+    def GetColorGroupsList(self):
+        return []
+
+    def ExportCurrentFrameAsStill(self, path):
+        Path(path).write_bytes(b"\x89PNG\r\n\x1a\n")
+        return True
+
+
+class ProjectManager(_Obj):
+    def __init__(self):
+        self._projects: dict = {}
+        self._current = None
+
+    def GetCurrentProject(self):
+        return self._current
+
+    def CreateProject(self, name):
+        if name in self._projects:
+            return None
+        self._projects[name] = Project(name)
+        self._current = self._projects[name]
+        return self._current
+
+    def LoadProject(self, name):
+        project = self._projects.get(name)
+        if project is not None:
+            self._current = project
+        return project
+
+    def SaveProject(self):
+        return self._current is not None
+
+    def CloseProject(self, project):
+        if project is self._current:
+            self._current = None
+        return True
+
+    def DeleteProject(self, name):
+        if name not in self._projects or self._projects[name] is self._current:
+            return False
+        del self._projects[name]
+        return True
+
+    def GetProjectListInCurrentFolder(self):
+        return list(self._projects)
+
+    def GetFolderListInCurrentFolder(self):
+        return []
+
+    def GetCurrentDatabase(self):
+        return {"DbType": "Disk", "DbName": "Local Database"}
+
+    def GetDatabaseList(self):
+        return [self.GetCurrentDatabase()]
+
+
+class MediaStorage(_Obj):
+    def __init__(self, project_manager):
+        self._pm = project_manager
+
+    def GetMountedVolumeList(self):
+        return ["/"]
+
+    def GetSubFolderList(self, path):
+        p = Path(path)
+        return sorted(str(c) for c in p.iterdir() if c.is_dir()) if p.is_dir() else []
+
+    def GetFileList(self, path):
+        p = Path(path)
+        return sorted(str(c) for c in p.iterdir() if c.is_file()) if p.is_dir() else []
+
+    def AddItemListToMediaPool(self, *items):
+        project = self._pm.GetCurrentProject()
+        if project is None:
+            return []
+        paths = items[0] if len(items) == 1 and isinstance(items[0], list | tuple) else list(items)
+        return project.GetMediaPool().ImportMedia(paths)
+
+
+class Resolve(_Obj):
+    def __init__(self, version: str = "20.3.0.0"):
+        self._version = version
+        self._pm = ProjectManager()
+        self._storage = MediaStorage(self._pm)
+        self._page = "edit"
+
+    def GetProductName(self):
+        return "DaVinci Resolve Studio"
+
+    def GetVersionString(self):
+        return self._version
+
+    def GetVersion(self):
+        return [int(p) for p in self._version.split(".")] + [""]
+
+    def GetProjectManager(self):
+        return self._pm
+
+    def GetMediaStorage(self):
+        return self._storage
+
+    def GetCurrentPage(self):
+        return self._page
+
+    def OpenPage(self, page):
+        self._page = page
+        return True
+
+    def Fusion(self):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Timecode helpers (kept local so the simulator has no package imports)
+# ---------------------------------------------------------------------------
+
+
+def _frames_to_tc(frames: int, fps: float) -> str:
+    base = round(fps) or 24
+    secs, f = divmod(int(frames), base)
+    mins, s = divmod(secs, 60)
+    h, m = divmod(mins, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}:{f:02d}"
+
+
+def _tc_to_frames(tc: str, fps: float) -> int:
+    base = round(fps) or 24
+    parts = [int(p) for p in tc.replace(";", ":").split(":")]
+    while len(parts) < 4:
+        parts.insert(0, 0)
+    h, m, s, f = parts[-4:]
+    return ((h * 60 + m) * 60 + s) * base + f
@@ -0,0 +1,309 @@
+"""
+Whole-timeline snapshots.
+
+A snapshot is a flat sequence of records collected in one traversal of a
+timeline:
+
+  {"type": "timeline", ...}  — name, fps, start frame/TC, track counts, markers
+  {"type": "track", ...}     — one per track: type, index, name, enabled, locked
+  {"type": "item", ...}      — one per item: position, source range, media,
+                               clip color, flags, markers, properties, hash
+  {"type": "summary", ...}   — counts, content hash, timestamp
+
+Records are written line by line as NDJSON when streaming to disk.  The
+content hash is a SHA-256 over every record except the summary, so two
+snapshots of an unchanged timeline hash identically.  Each item also carries
+its own ``hash`` (over everything but its track, position and ID) which the
+diff engine uses for alignment.
+
+Recent snapshots are kept in memory for ``RESOLVE_SNAPSHOT_TTL`` seconds and
+dropped whenever ``item_cache.bump()`` records a structural edit.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .item_cache import item_cache
+from .marker_io import marker_records
+
+# Seconds a snapshot is reused before the timeline is traversed again.
+SNAPSHOT_TTL = float(os.getenv("RESOLVE_SNAPSHOT_TTL", "2.0"))
+
+TRACK_TYPES = ("video", "audio", "subtitle")
+
+# Fallback when GetProperty() without a key is unsupported (older Resolve).
+ITEM_PROPERTIES = (
+    "Pan",
+    "Tilt",
+    "ZoomX",
+    "ZoomY",
+    "ZoomGang",
+    "RotationAngle",
+    "AnchorPointX",
+    "AnchorPointY",
+    "Pitch",
+    "Yaw",
+    "FlipX",
+    "FlipY",
+    "CropLeft",
+    "CropRight",
+    "CropTop",
+    "CropBottom",
+    "CropSoftness",
+    "CropRetain",
+    "DynamicZoomEase",
+    "CompositeMode",
+    "Opacity",
+    "Distortion",
+    "LenCorrection",
+    "LenDistortionType",
+    "RetimeProcess",
+    "MotionEstimation",
+    "Scaling",
+    "ResizeFilter",
+)
+
+# Item fields that locate an item rather than describe it; excluded from
+# the per-item hash so moved items still match.
+_LOCATION_FIELDS = ("type", "track_type", "track", "index", "id", "start", "end", "hash")
+
+
+def _call(obj, method: str, *args, default=None):
+    try:
+        value = getattr(obj, method)(*args)
+    except Exception:
+        return default
+    return default if value is None else value
+
+
+def canonical(record: dict) -> bytes:
+    """Stable JSON encoding used for hashing."""
+    return json.dumps(record, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def item_hash(record: dict) -> str:
+    """Short hash of an item record's content, ignoring where it sits."""
+    body = {k: v for k, v in record.items() if k not in _LOCATION_FIELDS}
+    return hashlib.sha1(canonical(body)).hexdigest()[:16]
+
+
+def _item_properties(item) -> dict:
+    props = _call(item, "GetProperty")
+    if isinstance(props, dict) and props:
+        return {k: v for k, v in props.items() if v is not None}
+    out = {}
+    for name in ITEM_PROPERTIES:
+        val = _call(item, "GetProperty", name)
+        if val is not None:
+            out[name] = val
+    return out
+
+
+def _item_record(item, track_type: str, track: int, index: int, fps: float, properties: bool) -> dict:
+    start = _call(item, "GetStart", default=0)
+    end = _call(item, "GetEnd", default=0)
+    left = _call(item, "GetLeftOffset", default=0)
+    src_start = _call(item, "GetSourceStartFrame")
+    src_end = _call(item, "GetSourceEndFrame")
+    if src_start is None:
+        src_start, src_end = left, left + (end - start)
+
+    mpi = _call(item, "GetMediaPoolItem")
+    rec = {
+        "type": "item",
+        "track_type": track_type,
+        "track": track,
+        "index": index,
+        "id": _call(item, "GetUniqueId", default=""),
+        "name": _call(item, "GetName", default=""),
+        "start": start,
+        "end": end,
+        "duration": _call(item, "GetDuration", default=end - start),
+        "left_offset": left,
+        "right_offset": _call(item, "GetRightOffset", default=0),
+        "source_start": src_start,
+        "source_end": src_end,
+        "media_id": _call(mpi, "GetUniqueId", default="") if mpi else "",
+        "media_path": _call(mpi, "GetClipProperty", "File Path", default="") if mpi else "",
+        "enabled": bool(_call(item, "GetClipEnabled", default=True)),
+        "clip_color": _call(item, "GetClipColor", default=""),
+        "flags": list(_call(item, "GetFlagList", default=[])),
+        "markers": marker_records(_call(item, "GetMarkers", default={}), fps),
+    }
+    if properties:
+        rec["properties"] = _item_properties(item)
+    rec["hash"] = item_hash(rec)
+    return rec
+
+
+def iter_records(tl, properties: bool = True):
+    """Yield snapshot records (without the summary) for timeline *tl*."""
+    try:
+        fps = float(tl.GetSetting("timelineFrameRate") or 24)
+    except (ValueError, TypeError):
+        fps = 24.0
+    start_frame = _call(tl, "GetStartFrame", default=0)
+    counts = {t: _call(tl, "GetTrackCount", t, default=0) for t in TRACK_TYPES}
+    yield {
+        "type": "timeline",
+        "name": _call(tl, "GetName", default=""),
+        "id": _call(tl, "GetUniqueId", default=""),
+        "fps": fps,
+        "start_frame": start_frame,
+        "end_frame": _call(tl, "GetEndFrame", default=0),
+        "start_tc": _call(tl, "GetStartTimecode", default=""),
+        "width": _call(tl, "GetSetting", "timelineResolutionWidth", default=""),
+        "height": _call(tl, "GetSetting", "timelineResolutionHeight", default=""),
+        "tracks": counts,
+        "markers": marker_records(_call(tl, "GetMarkers", default={}), fps, start_frame),
+    }
+    for track_type in TRACK_TYPES:
+        for track in range(1, counts[track_type] + 1):
+            yield {
+                "type": "track",
+                "track_type": track_type,
+                "track": track,
+                "name": _call(tl, "GetTrackName", track_type, track, default=""),
+                "enabled": bool(_call(tl, "GetIsTrackEnabled", track_type, track, default=True)),
+                "locked": bool(_call(tl, "GetIsTrackLocked", track_type, track, default=False)),
+            }
+            for index, item in enumerate(item_cache.items(tl, track_type, track), 1):
+                yield _item_record(item, track_type, track, index, fps, properties)
+
+
+class Snapshot:
+    """A collected snapshot: header, tracks, items and content hash.
+
+    A snapshot streamed to a file keeps only its header record and the
+    track/item *counts*; the rest is in the file.
+    """
+
+    def __init__(self, records: list, content_hash: str, taken_at: float, counts: dict | None = None):
+        self.records = records
+        self.hash = content_hash
+        self.taken_at = taken_at
+        self.counts = counts
+
+    @property
+    def header(self) -> dict:
+        return self.records[0] if self.records and self.records[0].get("type") == "timeline" else {}
+
+    @property
+    def tracks(self) -> list:
+        return [r for r in self.records if r.get("type") == "track"]
+
+    @property
+    def items(self) -> list:
+        return [r for r in self.records if r.get("type") == "item"]
+
+    def summary(self) -> dict:
+        header = self.header
+        counts = self.counts or {"tracks": len(self.tracks), "items": len(self.items)}
+        return {
+            "type": "summary",
+            "timeline": header.get("name", ""),
+            "tracks": counts["tracks"],
+            "items": counts["items"],
+            "markers": len(header.get("markers", [])),
+            "hash": self.hash,
+            "taken_at": round(self.taken_at, 3),
+        }
+
+    def to_dict(self) -> dict:
+        """Compact nested form: header with ``track_list`` and ``items``."""
+        return {
+            **self.header,
+            "track_list": self.tracks,
+            "items": self.items,
+            "hash": self.hash,
+        }
+
+    def write_ndjson(self, path) -> None:
+        """Write all records plus the summary to *path*, one per line."""
+        with open(path, "w", encoding="utf-8") as fh:
+            for rec in self.records:
+                fh.write(json.dumps(rec, default=str) + "\n")
+            fh.write(json.dumps(self.summary()) + "\n")
+
+
+def _collect(tl, properties: bool, fh=None) -> Snapshot:
+    """Traverse *tl* once, hashing every record and streaming it to *fh*.
+
+    With *fh*, only the header and counts are kept in memory.
+    """
+    digest = hashlib.sha256()
+    records: list = []
+    counts = {"tracks": 0, "items": 0}
+    for rec in iter_records(tl, properties):
+        digest.update(canonical(rec))
+        if fh:
+            fh.write(json.dumps(rec, default=str) + "\n")
+            if rec["type"] == "timeline":
+                records.append(rec)
+            else:
+                counts[rec["type"] + "s"] += 1
+        else:
+            records.append(rec)
+    snap = Snapshot(records, digest.hexdigest(), time.time(), counts if fh else None)
+    if fh:
+        fh.write(json.dumps(snap.summary()) + "\n")
+    return snap
+
+
+class SnapshotCache:
+    """Recent snapshots keyed by timeline ID, invalidated with the item cache."""
+
+    def __init__(self, ttl: float = SNAPSHOT_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (timeline id, properties) -> (item_cache generation, monotonic time, Snapshot)
+        self._entries: dict[tuple, tuple] = {}
+        self._counters = {"hits": 0, "traversals": 0}
+
+    def take(self, tl, properties: bool = True, out_path=None, use_cache: bool = True) -> Snapshot:
+        """Return a snapshot of *tl*, reusing a fresh cached one if *use_cache*.
+
+        With *out_path*, records are streamed to that NDJSON file while the
+        timeline is traversed and the returned snapshot holds only the header,
+        counts and hash; it is not cached.  Property edits do not bump the item
+        cache, so pass ``use_cache=False`` when they must be seen immediately.
+        """
+        key = (_call(tl, "GetUniqueId", default=""), properties)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if use_cache and entry and entry[0] == item_cache.generation and now - entry[1] <= self.ttl:
+                self._counters["hits"] += 1
+                snap = entry[2]
+                if out_path:
+                    snap.write_ndjson(out_path)
+                return snap
+
+        generation = item_cache.generation
+        if out_path:
+            with open(out_path, "w", encoding="utf-8") as fh:
+                snap = _collect(tl, properties, fh)
+            with self._lock:
+                self._counters["traversals"] += 1
+            return snap
+
+        snap = _collect(tl, properties)
+        with self._lock:
+            self._counters["traversals"] += 1
+            self._entries[key] = (generation, time.monotonic(), snap)
+        return snap
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries)}
+
+
+# Process-wide snapshot cache.
+snapshot_cache = SnapshotCache()
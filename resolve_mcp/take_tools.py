@@ -7,24 +7,21 @@ switch between them non-destructively.
 """
 
 from .config import mcp
+from .item_cache import timeline_item
+from .media_index import find_clip
 from .resolve import _boilerplate
 
 
-def _get_item(track_type, track_index, item_index):
-    """Get a timeline item by track and index."""
+def _get_item(track_type, track_index, item_index, item_id=""):
+    """Get a timeline item by unique ID, or by track and index."""
     _, project, _ = _boilerplate()
-    tl = project.GetCurrentTimeline()
-    if not tl:
-        raise ValueError("No active timeline.")
-    items = tl.GetItemListInTrack(track_type, int(track_index)) or []
-    if item_index < 1 or item_index > len(items):
-        raise ValueError(f"Item {item_index} out of range (1-{len(items)}).")
-    return items[item_index - 1]
+    return timeline_item(project, track_type, track_index, item_index, item_id)[1]
 
 
 @mcp.tool
 def resolve_item_add_take(
-    track_type: str, track_index: int, item_index: int, clip_name: str, start_frame: int = -1, end_frame: int = -1
+    track_type: str, track_index: int, item_index: int, clip_name: str, start_frame: int = -1, end_frame: int = -1,
+    item_id: str = "",
 ) -> str:
     """Add a media pool clip as a new take for a timeline item.
 
@@ -32,22 +29,18 @@ def resolve_item_add_take(
     *item_index*: 1-based clip position on the track.
     *clip_name*: name of the media pool clip to add as a take.
     *start_frame*/*end_frame*: optional sub-clip range (-1 = full clip).
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
 
     Initializes a take selector on the timeline item if one doesn't exist.
     """
     _, project, mp = _boilerplate()
-    tl = project.GetCurrentTimeline()
-    if not tl:
-        return "No active timeline."
-
-    items = tl.GetItemListInTrack(track_type, int(track_index)) or []
-    if item_index < 1 or item_index > len(items):
-        return f"Item {item_index} out of range (1-{len(items)})."
-    item = items[item_index - 1]
+    try:
+        _, item = timeline_item(project, track_type, track_index, item_index, item_id)
+    except ValueError as e:
+        return str(e)
 
     # Find clip in media pool
-    root = mp.GetRootFolder()
-    target_clip = _find_clip_recursive(root, clip_name)
+    target_clip = find_clip(mp, clip_name)
     if not target_clip:
         return f"Clip '{clip_name}' not found in media pool."
 
@@ -61,25 +54,16 @@ def resolve_item_add_take(
     return "Failed to add take."
 
 
-def _find_clip_recursive(folder, name):
-    """Recursively search for a clip by name."""
-    for clip in folder.GetClipList() or []:
-        if clip.GetName() == name:
-            return clip
-    for sub in folder.GetSubFolderList() or []:
-        found = _find_clip_recursive(sub, name)
-        if found:
-            return found
-    return None
-
-
 @mcp.tool
-def resolve_item_get_takes_count(track_type: str, track_index: int, item_index: int) -> str:
+def resolve_item_get_takes_count(track_type: str, track_index: int, item_index: int,
+                                 item_id: str = "") -> str:
     """Get the number of takes for a timeline item.
 
     Returns 0 if the clip is not a take selector.
+
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
-    item = _get_item(track_type, track_index, item_index)
+    item = _get_item(track_type, track_index, item_index, item_id)
     count = item.GetTakesCount()
     if count == 0:
         return f"Item {item_index} is not a take selector (0 takes)."
@@ -87,12 +71,15 @@ def resolve_item_get_takes_count(track_type: str, track_index: int, item_index:
 
 
 @mcp.tool
-def resolve_item_get_selected_take(track_type: str, track_index: int, item_index: int) -> str:
+def resolve_item_get_selected_take(track_type: str, track_index: int, item_index: int,
+                                   item_id: str = "") -> str:
     """Get the currently selected take index for a timeline item.
 
     Returns 0 if the clip is not a take selector.
+
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
-    item = _get_item(track_type, track_index, item_index)
+    item = _get_item(track_type, track_index, item_index, item_id)
     idx = item.GetSelectedTakeIndex()
     if idx == 0:
         return f"Item {item_index} is not a take selector."
@@ -101,13 +88,15 @@ def resolve_item_get_selected_take(track_type: str, track_index: int, item_index
 
 
 @mcp.tool
-def resolve_item_get_take(track_type: str, track_index: int, item_index: int, take_index: int) -> str:
+def resolve_item_get_take(track_type: str, track_index: int, item_index: int, take_index: int,
+                          item_id: str = "") -> str:
     """Get information about a specific take.
 
     *take_index*: 1-based take number.
     Returns start frame, end frame, and media pool item name.
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
-    item = _get_item(track_type, track_index, item_index)
+    item = _get_item(track_type, track_index, item_index, item_id)
     info = item.GetTakeByIndex(int(take_index))
     if not info:
         return f"No take at index {take_index}."
@@ -120,12 +109,14 @@ def resolve_item_get_take(track_type: str, track_index: int, item_index: int, ta
 
 
 @mcp.tool
-def resolve_item_select_take(track_type: str, track_index: int, item_index: int, take_index: int) -> str:
+def resolve_item_select_take(track_type: str, track_index: int, item_index: int, take_index: int,
+                             item_id: str = "") -> str:
     """Select a specific take for a timeline item.
 
     *take_index*: 1-based take number.
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
-    item = _get_item(track_type, track_index, item_index)
+    item = _get_item(track_type, track_index, item_index, item_id)
     result = item.SelectTakeByIndex(int(take_index))
     if result:
         return f"Selected take {take_index} for item {item_index}."
@@ -133,12 +124,14 @@ def resolve_item_select_take(track_type: str, track_index: int, item_index: int,
 
 
 @mcp.tool
-def resolve_item_delete_take(track_type: str, track_index: int, item_index: int, take_index: int) -> str:
+def resolve_item_delete_take(track_type: str, track_index: int, item_index: int, take_index: int,
+                             item_id: str = "") -> str:
     """Delete a take from a timeline item's take selector.
 
     *take_index*: 1-based take number.
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
-    item = _get_item(track_type, track_index, item_index)
+    item = _get_item(track_type, track_index, item_index, item_id)
     result = item.DeleteTakeByIndex(int(take_index))
     if result:
         return f"Deleted take {take_index} from item {item_index}."
@@ -146,13 +139,15 @@ def resolve_item_delete_take(track_type: str, track_index: int, item_index: int,
 
 
 @mcp.tool
-def resolve_item_finalize_take(track_type: str, track_index: int, item_index: int) -> str:
+def resolve_item_finalize_take(track_type: str, track_index: int, item_index: int, item_id: str = "") -> str:
     """Finalize the take selection, removing the take selector.
 
     After finalization, the currently selected take becomes the clip
     and other takes are discarded. This is irreversible.
+
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
-    item = _get_item(track_type, track_index, item_index)
+    item = _get_item(track_type, track_index, item_index, item_id)
     result = item.FinalizeTake()
     if result:
         return f"Take selection finalized for item {item_index}."
@@ -2,29 +2,48 @@
 OTIO timeline construction, FCP7 XML rendering, and media upload for editing pass.
 """
 
+from __future__ import annotations
+
 import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import opentimelineio as otio
-from opentimelineio.opentime import RationalTime, TimeRange
+if TYPE_CHECKING:
+    import opentimelineio as otio
 
 from .config import MODEL, client, log
+from .execution import check_cancelled, map_work
 from .retry import retry_gemini
-from .ffprobe import ffprobe_duration, ffprobe_start_tc, ffprobe_audio_info, tc_to_frames
-from .media import find_proxy
+from .ffprobe import ffprobe_audio_info, probe_many, tc_to_frames
+from .media import find_proxy_parts
+
+
+def _upload_one(upload_path: Path):
+    """Upload one file and wait for Gemini to finish processing it; None on failure."""
+    try:
+        ref = retry_gemini(client.files.upload, file=str(upload_path))
+        # Wait for processing (Gemini may need to ingest the video)
+        while ref.state.name == "PROCESSING":
+            check_cancelled()
+            time.sleep(2)
+            ref = client.files.get(name=ref.name)
+        if ref.state.name == "ACTIVE":
+            return ref
+        log.warning("Upload for %s ended in state %s", upload_path.name, ref.state.name)
+    except Exception as exc:
+        log.warning("Failed to upload %s: %s", upload_path.name, exc)
+    return None
 
 
 def upload_media_for_editing(sidecars: list[dict]) -> list:
     """Upload proxy video/audio files to Gemini Files API for the editing pass.
 
     Returns a list of Gemini file references (in sidecar order) that can be
-    passed as content parts to generate_content.  Skips files that fail to
-    upload and logs warnings.
+    passed as content parts to generate_content; a proxy split to fit the
+    upload limit contributes one reference per part.  Skips files that fail
+    to upload and logs warnings.  Uploads run in parallel on the work pool.
     """
-    file_refs = []
-    seen_paths: dict[str, object] = {}  # dedup by resolved path
-
+    upload_paths: list[tuple[str, Path]] = []  # (resolved path, upload path) per file to upload
     for sc in sidecars:
         raw_path = sc.get("file_path")
         if not raw_path:
@@ -33,30 +52,13 @@ def upload_media_for_editing(sidecars: list[dict]) -> list:
         if not media_path.exists():
             log.warning("Source file missing: %s", raw_path)
             continue
+        for upload_path in find_proxy_parts(media_path):
+            upload_paths.append((str(upload_path.resolve()), upload_path))
 
-        upload_path = find_proxy(media_path)
-        resolved = str(upload_path.resolve())
-
-        # Reuse if already uploaded in this batch
-        if resolved in seen_paths:
-            file_refs.append(seen_paths[resolved])
-            continue
-
-        try:
-            ref = retry_gemini(client.files.upload, file=str(upload_path))
-            # Wait for processing (Gemini may need to ingest the video)
-            while ref.state.name == "PROCESSING":
-                time.sleep(2)
-                ref = client.files.get(name=ref.name)
-            if ref.state.name == "ACTIVE":
-                seen_paths[resolved] = ref
-                file_refs.append(ref)
-            else:
-                log.warning("Upload for %s ended in state %s", upload_path.name, ref.state.name)
-        except Exception as exc:
-            log.warning("Failed to upload %s: %s", upload_path.name, exc)
-
-    return file_refs
+    # Upload each file once even if several sidecars share it.
+    unique = dict(upload_paths)
+    refs = dict(zip(unique, map_work(_upload_one, unique.values(), "Uploading media to Gemini"), strict=True))
+    return [refs[resolved] for resolved, _ in upload_paths if refs[resolved] is not None]
 
 
 def build_otio_timeline(
@@ -73,6 +75,10 @@ def build_otio_timeline(
         tc_offsets: Map of source_file path -> start timecode in frames.
         clip_durations: Map of source_file path -> duration in seconds.
     """
+    # OTIO is imported on first use to keep server start-up fast.
+    import opentimelineio as otio
+    from opentimelineio.opentime import RationalTime, TimeRange
+
     if tc_offsets is None:
         tc_offsets = {}
     if clip_durations is None:
@@ -180,6 +186,7 @@ def render_xml(root: Path, edit_plan: dict, sidecars: list[dict]) -> tuple[Path,
 
     Returns (xml_path, tc_debug_lines).  Pure local operation — no Gemini.
     """
+    import opentimelineio as otio
     # Timeline fps = highest fps found across video sidecars.
     video_fps_values = [
         sc.get("fps", 0) for sc in sidecars
@@ -187,7 +194,9 @@ def render_xml(root: Path, edit_plan: dict, sidecars: list[dict]) -> tuple[Path,
     ]
     timeline_fps = max(video_fps_values) if video_fps_values else 24.0
 
-    # Probe each source file with ffprobe for start timecode and duration.
+    # Probe every source file for start timecode and duration, concurrently;
+    # files probed by an earlier build come from the probe cache.
+    probes = probe_many(Path(sc["file_path"]) for sc in sidecars if sc.get("file_path"))
     tc_offsets: dict[str, int] = {}
     clip_durations: dict[str, float] = {}
     tc_debug: list[str] = []
@@ -200,11 +209,12 @@ def render_xml(root: Path, edit_plan: dict, sidecars: list[dict]) -> tuple[Path,
         is_audio = sc.get("media_type") == "audio"
         exists = media_path.exists()
         if exists:
-            dur = ffprobe_duration(media_path)
+            info = probes[media_path]
+            dur = info.duration
             if dur:
                 clip_durations[fp] = dur
             if not is_audio:
-                probe_tc = ffprobe_start_tc(media_path)
+                probe_tc = info.start_tc
                 if probe_tc:
                     tc_offsets[fp] = tc_to_frames(probe_tc, clip_fps)
                     tc_debug.append(f"{media_path.name}: TC={probe_tc} → {tc_offsets[fp]}f, dur={dur:.2f}s")
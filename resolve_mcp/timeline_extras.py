@@ -8,7 +8,9 @@ Fusion clips, sidecar updates, node color reset, and Fairlight presets.
 import base64
 
 from .config import mcp
-from .resolve import _boilerplate, get_resolve
+from .item_cache import item_cache
+from .media_index import bin_tree, find_clip, media_index
+from .resolve import _boilerplate, _find_bin_or_error, get_resolve
 
 # ---------------------------------------------------------------------------
 # Timecode tools (Timeline)
@@ -83,11 +85,12 @@ def resolve_get_current_video_item() -> str:
 
 
 @mcp.tool
-def resolve_get_linked_items(track_type: str, track_index: int, item_index: int) -> str:
+def resolve_get_linked_items(track_type: str, track_index: int, item_index: int, item_id: str = "") -> str:
     """Get all timeline items linked to a specific clip.
 
     *track_type*: 'video' or 'audio'.
     *item_index*: 1-based clip position on the track.
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
 
     Returns a list of linked items (e.g., video clip linked to its audio).
     """
@@ -96,10 +99,10 @@ def resolve_get_linked_items(track_type: str, track_index: int, item_index: int)
     if not tl:
         return "No active timeline."
 
-    items = tl.GetItemListInTrack(track_type, int(track_index)) or []
-    if item_index < 1 or item_index > len(items):
-        return f"Item {item_index} out of range (1-{len(items)})."
-    item = items[item_index - 1]
+    try:
+        item = item_cache.get(tl, track_type, track_index, item_index, item_id)
+    except ValueError as e:
+        return str(e)
 
     linked = item.GetLinkedItems()
     if not linked:
@@ -117,21 +120,24 @@ def resolve_get_linked_items(track_type: str, track_index: int, item_index: int)
 
 
 @mcp.tool
-def resolve_get_track_type_and_index(track_type: str, track_index: int, item_index: int) -> str:
+def resolve_get_track_type_and_index(track_type: str, track_index: int, item_index: int,
+                                     item_id: str = "") -> str:
     """Get the track type and index for a timeline item.
 
     Returns the track type ('video', 'audio', 'subtitle') and 1-based index.
     Useful for cross-referencing items across tracks.
+
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
     _, project, _ = _boilerplate()
     tl = project.GetCurrentTimeline()
     if not tl:
         return "No active timeline."
 
-    items = tl.GetItemListInTrack(track_type, int(track_index)) or []
-    if item_index < 1 or item_index > len(items):
-        return f"Item {item_index} out of range (1-{len(items)})."
-    item = items[item_index - 1]
+    try:
+        item = item_cache.get(tl, track_type, track_index, item_index, item_id)
+    except ValueError as e:
+        return str(e)
 
     result = item.GetTrackTypeAndIndex()
     if result and len(result) >= 2:
@@ -207,13 +213,15 @@ def resolve_get_current_thumbnail(save_path: str = "") -> str:
 
 @mcp.tool
 def resolve_export_lut(
-    export_path: str, lut_size: str = "33pt", track_type: str = "video", track_index: int = 1, item_index: int = 0
+    export_path: str, lut_size: str = "33pt", track_type: str = "video", track_index: int = 1, item_index: int = 0,
+    item_id: str = "",
 ) -> str:
     """Export a LUT from a timeline clip's grade.
 
     *export_path*: absolute path for the LUT file (.cube or .vlt).
     *lut_size*: '17pt', '33pt', '65pt', or 'panasonic_vlut'.
     *item_index*: 0 = current clip, or 1-based index.
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
 
     Exports the cumulative grade of the clip as a LUT file for use
     in other applications or on-set monitoring.
@@ -235,15 +243,15 @@ def resolve_export_lut(
     if export_type is None:
         return f"Invalid LUT size '{lut_size}'. Use '17pt', '33pt', '65pt', or 'panasonic_vlut'."
 
-    if item_index == 0:
+    if item_index == 0 and not item_id:
         item = tl.GetCurrentVideoItem()
         if not item:
             return "No current clip."
     else:
-        items = tl.GetItemListInTrack(track_type, int(track_index)) or []
-        if item_index < 1 or item_index > len(items):
-            return f"Item {item_index} out of range."
-        item = items[item_index - 1]
+        try:
+            item = item_cache.get(tl, track_type, track_index, item_index, item_id)
+        except ValueError as e:
+            return str(e)
 
     result = item.ExportLUT(export_type, export_path)
     name = item.GetName() or f"clip {item_index}"
@@ -271,13 +279,14 @@ def resolve_create_fusion_clip(track_type: str, track_index: int, item_indices:
     if not tl:
         return "No active timeline."
 
-    items = tl.GetItemListInTrack(track_type, int(track_index)) or []
+    items = item_cache.items(tl, track_type, track_index)
     indices = [int(x.strip()) for x in item_indices.split(",")]
     selected = [items[i - 1] for i in indices if 1 <= i <= len(items)]
     if not selected:
         return "No valid items selected."
 
     result = tl.CreateFusionClip(selected)
+    item_cache.bump()
     if result:
         return f"Created Fusion clip from {len(selected)} item(s)."
     return "Failed to create Fusion clip."
@@ -289,22 +298,24 @@ def resolve_create_fusion_clip(track_type: str, track_index: int, item_indices:
 
 
 @mcp.tool
-def resolve_update_sidecar(track_type: str, track_index: int, item_index: int) -> str:
+def resolve_update_sidecar(track_type: str, track_index: int, item_index: int, item_id: str = "") -> str:
     """Update sidecar file for a BRAW or R3D clip.
 
     Writes current decode settings to the .sidecar (BRAW) or .RMD (R3D) file.
     Changes persist outside of Resolve and affect other applications reading
     the same media.
+
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
     """
     _, project, _ = _boilerplate()
     tl = project.GetCurrentTimeline()
     if not tl:
         return "No active timeline."
 
-    items = tl.GetItemListInTrack(track_type, int(track_index)) or []
-    if item_index < 1 or item_index > len(items):
-        return f"Item {item_index} out of range."
-    item = items[item_index - 1]
+    try:
+        item = item_cache.get(tl, track_type, track_index, item_index, item_id)
+    except ValueError as e:
+        return str(e)
 
     result = item.UpdateSidecar()
     name = item.GetName() or f"item {item_index}"
@@ -433,7 +444,7 @@ def resolve_get_third_party_metadata(clip_name: str, metadata_key: str = "") ->
     is used by external tools and workflows (e.g., camera metadata, VFX IDs).
     """
     _, _, mp = _boilerplate()
-    clip = _find_clip(mp.GetRootFolder(), clip_name)
+    clip = find_clip(mp, clip_name)
     if not clip:
         return f"Clip '{clip_name}' not found."
 
@@ -459,7 +470,7 @@ def resolve_set_third_party_metadata(clip_name: str, metadata_key: str, metadata
     *metadata_value*: the value to assign.
     """
     _, _, mp = _boilerplate()
-    clip = _find_clip(mp.GetRootFolder(), clip_name)
+    clip = find_clip(mp, clip_name)
     if not clip:
         return f"Clip '{clip_name}' not found."
 
@@ -501,14 +512,18 @@ def resolve_move_folders(folder_names: str, target_folder: str) -> str:
     """
     _, _, mp = _boilerplate()
     root = mp.GetRootFolder()
-    target = _find_folder(root, target_folder)
+    target, error = _find_bin_or_error(root, target_folder)
+    if error:
+        return error
     if not target:
         return f"Target folder '{target_folder}' not found."
 
     names = [n.strip() for n in folder_names.split(",")]
     folders = []
     for name in names:
-        f = _find_folder(root, name)
+        f, error = _find_bin_or_error(root, name)
+        if error:
+            return error
         if f:
             folders.append(f)
 
@@ -516,7 +531,9 @@ def resolve_move_folders(folder_names: str, target_folder: str) -> str:
         return "No matching folders found."
 
     result = mp.MoveFolders(folders, target)
+    media_index.invalidate()
     if result:
+        bin_tree.moved(folders, target)
         return f"Moved {len(folders)} folder(s) to '{target_folder}'."
     return "Failed to move folders."
 
@@ -544,12 +561,14 @@ def resolve_reveal_in_storage(path: str) -> str:
 
 @mcp.tool
 def resolve_load_burn_in_preset(
-    preset_name: str, track_type: str = "video", track_index: int = 1, item_index: int = 0
+    preset_name: str, track_type: str = "video", track_index: int = 1, item_index: int = 0,
+    item_id: str = "",
 ) -> str:
     """Load a data burn-in preset for a timeline clip.
 
     *preset_name*: name of the burn-in preset.
     *item_index*: 0 = current clip, or 1-based clip index.
+    *item_id*: optional timeline item unique ID; when set, track and index are ignored.
 
     Burn-in presets overlay metadata (timecode, clip name, reel) onto the image.
     """
@@ -558,45 +577,17 @@ def resolve_load_burn_in_preset(
     if not tl:
         return "No active timeline."
 
-    if item_index == 0:
+    if item_index == 0 and not item_id:
         item = tl.GetCurrentVideoItem()
         if not item:
             return "No current clip."
     else:
-        items = tl.GetItemListInTrack(track_type, int(track_index)) or []
-        if item_index < 1 or item_index > len(items):
-            return f"Item {item_index} out of range."
-        item = items[item_index - 1]
+        try:
+            item = item_cache.get(tl, track_type, track_index, item_index, item_id)
+        except ValueError as e:
+            return str(e)
 
     result = item.LoadBurnInPreset(preset_name)
     if result:
         return f"Burn-in preset '{preset_name}' loaded."
     return f"Failed to load burn-in preset '{preset_name}'."
-
-
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-
-def _find_clip(folder, name):
-    """Recursively search for a clip by name."""
-    for clip in folder.GetClipList() or []:
-        if clip.GetName() == name:
-            return clip
-    for sub in folder.GetSubFolderList() or []:
-        found = _find_clip(sub, name)
-        if found:
-            return found
-    return None
-
-
-def _find_folder(folder, name):
-    """Recursively find a folder by name."""
-    if folder.GetName() == name:
-        return folder
-    for sub in folder.GetSubFolderList() or []:
-        found = _find_folder(sub, name)
-        if found:
-            return found
-    return None
@@ -8,6 +8,7 @@ from typing import Optional
 
 from .config import mcp
 from .errors import safe_resolve_call
+from .item_cache import item_cache
 from .resolve import _boilerplate
 
 
@@ -42,6 +43,7 @@ def resolve_insert_generator(generator_name: str, duration: float = 5.0,
             "duration": round(duration * fps),
             "trackIndex": track_index}
     r = tl.InsertGeneratorIntoTimeline(info)
+    item_cache.bump()
     return f"Generator '{generator_name}' inserted ({duration}s)." if r \
         else f"Failed — check generator name."
 
@@ -66,6 +68,7 @@ def resolve_insert_title(title_name: str, duration: float = 5.0,
             "duration": round(duration * fps),
             "trackIndex": track_index}
     r = tl.InsertTitleIntoTimeline(info)
+    item_cache.bump()
     return f"Title '{title_name}' inserted." if r else "Failed."
 
 
@@ -87,6 +90,7 @@ def resolve_insert_fusion_title(title_name: str, duration: float = 5.0,
             "duration": round(duration * fps),
             "trackIndex": track_index}
     r = tl.InsertFusionTitleIntoTimeline(info)
+    item_cache.bump()
     return f"Fusion title '{title_name}' inserted." if r else "Failed."
 
 
@@ -108,6 +112,7 @@ def resolve_insert_fusion_generator(generator_name: str, duration: float = 5.0,
             "duration": round(duration * fps),
             "trackIndex": track_index}
     r = tl.InsertFusionGeneratorIntoTimeline(info)
+    item_cache.bump()
     return f"Fusion generator '{generator_name}' inserted." if r else "Failed."
 
 
@@ -126,6 +131,7 @@ def resolve_insert_fusion_composition(track_index: int = 1,
     fps = float(tl.GetSetting("timelineFrameRate") or 24)
     info = {"duration": round(duration * fps), "trackIndex": track_index}
     r = tl.InsertFusionCompositionIntoTimeline(info)
+    item_cache.bump()
     return "Fusion composition inserted." if r else "Failed."
 
 
@@ -152,6 +158,7 @@ def resolve_insert_ofx_generator(generator_name: str, plugin_id: str,
             "duration": round(duration * fps),
             "trackIndex": track_index}
     r = tl.InsertOFXGeneratorIntoTimeline(info)
+    item_cache.bump()
     return f"OFX generator inserted." if r else "Failed."
 
 
@@ -165,6 +172,7 @@ def resolve_detect_scene_cuts() -> str:
     _, project, _ = _boilerplate()
     tl = _tl(project)
     r = tl.DetectSceneCuts()
+    item_cache.bump()
     if r and isinstance(r, list):
         return f"{len(r)} scene cut(s) detected:\n" + \
             "\n".join(f"  frame {f}" for f in r[:50])
@@ -203,7 +211,7 @@ def resolve_apply_drx_grade(drx_path: str, track_type: str = "video",
     """
     _, project, _ = _boilerplate()
     tl = _tl(project)
-    items = tl.GetItemListInTrack(track_type.lower(), int(track_index)) or []
+    items = item_cache.items(tl, track_type, track_index)
     if not items:
         return "No items on track."
     if item_index > 0:
@@ -259,4 +267,5 @@ def resolve_import_into_timeline(file_path: str,
         opts = {}
     r = tl.ImportIntoTimeline(file_path, opts) if opts \
         else tl.ImportIntoTimeline(file_path)
+    item_cache.bump()
     return f"Imported into timeline from {file_path}" if r else "Import failed."
@@ -1,9 +1,14 @@
-"""Timeline query and management tools: list, info, switch, duplicate, delete, settings."""
+"""Timeline query and management tools: list, info, snapshot, diff, switch, duplicate, delete, settings."""
 
 import json
+import time
+from pathlib import Path
 
 from .config import mcp
+from .media_index import media_index
 from .resolve import _boilerplate
+from .snapshot import snapshot_cache
+from .timeline_diff import diff_snapshots, load_snapshot
 
 
 def _get_timeline_by_name(project, name: str):
@@ -78,6 +83,94 @@ def resolve_get_timeline_info(timeline_name: str = "") -> str:
     }, indent=2)
 
 
+@mcp.tool
+def resolve_timeline_snapshot(timeline_name: str = "", output_path: str = "", include_properties: bool = True,
+                              if_hash: str = "") -> str:
+    """Capture a whole timeline in one call: tracks, items, source ranges,
+    media paths, properties, markers, flags and clip colors.
+
+    *timeline_name*: timeline to capture (default: current timeline).
+    *output_path*: stream the snapshot to this NDJSON file (one record per
+    line) and return only a summary — use this for long timelines.
+    *include_properties*: include each item's transform/crop/composite
+    properties (the most expensive part of the traversal).
+    *if_hash*: content hash from a previous snapshot; if the timeline still
+    hashes the same, returns ``{"unchanged": true, "hash": ...}`` instead of
+    the data.
+
+    Without *output_path*, returns compact JSON: the timeline header plus
+    ``track_list``, ``items`` and ``hash``.
+    """
+    _, project, _ = _boilerplate()
+    tl = _get_timeline_by_name(project, timeline_name) if timeline_name else project.GetCurrentTimeline()
+    if not tl:
+        return f"Timeline '{timeline_name}' not found." if timeline_name else "No active timeline."
+
+    out = None
+    if output_path and not if_hash:
+        out = Path(output_path).expanduser()
+        out.parent.mkdir(parents=True, exist_ok=True)
+    snap = snapshot_cache.take(tl, include_properties, out_path=out, use_cache=False)
+    if if_hash and snap.hash == if_hash:
+        return json.dumps({"unchanged": True, "hash": snap.hash})
+    if output_path:
+        if out is None:
+            out = Path(output_path).expanduser()
+            out.parent.mkdir(parents=True, exist_ok=True)
+            snap.write_ndjson(out)
+        return json.dumps({**snap.summary(), "path": str(out)})
+    return json.dumps(snap.to_dict(), separators=(",", ":"), default=str)
+
+
+@mcp.tool
+def resolve_diff_timelines(timeline_a: str = "", timeline_b: str = "", snapshot_path: str = "",
+                           include_properties: bool = True, max_entries: int = 200) -> str:
+    """Compare two timelines and report what changed, edit by edit.
+
+    *timeline_a*: the "before" timeline.
+    *timeline_b*: the "after" timeline (default: current timeline).
+    *snapshot_path*: compare against a saved NDJSON snapshot (from
+    ``resolve_timeline_snapshot``) instead of *timeline_a*; the "after" side
+    is then *timeline_b*, else *timeline_a*, else the current timeline.
+    *include_properties*: also compare item properties (transform, crop…);
+    only done when the saved snapshot, if any, includes them too.
+    *max_entries*: cap each change list (0 = no limit).
+
+    Returns JSON with ``inserted``, ``deleted``, ``moved``, ``trimmed``,
+    ``retimed`` and ``changed`` lists, a ``summary`` of counts, the number
+    of items only ``shifted`` by ripples, ``duration_delta`` (frames) and
+    ``track_delta``.  Identical content hashes short-circuit the diff.
+    """
+    _, project, _ = _boilerplate()
+    t0 = time.perf_counter()
+
+    def _timeline(name: str):
+        tl = _get_timeline_by_name(project, name) if name else project.GetCurrentTimeline()
+        if not tl:
+            raise ValueError(f"Timeline '{name}' not found." if name else "No active timeline.")
+        return tl
+
+    try:
+        if snapshot_path:
+            try:
+                before = load_snapshot(snapshot_path)
+            except FileNotFoundError:
+                return f"Snapshot not found: {snapshot_path}"
+            after_tl = _timeline(timeline_b or timeline_a)
+        else:
+            if not timeline_a:
+                return "Provide timeline_a or snapshot_path."
+            before = snapshot_cache.take(_timeline(timeline_a), include_properties)
+            after_tl = _timeline(timeline_b)
+    except ValueError as exc:
+        return str(exc)
+    after = snapshot_cache.take(after_tl, include_properties)
+
+    result = diff_snapshots(before, after, max_entries)
+    result["elapsed_ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+    return json.dumps(result, default=str)
+
+
 @mcp.tool
 def resolve_set_current_timeline(timeline_name: str) -> str:
     """Switch the active timeline by name."""
@@ -117,6 +210,7 @@ def resolve_delete_timelines(timeline_names: str) -> str:
     if not timelines:
         return f"No matching timelines found. Missing: {', '.join(missing)}"
     result = media_pool.DeleteTimelines(timelines)
+    media_index.invalidate()
     msg = f"Deleted {len(timelines)} timeline(s)."
     if missing:
         msg += f" Not found: {', '.join(missing)}."
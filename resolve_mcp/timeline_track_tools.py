@@ -1,6 +1,7 @@
 """Timeline track management and export tools: add/delete/name/enable/lock tracks, export, subtitles."""
 
 from .config import mcp
+from .item_cache import item_cache
 from .resolve import _boilerplate
 from .timeline_query_tools import _get_timeline_by_name
 
@@ -20,6 +21,7 @@ def resolve_add_track(track_type: str, sub_type: str = "") -> str:
     if track_type not in {"video", "audio", "subtitle"}:
         return "track_type must be 'video', 'audio', or 'subtitle'."
     result = tl.AddTrack(track_type, sub_type if sub_type else "")
+    item_cache.bump()
     return f"Added {track_type} track (now {tl.GetTrackCount(track_type)} total)." if result else f"Failed to add {track_type} track."
 
 
@@ -34,6 +36,7 @@ def resolve_delete_track(track_type: str, track_index: int) -> str:
     if not tl:
         return "No active timeline."
     result = tl.DeleteTrack(track_type.lower(), int(track_index))
+    item_cache.bump()
     return f"Deleted {track_type} track {track_index}." if result else f"Failed to delete {track_type} track {track_index}."
 
 
@@ -115,4 +118,5 @@ def resolve_create_subtitles(track_index: int = 0, language: str = "auto") -> st
     if track_index > 0:
         settings["trackIndex"] = track_index
     result = tl.CreateSubtitlesFromAudio(settings) if settings else tl.CreateSubtitlesFromAudio()
+    item_cache.bump()
     return "Auto-caption generation started." if result else "Auto-caption failed. Requires Resolve Studio and language packs."
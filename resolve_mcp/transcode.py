@@ -1,16 +1,77 @@
 """
 Video transcoding for Gemini upload — downsample to HEVC/AAC MP4 at ≤1280px.
 Uses NVENC on Windows, VideoToolbox on macOS, libx265 as fallback.
+Proxies are stored in ``proxy_cache``, keyed by source content and encode
+settings, never next to the source.
+
+A full re-encode is the last resort: ``plan_for_gemini`` first tries to
+pass the file through, remux it into MP4, re-encode only its audio, or (for
+callers that can upload several files) split it by stream copy, and logs the
+action it chose and the bytes it saved.
+
+Transcodes run on ``transcode_scheduler``: N ffmpeg jobs at once, each
+limited to T threads, shortest source first so the first sidecars appear
+early.  With libx265, T defaults to 4 (a ≤1280px proxy encode stops scaling
+beyond that) and N to cores / T; hardware encoders get 2 jobs, since the
+encoder sessions are the bottleneck.  ``RESOLVE_TRANSCODE_JOBS`` and
+``RESOLVE_TRANSCODE_THREADS`` override either.  Progress comes from
+``ffmpeg -progress``.  A job that reports no progress for
+``RESOLVE_TRANSCODE_STALL_TIMEOUT`` seconds is killed; a long encode that
+keeps moving is never cut off.
+
+One libx265 process stops scaling long before a big machine runs out of
+cores, so libx265 sources of ``RESOLVE_TRANSCODE_SEGMENT_MIN`` seconds or
+more (default 20 min) are encoded as ``RESOLVE_TRANSCODE_SEGMENT_SECONDS``
+chunks (default 5 min).  The chunks queue on the same workers with the job's
+priority, the audio is encoded once in its own pass, and the pieces are
+joined with the concat demuxer by stream copy into the usual proxy.
+``scripts/bench_transcode.py`` compares the two modes.
 """
 
+import contextlib
+import heapq
+import itertools
+import math
+import os
 import platform
 import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
 
-from .config import GEMINI_MAX_BYTES, GEMINI_MAX_LONG_EDGE, SAFE_CODECS, log
-from .ffprobe import ffprobe_codec, ffprobe_duration, ffprobe_resolution
+from .config import GEMINI_CONTAINERS, GEMINI_MAX_BYTES, GEMINI_MAX_LONG_EDGE, SAFE_CODECS, log
+from .execution import check_cancelled
+from .ffprobe import ffprobe_duration, probe
+from .proxy_cache import proxy_cache
+
+# 0 = derive from the core count and encoder (see transcode_slots).
+TRANSCODE_JOBS = int(os.getenv("RESOLVE_TRANSCODE_JOBS", "0"))
+TRANSCODE_THREADS = int(os.getenv("RESOLVE_TRANSCODE_THREADS", "0"))
+# Seconds without an ffmpeg progress report before a job is killed.
+TRANSCODE_STALL_TIMEOUT = float(os.getenv("RESOLVE_TRANSCODE_STALL_TIMEOUT", "300"))
+# Software encodes of sources at least this long are split into chunks (seconds).
+TRANSCODE_SEGMENT_MIN_DURATION = float(os.getenv("RESOLVE_TRANSCODE_SEGMENT_MIN", "1200"))
+# Length of each chunk of a segmented encode (seconds).
+TRANSCODE_SEGMENT_SECONDS = float(os.getenv("RESOLVE_TRANSCODE_SEGMENT_SECONDS", "300"))
+# Most parts a stream-copied source may be split into before a full transcode
+# (which uploads far fewer bytes) is preferred.
+SPLIT_MAX_PARTS = int(os.getenv("RESOLVE_SPLIT_MAX_PARTS", "4"))
+
+# plan_for_gemini() actions, cheapest first.
+ACTIONS = ("pass", "remux", "audio", "split", "transcode")
+# Audio codecs an MP4 can carry by stream copy.
+MP4_AUDIO_CODECS = frozenset({"aac", "mp3", "ac3", "eac3", "alac", "opus"})
+# Bit rates used to estimate output sizes.
+_AAC_BPS = 128_000
+_UNKNOWN_AUDIO_BPS = 320_000
+_PROXY_BPS = 3_000_000
+# Estimates are rough and MP4 adds overhead; keep this far under the limit.
+_SIZE_MARGIN = 0.9
 
 # Windows: prefer the full-build ffmpeg with NVENC support
 _FFMPEG_PATHS = [
@@ -29,7 +90,7 @@ def _find_ffmpeg() -> str:
     raise RuntimeError("ffmpeg not found. Install ffmpeg with NVENC support.")
 
 
-def _detect_hw_encoder() -> Optional[str]:
+def _detect_hw_encoder() -> str | None:
     """Return the best available hardware HEVC encoder, or None."""
     try:
         ffmpeg = _find_ffmpeg()
@@ -54,11 +115,11 @@ def _detect_hw_encoder() -> Optional[str]:
 
 
 # Cache at module load so we don't probe ffmpeg on every file
-_HW_ENCODER: Optional[str] = None
+_HW_ENCODER: str | None = None
 _HW_ENCODER_CHECKED = False
 
 
-def get_hw_encoder() -> Optional[str]:
+def get_hw_encoder() -> str | None:
     global _HW_ENCODER, _HW_ENCODER_CHECKED
     if not _HW_ENCODER_CHECKED:
         _HW_ENCODER = _detect_hw_encoder()
@@ -66,23 +127,80 @@ def get_hw_encoder() -> Optional[str]:
     return _HW_ENCODER
 
 
-def _needs_transcode(video_path: Path) -> bool:
-    """Decide whether a video needs transcoding before Gemini upload."""
-    if video_path.stat().st_size > GEMINI_MAX_BYTES:
-        return True
-    codec = ffprobe_codec(video_path)
-    if codec is None:
-        return True
-    if codec not in SAFE_CODECS:
-        return True
-    w, h = ffprobe_resolution(video_path)
-    if w is not None and h is not None:
-        if max(w, h) > GEMINI_MAX_LONG_EDGE:
-            return True
-    return False
+@dataclass(frozen=True)
+class TranscodePlan:
+    """What ``plan_for_gemini`` chose for one file, and why."""
+
+    action: str  # one of ACTIONS
+    reason: str
+    source_bytes: int
+    est_bytes: int  # estimated upload size
+    parts: int = 1
+
+
+def plan_for_gemini(video_path: Path, allow_split: bool = False) -> TranscodePlan:
+    """Pick the cheapest way to make *video_path* uploadable to Gemini.
+
+    In order of preference:
+
+      pass       upload the source as-is
+      remux      copy the streams into an MP4 (container Gemini rejects)
+      audio      copy the video, re-encode only the audio to AAC (PCM that
+                 an MP4 can't carry, or audio pushing the file over the limit)
+      split      stream-copy into parts under ``GEMINI_MAX_BYTES``; only with
+                 *allow_split*, since the caller must upload every part
+      transcode  downscale and re-encode; the video itself is unusable
+    """
+    size = video_path.stat().st_size
+    info = probe(video_path)
+    duration = info.duration or 0.0
+
+    def plan(action: str, reason: str, est: float, parts: int = 1) -> TranscodePlan:
+        return TranscodePlan(action, reason, size, int(est), parts)
+
+    proxy_bytes = _PROXY_BPS * duration / 8 or size
+    if info.codec is None:
+        return plan("transcode", "no readable video stream", proxy_bytes)
+    if info.codec not in SAFE_CODECS:
+        return plan("transcode", f"{info.codec} video", proxy_bytes)
+    if info.width and info.height and max(info.width, info.height) > GEMINI_MAX_LONG_EDGE:
+        return plan("transcode", f"{info.width}x{info.height} exceeds {GEMINI_MAX_LONG_EDGE}px", proxy_bytes)
+
+    container_ok = video_path.suffix.lower() in GEMINI_CONTAINERS
+    if container_ok and size <= GEMINI_MAX_BYTES:
+        return plan("pass", "accepted as-is", size)
 
+    has_audio = info.channels is not None or info.audio_codec is not None
+    audio_bytes = min(size, (info.audio_bitrate or _UNKNOWN_AUDIO_BPS) * duration / 8) if has_audio else 0
+    aac_bytes = _AAC_BPS * duration / 8 if has_audio else 0
+    copied_bytes = size - audio_bytes + aac_bytes
+    budget = GEMINI_MAX_BYTES * _SIZE_MARGIN
+    over = f"{size / 1e9:.2f} GB, over the {GEMINI_MAX_BYTES / 1e9:.2f} GB upload limit"
 
-def _pick_quality_params(source_path: Path, duration_sec: float) -> list[str]:
+    if size <= budget and (not has_audio or info.audio_codec in MP4_AUDIO_CODECS):
+        return plan("remux", f"{video_path.suffix.lower()} container", size)
+    if copied_bytes <= budget:
+        reason = f"{info.audio_codec or 'unknown'} audio, ~{audio_bytes / 1e6:.0f} MB"
+        return plan("audio", reason if size <= GEMINI_MAX_BYTES else f"{reason}; {over}", copied_bytes)
+    if allow_split:
+        parts = math.ceil(copied_bytes / budget)
+        if parts <= SPLIT_MAX_PARTS:
+            return plan("split", over, copied_bytes, parts)
+    return plan("transcode", over, proxy_bytes)
+
+
+def transcode_slots(hw: str | None, cpus: int | None = None) -> tuple[int, int]:
+    """Return (concurrent jobs, threads per job) for this machine and encoder."""
+    cpus = cpus or os.cpu_count() or 4
+    if hw:
+        # Hardware encoders cap concurrent sessions; threads go to decode/scale.
+        threads = TRANSCODE_THREADS or max(2, min(8, cpus // 4))
+        return TRANSCODE_JOBS or 2, threads
+    threads = TRANSCODE_THREADS or min(4, cpus)
+    return TRANSCODE_JOBS or max(1, cpus // threads), threads
+
+
+def _pick_quality_params(source_path: Path, duration_sec: float, threads: int = 0) -> list[str]:
     """Return ffmpeg encoder + quality flags appropriate to the platform."""
     src_gb = source_path.stat().st_size / (1024 ** 3)
     hw = get_hw_encoder()
@@ -113,42 +231,34 @@ def _pick_quality_params(source_path: Path, duration_sec: float) -> list[str]:
             crf = 28
         else:
             crf = 32
-        return ["-c:v", "libx265", "-preset", "fast", "-crf", str(crf)]
-
+        flags = ["-c:v", "libx265", "-preset", "fast", "-crf", str(crf)]
+        if threads:
+            # Size x265's thread pool to the job's share of the machine.
+            flags += ["-x265-params", f"pools={threads}"]
+        return flags
 
-def prepare_for_gemini(video_path: Path) -> Path:
-    """Return a Gemini-safe file path.
-
-    If the source is already H.264/H.265 at ≤1280px and under 2 GB, return as-is.
-    Otherwise, transcode to HEVC/AAC MP4 and cache as {name}.gemini.mp4.
-    """
-    if not _needs_transcode(video_path):
-        return video_path
 
-    cache_path = video_path.with_suffix(".gemini.mp4")
-    if cache_path.exists():
-        if cache_path.stat().st_size > 0 and ffprobe_duration(cache_path) is not None:
-            return cache_path
-        log.warning("Corrupt proxy %s — re-transcoding", cache_path.name)
-        cache_path.unlink()
+def _encode_settings(source_path: Path, duration_sec: float) -> str:
+    """Everything about the encode that changes the proxy; part of its cache key."""
+    flags = " ".join(_pick_quality_params(source_path, duration_sec))
+    return f"{flags} long_edge={GEMINI_MAX_LONG_EDGE} yuv420p aac/128k"
 
-    duration = ffprobe_duration(video_path) or 300.0
-    encoder_flags = _pick_quality_params(video_path, duration)
-    hw = get_hw_encoder() or "libx265"
 
-    log.info("Transcoding %s → %s (%s)", video_path.name, cache_path.name, hw)
+_SCALE_FILTER = (
+    f"scale='min(1,{GEMINI_MAX_LONG_EDGE}/max(iw,ih))*iw':"
+    f"'min(1,{GEMINI_MAX_LONG_EDGE}/max(iw,ih))*ih',"
+    f"scale=trunc(iw/2)*2:trunc(ih/2)*2"
+)
+_FFMPEG_FLAGS = ["-y", "-nostats", "-progress", "pipe:1"]
 
-    scale_filter = (
-        f"scale='min(1,{GEMINI_MAX_LONG_EDGE}/max(iw,ih))*iw':"
-        f"'min(1,{GEMINI_MAX_LONG_EDGE}/max(iw,ih))*ih',"
-        f"scale=trunc(iw/2)*2:trunc(ih/2)*2"
-    )
 
-    ffmpeg = _find_ffmpeg()
+def _encode_flags(job: "TranscodeJob", threads: int) -> tuple[list[str], list[str]]:
+    """Video encode flags split into (before ``-i``, after ``-i``)."""
+    encoder_flags = _pick_quality_params(job.source, job.duration, threads)
 
     # NVENC encoder_flags already include -hwaccel cuda, so we need to
     # split: hwaccel flags go before -i, encoder flags after.
-    pre_input = []
+    pre_input = ["-threads", str(threads)] if threads else []
     post_input = []
     it = iter(encoder_flags)
     for flag in it:
@@ -156,34 +266,524 @@ def prepare_for_gemini(video_path: Path) -> Path:
             pre_input.extend([flag, next(it)])
         else:
             post_input.append(flag)
+    return pre_input, post_input
 
-    cmd = [
-        ffmpeg, "-y",
+
+def _ffmpeg_command(job: "TranscodeJob", threads: int) -> list[str]:
+    pre_input, post_input = _encode_flags(job, threads)
+    return [
+        _find_ffmpeg(), *_FFMPEG_FLAGS,
         *pre_input,
-        "-i", str(video_path),
-        "-vf", scale_filter,
+        "-i", str(job.source),
+        "-vf", _SCALE_FILTER,
         *post_input,
         "-pix_fmt", "yuv420p",
         "-c:a", "aac", "-b:a", "128k",
         "-movflags", "+faststart",
         "-map_metadata", "-1",
-        str(cache_path),
+        str(job.partial),
     ]
 
-    try:
-        subprocess.run(cmd, capture_output=True, text=True, timeout=3600, check=True)
-    except FileNotFoundError:
-        raise RuntimeError(
-            "ffmpeg not found. Install ffmpeg with NVENC support."
-        )
-    except subprocess.CalledProcessError as exc:
-        raise RuntimeError(f"ffmpeg transcode failed for {video_path.name}: {exc.stderr[:500]}")
-
-    if cache_path.stat().st_size > GEMINI_MAX_BYTES:
-        log.warning(
-            "%s is still %.1f GB after transcode — Gemini may reject it.",
-            cache_path.name,
-            cache_path.stat().st_size / (1024 ** 3),
+
+def _copy_command(job: "TranscodeJob", output: str, split_seconds: float = 0.0) -> list[str]:
+    """Stream-copy the video into an MP4 (remux/audio/split actions)."""
+    info = probe(job.source)
+    assert job.plan is not None  # copy actions always come from a plan
+    if job.plan.action == "remux":
+        audio = ["-c:a", "copy"]
+    else:
+        audio = ["-c:a", "aac", "-b:a", "128k"]
+    if split_seconds:
+        muxer = [
+            "-f", "segment", "-segment_time", f"{split_seconds:.3f}", "-reset_timestamps", "1",
+            "-segment_format", "mp4", "-segment_format_options", "movflags=+faststart",
+        ]
+    else:
+        muxer = ["-movflags", "+faststart"]
+    return [
+        _find_ffmpeg(), *_FFMPEG_FLAGS,
+        "-i", str(job.source),
+        "-map", "0:v:0", "-map", "0:a:0?",
+        "-c:v", "copy", *(["-tag:v", "hvc1"] if info.codec in ("hevc", "h265") else []),
+        *audio,
+        "-map_metadata", "-1",
+        *muxer,
+        output,
+    ]
+
+
+def segment_plan(duration: float, fps: float | None, hw: str | None) -> list[tuple[float, int | None]]:
+    """Chunks for a segmented encode as (start seconds, frame count), or [] to encode in one process.
+
+    Only software (libx265) encodes of sources of at least
+    ``TRANSCODE_SEGMENT_MIN_DURATION`` seconds are split.  Chunks are a whole
+    number of frames long, so they join without a gap or a repeated frame;
+    the last one runs to the end of the source.
+    """
+    if hw or not fps or duration < TRANSCODE_SEGMENT_MIN_DURATION:
+        return []
+    frames = max(1, round(TRANSCODE_SEGMENT_SECONDS * fps))
+    count = math.ceil(duration * fps / frames)
+    if count < 2:
+        return []
+    return [(i * frames / fps, frames if i < count - 1 else None) for i in range(count)]
+
+
+class _Segment:
+    """One chunk of a segmented encode (or its audio pass), queued like a job."""
+
+    def __init__(self, job: "TranscodeJob", index: int, start: float, frames: int | None, path: Path):
+        self.job = job
+        self.index = index
+        self.start = start
+        self.frames = frames
+        self.path = path
+        self.out_time = 0.0
+        self.speed: float | None = None
+        self.last_progress = 0.0
+
+    @property
+    def is_audio(self) -> bool:
+        return self.index < 0
+
+    def command(self, threads: int) -> list[str]:
+        job = self.job
+        if self.is_audio:
+            return [
+                _find_ffmpeg(), *_FFMPEG_FLAGS, "-i", str(job.source),
+                "-vn", "-c:a", "aac", "-b:a", "128k", "-map_metadata", "-1", str(self.path),
+            ]
+        pre_input, post_input = _encode_flags(job, threads)
+        # Seeking before -i decodes from the keyframe preceding `start` and
+        # drops frames up to it, so every chunk starts exactly on its frame
+        # and opens with a keyframe of its own.
+        return [
+            _find_ffmpeg(), *_FFMPEG_FLAGS,
+            *pre_input,
+            "-ss", f"{self.start:.6f}", "-i", str(job.source),
+            *(["-frames:v", str(self.frames)] if self.frames else []),
+            "-vf", _SCALE_FILTER,
+            *post_input,
+            "-pix_fmt", "yuv420p",
+            "-an", "-map_metadata", "-1",
+            str(self.path),
+        ]
+
+
+def _concat_command(job: "TranscodeJob", listing: Path, audio: Path | None) -> list[str]:
+    return [
+        _find_ffmpeg(), *_FFMPEG_FLAGS,
+        "-f", "concat", "-safe", "0", "-i", str(listing),
+        *(["-i", str(audio), "-map", "0:v", "-map", "1:a"] if audio else []),
+        "-c", "copy",
+        "-movflags", "+faststart",
+        "-map_metadata", "-1",
+        str(job.partial),
+    ]
+
+
+class TranscodeJob:
+    """One proxy transcode: queued, running, then done or failed."""
+
+    def __init__(
+        self, source: Path, output: Path, duration: float, priority: float, key: str = "",
+        plan: TranscodePlan | None = None,
+    ):
+        self.source = source
+        self.output = output
+        self.key = key
+        self.plan = plan
+        self.parts: list[Path] = []
+        self.partial = output.with_name(f".{output.stem}.part.mp4")
+        self.duration = duration
+        self.priority = priority
+        self.state = "queued"
+        self.out_time = 0.0
+        self.speed: float | None = None
+        self.error: Exception | None = None
+        self.queued_at = time.monotonic()
+        self.started_at = 0.0
+        self.finished_at = 0.0
+        self.last_progress = 0.0
+        self.segments: list[_Segment] = []
+        self._pending = 0
+        self.done = threading.Event()
+
+    @classmethod
+    def finished(
+        cls, path: Path, error: Exception | None = None, parts: list[Path] | None = None, key: str = "",
+    ) -> "TranscodeJob":
+        """An already-complete job (no transcode needed, cached, or it could not be planned)."""
+        job = cls(path, path, 0.0, 0.0, key)
+        job.parts = parts if parts and len(parts) > 1 else []
+        job._finish(error)
+        return job
+
+    @property
+    def encoded(self) -> float:
+        """Seconds of the source encoded so far."""
+        if self.segments:
+            return sum(seg.out_time for seg in self.segments if not seg.is_audio)
+        return self.out_time
+
+    @property
+    def percent(self) -> float:
+        if self.state == "done":
+            return 100.0
+        return round(min(99.9, 100.0 * self.encoded / self.duration), 1) if self.duration else 0.0
+
+    def _finish(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.state = "failed" if error else "done"
+        self.finished_at = time.monotonic()
+        self.done.set()
+
+    def result(self) -> Path:
+        """Wait for the proxy and return its path; raises RuntimeError if the transcode failed.
+
+        Inside a tool call, a cancelled client stops the wait (the transcode
+        carries on and its proxy is reused next time).
+        """
+        while not self.done.wait(0.5):
+            check_cancelled()
+        if self.error is not None:
+            raise self.error
+        return self.parts[0] if self.parts else self.output
+
+    def result_parts(self) -> list[Path]:
+        """Like ``result()``, but every file of a split upload, in order."""
+        first = self.result()
+        return self.parts or [first]
+
+    def release(self) -> None:
+        """Drop one pin on this job's proxy, taken by ``submit(pin=True)``."""
+        if self.key:
+            proxy_cache.unpin(self.key)
+
+    def describe(self) -> dict:
+        info = {
+            "file": self.source.name,
+            "action": self.plan.action if self.plan else None,
+            "state": self.state,
+            "percent": self.percent,
+            "speed": self.speed,
+            "duration_s": round(self.duration, 1),
+        }
+        if self.segments:
+            info["segments"] = len(self.segments)
+            info["segments_left"] = self._pending
+        return info
+
+
+class TranscodeScheduler:
+    """Runs proxy transcodes on a bounded set of workers, shortest source first."""
+
+    def __init__(self, jobs: int | None = None, threads: int | None = None):
+        self._jobs_override = jobs
+        self._threads_override = threads
+        self.jobs = 0
+        self.threads = 0
+        self._cond = threading.Condition()
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._active: dict[Path, TranscodeJob] = {}
+        self._workers: list[threading.Thread] = []
+        self._completed = 0
+        self._failed = 0
+        self._actions: Counter = Counter()
+        self._bytes_saved = 0
+
+    def _configure(self) -> None:
+        if not self.jobs:
+            jobs, threads = transcode_slots(get_hw_encoder())
+            self.jobs = self._jobs_override or jobs
+            self.threads = self._threads_override or threads
+
+    def submit(
+        self, video_path: Path, priority: float | None = None, allow_split: bool = False, pin: bool = False,
+    ) -> TranscodeJob:
+        """Queue the cheapest Gemini-safe conversion of *video_path* and return its job.
+
+        ``plan_for_gemini`` picks the action.  Sources Gemini accepts as-is,
+        and sources already in ``proxy_cache``, come back as already-finished
+        jobs.  *priority* defaults to the source duration, so short clips go
+        first.  With *allow_split*, an oversized source may become several
+        files (see ``TranscodeJob.result_parts``).  With *pin*, the proxy
+        (every part of a split) is kept from eviction until the caller, done
+        with it, calls ``job.release()`` — whether the job succeeds or not.
+        """
+        video_path = Path(video_path)
+        try:
+            plan = plan_for_gemini(video_path, allow_split)
+            log.info(
+                "%s: %s (%s), %.0f MB → ~%.0f MB",
+                video_path.name, plan.action, plan.reason, plan.source_bytes / 1e6, plan.est_bytes / 1e6,
+            )
+            if plan.action == "pass":
+                with self._cond:
+                    self._actions["pass"] += 1
+                return TranscodeJob.finished(video_path)
+            duration = ffprobe_duration(video_path) or 300.0
+            if plan.action == "transcode":
+                settings = _encode_settings(video_path, duration)
+            else:
+                settings = f"{plan.action} parts={plan.parts} aac/128k"
+            key = proxy_cache.key(video_path, settings)
+        except OSError as exc:
+            return TranscodeJob.finished(video_path, RuntimeError(f"Cannot transcode {video_path.name}: {exc}"))
+
+        output = proxy_cache.path_for(key)
+        if pin:
+            proxy_cache.pin(key)
+        with self._cond:
+            job = self._active.get(output)
+            if job is not None:
+                return job
+        cached = proxy_cache.get_parts(key)
+        if cached is not None:
+            return TranscodeJob.finished(cached[0], parts=cached, key=key)
+
+        job = TranscodeJob(video_path, output, duration, duration if priority is None else priority, key, plan)
+        with self._cond:
+            if output in self._active:
+                return self._active[output]
+            proxy_cache.pin(key)  # the scheduler's own pin, dropped once _done has measured the proxy
+            self._configure()
+            self._active[output] = job
+            heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+            if len(self._workers) < self.jobs:
+                worker = threading.Thread(target=self._loop, name=f"resolve-transcode-{len(self._workers)}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+        return job
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                task = heapq.heappop(self._heap)[2]
+                task.last_progress = time.monotonic()
+                if isinstance(task, TranscodeJob):
+                    task.state = "running"
+                    task.started_at = task.last_progress
+            if isinstance(task, _Segment):
+                self._run_segment(task)
+                continue
+            try:
+                if task.plan and task.plan.action != "transcode":
+                    self._run_copy(task)
+                    self._done(task)
+                    continue
+                plan = segment_plan(task.duration, probe(task.source).fps, get_hw_encoder())
+                if plan:
+                    self._queue_segments(task, plan)
+                    continue
+                self._run(task)
+            except Exception as exc:
+                self._done(task, exc)
+            else:
+                self._done(task)
+
+    def _done(self, job: TranscodeJob, error: Exception | None = None) -> None:
+        if error is not None and not isinstance(error, RuntimeError):
+            error = RuntimeError(f"Transcode of {job.source.name} failed: {error}")
+        saved = 0
+        try:
+            if error is None and job.plan:
+                written = sum(p.stat().st_size for p in (job.parts or [job.output]))
+                saved = job.plan.source_bytes - written
+                log.info(
+                    "%s: %s done, %.0f MB → %.0f MB (saved %.0f MB)",
+                    job.source.name, job.plan.action, job.plan.source_bytes / 1e6, written / 1e6, saved / 1e6,
+                )
+        except OSError as exc:
+            error = RuntimeError(f"Proxy for {job.source.name} vanished after transcode: {exc}")
+        finally:
+            proxy_cache.unpin(job.key)
+        with self._cond:
+            self._active.pop(job.output, None)
+            self._failed += error is not None
+            self._completed += error is None
+            if error is None and job.plan:
+                self._actions[job.plan.action] += 1
+                self._bytes_saved += saved
+        job._finish(error)
+
+    def _ffmpeg(self, cmd: list[str], task, output: Path, what: str) -> None:
+        """Run one ffmpeg command, feeding its progress into *task*; raises RuntimeError on failure."""
+        with tempfile.TemporaryFile(mode="w+") as stderr:
+            try:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr, text=True)
+            except FileNotFoundError:
+                raise RuntimeError("ffmpeg not found. Install ffmpeg with NVENC support.")
+            reader = threading.Thread(target=_read_progress, args=(proc, task), daemon=True)
+            reader.start()
+            stalled = False
+            while proc.poll() is None:
+                try:
+                    proc.wait(timeout=1.0)
+                except subprocess.TimeoutExpired:
+                    if time.monotonic() - task.last_progress > TRANSCODE_STALL_TIMEOUT:
+                        stalled = True
+                        proc.kill()
+                        proc.wait()
+            reader.join(timeout=5)
+            if stalled or proc.returncode != 0:
+                output.unlink(missing_ok=True)
+                if stalled:
+                    raise RuntimeError(
+                        f"ffmpeg {what} stalled for {_task_source(task).name} "
+                        f"(no progress for {TRANSCODE_STALL_TIMEOUT:.0f} s)"
+                    )
+                stderr.seek(0)
+                raise RuntimeError(f"ffmpeg {what} failed for {_task_source(task).name}: {stderr.read()[-500:]}")
+
+    def _run(self, job: TranscodeJob) -> None:
+        hw = get_hw_encoder() or "libx265"
+        log.info("Transcoding %s → %s (%s, %d threads)", job.source.name, job.output.name, hw, self.threads)
+        job.partial = proxy_cache.partial_path(job.key)
+        self._ffmpeg(_ffmpeg_command(job, self.threads), job, job.partial, "transcode")
+        self._store(job)
+
+    def _run_copy(self, job: TranscodeJob) -> None:
+        """Remux, audio-only re-encode or split: the video is stream-copied."""
+        plan = job.plan
+        assert plan is not None  # _loop only sends planned copy jobs here
+        log.info("%s %s → proxy cache (video stream copy)", plan.action.capitalize(), job.source.name)
+        job.partial = proxy_cache.partial_path(job.key)
+        if plan.action != "split":
+            self._ffmpeg(_copy_command(job, str(job.partial)), job, job.partial, plan.action)
+            self._store(job)
+            return
+        workdir = job.partial.with_name(f".{job.key}.split")
+        workdir.mkdir(parents=True, exist_ok=True)
+        try:
+            cmd = _copy_command(job, str(workdir / "%02d.mp4"), job.duration / plan.parts)
+            self._ffmpeg(cmd, job, workdir / "00.mp4", "split")
+            job.parts = proxy_cache.put_parts(job.key, sorted(workdir.glob("*.mp4")), job.source)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        for part in job.parts:
+            if part.stat().st_size > GEMINI_MAX_BYTES:
+                log.warning("%s is %.1f GB — Gemini may reject it.", part.name, part.stat().st_size / (1024 ** 3))
+
+    def _store(self, job: TranscodeJob) -> None:
+        proxy_cache.put(job.key, job.partial, job.source)
+
+        if job.output.stat().st_size > GEMINI_MAX_BYTES:
+            log.warning(
+                "%s is still %.1f GB after transcode — Gemini may reject it.",
+                job.output.name,
+                job.output.stat().st_size / (1024 ** 3),
+            )
+
+    # -- segmented encodes ----------------------------------------------------
+
+    def _queue_segments(self, job: TranscodeJob, plan: list) -> None:
+        """Queue *job* as parallel chunks (plus one audio pass) with the job's priority."""
+        job.partial = proxy_cache.partial_path(job.key)
+        workdir = job.partial.with_name(f".{job.key}.segments")
+        workdir.mkdir(parents=True, exist_ok=True)
+        job.segments = [
+            _Segment(job, i, start, frames, workdir / f"{i:04d}.mp4") for i, (start, frames) in enumerate(plan)
+        ]
+        if probe(job.source).channels:
+            job.segments.append(_Segment(job, -1, 0.0, None, workdir / "audio.m4a"))
+        job._pending = len(job.segments)
+        log.info(
+            "Transcoding %s in %d segments of %.0f s (libx265, %d threads each)",
+            job.source.name, len(plan), TRANSCODE_SEGMENT_SECONDS, self.threads,
         )
+        with self._cond:
+            for seg in job.segments:
+                heapq.heappush(self._heap, (job.priority, next(self._seq), seg))
+            self._cond.notify_all()
+
+    def _run_segment(self, seg: _Segment) -> None:
+        job = seg.job
+        if job.error is None:
+            try:
+                self._ffmpeg(seg.command(self.threads), seg, seg.path, "segment encode")
+            except Exception as exc:
+                job.error = exc  # remaining chunks of this job are skipped
+        with self._cond:
+            job._pending -= 1
+            last = job._pending == 0
+        if last:
+            self._join(job)
+
+    def _join(self, job: TranscodeJob) -> None:
+        """Concatenate a segmented job's chunks by stream copy and store the proxy."""
+        workdir = job.segments[0].path.parent
+        error = job.error
+        try:
+            if error is None:
+                video = [seg.path for seg in job.segments if not seg.is_audio]
+                audio = next((seg.path for seg in job.segments if seg.is_audio), None)
+                listing = workdir / "segments.txt"
+                listing.write_text("".join("file '{}'\n".format(str(p).replace("'", "'\\''")) for p in video))
+                self._ffmpeg(_concat_command(job, listing, audio), job, job.partial, "segment join")
+                self._store(job)
+        except Exception as exc:
+            error = exc
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        self._done(job, error)
 
-    return cache_path
+    def stats(self) -> dict:
+        """Worker layout, queue depth and the state of every active job."""
+        with self._cond:
+            active = sorted(self._active.values(), key=lambda j: (j.state != "running", j.priority))
+            return {
+                "jobs": self.jobs,
+                "threads_per_job": self.threads,
+                "queued": len(self._heap),
+                "completed": self._completed,
+                "failed": self._failed,
+                "actions": dict(self._actions),
+                "bytes_saved": self._bytes_saved,
+                "active": [j.describe() for j in active],
+            }
+
+
+def _task_source(task) -> Path:
+    return task.job.source if isinstance(task, _Segment) else task.source
+
+
+def _read_progress(proc: subprocess.Popen, job) -> None:
+    """Parse ``ffmpeg -progress`` key=value lines into *job* (a job or one of its segments)."""
+    stdout = proc.stdout
+    if stdout is None:  # started without stdout=PIPE
+        return
+    for line in stdout:
+        key, _, value = line.strip().partition("=")
+        job.last_progress = time.monotonic()
+        if key in ("out_time_us", "out_time_ms"):  # both are microseconds
+            with contextlib.suppress(ValueError):
+                job.out_time = max(job.out_time, int(value) / 1_000_000)
+        elif key == "speed" and value.endswith("x"):
+            with contextlib.suppress(ValueError):
+                job.speed = float(value[:-1])
+
+
+# Process-wide scheduler shared by ingest and the AI tools.
+transcode_scheduler = TranscodeScheduler()
+
+
+@contextlib.contextmanager
+def prepare_for_gemini(video_path: Path) -> Iterator[Path]:
+    """Yield a Gemini-safe file path, kept from eviction until the block exits.
+
+    If the source is already H.264/H.265 at ≤1280px and under 2 GB, yield it as-is.
+    Otherwise, transcode to HEVC/AAC MP4 and yield the proxy in ``proxy_cache``.
+    Upload it inside the ``with`` block.  The transcode runs on
+    ``transcode_scheduler``; to overlap several, submit them there first and
+    collect each job's ``result()``.
+    """
+    job = transcode_scheduler.submit(video_path, pin=True)
+    try:
+        yield job.result()
+    finally:
+        job.release()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: how long a fresh interpreter takes to import the server.
+
+Each sample runs ``import resolve_mcp`` in a new Python process, the way an
+MCP client spawns the server per session.  The FastMCP server framework import
+is timed separately so the server's own share (tool modules, registration) can
+be tracked on its own.
+
+    python scripts/bench_startup.py                     # median of 5 runs
+    python scripts/bench_startup.py --top 15            # plus slowest imports
+    python scripts/bench_startup.py --budget-ms 800     # fail above budget
+    python scripts/bench_startup.py --profile color     # one tool profile
+
+``--budget-ms`` applies to the server's own share (total minus FastMCP).
+The report also lists heavy optional dependencies that were imported at
+start-up; those should load on first use only.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# What a bare FastMCP server costs to import; the server's own share is the rest.
+FRAMEWORK_MODULE = "fastmcp.server.server"
+# Imported on first use only; finding one at start-up is a regression.
+LAZY_MODULES = ("google.genai", "opentimelineio", "PIL")
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - t0) * 1000.0
+extra = {{}}
+if "{module}" == "resolve_mcp":
+    import asyncio
+    from mcp.types import ListToolsResult
+    tools = asyncio.run(resolve_mcp.mcp.list_tools())
+    extra["tools"] = len(tools)
+    manifest = ListToolsResult(tools=[t.to_mcp_tool(name=t.name) for t in tools])
+    extra["manifest_kb"] = round(len(manifest.model_dump_json(by_alias=True, exclude_none=True)) / 1024, 1)
+    extra["lazy_loaded"] = [m for m in {lazy!r} if m in sys.modules]
+print(elapsed, __import__("json").dumps(extra))
+"""
+
+
+def _sample(module: str, env: dict) -> tuple[float, dict]:
+    out = (
+        subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, lazy=LAZY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=ROOT,
+            env=env,
+        )
+        .stdout.strip()
+        .splitlines()[-1]
+    )
+    ms, extra = out.split(" ", 1)
+    return float(ms), json.loads(extra)
+
+
+def measure(runs: int = 5, env: dict | None = None) -> dict:
+    """Median cold import times (ms) of FastMCP and of the whole server."""
+    env = {**os.environ, **(env or {})}
+    framework = [_sample(FRAMEWORK_MODULE, env)[0] for _ in range(runs)]
+    total, extra = [], {}
+    for _ in range(runs):
+        ms, extra = _sample("resolve_mcp", env)
+        total.append(ms)
+    fw, tot = statistics.median(framework), statistics.median(total)
+    return {
+        "runs": runs,
+        "framework_ms": round(fw, 1),
+        "total_ms": round(tot, 1),
+        "own_ms": round(tot - fw, 1),
+        "tools": extra.get("tools"),
+        "manifest_kb": extra.get("manifest_kb"),
+        "lazy_loaded": extra.get("lazy_loaded", []),
+    }
+
+
+def slowest_imports(top: int, env: dict | None = None) -> list[tuple[str, float]]:
+    """Largest self times (ms) from ``-X importtime`` for one cold import."""
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import resolve_mcp"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+        env={**os.environ, **(env or {})},
+    ).stderr
+    rows = []
+    for line in err.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[0].startswith("import time:") and parts[0].split(":")[1].strip().isdigit():
+            rows.append((parts[2].strip(), int(parts[0].split(":")[1]) / 1000.0))
+    return sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest imports")
+    parser.add_argument("--profile", help="tool profile to load (default: RESOLVE_PROFILE or full)")
+    parser.add_argument("--budget-ms", type=float, help="fail if the server's own import time exceeds this")
+    args = parser.parse_args(argv)
+
+    # A key makes config.py set up the Gemini client, the costly path.
+    env = {"GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY", "bench-placeholder")}
+    if args.profile:
+        env["RESOLVE_PROFILE"] = args.profile
+    report = measure(args.runs, env)
+    if args.top:
+        report["slowest_imports_ms"] = slowest_imports(args.top, env)
+    print(json.dumps(report, indent=2))
+
+    failed = False
+    if report["lazy_loaded"]:
+        print(f"Loaded at start-up but should be lazy: {', '.join(report['lazy_loaded'])}", file=sys.stderr)
+        failed = True
+    if args.budget_ms is not None and report["own_ms"] > args.budget_ms:
+        print(f"Own import time {report['own_ms']} ms exceeds budget {args.budget_ms} ms", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
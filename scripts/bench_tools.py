@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Scale benchmarks for the tool layer, run against the in-memory Resolve simulator.
+
+Times representative tools on synthetic projects of 1k/10k/50k media pool
+clips and 500/5k-item timelines, and counts the Resolve scripting calls each
+one makes.  Every case is measured cold (all server caches dropped) and warm
+(median of the repeats that follow).
+
+    python scripts/bench_tools.py                       # full matrix
+    python scripts/bench_tools.py --quick               # 1k clips x 500 items
+    python scripts/bench_tools.py --save scripts/bench_baseline.json
+    python scripts/bench_tools.py --compare scripts/bench_baseline.json
+
+``--compare`` exits non-zero when a case makes more API calls than the
+baseline, or its time exceeds the baseline by more than ``--tolerance``
+(ratio) plus ``--slack-ms``.  API call counts are deterministic; wall times
+depend on the machine, so re-save the baseline when changing hardware.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from resolve_mcp import simulator  # noqa: E402
+
+os.environ["RESOLVE_SCRIPT_API"] = simulator.SCRIPT_API_DIR
+
+from resolve_mcp import resources  # noqa: E402
+from resolve_mcp.color_ai_tools import _export_timeline_frames  # noqa: E402
+from resolve_mcp.connection import connection  # noqa: E402
+from resolve_mcp.item_cache import item_cache  # noqa: E402
+from resolve_mcp.marker_tools import resolve_list_markers  # noqa: E402
+from resolve_mcp.media_index import bin_tree, media_index  # noqa: E402
+from resolve_mcp.media_pool_query_tools import resolve_get_clip_info, resolve_search_clips  # noqa: E402
+from resolve_mcp.resolve_build import build_timeline_direct  # noqa: E402
+from resolve_mcp.snapshot import snapshot_cache  # noqa: E402
+from resolve_mcp.timeline_query_tools import resolve_get_timeline_info  # noqa: E402
+
+CLIP_SIZES = (1_000, 10_000, 50_000)
+ITEM_SIZES = (500, 5_000)
+BUILD_CUTS = 100
+# Sources not yet in the media pool, imported by the build-with-imports case.
+BUILD_NEW_SOURCES = 20
+
+
+def _drop_caches() -> None:
+    connection.invalidate()
+    media_index.reset()
+    bin_tree.invalidate()
+    item_cache.bump()
+    snapshot_cache.invalidate()
+
+
+def _api_calls() -> int:
+    return sum(simulator.sim.calls.values())
+
+
+def _cases(resolve) -> dict:
+    """Return ``{case name: zero-arg callable}`` for one generated project."""
+    project = resolve.GetProjectManager().GetCurrentProject()
+    root = project.GetMediaPool().GetRootFolder()
+    clips = []
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        clips.extend(folder._clips)
+        stack.extend(folder._subs)
+    target = clips[len(clips) // 2]
+    paths = [c._props["File Path"] for c in clips[:: max(1, len(clips) // BUILD_CUTS)][:BUILD_CUTS]]
+    plan = {
+        "timeline_name": "Bench Build",
+        "cuts": [{"source_file": p, "start_sec": 0, "end_sec": 2} for p in paths],
+    }
+    timeline = project.GetCurrentTimeline()
+    frames_dir = tempfile.mkdtemp(prefix="bench_frames_")
+
+    def build(edit_plan=plan):
+        ok, msg = build_timeline_direct(edit_plan, resolve)
+        # Keep the project the same size across repeats.
+        project.SetCurrentTimeline(timeline)
+        mp = project.GetMediaPool()
+        extra = [project.GetTimelineByIndex(i) for i in range(2, project.GetTimelineCount() + 1)]
+        mp.DeleteTimelines(extra)
+        return msg
+
+    runs = iter(range(1_000_000))
+
+    def build_with_imports():
+        # Fresh sources every run, so each one misses the index and is imported.
+        run = next(runs)
+        new = [f"/media/new/N{run:04d}_{i:02d}.mov" for i in range(BUILD_NEW_SOURCES)]
+        cuts = plan["cuts"][: BUILD_CUTS - BUILD_NEW_SOURCES]
+        cuts = cuts + [{"source_file": p, "start_sec": 0, "end_sec": 2} for p in new]
+        return build({"timeline_name": "Bench Import Build", "cuts": cuts})
+
+    return {
+        "resolve_search_clips": lambda: resolve_search_clips(target.GetName()[:-4]),
+        "resolve_get_clip_info": lambda: resolve_get_clip_info(target.GetName()),
+        "build_timeline_direct": build,
+        "build_timeline_imports": build_with_imports,
+        "resolve_list_markers": resolve_list_markers,
+        "resolve_get_timeline_info": resolve_get_timeline_info,
+        "resolve://bins": resources.resource_bins,
+        "resolve://timelines": resources.resource_timelines,
+        "_export_timeline_frames": lambda: _export_timeline_frames(project, timeline, frames_dir),
+    }
+
+
+def _measure(fn, repeats: int) -> dict:
+    _drop_caches()
+    calls0, t0 = _api_calls(), time.perf_counter()
+    fn()
+    cold_ms = (time.perf_counter() - t0) * 1000.0
+    cold_calls = _api_calls() - calls0
+
+    warm_ms, warm_calls = [], []
+    for _ in range(repeats):
+        calls0, t0 = _api_calls(), time.perf_counter()
+        fn()
+        warm_ms.append((time.perf_counter() - t0) * 1000.0)
+        warm_calls.append(_api_calls() - calls0)
+    return {
+        "cold_ms": round(cold_ms, 3),
+        "cold_api_calls": cold_calls,
+        "warm_ms": round(statistics.median(warm_ms), 3) if warm_ms else None,
+        "warm_api_calls": max(warm_calls) if warm_calls else None,
+    }
+
+
+def run(clip_sizes, item_sizes, repeats: int, latency_ms: float, only=None) -> dict:
+    simulator.sim.latency_ms = latency_ms
+    results: dict = {}
+    for n_clips in clip_sizes:
+        for n_items in item_sizes:
+            key = f"clips={n_clips},items={n_items}"
+            t0 = time.perf_counter()
+            resolve = simulator.generate_project(
+                bins=max(10, n_clips // 200),
+                clips=n_clips,
+                items=n_items,
+                markers=n_items // 5,
+                seed=0,
+            )
+            simulator.install(resolve)
+            print(f"{key}: generated in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+            results[key] = {}
+            for name, fn in _cases(resolve).items():
+                if only and name not in only:
+                    continue
+                results[key][name] = r = _measure(fn, repeats)
+                print(
+                    f"  {name:28s} cold {r['cold_ms']:10.2f} ms / {r['cold_api_calls']:7d} calls"
+                    f"   warm {r['warm_ms'] or 0:10.2f} ms / {r['warm_api_calls'] or 0:7d} calls",
+                    file=sys.stderr,
+                )
+    simulator.install(None)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "latency_ms": latency_ms,
+            "repeats": repeats,
+            "date": time.strftime("%Y-%m-%d"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float, slack_ms: float) -> list[str]:
+    """Return human-readable regressions of *current* against *baseline*."""
+    problems = []
+    for key, cases in current["results"].items():
+        for name, now in cases.items():
+            then = baseline.get("results", {}).get(key, {}).get(name)
+            if not then:
+                continue
+            for phase in ("cold", "warm"):
+                calls_now, calls_then = now.get(f"{phase}_api_calls"), then.get(f"{phase}_api_calls")
+                if calls_now is not None and calls_then is not None and calls_now > calls_then:
+                    problems.append(f"{key} {name} {phase}: API calls {calls_then} -> {calls_now}")
+                ms_now, ms_then = now.get(f"{phase}_ms"), then.get(f"{phase}_ms")
+                if ms_now is not None and ms_then is not None and ms_now > ms_then * tolerance + slack_ms:
+                    problems.append(f"{key} {name} {phase}: {ms_then:.2f} ms -> {ms_now:.2f} ms")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clips", type=int, nargs="+", default=list(CLIP_SIZES))
+    parser.add_argument("--items", type=int, nargs="+", default=list(ITEM_SIZES))
+    parser.add_argument("--quick", action="store_true", help="only 1k clips x 500 items")
+    parser.add_argument("--only", nargs="+", help="run only these cases")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated cost per scripting call")
+    parser.add_argument("--save", help="write results to this baseline JSON file")
+    parser.add_argument("--compare", help="compare against this baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed time ratio vs baseline")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="absolute time allowance per case")
+    args = parser.parse_args(argv)
+
+    clip_sizes, item_sizes = ([1_000], [500]) if args.quick else (args.clips, args.items)
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run(clip_sizes, item_sizes, args.repeats, args.latency_ms, args.only)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.save}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        problems = compare(report, baseline, args.tolerance, args.slack_ms)
+        for line in problems:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if problems:
+            return 1
+        print("No regressions against baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
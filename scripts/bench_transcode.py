@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Transcode benchmark: one libx265 process against the segmented encode.
+
+Encodes the same source into a throwaway proxy cache twice, once as a single
+ffmpeg process and once split into ``--segment-seconds`` chunks spread over
+``--jobs`` workers, and reports wall time, proxy size and speed-up.  Both runs
+use libx265, the only encoder that is segmented; hardware encoders are left
+out.  Requires ffmpeg and ffprobe.
+
+    python scripts/bench_transcode.py interview.mov
+    python scripts/bench_transcode.py --synthetic 30        # generated 30-minute 1080p clip
+    python scripts/bench_transcode.py clip.mov --segment-seconds 120 --jobs 8
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from resolve_mcp import transcode  # noqa: E402
+from resolve_mcp.ffprobe import ffprobe_duration  # noqa: E402
+from resolve_mcp.proxy_cache import ProxyCache  # noqa: E402
+
+
+def synthetic_source(minutes: float, folder: Path) -> Path:
+    """A 1080p25 test pattern with a tone, long enough to be segmented."""
+    path = folder / f"synthetic_{minutes:g}min.mp4"
+    seconds = minutes * 60
+    subprocess.run(
+        [
+            transcode._find_ffmpeg(),
+            "-y",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=size=1920x1080:rate=25:duration={seconds}",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:duration={seconds}",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-crf",
+            "28",
+            "-c:a",
+            "aac",
+            "-shortest",
+            str(path),
+        ],
+        check=True,
+    )
+    return path
+
+
+def encode(source: Path, folder: Path, segmented: bool, jobs: int | None, threads: int | None) -> dict:
+    """Transcode *source* once in the given mode; returns timings and output facts."""
+    transcode.proxy_cache = ProxyCache(str(folder / ("segmented" if segmented else "single")))
+    transcode.TRANSCODE_SEGMENT_MIN_DURATION = 0.0 if segmented else float("inf")
+    scheduler = transcode.TranscodeScheduler(jobs=jobs, threads=threads)
+    t0 = time.perf_counter()
+    job = scheduler.submit(source)
+    proxy = job.result()
+    wall = time.perf_counter() - t0
+    return {
+        "wall_s": round(wall, 2),
+        "realtime_x": round(job.duration / wall, 2),
+        "segments": len([s for s in job.segments if not s.is_audio]) or 1,
+        "workers": scheduler.jobs,
+        "threads_per_worker": scheduler.threads,
+        "proxy_mb": round(proxy.stat().st_size / 1e6, 1),
+        "proxy_duration_s": ffprobe_duration(proxy),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("source", nargs="?", type=Path, help="video to transcode")
+    parser.add_argument("--synthetic", type=float, metavar="MINUTES", help="generate a test clip instead")
+    parser.add_argument("--segment-seconds", type=float, default=transcode.TRANSCODE_SEGMENT_SECONDS)
+    parser.add_argument("--jobs", type=int, help="workers (default: RESOLVE_TRANSCODE_JOBS or cores / 4)")
+    parser.add_argument("--threads", type=int, help="threads per worker (default: RESOLVE_TRANSCODE_THREADS or 4)")
+    args = parser.parse_args(argv)
+    if not args.source and not args.synthetic:
+        parser.error("give a source file or --synthetic MINUTES")
+
+    # Both modes on libx265, whatever hardware encoder this machine has.
+    transcode._HW_ENCODER, transcode._HW_ENCODER_CHECKED = None, True
+    transcode.plan_for_gemini = lambda path, allow_split=False: transcode.TranscodePlan(
+        "transcode",
+        "benchmark",
+        path.stat().st_size,
+        0,
+    )
+    transcode.TRANSCODE_SEGMENT_SECONDS = args.segment_seconds
+
+    with tempfile.TemporaryDirectory(prefix="resolve-bench-") as tmp:
+        folder = Path(tmp)
+        source = args.source or synthetic_source(args.synthetic, folder)
+        single = encode(source, folder, False, args.jobs, args.threads)
+        segmented = encode(source, folder, True, args.jobs, args.threads)
+    report = {
+        "source": str(source),
+        "duration_s": ffprobe_duration(source) if args.source else args.synthetic * 60,
+        "single": single,
+        "segmented": segmented,
+        "speedup": round(single["wall_s"] / segmented["wall_s"], 2),
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""
+Shared fixtures.
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Keep the persistent caches out of ~/.cache for the whole session.  Set
+# before resolve_mcp is imported, since the cache paths are read at import.
+_CACHE_DIR = tempfile.mkdtemp(prefix="resolve-mcp-tests-")
+os.environ["RESOLVE_PROBE_CACHE"] = os.path.join(_CACHE_DIR, "probe.sqlite3")
+os.environ["RESOLVE_PROXY_CACHE"] = os.path.join(_CACHE_DIR, "proxies")
+
+from resolve_mcp.simulator import SCRIPT_API_DIR, generate_project, install  # noqa: E402
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_CACHE_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def simulated(monkeypatch):
+    """Install a small generated project and route the connection to it."""
+    from resolve_mcp.connection import connection
+    from resolve_mcp.item_cache import item_cache
+    from resolve_mcp.media_index import bin_tree, media_index
+
+    monkeypatch.setenv("RESOLVE_SCRIPT_API", SCRIPT_API_DIR)
+    resolve = install(generate_project(bins=4, clips=40, timelines=2, items=12, markers=3, seed=1))
+    connection.invalidate()
+    media_index.reset()
+    bin_tree.invalidate()
+    item_cache.bump()
+    yield resolve
+    install(None)
+    connection.invalidate()
@@ -0,0 +1,88 @@
+"""
+Batch tests — resolve_batch runs steps in order and stops at failed steps,
+including failures reported as result text rather than raised.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from resolve_mcp.errors import is_failure
+
+
+def _batch(steps, **kwargs):
+    import resolve_mcp  # noqa: F401 — registers every tool
+    from resolve_mcp.batch_tools import resolve_batch
+
+    return json.loads(asyncio.run(resolve_batch(json.dumps(steps), **kwargs)))
+
+
+GOOD = {
+    "tool": "resolve_set_item_properties",
+    "args": {"track_type": "video", "track_index": 1, "item_index": 1, "properties_json": '{"ZoomX": 1.2}'},
+}
+OUT_OF_RANGE = {
+    "tool": "resolve_set_item_properties",
+    "args": {"track_type": "video", "track_index": 1, "item_index": 999, "properties_json": "{}"},
+}
+MISSING_CLIP = {"tool": "resolve_clip_replace", "args": {"clip_name": "nope.mov", "new_file_path": "/x.mov"}}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Error: DaVinci Resolve is not running.",
+        "No active timeline.",
+        "No items on video track 2.",
+        "Item index 999 out of range (1–12).",
+        "Clip 'nope.mov' not found.",
+        "Could not determine track type and index.",
+        "Relink returned failure. Relinked 2 clip(s).",
+        '{"error": "Timeline \'X\' not found."}',
+    ],
+)
+def test_failures_detected(text):
+    assert is_failure(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Property updates:\n  ZoomX=1.2: OK",
+        "Relinked 3 clip(s) to '/media'. Not found: A001.",
+        '{"ran": 2, "ok": 2, "failed": 0}',
+        "2 timeline(s):\n  Timeline 1",
+    ],
+)
+def test_successes_not_flagged(text):
+    assert not is_failure(text)
+
+
+class TestResolveBatch:
+    def test_stops_at_text_failure(self, simulated):
+        out = _batch([GOOD, OUT_OF_RANGE, GOOD])
+        assert (out["ran"], out["ok"], out["failed"], out["stopped_at"]) == (2, 1, 1, 1)
+        assert "out of range" in out["steps"][1]["result"]
+
+    def test_continues_when_asked(self, simulated):
+        out = _batch([MISSING_CLIP, {"tool": "no_such_tool"}, GOOD], stop_on_error=False)
+        assert [s["ok"] for s in out["steps"]] == [False, False, True]
+        assert out["stopped_at"] is None
+
+    def test_failed_steps_count_as_errors_in_metrics(self, simulated):
+        from resolve_mcp.metrics import metrics
+
+        before = metrics.snapshot()["tools"].get("resolve_clip_replace", {}).get("errors", 0)
+        _batch([MISSING_CLIP])
+        assert metrics.snapshot()["tools"]["resolve_clip_replace"]["errors"] == before + 1
+
+    def test_steps_share_one_ping(self, simulated, monkeypatch):
+        from resolve_mcp.connection import connection
+
+        monkeypatch.setattr(connection, "ping_interval", 0.0)
+        connection.get()
+        before = connection.stats()["pings"]
+        out = _batch([GOOD, GOOD, GOOD])
+        assert out["ok"] == 3
+        assert connection.stats()["pings"] == before + 1  # the batch's own health check
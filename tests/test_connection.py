@@ -0,0 +1,91 @@
+"""
+Connection tests — one cached handle, health-check pings and reconnects,
+against the Resolve simulator.
+"""
+
+import threading
+import time
+
+import pytest
+
+from resolve_mcp import execution
+from resolve_mcp.connection import ResolveConnection
+from resolve_mcp.simulator import SCRIPT_API_DIR, Resolve, generate_project, install
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    monkeypatch.setenv("RESOLVE_SCRIPT_API", SCRIPT_API_DIR)
+    install(generate_project(bins=1, clips=1, items=1))
+    yield ResolveConnection(ping_interval=0.0, ping_timeout=1.0)
+    install(None)
+
+
+class TestResolveConnection:
+    def test_one_handle_until_a_ping_fails(self, conn, monkeypatch):
+        conn.ping_interval = 60.0
+        handle = conn.get()
+        assert handle is not None and conn.get() is handle
+        assert conn.project_manager(handle) is conn.project_manager()
+        assert conn.stats()["cache_hits"] >= 2 and conn.stats()["pings"] == 0
+
+        conn.ping_interval = 0.0
+        assert conn.get() is handle
+        monkeypatch.setattr(Resolve, "GetVersionString", lambda self: None)  # Resolve restarted
+        fresh = conn.get()
+        assert fresh is not None and fresh is not handle
+        stats = conn.stats()
+        assert (stats["pings"], stats["ping_failures"], stats["connects"], stats["reconnects"]) == (2, 1, 2, 1)
+
+    def test_hold_skips_pings(self, conn):
+        with conn.hold() as handle:
+            for _ in range(5):
+                assert conn.get() is handle
+        assert conn.stats()["pings"] == 0
+
+    def test_hold_is_per_context(self, conn):
+        with conn.hold():
+            other = threading.Thread(target=conn.get)  # an unrelated call keeps pinging
+            other.start()
+            other.join()
+        assert conn.stats()["pings"] == 1
+
+    def test_not_running(self, conn):
+        install(None)
+        conn.invalidate()
+        conn._module = type("NoResolve", (), {"scriptapp": staticmethod(lambda app: None)})
+        assert conn.get() is None and conn.project_manager() is None
+        assert conn.stats()["connect_failures"] >= 1
+
+    def test_ping_survives_cancelled_tool_call(self, conn):
+        handle = conn.get()
+        call = execution.ToolCall("resolve_list_timelines")
+        call.cancelled.set()
+        token = execution._call.set(call)
+        try:
+            assert conn.get() is handle  # pinged, not reconnected
+        finally:
+            execution._call.reset(token)
+        stats = conn.stats()
+        assert (stats["pings"], stats["ping_failures"], stats["reconnects"]) == (1, 0, 0)
+
+    def test_slow_ping_does_not_hold_the_lock(self, conn, monkeypatch):
+        handle = conn.get()
+        started = threading.Event()
+
+        def slow_version(self):
+            started.set()
+            time.sleep(0.3)
+            return "19.0"
+
+        monkeypatch.setattr(Resolve, "GetVersionString", slow_version)
+        results = []
+        pinger = threading.Thread(target=lambda: results.append(conn.get()))
+        pinger.start()
+        assert started.wait(1.0)
+        t0 = time.monotonic()
+        assert conn.stats()["connected"]
+        assert time.monotonic() - t0 < 0.1  # not blocked behind the ping
+        assert conn.get() is handle  # waits for the ping in flight instead of sending another
+        pinger.join()
+        assert results == [handle] and conn.stats()["pings"] == 1
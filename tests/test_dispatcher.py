@@ -0,0 +1,131 @@
+"""
+Dispatcher tests — priority ordering, re-entrancy and error propagation.
+"""
+
+import threading
+import time
+
+import pytest
+
+from resolve_mcp.dispatcher import BACKGROUND, INTERACTIVE, URGENT, ResolveDispatcher, runs_on_executor
+
+
+@pytest.fixture
+def dispatcher():
+    return ResolveDispatcher(grace=0.0, enabled=True)
+
+
+def _block(dispatcher):
+    """Occupy the executor until the returned event is set."""
+    gate, busy = threading.Event(), threading.Event()
+
+    def hold():
+        busy.set()
+        gate.wait(5)
+
+    dispatcher.submit(hold)
+    busy.wait(5)
+    return gate
+
+
+class TestDispatcher:
+    def test_priority_order(self, dispatcher):
+        gate = _block(dispatcher)
+        order = []
+        jobs = [
+            dispatcher.submit(order.append, "bg1", priority=BACKGROUND),
+            dispatcher.submit(order.append, "bg2", priority=BACKGROUND),
+            dispatcher.submit(order.append, "ui", priority=INTERACTIVE),
+            dispatcher.submit(order.append, "ping", priority=URGENT),
+        ]
+        assert dispatcher.stats()["queue_depth"] == 4
+        gate.set()
+        for job in jobs:
+            assert job.wait(5)
+        assert order == ["ping", "ui", "bg1", "bg2"]
+        assert dispatcher.stats()["preemptions"] == 2
+
+    def test_context_priority(self, dispatcher):
+        gate = _block(dispatcher)
+        with dispatcher.priority(BACKGROUND):
+            job = dispatcher.submit(lambda: None)
+        assert job.priority == BACKGROUND
+        gate.set()
+        job.wait(5)
+        assert dispatcher.stats()["priorities"]["background"]["calls"] == 1
+
+    def test_nested_call_runs_inline(self, dispatcher):
+        def outer():
+            assert dispatcher.on_executor()
+            return dispatcher.call(lambda: "inner")
+
+        assert dispatcher.call(outer) == "inner"
+        assert dispatcher.stats()["inline_calls"] == 1
+
+    def test_long_job_lets_pings_run(self, dispatcher):
+        order = []
+        started, ping_queued = threading.Event(), threading.Event()
+
+        def walk():
+            started.set()
+            ping_queued.wait(5)
+            order.append("bin 1")
+            assert dispatcher.run_urgent() == 1  # the ping, not the queued tool call
+            order.append("bin 2")
+
+        walking = dispatcher.submit(walk)
+        started.wait(5)
+        tool = dispatcher.submit(order.append, "tool", priority=INTERACTIVE)
+        ping = dispatcher.submit(order.append, "ping", priority=URGENT)
+        ping_queued.set()
+        assert ping.wait(5) and walking.wait(5) and tool.wait(5)
+        assert order == ["bin 1", "ping", "bin 2", "tool"]
+        assert dispatcher.stats()["priorities"]["urgent"]["calls"] == 1
+        assert dispatcher.run_urgent() == 0  # not on the executor: nothing to do
+
+    def test_errors_propagate(self, dispatcher):
+        def boom():
+            raise TypeError("bad argument")
+
+        with pytest.raises(TypeError, match="bad argument"):
+            dispatcher.call(boom)
+        assert dispatcher.stats()["priorities"]["interactive"]["errors"] == 1
+
+    def test_wait_timeout_starts_when_job_runs(self, dispatcher):
+        gate = _block(dispatcher)
+        release = threading.Event()
+        job = dispatcher.submit(release.wait, 5)
+        threading.Timer(0.2, gate.set).start()
+        assert not job.wait(0.1)  # queued for 0.2 s, then runs past the timeout
+        release.set()
+        assert job.wait(5)
+
+    def test_wait_limit_bounds_a_job_that_never_starts(self, dispatcher):
+        gate = _block(dispatcher)
+        job = dispatcher.submit(lambda: "pong", priority=URGENT)
+        t0 = time.monotonic()
+        assert not job.wait(0.05, limit=0.3)
+        assert 0.25 < time.monotonic() - t0 < 1.0
+        gate.set()
+        assert job.wait(5) and job.outcome() == "pong"
+
+    def test_lock_taken_on_executor_does_not_deadlock(self, dispatcher, monkeypatch):
+        from resolve_mcp import dispatcher as dispatch_module
+
+        monkeypatch.setattr(dispatch_module, "dispatcher", dispatcher)
+        lock = threading.Lock()
+
+        @runs_on_executor
+        def locked_lookup():
+            with lock:
+                return dispatcher.call(lambda: "inner")
+
+        # A job already on the executor that needs the same lock.
+        results = []
+        gate = _block(dispatcher)
+        dispatcher.submit(lambda: results.append(locked_lookup()))
+        worker = threading.Thread(target=lambda: results.append(locked_lookup()))
+        worker.start()
+        gate.set()
+        worker.join(5)
+        assert not worker.is_alive() and results == ["inner", "inner"]
@@ -0,0 +1,39 @@
+"""
+Execution tests — work pool context propagation and cancellation.
+"""
+
+import pytest
+
+from resolve_mcp.dispatcher import ResolveDispatcher
+from resolve_mcp.errors import ToolCancelled
+from resolve_mcp.execution import ToolCall, _call, check_cancelled, current_call, map_work
+
+
+@pytest.fixture
+def tool_call():
+    call = ToolCall("test_tool")
+    token = _call.set(call)
+    yield call
+    _call.reset(token)
+
+
+class TestExecution:
+    def test_map_work_keeps_order_and_call(self, tool_call):
+        results = map_work(lambda n: (n * n, current_call()), range(20))
+        assert [r[0] for r in results] == [n * n for n in range(20)]
+        assert all(r[1] is tool_call for r in results)
+
+    def test_cancelled_call_stops_work(self, tool_call):
+        dispatcher = ResolveDispatcher(grace=0.0, enabled=True)
+        assert dispatcher.call(lambda: "ok") == "ok"
+        tool_call.cancelled.set()
+        with pytest.raises(ToolCancelled):
+            check_cancelled()
+        with pytest.raises(ToolCancelled):
+            dispatcher.call(lambda: "ok")
+        with pytest.raises(ToolCancelled):
+            map_work(str, range(5))
+
+    def test_cancellation_is_not_an_exception(self):
+        # Tools' ``except Exception`` handlers must let cancellation through.
+        assert not issubclass(ToolCancelled, Exception)
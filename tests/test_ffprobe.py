@@ -0,0 +1,245 @@
+"""
+ffprobe tests — JSON parsing, the single-run probe cache and its database.
+"""
+
+import json
+import struct
+import subprocess
+import time
+
+import pytest
+
+from resolve_mcp import ffprobe
+from resolve_mcp.bmff import frames_to_tc, read_bmff
+from resolve_mcp.ffprobe import (
+    ProbeResult,
+    ffprobe_audio_info,
+    ffprobe_resolution,
+    parse_probe,
+    probe,
+    probe_many,
+)
+from resolve_mcp.probe_cache import ProbeCache
+
+CAMERA_CLIP = {
+    "streams": [
+        {
+            "codec_type": "video",
+            "codec_name": "H264",
+            "width": 3840,
+            "height": 2160,
+            "r_frame_rate": "30000/1001",
+            "tags": {"timecode": "14:40:52;00"},
+        },
+        {"codec_type": "audio", "codec_name": "aac", "sample_rate": "48000", "channels": 2},
+    ],
+    "format": {"duration": "12.512500", "tags": {"timecode": "00:00:00:00"}},
+}
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    cache = ProbeCache(str(tmp_path / "probe.sqlite3"))
+    monkeypatch.setattr(ffprobe, "probe_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def fake_ffprobe(monkeypatch, db):
+    """Count ffprobe runs and answer with CAMERA_CLIP."""
+    runs = []
+
+    def run(cmd, **kwargs):
+        runs.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(CAMERA_CLIP), stderr="")
+
+    ffprobe.clear_probe_cache()
+    monkeypatch.setattr(ffprobe.subprocess, "run", run)
+    yield runs
+    ffprobe.clear_probe_cache()
+
+
+class TestProbe:
+    def test_parse_camera_clip(self):
+        info = parse_probe(CAMERA_CLIP)
+        assert info.codec == "h264"
+        assert info.duration == pytest.approx(12.5125)
+        assert info.fps == pytest.approx(29.97, abs=0.01)
+        assert info.start_tc == "14:40:52;00"  # stream tag wins over format tag
+        assert (info.width, info.height, info.sample_rate, info.channels) == (3840, 2160, 48000, 2)
+        assert info.audio_codec == "aac"
+
+    def test_parse_audio_only(self):
+        info = parse_probe(
+            {"streams": [{"codec_type": "audio", "sample_rate": "44100", "channels": 1}], "format": {"duration": "3.0"}}
+        )
+        assert info.codec is None and info.fps is None and info.start_tc is None
+        assert (info.sample_rate, info.channels) == (44100, 1)
+        assert parse_probe({}) == ProbeResult() and not parse_probe({}).ok
+
+    def test_one_run_per_file_until_it_changes(self, fake_ffprobe, tmp_path):
+        clip = tmp_path / "A001.mov"
+        clip.write_bytes(b"x")
+        assert probe(clip).codec == "h264"
+        assert ffprobe_resolution(clip) == (3840, 2160)
+        assert ffprobe_audio_info(clip) == (48000, 2)
+        assert len(fake_ffprobe) == 1
+        assert "-show_streams" in fake_ffprobe[0] and "-show_format" in fake_ffprobe[0]
+
+        clip.write_bytes(b"longer")
+        probe(clip)
+        assert len(fake_ffprobe) == 2
+
+    def test_missing_file(self, fake_ffprobe, tmp_path):
+        assert probe(tmp_path / "gone.mov") == ProbeResult()
+        assert ffprobe_audio_info(tmp_path / "gone.mov") == (48000, 2)
+        assert not fake_ffprobe
+
+    def test_failed_run_is_not_cached(self, fake_ffprobe, db, monkeypatch, tmp_path):
+        def failing(cmd, **kwargs):
+            fake_ffprobe.append(cmd)
+            return subprocess.CompletedProcess(cmd, 1, stdout="{}", stderr="Input/output error")
+
+        clip = tmp_path / "A001.mxf"
+        clip.write_bytes(b"x")
+        monkeypatch.setattr(ffprobe.subprocess, "run", failing)
+        assert not probe(clip).ok
+        assert db.stats()["writes"] == 0
+
+        monkeypatch.setattr(
+            ffprobe.subprocess,
+            "run",
+            lambda cmd, **kw: subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(CAMERA_CLIP), stderr=""),
+        )
+        assert probe(clip).codec == "h264"  # probed again once the file reads
+        assert db.stats()["writes"] == 1
+
+    def test_database_survives_restart(self, fake_ffprobe, db, tmp_path):
+        clips = [tmp_path / f"A00{i}.mov" for i in range(3)]
+        for clip in clips:
+            clip.write_bytes(b"x")
+        first = [probe(c) for c in clips]
+        assert len(fake_ffprobe) == 3
+
+        ffprobe.clear_probe_cache()  # as if the server restarted
+        assert list(probe_many(clips).values()) == first
+        assert [probe(c) for c in clips] == first
+        assert len(fake_ffprobe) == 3
+        assert db.stats()["hits"] == 3 and db.stats()["entries"] == 3
+
+        clips[0].write_bytes(b"re-exported")
+        ffprobe.clear_probe_cache()
+        probe_many(clips)
+        assert len(fake_ffprobe) == 4 and db.stats()["hits"] == 5  # stale row is not served
+        clips[1].unlink()
+        clips[2].write_bytes(b"changed")
+        assert db.prune(missing=True) == 2  # one deleted, one changed since its probe
+        assert db.stats()["entries"] == 1
+
+    def test_older_schema_is_dropped(self, tmp_path):
+        path = str(tmp_path / "probe.sqlite3")
+        key = (str(tmp_path / "A001.mov"), 1, 1)
+        old = ProbeCache(path)
+        old.put(key, {"codec": "h264"})
+        old._connect().execute("PRAGMA user_version=2")  # written before fourcc was stored
+        old._connect().commit()
+        assert ProbeCache(path).get(key) is None
+
+    def test_probe_many_runs_concurrently_within_deadline(self, fake_ffprobe, db, monkeypatch, tmp_path):
+        def slow_run(cmd, **kwargs):
+            time.sleep(2 if cmd[-1].endswith("stuck.mov") else 0.2)
+            fake_ffprobe.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(CAMERA_CLIP), stderr="")
+
+        monkeypatch.setattr(ffprobe.subprocess, "run", slow_run)
+        clips = [tmp_path / f"B{i:03}.mov" for i in range(8)] + [tmp_path / "stuck.mov"]
+        for clip in clips:
+            clip.write_bytes(b"x")
+
+        t0 = time.monotonic()
+        results = probe_many(clips + [tmp_path / "missing.mov"], max_workers=9, deadline=1.0)
+        assert time.monotonic() - t0 < 2.0
+        assert list(results) == clips + [tmp_path / "missing.mov"]
+        assert all(results[c].codec == "h264" for c in clips[:-1])
+        assert not results[clips[-1]].ok and not results[tmp_path / "missing.mov"].ok
+
+        # The straggler is not waited for, but its result still lands in the cache.
+        while db.stats()["entries"] < len(clips) and time.monotonic() - t0 < 5:
+            time.sleep(0.05)
+        assert db.stats()["entries"] == len(clips)
+
+
+def _box(kind: bytes, *payload: bytes) -> bytes:
+    body = b"".join(payload)
+    return struct.pack(">I4s", 8 + len(body), kind) + body
+
+
+def _full(kind: bytes, *payload: bytes, version: int = 0) -> bytes:
+    return _box(kind, bytes([version, 0, 0, 0]), *payload)
+
+
+def _track(handler: bytes, timescale: int, entry: bytes, stts=b"", stco=b"") -> bytes:
+    stbl = _box(b"stbl", _full(b"stsd", struct.pack(">I", 1), entry), stts, stco)
+    return _box(
+        b"trak",
+        _box(
+            b"mdia",
+            _full(b"mdhd", struct.pack(">IIII", 0, 0, timescale, 0), b"\0" * 4),
+            _full(b"hdlr", b"\0" * 4, handler, b"\0" * 12),
+            _box(b"minf", stbl),
+        ),
+    )
+
+
+def _camera_mov(tc_frame: int = 1583976, drop_frame: bool = True) -> bytes:
+    """A minimal QuickTime file: 1080p H.264 at 29.97, 48 kHz stereo, tmcd track."""
+    video = _track(
+        b"vide",
+        30000,
+        _box(b"avc1", b"\0" * 6, b"\0\x01", b"\0" * 16, struct.pack(">HH", 1920, 1080), b"\0" * 50),
+        stts=_full(b"stts", struct.pack(">III", 1, 375, 1001)),
+    )
+    audio = _track(
+        b"soun", 48000, _box(b"sowt", b"\0" * 6, b"\0\x01", b"\0" * 8, struct.pack(">HHHHI", 2, 16, 0, 0, 48000 << 16))
+    )
+    mdat = _box(b"mdat", struct.pack(">I", tc_frame))
+    ftyp = _box(b"ftyp", b"qt  ", b"\0" * 4)
+    tc_offset = len(ftyp) + 8
+
+    def tmcd():
+        entry = _box(
+            b"tmcd", b"\0" * 6, b"\0\x01", b"\0" * 4, struct.pack(">IIIBB", 1 if drop_frame else 0, 30000, 1001, 30, 0)
+        )
+        return _track(b"tmcd", 30000, entry, stco=_full(b"stco", struct.pack(">II", 1, tc_offset)))
+
+    moov = _box(b"moov", _full(b"mvhd", struct.pack(">IIII", 0, 0, 600, 7500), b"\0" * 80), video, audio, tmcd())
+    return ftyp + mdat + moov
+
+
+class TestBmff:
+    def test_reads_camera_mov_without_ffprobe(self, fake_ffprobe, tmp_path):
+        clip = tmp_path / "C0001.MOV"
+        clip.write_bytes(_camera_mov())
+        info = probe(clip)
+        assert not fake_ffprobe
+        assert (info.codec, info.fourcc, info.width, info.height) == ("h264", "avc1", 1920, 1080)
+        assert info.duration == pytest.approx(12.5)
+        assert info.fps == pytest.approx(30000 / 1001)
+        assert (info.sample_rate, info.channels) == (48000, 2)
+        assert (info.audio_codec, info.audio_bitrate) == ("pcm_s16le", 48000 * 2 * 16)
+        assert info.start_tc == "14:40:52;00"
+
+    def test_timecode_formatting(self):
+        assert frames_to_tc(1800, 30) == "00:01:00:00"
+        assert frames_to_tc(1800, 30, drop_frame=True) == "00:01:00;02"
+        assert frames_to_tc(17982, 30, drop_frame=True) == "00:10:00;00"
+        assert frames_to_tc(86400 * 24, 24) == "00:00:00:00"
+
+    def test_falls_back_to_ffprobe(self, fake_ffprobe, tmp_path):
+        mxf = tmp_path / "A001.mov"
+        mxf.write_bytes(b"\x06\x0e\x2b\x34" + b"\0" * 64)  # MXF key, misnamed
+        assert read_bmff(mxf) is None
+        assert probe(mxf).codec == "h264" and len(fake_ffprobe) == 1
+        truncated = tmp_path / "B001.mov"
+        truncated.write_bytes(_camera_mov()[:-40])
+        assert read_bmff(truncated) is None
@@ -6,10 +6,20 @@ They catch broken imports, syntax errors, and missing dependencies.
 """
 
 import importlib
+import os
 import pkgutil
+import statistics
+import subprocess
+import sys
+import time
 
 import pytest
 
+# Server's own share of a cold start (ms) on top of a bare FastMCP import.
+STARTUP_BUDGET_MS = float(os.getenv("RESOLVE_STARTUP_BUDGET_MS", "1200"))
+# Loaded on first use only.
+LAZY_MODULES = ("google.genai", "opentimelineio", "PIL")
+
 
 def _iter_tool_modules():
     """Yield (module_name, full_path) for every *_tools.py module in resolve_mcp."""
@@ -88,3 +98,50 @@ class TestToolRegistration:
             except (AttributeError, TypeError):
                 pytest.skip("Could not introspect tool count from FastMCP internals")
         assert tool_count >= 200, f"Expected 200+ tools, got {tool_count}"
+
+
+def _cold_import(code: str, **env) -> tuple[float, str]:
+    """Run *code* in a fresh interpreter; return (wall ms, stdout)."""
+    env = {**os.environ, "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY", "test-placeholder"), **env}
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env).stdout
+    return (time.perf_counter() - t0) * 1000.0, out.strip()
+
+
+class TestColdStart:
+    """Server start-up stays fast: heavy dependencies load on first use."""
+
+    def test_heavy_dependencies_are_lazy(self):
+        _, out = _cold_import(f"import sys, resolve_mcp; print([m for m in {LAZY_MODULES!r} if m in sys.modules])")
+        assert out == "[]"
+
+    def test_cold_start_budget(self):
+        framework = statistics.median(_cold_import("import fastmcp.server.server")[0] for _ in range(3))
+        server = statistics.median(_cold_import("import resolve_mcp")[0] for _ in range(3))
+        assert server - framework <= STARTUP_BUDGET_MS, (
+            f"cold start {server:.0f} ms is {server - framework:.0f} ms over FastMCP "
+            f"(budget {STARTUP_BUDGET_MS:.0f} ms); see scripts/bench_startup.py --top 20"
+        )
+
+
+class TestProfiles:
+    """Tool profiles register only their own tool groups."""
+
+    def test_parse_profile(self):
+        from resolve_mcp.profiles import PROFILES, parse_profile
+
+        assert parse_profile("Edit, color") == {"edit", "color"}
+        assert parse_profile("") == PROFILES["full"]
+        with pytest.raises(ValueError, match="Unknown tool profile"):
+            parse_profile("grading")
+
+    def test_profile_limits_imports(self):
+        _, out = _cold_import(
+            "import asyncio, sys, resolve_mcp; "
+            "print(len(asyncio.run(resolve_mcp.mcp.list_tools())), "
+            "[m for m in ('color_tools', 'render_tools', 'resolve_tools') if 'resolve_mcp.' + m in sys.modules])",
+            RESOLVE_PROFILE="color",
+        )
+        count, loaded = out.split(" ", 1)
+        assert loaded == "['color_tools']"
+        assert 0 < int(count) < 200
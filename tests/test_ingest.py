@@ -0,0 +1,101 @@
+"""
+Ingest pipeline tests — stages overlap, proxies stay bounded, progress contract.
+
+Gemini and the transcode scheduler are replaced by fakes that sleep, so the
+test measures how the stages overlap rather than any real work.
+"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from resolve_mcp import ingest_worker  # noqa: E402
+from resolve_mcp.ffprobe import ProbeResult  # noqa: E402
+from resolve_mcp.transcode import TranscodeJob  # noqa: E402
+
+STAGE_SECONDS = 0.15
+
+
+class FakeScheduler:
+    """Transcodes take STAGE_SECONDS each, two at a time; tracks proxies not yet uploaded."""
+
+    def __init__(self):
+        self.pool = threading.Semaphore(2)
+        self.lock = threading.Lock()
+        self.outstanding = 0
+        self.peak = 0
+
+    def submit(self, path, priority=None, allow_split=False, pin=False):
+        with self.lock:
+            self.outstanding += 1
+            self.peak = max(self.peak, self.outstanding)
+        job = TranscodeJob(path, path.with_suffix(".gemini.mp4"), 1.0, priority or 0)
+
+        def run():
+            with self.pool:
+                time.sleep(STAGE_SECONDS)
+            job._finish(RuntimeError("corrupt source") if "bad" in path.name else None)
+
+        threading.Thread(target=run, daemon=True).start()
+        return job
+
+
+class FakeGemini:
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.files = SimpleNamespace(upload=self.upload, get=None)
+        self.models = SimpleNamespace(generate_content=self.generate_content)
+
+    def upload(self, file):
+        time.sleep(STAGE_SECONDS)
+        with self.scheduler.lock:
+            self.scheduler.outstanding -= 1
+        return SimpleNamespace(name=file, state=SimpleNamespace(name="ACTIVE"))
+
+    def generate_content(self, model, contents, config):
+        time.sleep(STAGE_SECONDS)
+        return SimpleNamespace(text=json.dumps({"summary": contents[0].name}))
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    scheduler = FakeScheduler()
+    monkeypatch.setattr(ingest_worker, "transcode_scheduler", scheduler)
+    monkeypatch.setattr(ingest_worker, "client", FakeGemini(scheduler))
+    monkeypatch.setattr(ingest_worker, "probe_many", lambda paths: {p: ProbeResult(duration=1.0) for p in paths})
+    monkeypatch.setattr(ingest_worker, "probe", lambda p: ProbeResult(duration=1.0, fps=25.0))
+    monkeypatch.setattr(ingest_worker, "INGEST_UPLOADS", 3)
+    monkeypatch.setattr(ingest_worker, "INGEST_ANALYZERS", 3)
+    monkeypatch.setattr(ingest_worker, "INGEST_MAX_PROXIES", 3)
+    return scheduler
+
+
+class TestIngestPipeline:
+    def test_stages_overlap_with_bounded_proxies(self, pipeline, tmp_path):
+        clips = [tmp_path / f"A{i:03}.mov" for i in range(8)] + [tmp_path / "bad.mov", tmp_path / "vo.wav"]
+        for clip in clips:
+            clip.write_bytes(b"x")
+        (tmp_path / "A000.mov.json").write_text("{}")  # already analyzed
+
+        t0 = time.monotonic()
+        ingest_worker._ingest_worker(tmp_path)
+        elapsed = time.monotonic() - t0
+
+        # 9 pending files x 3 stages run back to back would take ~4 s.
+        assert elapsed < 9 * 3 * STAGE_SECONDS / 2
+        assert pipeline.peak <= 3
+
+        progress = json.loads((tmp_path / ".ingest_progress.json").read_text())
+        assert progress["status"] == "complete"
+        assert (progress["completed"], progress["total"]) == (9, 10)
+        assert progress["errors"] == ["bad.mov: corrupt source"]
+        assert not any(progress["stages"].values())
+
+        sidecar = json.loads((tmp_path / "A001.mov.json").read_text())
+        assert sidecar["filename"] == "A001.mov" and sidecar["fps"] == 25.0
+        assert (tmp_path / "vo.wav.json").exists() and not (tmp_path / "bad.mov.json").exists()
@@ -0,0 +1,53 @@
+"""
+Timeline item cache tests — positional and ID lookups against the simulator.
+"""
+
+import pytest
+
+from resolve_mcp.item_cache import TimelineItemCache
+
+
+@pytest.fixture
+def timeline(simulated):
+    return simulated.GetProjectManager().GetCurrentProject().GetCurrentTimeline()
+
+
+class TestTimelineItemCache:
+    def test_track_list_fetched_once(self, timeline):
+        cache = TimelineItemCache(ttl=60.0)
+        items = timeline.GetItemListInTrack("video", 1)
+        assert cache.get(timeline, "video", 1, 1) is items[0]
+        assert cache.get(timeline, "Video", 1, len(items)) is items[-1]
+        assert cache.stats()["list_fetches"] == 1 and cache.stats()["list_hits"] == 1
+        with pytest.raises(ValueError, match="out of range"):
+            cache.get(timeline, "video", 1, len(items) + 1)
+        with pytest.raises(ValueError, match="No items on video track 9"):
+            cache.get(timeline, "video", 9, 1)
+
+    def test_lookup_by_id(self, timeline):
+        cache = TimelineItemCache(ttl=60.0)
+        target = timeline.GetItemListInTrack("audio", 1)[3]
+        assert cache.by_id(timeline, target.GetUniqueId()) is target
+        assert cache.get(timeline, "video", 5, 5, item_id=target.GetUniqueId()) is target
+        assert cache.stats()["id_scans"] == 1 and cache.stats()["id_hits"] == 1
+        with pytest.raises(ValueError, match="No timeline item with ID"):
+            cache.by_id(timeline, "missing")
+
+    def test_bump_refetches(self, timeline):
+        cache = TimelineItemCache(ttl=60.0)
+        first = cache.get(timeline, "video", 1, 1)
+        timeline.DeleteClips([first])
+        assert cache.get(timeline, "video", 1, 1) is first  # stale until bumped
+        cache.bump()
+        assert cache.get(timeline, "video", 1, 1) is not first
+        assert cache.stats()["list_fetches"] == 2
+
+
+class TestItemTools:
+    def test_tool_accepts_item_id(self, simulated, timeline):
+        from resolve_mcp.clip_edit_tools import resolve_set_item_properties
+
+        item = timeline.GetItemListInTrack("video", 1)[2]
+        out = resolve_set_item_properties("video", 1, 99, '{"ZoomX": 1.5}', item_id=item.GetUniqueId())
+        assert out == "Property updates:\n  ZoomX=1.5: OK"
+        assert item.GetProperty("ZoomX") == 1.5
@@ -0,0 +1,139 @@
+"""
+Media pool index tests — lookups by name, stem, path and ID stay correct as
+the simulated pool changes underneath the index.
+"""
+
+import pytest
+
+from resolve_mcp.media_index import find_clip, find_clips, media_index
+from resolve_mcp.simulator import sim
+
+
+@pytest.fixture
+def pool(simulated):
+    return simulated.GetProjectManager().GetCurrentProject().GetMediaPool()
+
+
+class TestMediaPoolIndex:
+    def test_lookup_keys(self, pool):
+        clip = find_clip(pool, "A000_C00004.mov")
+        assert clip is not None
+        assert find_clip(pool, "A000_C00004") is clip
+        assert find_clip(pool, clip.GetClipProperty("File Path")) is clip
+        assert find_clip(pool, clip.GetUniqueId()) is clip
+        found, missing = find_clips(pool, ["A000_C00004", "nope.mov"])
+        assert found == [clip] and missing == ["nope.mov"]
+
+    def test_renamed_clip_is_reindexed(self, pool):
+        clip = find_clip(pool, "A000_C00004.mov")
+        clip.SetClipProperty("Clip Name", "RENAMED.mov")
+        media_index.invalidate()
+        assert find_clip(pool, "RENAMED.mov") is clip
+        assert find_clip(pool, "A000_C00004.mov") is None
+
+        # A miss re-reads every clip once per invalidate(); after that it only
+        # re-checks bin counts, so a rename behind the index's back waits.
+        other = find_clip(pool, "A000_C00008.mov")
+        other.SetClipProperty("Clip Name", "RENAMED_2.mov")
+        calls = sum(sim.calls.values())
+        assert find_clip(pool, "RENAMED_2") is None
+        assert sum(sim.calls.values()) - calls < 20
+        media_index.invalidate()
+        assert find_clip(pool, "RENAMED_2") is other
+
+    def test_imported_clip_found_on_miss(self, pool):
+        folder = pool.GetRootFolder().GetSubFolderList()[0]
+        pool.SetCurrentFolder(folder)
+        assert find_clip(pool, "A000_C00004")  # warm the index
+        walks = media_index.stats()["full_walks"]
+        pool.ImportMedia(["/media/new_take.mov"])
+        assert find_clip(pool, "new_take") is not None
+        assert media_index.stats()["full_walks"] == walks  # bins re-read in place
+
+    def test_walk_lets_pings_run_between_bins(self, pool, monkeypatch):
+        from resolve_mcp.dispatcher import dispatcher
+
+        calls = []
+        monkeypatch.setattr(dispatcher, "run_urgent", lambda: calls.append(1) or 0)
+        media_index.reset()
+        assert find_clip(pool, "A000_C00004")
+        stack, bins = [pool.GetRootFolder()], 0
+        while stack:
+            bins += 1
+            stack.extend(stack.pop().GetSubFolderList())
+        assert len(calls) == bins  # once per bin
+
+    def test_build_registers_imports(self, simulated, pool):
+        from resolve_mcp.resolve_build import build_timeline_direct
+
+        assert find_clip(pool, "A000_C00004")  # warm the index
+        before = media_index.stats()
+        cuts = [{"source_file": f"/media/new/N{i}.mov", "start_sec": 0, "end_sec": 1} for i in range(5)]
+        ok, _ = build_timeline_direct({"cuts": cuts}, simulated)
+        after = media_index.stats()
+        assert ok and after["clips"] == before["clips"] + 5
+        assert after["bins_rewalked"] == before["bins_rewalked"]  # no bin re-read for the imports
+        assert find_clip(pool, "N3") is not None
+
+
+class TestToolsUseStems:
+    def test_create_timeline_from_clip_stems(self, simulated):
+        from resolve_mcp.media_pool_extras import resolve_create_timeline_from_clips
+
+        assert resolve_create_timeline_from_clips("X", "A000_C00004, A000_C00008.mov") == (
+            "Timeline 'X' created with 2 clip(s)."
+        )
+        assert resolve_create_timeline_from_clips("Y", "missing") == "No matching clips found."
+
+
+class TestBinTree:
+    def test_paths_and_ambiguous_names(self, pool):
+        from resolve_mcp.errors import BinAmbiguous
+        from resolve_mcp.media_index import bin_tree
+
+        root = pool.GetRootFolder()
+        first = root.GetSubFolderList()[0]
+        a = pool.AddSubFolder(first, "Dailies")
+        b = pool.AddSubFolder(root, "Dailies")
+        bin_tree.invalidate()
+        assert bin_tree.find(root, f"{first.GetName()}/Dailies") is a
+        assert bin_tree.find(root, f"{root.GetName()}/Dailies") is b  # root name tolerated
+        with pytest.raises(BinAmbiguous, match="matches 2 bins"):
+            bin_tree.find(root, "Dailies")
+        assert bin_tree.paths(root, "Dailies") == sorted(["Dailies", f"{first.GetName()}/Dailies"])
+
+        # Patched in place: no rebuild for a new bin or a deleted one.
+        builds = bin_tree.stats()["builds"]
+        c = pool.AddSubFolder(a, "Selects")
+        bin_tree.added(a, c)
+        assert bin_tree.find(root, "Selects") is c
+        pool.DeleteFolders([b])
+        bin_tree.removed([b])
+        assert bin_tree.find(root, "Dailies") is a
+        assert bin_tree.stats()["builds"] == builds
+
+    def test_tools_report_ambiguous_bins(self, pool):
+        from resolve_mcp.media_index import bin_tree
+        from resolve_mcp.media_pool_edit_tools import resolve_import_media, resolve_move_clips
+        from resolve_mcp.media_pool_query_tools import resolve_search_clips
+        from resolve_mcp.timeline_extras import resolve_move_folders
+
+        root = pool.GetRootFolder()
+        pool.AddSubFolder(root.GetSubFolderList()[0], "Dailies")
+        pool.AddSubFolder(root, "Dailies")
+        bin_tree.invalidate()
+        for out in (
+            resolve_import_media("/media/x.mov", target_bin="Dailies"),
+            resolve_move_clips("A000_C00004", "Dailies"),
+            resolve_search_clips("A000", search_in="Dailies"),
+            resolve_move_folders("Dailies", root.GetName()),
+        ):
+            assert out.startswith("Error: Bin name 'Dailies' matches 2 bins")
+
+    def test_missing_bin_triggers_rebuild(self, pool):
+        from resolve_mcp.media_index import bin_tree
+
+        root = pool.GetRootFolder()
+        assert bin_tree.find(root, "Late Bin") is None
+        late = pool.AddSubFolder(root, "Late Bin")  # added behind the tree's back
+        assert bin_tree.find(root, "Late Bin") is late
@@ -0,0 +1,35 @@
+"""
+Metrics tests — the counting proxy around Resolve handles and per-tool stats.
+"""
+
+from resolve_mcp.metrics import ToolMetrics, _Counted, counted, metrics
+
+
+class TestCountedProxy:
+    def test_calls_counted_and_objects_proxied(self, simulated):
+        resolve = counted(simulated)
+        assert isinstance(resolve, _Counted) and counted(resolve) is resolve
+        with metrics.invocation("test_tool") as inv:
+            project = resolve.GetProjectManager().GetCurrentProject()
+            pool = project.GetMediaPool()
+            folders = pool.GetRootFolder().GetSubFolderList()
+            assert folders and all(isinstance(f, _Counted) for f in folders)
+            assert pool.SetCurrentFolder(folders[0])  # proxies are unwrapped on the way in
+            assert pool.GetCurrentFolder() == folders[0] and hash(pool.GetCurrentFolder()) == hash(folders[0])
+            assert isinstance(project.GetName(), str)
+        assert inv.api_calls == 9
+        stats = metrics.snapshot()["tools"]["test_tool"]
+        assert stats["calls"] >= 1 and stats["api_calls"] >= 9
+
+    def test_none_passes_through(self):
+        assert counted(None) is None
+
+
+class TestToolMetrics:
+    def test_errors_and_percentiles(self):
+        m = ToolMetrics(window=10)
+        for i in range(10):
+            m.record("t", float(i), error=i % 5 == 0)
+        stats = m.snapshot()["tools"]["t"]
+        assert stats["calls"] == 10 and stats["errors"] == 2 and stats["error_rate"] == 0.2
+        assert (stats["p95_ms"], stats["max_ms"]) == (9.0, 9.0)
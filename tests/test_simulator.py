@@ -0,0 +1,174 @@
+"""
+Simulator tests — drive real tools against the in-memory Resolve simulator.
+
+These tests don't require DaVinci Resolve to be running.  They load the
+simulator through ``RESOLVE_SCRIPT_API`` exactly as the server loads Resolve.
+"""
+
+import json
+
+import pytest
+
+from resolve_mcp.simulator import generate_project, sim
+
+
+class TestGenerator:
+    """Synthetic projects have the requested shape."""
+
+    def test_project_shape(self):
+        resolve = generate_project(bins=5, clips=50, timelines=2, items=20, video_tracks=2, seed=3)
+        project = resolve.GetProjectManager().GetCurrentProject()
+        assert project.GetTimelineCount() == 2
+        root = project.GetMediaPool().GetRootFolder()
+        stack, clips, bins = [root], 0, 0
+        while stack:
+            folder = stack.pop()
+            clips += len(folder.GetClipList())
+            subs = folder.GetSubFolderList()
+            bins += len(subs)
+            stack.extend(subs)
+        assert (bins, clips) == (5, 50)
+        tl = project.GetCurrentTimeline()
+        assert tl.GetTrackCount("video") == 2
+        total = sum(len(tl.GetItemListInTrack("video", i)) for i in (1, 2))
+        assert total == 20
+
+    def test_seed_is_deterministic(self):
+        def names(seed):
+            project = generate_project(bins=3, clips=9, seed=seed).GetProjectManager().GetCurrentProject()
+            return [f.GetName() for f in project.GetMediaPool().GetRootFolder().GetSubFolderList()]
+
+        assert names(7) == names(7)
+
+    def test_unimplemented_calls_are_recorded(self):
+        resolve = generate_project(clips=1, items=1)
+        sim.unimplemented.clear()
+        assert resolve.GetProjectManager().GetCurrentProject().GetQuickExportRenderPresets() is None
+        assert sim.unimplemented["Project.GetQuickExportRenderPresets"] == 1
+
+
+class TestToolsOnSimulator:
+    """Tools run end to end against the simulator."""
+
+    def test_list_timelines(self, simulated):
+        from resolve_mcp.timeline_query_tools import resolve_list_timelines
+
+        out = resolve_list_timelines()
+        assert out.startswith("2 timeline(s)")
+
+    def test_marker_round_trip(self, simulated, tmp_path):
+        from resolve_mcp.marker_tools import resolve_export_markers, resolve_import_markers
+
+        out = resolve_import_markers(data='[{"frame": 5, "name": "a"}, {"seconds": 2, "color": "Red"}]')
+        assert out.startswith("Imported 2 of 2")
+        path = tmp_path / "markers.ndjson"
+        resolve_export_markers(str(path), include_clips=False)
+        frames = [json.loads(line)["frame"] for line in path.read_text().splitlines()]
+        assert {5, 48} <= set(frames)
+
+    def test_marker_import_skips_bad_entries(self, simulated):
+        from resolve_mcp.marker_tools import resolve_import_markers
+
+        csv_text = "frame,name,duration,customData\n7,a,2,x1\n9,b,long,x2\n"
+        out = resolve_import_markers(data=csv_text, fmt="csv")
+        assert out.startswith("Imported 1 of 1 csv")
+        assert "1 unparsed" in out and "entry 2: bad duration 'long'" in out
+        tl = simulated.GetProjectManager().GetCurrentProject().GetCurrentTimeline()
+        assert tl.GetMarkers()[7]["customData"] == "x1"
+
+    def test_set_item_properties_bulk(self, simulated):
+        from resolve_mcp.clip_edit_tools import resolve_set_item_properties_bulk
+
+        tl = simulated.GetProjectManager().GetCurrentProject().GetCurrentTimeline()
+        items = tl.GetItemListInTrack("video", 1)
+        items[0].SetClipColor("Orange")
+        items[4].SetClipColor("Orange")
+        items[4].SetClipEnabled(False)
+
+        out = resolve_set_item_properties_bulk('{"ZoomX": 1.5}', name_pattern="*.mp4", dry_run=True)
+        assert out == "Dry run: 3 of 12 item(s) on video track(s) 1 would be updated."
+        assert all(item.GetProperty("ZoomX") != 1.5 for item in items)
+
+        out = resolve_set_item_properties_bulk('{"ZoomX": 1.5, "Bogus": 1}', clip_color="orange")
+        assert out.splitlines() == [
+            "Updated 2 of 12 item(s) on video track(s) 1:",
+            "  ZoomX=1.5: 2 OK, 0 FAILED",
+            "  Bogus=1: 0 OK, 2 FAILED",
+        ]
+        assert [i for i, item in enumerate(items) if item.GetProperty("ZoomX") == 1.5] == [0, 4]
+
+        out = resolve_set_item_properties_bulk('{"Pan": 10}', clip_color="Orange", enabled_state="enabled")
+        assert out.startswith("Updated 1 of 12") and items[0].GetProperty("Pan") == 10
+        out = resolve_set_item_properties_bulk(
+            '{"Pan": 10}', frame_start=items[1].GetStart(), frame_end=items[3].GetStart()
+        )
+        assert out.startswith("Updated 2 of 12")
+        assert resolve_set_item_properties_bulk('{"Pan": 1}', track_range="2") == "No video tracks match '2'."
+        assert resolve_set_item_properties_bulk("[]").startswith("properties_json must be")
+
+    def test_snapshot_and_diff(self, simulated, tmp_path):
+        from resolve_mcp.timeline_query_tools import resolve_diff_timelines, resolve_timeline_snapshot
+
+        path = tmp_path / "tl.ndjson"
+        summary = json.loads(resolve_timeline_snapshot(output_path=str(path)))
+        assert summary["items"] == 24  # 12 video + 12 mirrored audio
+        diff = json.loads(resolve_diff_timelines(snapshot_path=str(path)))
+        assert diff["identical"]
+
+        # The live side taken without properties: nothing is reported as changed.
+        diff = json.loads(resolve_diff_timelines(snapshot_path=str(path), include_properties=False))
+        assert diff["summary"] == dict.fromkeys(diff["summary"], 0) and diff["unchanged"] == 24
+
+    def test_streamed_snapshot_keeps_only_the_summary(self, simulated, tmp_path):
+        from resolve_mcp.snapshot import SnapshotCache
+
+        tl = simulated.GetProjectManager().GetCurrentProject().GetCurrentTimeline()
+        cache = SnapshotCache()
+        streamed = cache.take(tl, out_path=tmp_path / "tl.ndjson")
+        assert [r["type"] for r in streamed.records] == ["timeline"]
+        assert cache.stats()["entries"] == 0
+
+        full = cache.take(tl)
+        assert len(full.records) > 1
+        assert {**streamed.summary(), "taken_at": 0} == {**full.summary(), "taken_at": 0}
+
+    def test_progress_and_cancellation(self, simulated):
+        import asyncio
+
+        from fastmcp import Client
+
+        import resolve_mcp  # noqa: F401 — registers every tool
+        from resolve_mcp.config import mcp
+
+        progress = []
+
+        async def on_progress(done, total, message):
+            progress.append((done, total))
+
+        async def run():
+            async with Client(mcp, progress_handler=on_progress) as client:
+                paths = ",".join(f"/media/import_{i}.mov" for i in range(120))
+                result = await client.call_tool("resolve_import_media", {"file_paths": paths})
+                assert result.content[0].text == "Imported 120 file(s)."
+
+                sim.latency_ms = 5
+                task = asyncio.create_task(client.call_tool("resolve_timeline_snapshot", {}))
+                await asyncio.sleep(0.3)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                await asyncio.sleep(0.2)
+                before = sum(sim.calls.values())
+                await asyncio.sleep(0.2)
+                assert sum(sim.calls.values()) == before  # the cancelled tool stopped
+                sim.latency_ms = 0
+
+                # The session survives the cancellation.
+                result = await client.call_tool("resolve_list_timelines", {})
+                assert result.content[0].text.startswith("2 timeline(s)")
+
+        try:
+            asyncio.run(run())
+        finally:
+            sim.latency_ms = 0
+        assert progress[-1] == (120, 120)
@@ -0,0 +1,51 @@
+"""
+Timeline diff tests — pairing items between snapshots.
+"""
+
+import random
+import time
+
+from resolve_mcp.timeline_diff import _overlap, _pair
+
+
+def _cut(media: str, start: int, end: int) -> dict:
+    return {"media_id": media, "source_start": start, "source_end": end, "start": start, "end": end}
+
+
+def _pair_by_scan(items_a: list, items_b: list) -> list:
+    """Reference for the overlap pass: best overlap by scanning every unpaired A item."""
+    left_a, pairs = list(range(len(items_a))), []
+    for ib, b in enumerate(items_b):
+        same = [ia for ia in left_a if items_a[ia]["media_id"] == b["media_id"]]
+        if same:
+            best = max(same, key=lambda ia: _overlap(items_a[ia], b))
+            if _overlap(items_a[best], b) > 0:
+                left_a.remove(best)
+                pairs.append((best, ib))
+    return sorted(pairs)
+
+
+class TestPair:
+    def test_largest_overlap_wins(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            items_a, items_b = [], []
+            for items in (items_a, items_b):
+                for _ in range(rng.randint(0, 30)):
+                    start = rng.randint(0, 2000)
+                    items.append(_cut(rng.choice("ab"), start, start + rng.randint(1, 300)))
+            pairs, deleted, inserted = _pair(items_a, items_b)
+            expected = _pair_by_scan(items_a, items_b)
+            # Items the overlap pass leaves are then paired by media alone.
+            assert set(expected) <= set(pairs)
+            assert len(pairs) + len(deleted) == len(items_a) and len(pairs) + len(inserted) == len(items_b)
+
+    def test_many_cuts_of_one_source(self):
+        # An interview cut into thousands of pieces, every piece trimmed by one frame.
+        items_a = [_cut("interview", i * 100, i * 100 + 90) for i in range(5000)]
+        items_b = [_cut("interview", i * 100 + 1, i * 100 + 90) for i in range(5000)]
+        t0 = time.perf_counter()
+        pairs, deleted, inserted = _pair(items_a, items_b[::-1])
+        assert time.perf_counter() - t0 < 1.0
+        assert not deleted and not inserted
+        assert all(ia == 4999 - ib for ia, ib in pairs)
@@ -0,0 +1,324 @@
+"""
+Transcode tests — slot sizing, shortest-first order, ffmpeg progress, proxy cache.
+
+ffmpeg is replaced by a small script that prints ``-progress`` output and
+writes the output file, so these run without ffmpeg installed.
+"""
+
+import sys
+import textwrap
+
+import pytest
+
+from resolve_mcp import transcode
+from resolve_mcp.ffprobe import ProbeResult
+from resolve_mcp.proxy_cache import ProxyCache
+from resolve_mcp.transcode import (
+    TranscodeScheduler,
+    plan_for_gemini,
+    prepare_for_gemini,
+    segment_plan,
+    transcode_slots,
+)
+
+GB = 1024**3
+
+FAKE_FFMPEG = """\
+#!{python}
+import sys, time
+args, out = sys.argv[1:], sys.argv[-1]
+inputs = [args[i + 1] for i, a in enumerate(args) if a == "-i"]
+open({log!r}, "a").write(inputs[0] + "\\n")
+if "broken" in inputs[0]:
+    sys.stderr.write("Invalid data found when processing input")
+    sys.exit(1)
+for us in (500000, 1000000):
+    print(f"out_time_us={{us}}", flush=True)
+    print("speed=3.5x", flush=True)
+    time.sleep(0.05)
+print("progress=end", flush=True)
+if "concat" in args:
+    parts = [line.split("'")[1] for line in open(inputs[0])] + inputs[1:]
+    data = b"".join(open(p, "rb").read() for p in parts)
+elif "segment" in args:
+    for i in range(2):
+        open(out % i, "wb").write(b"part%d" % i)
+    sys.exit(0)
+elif "-ss" in args:
+    frames = args[args.index("-frames:v") + 1] if "-frames:v" in args else "end"
+    data = f"video {{args[args.index('-ss') + 1]}} {{frames}}\\n".encode()
+elif "-vn" in args:
+    data = b"audio\\n"
+else:
+    data = b"proxy"
+open(out, "wb").write(data)
+"""
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    proxies = ProxyCache(str(tmp_path / "proxies"))
+    monkeypatch.setattr(transcode, "proxy_cache", proxies)
+    return proxies
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch, cache):
+    """Install the fake ffmpeg; returns a function reading the order sources were started in."""
+    log = tmp_path / "started.log"
+    script = tmp_path / "ffmpeg"
+    script.write_text(textwrap.dedent(FAKE_FFMPEG).format(python=sys.executable, log=str(log)))
+    script.chmod(0o755)
+    monkeypatch.setattr(transcode, "_find_ffmpeg", lambda: str(script))
+    monkeypatch.setattr(transcode, "get_hw_encoder", lambda: None)
+    monkeypatch.setattr(transcode, "ffprobe_duration", lambda p: 2.0)
+    monkeypatch.setattr(transcode, "probe", lambda p: ProbeResult(codec="prores", duration=2.0, fps=25.0, channels=2))
+    return lambda: [line.rsplit("/", 1)[-1] for line in log.read_text().split()]
+
+
+class TestTranscodeScheduler:
+    def test_slots(self, monkeypatch):
+        monkeypatch.setattr(transcode, "TRANSCODE_JOBS", 0)
+        monkeypatch.setattr(transcode, "TRANSCODE_THREADS", 0)
+        assert transcode_slots(None, cpus=32) == (8, 4)
+        assert transcode_slots(None, cpus=2) == (1, 2)
+        assert transcode_slots("hevc_nvenc", cpus=32) == (2, 8)
+        monkeypatch.setattr(transcode, "TRANSCODE_JOBS", 3)
+        assert transcode_slots(None, cpus=32) == (3, 4)
+
+    def test_shortest_first_with_progress(self, fake_ffmpeg, cache, tmp_path):
+        sched = TranscodeScheduler(jobs=1, threads=2)
+        durations = {"first.mov": 1, "long.mov": 900, "short.mov": 5, "mid.mov": 60}
+        clips = {name: tmp_path / name for name in durations}
+        for name, clip in clips.items():
+            clip.write_bytes(name.encode())
+        jobs = [sched.submit(clips[name], priority=d) for name, d in durations.items()]
+        assert sched.submit(clips["long.mov"]) is jobs[1]  # same output: one job
+
+        outputs = [job.result() for job in jobs]
+        assert fake_ffmpeg() == ["first.mov", "short.mov", "mid.mov", "long.mov"]
+        assert all(out.parent == cache.directory and out.read_bytes() == b"proxy" for out in outputs)
+        assert len(set(outputs)) == 4
+        assert not list(tmp_path.glob("*.gemini.mp4")) and not list(cache.directory.glob(".*.part.mp4"))
+        assert jobs[0].out_time == pytest.approx(1.0) and jobs[0].speed == 3.5 and jobs[0].percent == 100.0
+        assert sched.stats()["completed"] == 4 and not sched.stats()["active"]
+        assert cache.stats()["pinned"] == 0  # the scheduler's own pins end with each job
+
+        # A finished proxy is reused without running ffmpeg again.
+        assert sched.submit(clips["short.mov"]).result() == outputs[2]
+        assert len(fake_ffmpeg()) == 4
+
+    def test_prepared_proxy_is_pinned_until_uploaded(self, fake_ffmpeg, cache, monkeypatch, tmp_path):
+        monkeypatch.setattr(transcode, "transcode_scheduler", TranscodeScheduler(jobs=1, threads=1))
+        src = tmp_path / "A001.mov"
+        src.write_bytes(b"x")
+        with prepare_for_gemini(src) as upload_path:
+            assert upload_path.read_bytes() == b"proxy" and cache.stats()["pinned"] == 1
+        assert cache.stats()["pinned"] == 0
+
+    def test_failure_removes_partial_output(self, fake_ffmpeg, cache, tmp_path):
+        src = tmp_path / "broken.mov"
+        src.write_bytes(b"x")
+        job = TranscodeScheduler(jobs=1, threads=1).submit(src)
+        with pytest.raises(RuntimeError, match="Invalid data"):
+            job.result()
+        assert job.state == "failed"
+        assert not any(cache.directory.iterdir()) and cache.stats()["entries"] == 0
+
+    def test_segment_plan(self, monkeypatch):
+        monkeypatch.setattr(transcode, "TRANSCODE_SEGMENT_MIN_DURATION", 1200)
+        monkeypatch.setattr(transcode, "TRANSCODE_SEGMENT_SECONDS", 300)
+        plan = segment_plan(3600.0, 24000 / 1001, None)
+        assert len(plan) == 12 and plan[-1][1] is None
+        assert {frames for _, frames in plan[:-1]} == {7193}  # whole frames, not 300 s
+        assert plan[1][0] == pytest.approx(7193 * 1001 / 24000)
+        assert segment_plan(600.0, 25.0, None) == []  # short source
+        assert segment_plan(3600.0, 25.0, "hevc_nvenc") == []  # hardware encoder
+        assert segment_plan(3600.0, None, None) == []  # unknown frame rate
+
+    def test_segmented_encode_joins_chunks_in_order(self, fake_ffmpeg, cache, monkeypatch, tmp_path):
+        monkeypatch.setattr(transcode, "ffprobe_duration", lambda p: 30.0)
+        monkeypatch.setattr(transcode, "TRANSCODE_SEGMENT_MIN_DURATION", 10)
+        monkeypatch.setattr(transcode, "TRANSCODE_SEGMENT_SECONDS", 8)
+        src = tmp_path / "interview.mov"
+        src.write_bytes(b"x")
+        job = TranscodeScheduler(jobs=3, threads=2).submit(src)
+        proxy = job.result()
+
+        assert proxy.parent == cache.directory
+        assert proxy.read_text().splitlines() == [
+            "video 0.000000 200",
+            "video 8.000000 200",
+            "video 16.000000 200",
+            "video 24.000000 end",
+            "audio",
+        ]
+        assert len(job.segments) == 5 and job.percent == 100.0
+        assert job.encoded == pytest.approx(4.0)  # four video chunks x 1 s of fake progress
+        assert [p.name for p in cache.directory.iterdir() if p.name not in ("index.json", ".index.json.lock")] == [
+            proxy.name
+        ]
+
+
+class TestPlan:
+    @pytest.fixture
+    def clip(self, tmp_path, monkeypatch):
+        """Return a function making a sparse file of a given size with given probe fields."""
+        infos = {}
+        monkeypatch.setattr(transcode, "probe", lambda p: infos[p.name])
+
+        def make(name, size, **info):
+            path = tmp_path / name
+            with open(path, "wb") as fh:
+                fh.truncate(int(size))
+            infos[name] = ProbeResult(
+                **{
+                    "codec": "h264",
+                    "width": 1280,
+                    "height": 720,
+                    "duration": 600.0,
+                    "channels": 2,
+                    "audio_codec": "aac",
+                    **info,
+                }
+            )
+            return path
+
+        return make
+
+    def test_cheapest_action(self, clip):
+        assert plan_for_gemini(clip("a.mp4", 1e8)).action == "pass"
+        assert plan_for_gemini(clip("b.mkv", 1e8)).action == "remux"
+        pcm = clip("c.mkv", 1e8, audio_codec="pcm_s24le", audio_bitrate=48000 * 2 * 24)
+        assert plan_for_gemini(pcm).action == "audio"
+        assert plan_for_gemini(clip("d.mxf", 1e8, codec="prores")).action == "transcode"
+        assert plan_for_gemini(clip("e.mp4", 1e8, width=3840, height=2160)).reason == "3840x2160 exceeds 1280px"
+
+    def test_oversized_sources(self, clip):
+        # 8-channel 24-bit PCM (4.6 Mbit/s) takes a 1-hour 720p file over the limit.
+        loud = clip("f.mov", 2.1 * GB, duration=3600.0, audio_codec="pcm_s24le", audio_bitrate=4_608_000)
+        plan = plan_for_gemini(loud)
+        assert plan.action == "audio" and plan.est_bytes < 0.9 * 2 * GB
+        # Mostly video: split when the caller can take parts, else re-encode.
+        big = clip("g.mp4", 3 * GB, duration=3600.0, audio_bitrate=128_000)
+        assert plan_for_gemini(big).action == "transcode"
+        assert (plan_for_gemini(big, allow_split=True).action, plan_for_gemini(big, allow_split=True).parts) == (
+            "split",
+            2,
+        )
+        assert plan_for_gemini(clip("h.mp4", 20 * GB, duration=3600.0), allow_split=True).action == "transcode"
+
+    def test_remux_and_split_run_by_stream_copy(self, fake_ffmpeg, cache, monkeypatch, tmp_path):
+        sched = TranscodeScheduler(jobs=2, threads=2)
+        mkv = tmp_path / "take1.mkv"
+        mkv.write_bytes(b"mkv")
+        monkeypatch.setattr(
+            transcode,
+            "probe",
+            lambda p: ProbeResult(codec="hevc", width=1280, height=720, duration=2.0, channels=2, audio_codec="aac"),
+        )
+        job = sched.submit(mkv)
+        assert job.plan.action == "remux"
+        proxy = job.result()
+        assert proxy.parent == cache.directory and proxy.read_bytes() == b"proxy"
+
+        big = tmp_path / "long.mp4"
+        with open(big, "wb") as fh:
+            fh.truncate(3 * GB)
+        monkeypatch.setattr(
+            transcode,
+            "probe",
+            lambda p: ProbeResult(codec="h264", width=1280, height=720, duration=3600.0, channels=2, audio_codec="aac"),
+        )
+        job = sched.submit(big, allow_split=True, pin=True)
+        parts = job.result_parts()
+        assert cache.stats()["pinned"] == 1
+        job.release()
+        assert cache.stats()["pinned"] == 0
+        assert job.plan.action == "split" and [p.read_bytes() for p in parts] == [b"part0", b"part1"]
+        assert sched.submit(big, allow_split=True).result_parts() == parts  # served from the cache
+        assert cache.find_parts(big) == parts  # the editing pass uploads every part
+        assert sched.stats()["actions"] == {"remux": 1, "split": 1}
+        assert sched.stats()["bytes_saved"] == 3 * GB + 3 - len(b"proxy") - len(b"part0part1")
+
+
+class TestProxyCache:
+    def test_content_addressed_and_evicted_lru(self, tmp_path):
+        cache = ProxyCache(str(tmp_path / "proxies"), max_gb=250 / 1024**3)
+        sources = []
+        for i in range(3):
+            sources.append(tmp_path / f"C{i}.mov")
+            sources[-1].write_bytes(bytes([i]) * 3000)
+
+        def encode(src, settings="hevc crf=28"):
+            key = cache.key(src, settings)
+            cache.partial_path(key).write_bytes(b"p" * 100)
+            return key, cache.put(key, cache.partial_path(key), src)
+
+        key0, proxy0 = encode(sources[0])
+        assert cache.get(key0) == proxy0 and cache.find_parts(sources[0]) == [proxy0]
+        assert cache.key(sources[0], "hevc crf=32") != key0  # settings are part of the key
+
+        # Same content under another name and folder: same proxy.
+        moved = tmp_path / "card2" / "renamed.mov"
+        moved.parent.mkdir()
+        sources[0].rename(moved)
+        assert cache.key(moved, "hevc crf=28") == key0
+
+        key1, _ = encode(sources[1])
+        cache.get(key0)  # C0 is now the most recently used
+        key2, _ = encode(sources[2])  # 300 bytes > 250: evict C1
+        assert cache.get(key1) is None and cache.get(key0) and cache.get(key2)
+        assert cache.stats()["evicted"] == 1 and cache.stats()["bytes"] == 200
+
+        # The index survives a restart; a damaged proxy is dropped, not served.
+        reopened = ProxyCache(str(tmp_path / "proxies"))
+        assert reopened.get(key2) is not None
+        reopened.path_for(key2).write_bytes(b"truncated")
+        assert reopened.get(key2) is None and not reopened.path_for(key2).exists()
+
+    def test_processes_share_the_index(self, tmp_path):
+        # Two servers on one cache directory: neither overwrites the other's entries.
+        first, second = ProxyCache(str(tmp_path / "proxies")), ProxyCache(str(tmp_path / "proxies"))
+        sources = [tmp_path / f"C{i}.mov" for i in range(2)]
+        keys = []
+        for i, (src, cache) in enumerate(zip(sources, (first, second), strict=True)):
+            src.write_bytes(bytes([i]) * 3000)
+            keys.append(cache.key(src, "remux"))
+            assert cache.get(keys[i]) is None  # both have read the (empty) index
+        for i, cache in enumerate((first, second)):
+            cache.partial_path(keys[i]).write_bytes(b"p" * 100)
+            cache.put(keys[i], cache.partial_path(keys[i]), sources[i])
+        assert first.get(keys[1]) is not None and second.get(keys[0]) is not None
+        assert ProxyCache(str(tmp_path / "proxies")).stats()["entries"] == 2
+
+    def test_pinned_proxies_are_not_evicted(self, tmp_path):
+        cache = ProxyCache(str(tmp_path / "proxies"), max_gb=250 / 1024**3)
+        sources = [tmp_path / f"C{i}.mov" for i in range(4)]
+        for i, src in enumerate(sources):
+            src.write_bytes(bytes([i]) * 3000)
+        keys = [cache.key(src, "split") for src in sources]
+        cache.directory.mkdir(parents=True)
+
+        def encode(i):
+            partials = [tmp_path / f"{i}.{n}.mp4" for n in range(2)]
+            for partial in partials:
+                partial.write_bytes(b"p" * 50)
+            return cache.put_parts(keys[i], partials, sources[i])
+
+        cache.pin(keys[0])
+        cache.pin(keys[0])  # pins nest
+        cache.pin(keys[1])  # pinned before its proxy is written
+        parts0 = encode(0)
+        encode(1)
+        encode(2)  # 300 bytes > 250, but C2 was just written and C0, C1 are pinned
+        assert cache.stats()["evicted"] == 0 and cache.stats()["pinned"] == 2
+
+        cache.unpin(keys[0])
+        cache.unpin(keys[1])
+        encode(3)  # C0 still has one holder: evict C1 and C2
+        assert cache.get_parts(keys[1]) is None and cache.get_parts(keys[2]) is None
+        assert all(p.exists() for p in parts0)
+        cache.unpin(keys[0])
+        encode(1)
+        assert cache.get_parts(keys[0]) is None and cache.stats()["pinned"] == 0